@@ -0,0 +1,135 @@
+"""
+백그라운드 작업 큐 모듈.
+
+SMS 발송처럼 외부 서비스 지연에 영향을 받는 작업을 요청 처리 스레드에서 분리하기 위한
+프로세스 내 작업 큐를 정의한다. 큐마다 크기가 제한된 대기열과 고정 개수의 워커 스레드를 가지며,
+워커는 첫 작업이 들어올 때 시작된다.
+
+큐 설정은 settings.BACKGROUND_QUEUES 에 이름 단위로 정의한다.
+BACKGROUND_QUEUE_EAGER 가 True 이면 작업을 호출 스레드에서 즉시 실행한다. (테스트용)
+
+Classes:
+    QueueFull: 대기열이 가득 찼을 때 발생하는 예외
+    DispatchQueue: 제한된 워커 풀을 가진 작업 큐
+
+Functions:
+    get_queue: 이름으로 큐 인스턴스를 조회
+"""
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAXSIZE = 1000
+
+
+class QueueFull(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class DispatchQueue:
+    """
+    제한된 워커 풀로 작업을 처리하는 큐.
+
+    Attributes:
+        name (str): 큐 이름 (로그 식별용)
+        workers (int): 워커 스레드 수
+        maxsize (int): 대기열 최대 길이
+    """
+
+    def __init__(self, name, workers=DEFAULT_WORKERS, maxsize=DEFAULT_MAXSIZE):
+        self.name = name
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f'{self.name}-worker-{index}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                self._execute(func, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, func, args, kwargs):
+        # 워커 스레드는 요청 사이클 밖에서 동작하므로 DB 연결을 직접 정리한다.
+        close_old_connections()
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception("background task failed (queue=%s, task=%s)", self.name, getattr(func, '__name__', func))
+        finally:
+            close_old_connections()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        작업을 대기열에 넣고 즉시 반환한다.
+
+        Raises:
+            QueueFull: 대기열이 가득 찬 경우
+        """
+        if getattr(settings, 'BACKGROUND_QUEUE_EAGER', False):
+            self._execute(func, args, kwargs)
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            raise QueueFull(self.name)
+
+    def pending(self):
+        """대기 중인 작업 수 (근사값)"""
+        return self._queue.qsize()
+
+    def join(self):
+        """대기열의 모든 작업이 끝날 때까지 기다린다."""
+        self._queue.join()
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_queue(name):
+    """
+    이름에 해당하는 DispatchQueue 를 반환한다. (프로세스당 이름별 1개)
+
+    Args:
+        name (str): settings.BACKGROUND_QUEUES 의 큐 이름
+
+    Returns:
+        DispatchQueue: 작업 큐
+    """
+    dispatch_queue = _queues.get(name)
+    if dispatch_queue is None:
+        with _queues_lock:
+            dispatch_queue = _queues.get(name)
+            if dispatch_queue is None:
+                options = getattr(settings, 'BACKGROUND_QUEUES', {}).get(name, {})
+                dispatch_queue = DispatchQueue(
+                    name,
+                    workers=options.get('workers', DEFAULT_WORKERS),
+                    maxsize=options.get('maxsize', DEFAULT_MAXSIZE),
+                )
+                _queues[name] = dispatch_queue
+    return dispatch_queue
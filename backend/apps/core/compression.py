@@ -0,0 +1,125 @@
+"""
+응답 압축 모듈.
+
+Accept-Encoding 을 협상해 JSON/텍스트 응답을 brotli 또는 gzip 으로 압축한다.
+COMPRESSION_MIN_SIZE 보다 작은 본문은 압축 이득보다 CPU 비용이 커서 그대로 보낸다.
+brotli 는 선택 의존성(brotli 패키지)이 설치된 경우에만 사용하며, 없으면 gzip 만 협상한다.
+
+스트리밍 응답(내보내기 등)은 자체적으로 압축하므로 대상에서 제외한다.
+
+Functions:
+    negotiate: Accept-Encoding 에서 사용할 인코딩 선택
+    compress_response: 응답 본문 압축
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+COMPRESSIBLE_SUFFIXES = ('+json', '+xml')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def available_encodings():
+    """서버가 지원하는 인코딩 (선호 순)."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _qualities(accept_encoding):
+    """Accept-Encoding 헤더 값을 {인코딩: q} 로 파싱한다. 잘못된 q 는 0 으로 본다."""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, *params = part.strip().split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(accept_encoding, encodings=None):
+    """
+    Accept-Encoding 헤더 값에서 사용할 인코딩을 고른다. q=0 은 거부로 본다.
+
+    Args:
+        accept_encoding (str): Accept-Encoding 헤더 값
+        encodings (tuple): 후보 인코딩 (우선순위 순, 기본값 available_encodings())
+
+    Returns:
+        str | None: 'br' / 'gzip' / None
+    """
+    accepted = _qualities(accept_encoding)
+    best = None
+    for encoding in encodings or available_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (encoding, quality)
+    return best[0] if best else None
+
+
+def identity_acceptable(accept_encoding):
+    """
+    압축하지 않은 응답을 보낼 수 있는지 확인한다.
+    identity;q=0, 또는 identity 없이 *;q=0 이면 거부로 본다. (RFC 9110 12.5.3)
+    """
+    accepted = _qualities(accept_encoding)
+    if 'identity' in accepted:
+        return accepted['identity'] > 0
+    return accepted.get('*', 1.0) > 0
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+def compress(data, encoding):
+    """본문을 한 번에 압축한다."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=_setting('COMPRESSION_BROTLI_QUALITY', 5))
+    compressor = zlib.compressobj(_setting('COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_response(request, response):
+    """
+    조건을 만족하면 응답 본문을 압축하고 Content-Encoding / Vary 헤더를 설정한다.
+
+    압축한 응답의 강한 ETag 는 바이트 단위로 달라지므로 약한 ETag 로 바꾼다.
+    """
+    if response.streaming or response.has_header('Content-Encoding'):
+        return response
+    if not is_compressible(response.get('Content-Type', '')):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if response.status_code != 200 or len(response.content) < _setting('COMPRESSION_MIN_SIZE', 1024):
+        return response
+    encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if encoding is None:
+        return response
+
+    compressed = compress(response.content, encoding)
+    if len(compressed) >= len(response.content):
+        return response
+    response.content = compressed
+    response['Content-Length'] = str(len(compressed))
+    response['Content-Encoding'] = encoding
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
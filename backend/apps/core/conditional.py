@@ -0,0 +1,99 @@
+"""
+조건부 GET(Conditional GET) 모듈.
+
+조회 API 응답에 약한 ETag 와 Last-Modified 를 붙이고, 클라이언트가 보낸 If-None-Match /
+If-Modified-Since 가 일치하면 시리얼라이저를 실행하기 전에 304 를 반환한다.
+
+검증자는 응답 본문을 만들지 않고 계산한다.
+    - 목록: 대상 쿼리셋들의 MAX(시각 필드) 와 COUNT(*) 집계 (행이 삭제되면 개수가 바뀐다)
+    - 상세: 조회한 객체의 시각 필드 (+ 추가 소스의 집계)
+Last-Modified 는 상세 응답에만 붙인다. 목록은 행이 삭제되어도 MAX(시각 필드)가 그대로일 수 있어
+If-Modified-Since 만으로는 변경을 알 수 없으므로 ETag 로만 검증한다.
+표현 형식(시리얼라이저 필드 등)이 바뀌면 conditional_version 을 올려 기존 ETag 를 무효화한다.
+
+Classes:
+    ConditionalGetMixin: list / retrieve 에 조건부 GET 을 적용하는 ViewSet 믹스인
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    list / retrieve 에 조건부 GET 을 적용하는 ViewSet 믹스인.
+
+    Attributes:
+        conditional_field (str): 변경 시각 필드 (기본값 'updated_at')
+        conditional_version (int): 응답 표현 버전
+        conditional_vary (tuple): 응답 표현을 바꾸는 요청 헤더 (Vary 에 추가)
+    """
+    conditional_field = 'updated_at'
+    conditional_version = 1
+    conditional_vary = ()
+
+    def get_conditional_sources(self, obj=None):
+        """
+        검증자 계산에 집계할 (쿼리셋, 시각 필드) 목록을 반환한다.
+
+        기본값은 목록 조회 시 필터링된 쿼리셋, 상세 조회 시 없음(객체의 시각 필드만 사용)이다.
+        응답에 포함되는 하위 객체가 상위 객체의 시각 필드를 갱신하지 않으면 여기에 추가한다.
+        """
+        if obj is not None:
+            return []
+        return [(self.filter_queryset(self.get_queryset()), self.conditional_field)]
+
+    def get_conditional_parts(self):
+        """응답 표현을 바꾸는 요청 조건 (ETag 계산에 포함)."""
+        user = getattr(self.request, 'user', None)
+        return [self.conditional_version, getattr(user, 'pk', None)]
+
+    def get_validators(self, obj=None):
+        """
+        Returns:
+            tuple: (약한 ETag, Last-Modified datetime 또는 None, 목록이면 항상 None)
+        """
+        parts = self.get_conditional_parts()
+        stamps = []
+        if obj is not None:
+            stamp = getattr(obj, self.conditional_field)
+            stamps.append(stamp)
+            parts.append(stamp.isoformat() if stamp else None)
+        for queryset, field in self.get_conditional_sources(obj):
+            row = queryset.order_by().aggregate(latest=Max(field), count=Count('pk'))
+            stamps.append(row['latest'])
+            parts += [row['latest'].isoformat() if row['latest'] else None, row['count']]
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:24]
+        last_modified = None
+        if obj is not None:
+            last_modified = max((stamp for stamp in stamps if stamp is not None), default=None)
+        return f'W/"{digest}"', last_modified
+
+    def _conditional(self, request, validators, render):
+        etag, last_modified = validators
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            patch_cache_control(response, private=True, no_cache=True)
+            if self.conditional_vary:
+                patch_vary_headers(response, self.conditional_vary)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(
+            request, self.get_validators(), lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self._conditional(
+            request, self.get_validators(instance), lambda: Response(self.get_serializer(instance).data)
+        )
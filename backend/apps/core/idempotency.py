@@ -0,0 +1,171 @@
+"""
+멱등성 키(Idempotency-Key) 모듈.
+
+불안정한 모바일 네트워크에서 클라이언트가 같은 쓰기 요청(세션 생성, 루틴 생성, 회원가입 등)을
+재시도해도 한 번만 처리되도록 한다. 클라이언트는 요청마다 고유한 Idempotency-Key 헤더를 보내고,
+재시도할 때 같은 키를 다시 보낸다.
+
+처리 흐름:
+    1. (요청 주체, 키) 로 IN_PROGRESS 행을 만든다. 유일 제약으로 동시 요청 중 하나만 성공한다.
+    2. 성공한 요청은 View 를 실행하고 응답을 COMPLETED 로 저장한다. (5xx, 429, 예외는 행을 삭제해 재시도 허용)
+    3. 나머지 요청은 도메인 테이블에 접근하지 않고 저장된 응답을 그대로 돌려준다.
+       첫 요청이 아직 처리 중이면 IDEMPOTENCY_WAIT_TIMEOUT 동안 기다린다.
+같은 키를 다른 요청 본문에 재사용하면 422 를 반환한다.
+만료된 키는 sweep_idempotency_keys 명령으로 expires_at 인덱스를 따라 청크 단위로 삭제한다.
+
+Functions:
+    idempotent: ViewSet 액션에 멱등성 키 처리를 적용하는 데코레이터
+    sweep_expired: 만료된 키 삭제
+"""
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+from .ratelimit import _digest, _ip_ident
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADERS = ('Location', 'Content-Location')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def request_owner(request):
+    """요청 주체. 인증된 사용자는 사용자 ID, 그 외에는 IP 해시."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{_digest(_ip_ident(request))}'
+
+
+def request_fingerprint(request):
+    """메서드, 경로, 본문으로 만든 요청 지문 (SHA-256)."""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return hashlib.sha256(f'{request.method}\n{request.path}\n{body}'.encode()).hexdigest()
+
+
+def _error(code, message, status_code, headers=None):
+    return Response({"error": code, "tts_message": message}, status=status_code, headers=headers)
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.response_status, headers=record.response_headers or {})
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _acquire(owner, key, fingerprint, ttl):
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                owner=owner, key=key, fingerprint=fingerprint, expires_at=timezone.now() + ttl
+            )
+    except IntegrityError:
+        return None
+
+
+def _complete(record, response):
+    body = None
+    if response.data is not None:
+        body = json.loads(JSONRenderer().render(response.data))
+    headers = {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)}
+    IdempotencyKey.objects.filter(pk=record.pk).update(
+        status='COMPLETED', response_status=response.status_code,
+        response_body=body, response_headers=headers,
+    )
+
+
+def idempotent(func):
+    """
+    ViewSet 액션에 멱등성 키 처리를 적용하는 데코레이터.
+
+    Idempotency-Key 헤더가 없거나 안전한 메서드(GET 등)이면 그대로 실행한다.
+    """
+    @wraps(func)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.META.get(HEADER)
+        if not key or request.method in SAFE_METHODS:
+            return func(view, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(
+                "INVALID_IDEMPOTENCY_KEY", "요청 식별 키가 올바르지 않습니다.", status.HTTP_400_BAD_REQUEST
+            )
+
+        owner = request_owner(request)
+        fingerprint = request_fingerprint(request)
+        ttl = timedelta(seconds=_setting('IDEMPOTENCY_TTL', 86400))
+        lock_timeout = timedelta(seconds=_setting('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+        deadline = time.monotonic() + _setting('IDEMPOTENCY_WAIT_TIMEOUT', 10)
+        delay = 0.05
+
+        while True:
+            record = _acquire(owner, key, fingerprint, ttl)
+            if record is not None:
+                break
+            existing = IdempotencyKey.objects.filter(owner=owner, key=key).first()
+            if existing is None:
+                # 첫 요청이 실패해 행이 삭제된 경우 다시 시도한다.
+                continue
+            now = timezone.now()
+            stale = existing.status == 'IN_PROGRESS' and existing.created_at < now - lock_timeout
+            if existing.expires_at <= now or stale:
+                # 만료되었거나 처리 중 프로세스가 중단된 키는 삭제하고 새로 처리한다.
+                IdempotencyKey.objects.filter(pk=existing.pk, status=existing.status).delete()
+                continue
+            if existing.fingerprint != fingerprint:
+                return _error(
+                    "IDEMPOTENCY_KEY_MISMATCH", "같은 요청 식별 키로 다른 요청을 보낼 수 없습니다.",
+                    status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if existing.status == 'COMPLETED':
+                return _replay(existing)
+            if time.monotonic() >= deadline:
+                return _error(
+                    "IDEMPOTENCY_KEY_IN_PROGRESS", "이전 요청을 처리하고 있습니다. 잠시 후 다시 시도해주세요.",
+                    status.HTTP_409_CONFLICT, headers={'Retry-After': '1'}
+                )
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+        try:
+            response = func(view, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if response.status_code >= 500 or response.status_code == 429 or not isinstance(response, Response):
+            record.delete()
+            return response
+        _complete(record, response)
+        return response
+    return wrapper
+
+
+def sweep_expired(chunk_size=1000, now=None):
+    """
+    만료된 키를 expires_at 인덱스 순서로 chunk_size 개씩 삭제한다.
+
+    Returns:
+        int: 삭제된 행 수
+    """
+    now = now or timezone.now()
+    expired = IdempotencyKey.objects.filter(expires_at__lte=now).order_by('expires_at')
+    deleted = 0
+    while True:
+        ids = list(expired.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
@@ -0,0 +1,49 @@
+"""
+스레드 안전한 LRU 캐시 모듈.
+
+프로세스 내에서 크기가 제한된 캐시가 필요한 곳(재생 계획, 사용자별 캐시 등)에서 사용한다.
+
+Classes:
+    LRUCache: 최대 항목 수가 제한된 LRU 캐시
+"""
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    최대 maxsize 개의 항목을 보관하고, 가장 오래 사용되지 않은 항목부터 제거하는 캐시.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
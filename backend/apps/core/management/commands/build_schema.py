@@ -0,0 +1,22 @@
+"""
+OpenAPI 스키마 사전 생성 명령.
+
+배포 빌드 단계에서 실행해 /api/schema/ 가 요청마다 스키마를 만들지 않도록 한다.
+
+Usage:
+    python manage.py build_schema [--output build/openapi.json]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.schema import build_schema
+
+
+class Command(BaseCommand):
+    help = 'OpenAPI 스키마를 생성해 파일로 저장한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help='저장 경로 (기본값 settings.OPENAPI_SCHEMA_PATH)')
+
+    def handle(self, *args, **options):
+        path, size = build_schema(options['output'])
+        self.stdout.write(self.style.SUCCESS(f"wrote {size} bytes to {path}"))
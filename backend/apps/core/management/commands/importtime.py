@@ -0,0 +1,59 @@
+"""
+모듈 import 시간 측정 명령.
+
+새 인터프리터를 `-X importtime` 옵션으로 실행해 Django 설정 로딩과 대상 모듈 import 를 수행하고,
+누적 시간이 큰 모듈 순으로 출력한다. 워커 기동 시간을 늘리는 모듈을 찾는 데 사용한다.
+
+Usage:
+    python manage.py importtime [--module config.wsgi] [--top 30]
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(output):
+    """
+    `-X importtime` 출력을 [(모듈, self_us, cumulative_us)] 로 변환한다.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+class Command(BaseCommand):
+    help = '워커 기동 시 import 시간을 모듈별로 측정한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='config.wsgi', help='import 할 진입 모듈')
+        parser.add_argument('--top', type=int, default=30, help='출력할 모듈 수')
+        parser.add_argument('--urls', action='store_true', help='URLconf 로딩까지 포함')
+
+    def handle(self, *args, **options):
+        code = f"import {options['module']}"
+        if options['urls']:
+            code += "; from django.urls import get_resolver; get_resolver().url_patterns"
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=str(settings.BASE_DIR), env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+
+        rows = parse_importtime(result.stderr)
+        total = sum(self_us for _, self_us, _ in rows)
+        self.stdout.write(f"{len(rows)} modules, {total / 1000:.1f} ms total")
+        self.stdout.write(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda row: -row[2])[:options['top']]:
+            self.stdout.write(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
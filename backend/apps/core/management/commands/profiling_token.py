@@ -0,0 +1,21 @@
+"""
+프로파일링 요청 헤더 값 발급 명령.
+
+Usage:
+    python manage.py profiling_token
+    curl -H "X-Profile-Token: <값>" https://.../api/exercises/
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = '프로파일링 요청 헤더 값을 발급한다.'
+
+    def handle(self, *args, **options):
+        header = getattr(settings, 'PROFILING_HEADER', 'X-Profile-Token')
+        max_age = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+        self.stdout.write(f'{header}: {make_token()}')
+        self.stderr.write(f'valid for {max_age} seconds')
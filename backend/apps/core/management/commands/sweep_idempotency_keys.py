@@ -0,0 +1,23 @@
+"""
+만료된 멱등성 키 정리 명령.
+
+expires_at 이 지난 Idempotency-Key 행을 청크 단위로 삭제한다.
+주기 실행(cron 등)을 전제로 한다.
+
+Usage:
+    python manage.py sweep_idempotency_keys [--chunk-size 1000]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.idempotency import sweep_expired
+
+
+class Command(BaseCommand):
+    help = '만료된 멱등성 키를 삭제한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='한 번에 삭제할 행 수')
+
+    def handle(self, *args, **options):
+        deleted = sweep_expired(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"deleted {deleted} expired idempotency keys"))
@@ -0,0 +1,348 @@
+"""
+요청 계측(Metrics) 모듈.
+
+요청 지연 시간 히스토그램, 상태 코드별 요청 수, DB 쿼리 수/시간, 시리얼라이저 시간을
+DRF ViewSet 액션(예: 'ExerciseViewSet.list') 단위 라벨로 집계하고
+Prometheus 텍스트 형식으로 내보낸다.
+
+집계는 스레드마다 별도의 샤드에 기록하므로 요청 처리 중에는 락을 잡지 않는다.
+샤드 합산은 수집(/metrics 조회) 시점에만 한다.
+gunicorn 처럼 여러 프로세스로 배포할 때는 METRICS_MULTIPROCESS_DIR 을 지정하면
+각 프로세스가 주기적으로 스냅샷 파일을 기록하고, 수집 시 모든 파일을 합산한다.
+
+Classes:
+    MetricsRegistry: 스레드 샤드 기반 카운터/히스토그램 저장소
+    RequestStats: 요청 1건의 DB/시리얼라이저 측정값
+
+Functions:
+    view_label: 요청을 처리한 View 의 라벨
+    record_request: 요청 1건의 측정값 기록
+    collect: 현재 프로세스(또는 전체 프로세스) 측정값 합산
+    render: Prometheus 텍스트 형식으로 변환
+    instrument_serializers: 시리얼라이저 직렬화 시간 측정 활성화
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 이름: (유형, 설명)
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests by view, method and status.'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by view.'),
+    'db_queries_total': ('counter', 'Database queries executed by view.'),
+    'db_query_duration_seconds_total': ('counter', 'Time spent in database queries by view.'),
+    'serializer_duration_seconds_total': ('counter', 'Time spent serializing responses by view.'),
+}
+
+
+class _Shard:
+    """스레드 하나가 단독으로 기록하는 측정값."""
+
+    def __init__(self, bucket_count):
+        self.thread = threading.current_thread()
+        self.counters = defaultdict(float)
+        # (이름, 라벨) -> [버킷별 개수..., +Inf 개수, 합계]
+        self.histograms = {}
+        self.bucket_count = bucket_count
+
+    def observe(self, key, index, value):
+        entry = self.histograms.get(key)
+        if entry is None:
+            entry = self.histograms[key] = [0] * (self.bucket_count + 2)
+        entry[index] += 1
+        entry[-1] += value
+
+
+def _merge(target, counters, histograms):
+    for key, value in counters.items():
+        target['counters'][key] = target['counters'].get(key, 0) + value
+    for key, entry in histograms.items():
+        existing = target['histograms'].get(key)
+        if existing is None:
+            target['histograms'][key] = list(entry)
+        else:
+            for index, value in enumerate(entry):
+                existing[index] += value
+
+
+class MetricsRegistry:
+    """
+    스레드 샤드 기반 측정값 저장소.
+
+    기록(inc/observe)은 현재 스레드의 샤드만 수정하므로 락이 필요 없다.
+    락은 스레드가 처음 기록할 때 샤드를 등록하는 순간과 수집 시점에만 사용한다.
+    종료된 스레드의 샤드는 수집 시 retired 샤드로 합쳐 누적값을 유지한다.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {'counters': {}, 'histograms': {}}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard(len(self.buckets))
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def inc(self, name, labels, amount=1):
+        self._shard().counters[(name, labels)] += amount
+
+    def observe(self, name, labels, value):
+        self._shard().observe((name, labels), bisect_left(self.buckets, value), value)
+
+    def snapshot(self):
+        """
+        모든 샤드를 합산한 측정값을 반환한다.
+
+        Returns:
+            dict: {'counters': {(이름, 라벨): 값}, 'histograms': {(이름, 라벨): [...]}}
+        """
+        result = {'counters': {}, 'histograms': {}}
+        with self._lock:
+            alive = []
+            for shard in self._shards:
+                # dict() 복사는 GIL 아래에서 원자적이므로 기록 중인 샤드도 안전하게 읽을 수 있다.
+                counters = dict(shard.counters)
+                histograms = {key: list(entry) for key, entry in dict(shard.histograms).items()}
+                if shard.thread.is_alive():
+                    alive.append(shard)
+                    _merge(result, counters, histograms)
+                else:
+                    _merge(self._retired, counters, histograms)
+            self._shards = alive
+            _merge(result, self._retired['counters'], self._retired['histograms'])
+        return result
+
+    def clear(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+            self._retired = {'counters': {}, 'histograms': {}}
+
+
+registry = MetricsRegistry()
+
+
+class RequestStats:
+    """
+    요청 1건의 DB 쿼리와 시리얼라이저 측정값.
+
+    connection.execute_wrapper 로 등록되어 모든 쿼리 실행 시간을 잰다.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - start
+
+
+_current = threading.local()
+
+
+def begin_request(stats):
+    _current.stats = stats
+
+
+def end_request():
+    _current.stats = None
+
+
+def view_label(request, view_func):
+    """
+    요청을 처리하는 View 의 라벨을 만든다.
+
+    DRF ViewSet 은 'ExerciseViewSet.list' 처럼 클래스와 액션 이름을,
+    APIView 는 클래스 이름을, 함수 View 는 함수 이름을 사용한다.
+    """
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__qualname__', type(view_func).__name__)
+    actions = getattr(view_func, 'actions', None)
+    if actions:
+        return f"{cls.__name__}.{actions.get(request.method.lower(), request.method.lower())}"
+    return cls.__name__
+
+
+def record_request(view, method, status_code, duration, stats):
+    """
+    요청 1건의 측정값을 현재 스레드 샤드에 기록하고, 필요하면 프로세스 스냅샷을 기록한다.
+    """
+    labels = (('view', view),)
+    registry.inc('http_requests_total', labels + (('method', method), ('status', str(status_code))))
+    registry.observe('http_request_duration_seconds', labels, duration)
+    registry.inc('db_queries_total', labels, stats.queries)
+    registry.inc('db_query_duration_seconds_total', labels, stats.query_time)
+    registry.inc('serializer_duration_seconds_total', labels, stats.serializer_time)
+    _maybe_dump()
+
+
+# -----------------------------------------------------------------------------
+# 다중 프로세스 모드
+# -----------------------------------------------------------------------------
+
+_last_dump = 0.0
+
+
+def _multiprocess_dir():
+    return getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+
+
+def _encode(snapshot):
+    return {
+        kind: [[name, [list(label) for label in labels], value] for (name, labels), value in entries.items()]
+        for kind, entries in snapshot.items()
+    }
+
+
+def _decode(data):
+    return {
+        kind: {(name, tuple(tuple(label) for label in labels)): value for name, labels, value in entries}
+        for kind, entries in data.items()
+    }
+
+
+def dump_snapshot():
+    """
+    현재 프로세스의 스냅샷을 METRICS_MULTIPROCESS_DIR/metrics-<pid>.json 으로 기록한다.
+    임시 파일에 쓴 뒤 교체하므로 수집 중인 프로세스가 쓰다 만 파일을 읽지 않는다.
+    """
+    global _last_dump
+    directory = _multiprocess_dir()
+    if not directory:
+        return
+    _last_dump = time.monotonic()
+    path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+    temp = f'{path}.{threading.get_ident()}.tmp'
+    with open(temp, 'w') as fp:
+        json.dump(_encode(registry.snapshot()), fp)
+    os.replace(temp, path)
+
+
+def _maybe_dump():
+    if _multiprocess_dir() and time.monotonic() - _last_dump >= getattr(settings, 'METRICS_DUMP_INTERVAL', 5):
+        dump_snapshot()
+
+
+def collect():
+    """
+    측정값을 합산한다. 다중 프로세스 모드에서는 모든 프로세스의 스냅샷 파일을 합산한다.
+    """
+    directory = _multiprocess_dir()
+    if not directory:
+        return registry.snapshot()
+    dump_snapshot()
+    result = {'counters': {}, 'histograms': {}}
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith('metrics-') and name.endswith('.json')):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as fp:
+                data = _decode(json.load(fp))
+        except (OSError, ValueError):
+            continue
+        _merge(result, data.get('counters', {}), data.get('histograms', {}))
+    return result
+
+
+# -----------------------------------------------------------------------------
+# 텍스트 형식
+# -----------------------------------------------------------------------------
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def render(snapshot, buckets=LATENCY_BUCKETS):
+    """
+    측정값을 Prometheus 텍스트 형식(0.0.4)으로 변환한다.
+    """
+    by_name = defaultdict(list)
+    for (name, labels), value in snapshot['counters'].items():
+        by_name[name].append((labels, value))
+    for (name, labels), entry in snapshot['histograms'].items():
+        by_name[name].append((labels, entry))
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name.get(name, [])):
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + (float('inf'),), value[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+# -----------------------------------------------------------------------------
+# 시리얼라이저 시간 측정
+# -----------------------------------------------------------------------------
+
+def instrument_serializers():
+    """
+    BaseSerializer.data 를 감싸 요청 처리 중 직렬화 시간을 RequestStats 에 누적한다.
+
+    중첩/목록 시리얼라이저가 서로를 호출해도 가장 바깥 호출 시간만 센다.
+    여러 번 호출해도 한 번만 적용된다.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, 'instrumented', False):
+        return
+
+    def data(self):
+        stats = getattr(_current, 'stats', None)
+        if stats is None or stats.serializing:
+            return original.fget(self)
+        stats.serializing = True
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            stats.serializer_time += time.perf_counter() - start
+            stats.serializing = False
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
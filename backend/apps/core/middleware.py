@@ -0,0 +1,141 @@
+"""
+공용 미들웨어 모듈.
+
+Classes:
+    MetricsMiddleware: 요청 지연 시간, 상태 코드, DB 쿼리, 시리얼라이저 시간 계측
+    ProfilingMiddleware: 표본/서명 헤더 요청 프로파일링
+    CompressionMiddleware: 응답 본문 brotli/gzip 압축
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import compression, metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+class MetricsMiddleware:
+    """
+    요청 계측 미들웨어.
+
+    모든 DB 연결에 execute_wrapper 를 등록해 쿼리 수와 시간을 재고,
+    process_view 에서 처리 View 라벨을 정한다. URL 이 매칭되지 않은 요청은 'unmatched' 로 기록한다.
+    settings.METRICS_ENABLED 가 False 이면 미들웨어 체인에서 제외된다.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        metrics.instrument_serializers()
+
+    def __call__(self, request):
+        stats = metrics.RequestStats()
+        metrics.begin_request(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            metrics.end_request()
+        metrics.record_request(
+            getattr(request, '_metrics_view', 'unmatched'), request.method,
+            response.status_code, time.perf_counter() - start, stats
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = metrics.view_label(request, view_func)
+
+
+class ProfilingMiddleware:
+    """
+    요청 프로파일링 미들웨어.
+
+    PROFILING_SAMPLE_RATE 비율의 무작위 요청과, PROFILING_HEADER 에 유효한 서명 값을 가진 요청을
+    프로파일링해 ProfileRing 에 저장하고 응답 헤더 X-Profile-Id 로 ID 를 알려준다.
+    프로파일러는 프로세스 전역 훅을 사용하므로 한 번에 한 요청만 프로파일링하며,
+    이미 진행 중이면 프로파일링 없이 처리한다.
+    프로파일 저장에 실패해도 요청 응답은 그대로 반환한다. (오류는 로그로 남기고 X-Profile-Id 는 생략)
+    settings.PROFILING_ENABLED 가 False 이면 미들웨어 체인에서 제외된다.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.mode = getattr(settings, 'PROFILING_MODE', 'cprofile')
+        header = getattr(settings, 'PROFILING_HEADER', 'X-Profile-Token')
+        self.header = 'HTTP_' + header.upper().replace('-', '_')
+        self.ring = profiling.get_ring()
+        self._busy = threading.Lock()
+
+    def _trigger(self, request):
+        if self.header in request.META:
+            return 'header' if profiling.verify_token(request.META[self.header]) else None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None or not self._busy.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            start, stop, write = profiling.new_profiler(self.mode)
+            started_at = time.time()
+            begin = time.perf_counter()
+            start()
+            try:
+                response = self.get_response(request)
+            finally:
+                stop()
+            duration = time.perf_counter() - begin
+
+            match = getattr(request, 'resolver_match', None)
+            profile_id = self.ring.new_id()
+            try:
+                self.ring.save(profile_id, {
+                    'profile_id': profile_id,
+                    'mode': self.mode,
+                    'trigger': trigger,
+                    'method': request.method,
+                    'path': request.path,
+                    'view': match.view_name if match else None,
+                    'status': response.status_code,
+                    'duration_ms': round(duration * 1000, 3),
+                    'started_at': started_at,
+                }, write)
+            except Exception:
+                logger.exception("failed to save request profile %s (%s %s)", profile_id, request.method, request.path)
+                return response
+        finally:
+            self._busy.release()
+        response['X-Profile-Id'] = profile_id
+        return response
+
+
+class CompressionMiddleware:
+    """
+    응답 압축 미들웨어. (apps.core.compression)
+
+    COMPRESSION_MIN_SIZE 이상인 JSON/텍스트 응답을 클라이언트가 허용한 인코딩(brotli 우선, gzip)으로 압축한다.
+    settings.COMPRESSION_ENABLED 가 False 이면 미들웨어 체인에서 제외된다.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'COMPRESSION_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return compression.compress_response(request, self.get_response(request))
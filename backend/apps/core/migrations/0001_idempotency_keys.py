@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('owner', models.CharField(max_length=80, verbose_name='요청 주체 (user:<id> | ip:<해시>)')),
+                ('key', models.CharField(max_length=255, verbose_name='Idempotency-Key')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='요청 지문 (SHA-256)')),
+                ('status', models.CharField(choices=[('IN_PROGRESS', '처리 중'), ('COMPLETED', '완료')], default='IN_PROGRESS', max_length=20, verbose_name='상태')),
+                ('response_status', models.IntegerField(blank=True, null=True, verbose_name='응답 상태 코드')),
+                ('response_body', models.JSONField(blank=True, null=True, verbose_name='응답 본문')),
+                ('response_headers', models.JSONField(blank=True, null=True, verbose_name='응답 헤더')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('expires_at', models.DateTimeField(verbose_name='만료 일시')),
+            ],
+            options={
+                'verbose_name': '멱등성 키',
+                'verbose_name_plural': '멱등성 키 목록',
+                'db_table': 'idempotency_keys',
+                'indexes': [models.Index(fields=['expires_at'], name='idempotency_expires_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'key'), name='idempotency_owner_key_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+"""
+공용(core) 데이터 모델 정의 모듈.
+"""
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Idempotency-Key 헤더로 식별되는 쓰기 요청의 처리 상태와 응답.
+
+    (owner, key) 가 유일하므로 같은 키의 동시 요청 중 하나만 행을 만들 수 있고,
+    나머지는 처리가 끝날 때까지 기다렸다가 저장된 응답을 돌려받는다.
+    """
+    STATUS_CHOICES = [
+        ('IN_PROGRESS', '처리 중'),
+        ('COMPLETED', '완료'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    owner = models.CharField(max_length=80, verbose_name="요청 주체 (user:<id> | ip:<해시>)")
+    key = models.CharField(max_length=255, verbose_name="Idempotency-Key")
+    fingerprint = models.CharField(max_length=64, verbose_name="요청 지문 (SHA-256)")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='IN_PROGRESS', verbose_name="상태")
+
+    response_status = models.IntegerField(blank=True, null=True, verbose_name="응답 상태 코드")
+    response_body = models.JSONField(blank=True, null=True, verbose_name="응답 본문")
+    response_headers = models.JSONField(blank=True, null=True, verbose_name="응답 헤더")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+    expires_at = models.DateTimeField(verbose_name="만료 일시")
+
+    class Meta:
+        db_table = 'idempotency_keys'
+        verbose_name = '멱등성 키'
+        verbose_name_plural = '멱등성 키 목록'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'key'], name='idempotency_owner_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
@@ -0,0 +1,175 @@
+"""
+운영 환경 요청 프로파일링 모듈.
+
+설정된 비율로 무작위 표본 추출한 요청, 또는 서명된 헤더(settings.PROFILING_HEADER)를
+가진 요청만 프로파일링한다. 프로파일러는 cProfile(함수 단위 누적 통계) 또는
+스택 샘플러(주기적으로 호출 스택을 수집해 folded stack 형식으로 저장) 중에서 고른다.
+
+결과는 요청 메타데이터(JSON)와 함께 PROFILING_DIR 에 저장하며, 파일 수가
+PROFILING_RING_SIZE 를 넘으면 가장 오래된 것부터 삭제한다.
+PROFILING_ENABLED 가 False 이면 미들웨어가 체인에서 제외되어 오버헤드가 없다.
+
+Classes:
+    StackSampler: 대상 스레드의 호출 스택을 주기적으로 수집하는 샘플러
+    ProfileRing: 크기가 제한된 프로파일 파일 저장소
+
+Functions:
+    make_token: 프로파일링 요청 헤더 값 생성
+    verify_token: 헤더 값 검증
+"""
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+
+SIGNING_SALT = 'apps.core.profiling'
+TOKEN_VALUE = 'profile'
+PROFILE_ID_RE = re.compile(r'^[0-9]{20}-[0-9a-f]{8}$')
+EXTENSIONS = {'cprofile': '.prof', 'sampler': '.folded'}
+
+
+def make_token():
+    """
+    프로파일링 요청 헤더 값을 만든다. PROFILING_TOKEN_MAX_AGE 동안 유효하다.
+    """
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(TOKEN_VALUE)
+
+
+def verify_token(value):
+    """
+    헤더 값이 유효한 서명인지 확인한다.
+    """
+    if not value:
+        return False
+    max_age = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+    try:
+        return signing.TimestampSigner(salt=SIGNING_SALT).unsign(value, max_age=max_age) == TOKEN_VALUE
+    except signing.BadSignature:
+        return False
+
+
+class StackSampler:
+    """
+    대상 스레드의 호출 스택을 interval 초마다 수집하는 샘플러.
+
+    별도 스레드에서 sys._current_frames() 를 읽으므로 대상 스레드의 실행에는 개입하지 않는다.
+    결과는 'module:function;module:function count' 형식(folded stack)으로 만든다.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='profiling-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, 'w') as fp:
+            for stack, count in self.stacks.most_common():
+                fp.write(f'{stack} {count}\n')
+
+
+class ProfileRing:
+    """
+    프로파일 파일 저장소.
+
+    파일 이름은 '<UTC 시각(마이크로초)>-<임의값>' 형식의 ID 로 시간순 정렬된다.
+    저장 후 개수가 size 를 넘으면 가장 오래된 프로파일(결과 파일과 메타데이터)부터 삭제한다.
+    """
+
+    def __init__(self, directory, size):
+        self.directory = str(directory)
+        self.size = size
+        self._lock = threading.Lock()
+
+    def new_id(self):
+        now = time.time()
+        stamp = time.strftime('%Y%m%d%H%M%S', time.gmtime(now)) + f'{int(now % 1 * 1_000_000):06d}'
+        return f'{stamp}-{uuid.uuid4().hex[:8]}'
+
+    def path(self, profile_id, extension):
+        return os.path.join(self.directory, f'{profile_id}{extension}')
+
+    def save(self, profile_id, metadata, write):
+        """
+        write(path) 로 결과 파일을 기록하고 메타데이터를 저장한 뒤 오래된 항목을 정리한다.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        write(self.path(profile_id, EXTENSIONS[metadata['mode']]))
+        with open(self.path(profile_id, '.json'), 'w') as fp:
+            json.dump(metadata, fp, ensure_ascii=False)
+        self._trim()
+
+    def _trim(self):
+        with self._lock:
+            ids = self.ids()
+            for profile_id in ids[:-self.size] if len(ids) > self.size else []:
+                for extension in ('.json', *EXTENSIONS.values()):
+                    try:
+                        os.remove(self.path(profile_id, extension))
+                    except FileNotFoundError:
+                        pass
+
+    def ids(self):
+        """저장된 프로파일 ID 목록 (오래된 순)."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json') and PROFILE_ID_RE.match(name[:-5]))
+
+    def metadata(self, profile_id):
+        """프로파일 메타데이터. 없거나 잘못된 ID 이면 None."""
+        if not PROFILE_ID_RE.match(str(profile_id)):
+            return None
+        try:
+            with open(self.path(profile_id, '.json')) as fp:
+                return json.load(fp)
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+def get_ring():
+    return ProfileRing(
+        getattr(settings, 'PROFILING_DIR', os.path.join(settings.BASE_DIR, 'profiles')),
+        getattr(settings, 'PROFILING_RING_SIZE', 50),
+    )
+
+
+def new_profiler(mode):
+    """
+    mode('cprofile' | 'sampler')에 맞는 프로파일러를 (start, stop, write) 로 반환한다.
+    """
+    if mode == 'sampler':
+        sampler = StackSampler(interval=getattr(settings, 'PROFILING_SAMPLER_INTERVAL', 0.005))
+        return sampler.start, sampler.stop, sampler.dump
+    profiler = cProfile.Profile()
+    return profiler.enable, profiler.disable, profiler.dump_stats
@@ -0,0 +1,468 @@
+"""
+슬라이딩 윈도우 기반 요청 제한(Rate Limit) 모듈.
+
+로그인, PIN 검증, SMS 인증처럼 비용이 크거나 무차별 대입 공격에 노출되는
+엔드포인트를 보호하기 위한 공용 제한기를 정의한다.
+제한 정책은 settings.RATE_LIMITS 에 스코프 단위로 정의하며,
+키(전화번호, 디바이스 해시, IP)별로 슬라이딩 윈도우 카운터를 유지한다.
+
+Classes:
+    Rate: 제한 정책 (윈도우 내 허용 횟수, 잠금 시간)
+    RateLimitStatus: 제한 검사 결과
+    InMemoryRateLimitBackend: 프로세스 내 메모리 백엔드 (정확한 슬라이딩 로그)
+    CacheRateLimitBackend: Django 캐시(Redis 등) 기반 공유 백엔드 (슬라이딩 윈도우 카운터)
+    SlidingWindowThrottle: DRF 스로틀 클래스
+
+Functions:
+    rate_limit: ViewSet 액션에 제한을 적용하는 데코레이터
+"""
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+_DURATION_RE = re.compile(r'^(\d*)([smhd])$')
+
+
+def parse_duration(value):
+    """
+    '30m', '1h', 'm' 형식의 기간 문자열을 초 단위 정수로 변환한다.
+
+    Args:
+        value (str | int): 기간 문자열 또는 초 단위 정수
+
+    Returns:
+        int: 초 단위 기간
+    """
+    if isinstance(value, int):
+        return value
+    match = _DURATION_RE.match(str(value).strip())
+    if not match:
+        raise ValueError(f"잘못된 기간 형식입니다: {value!r}")
+    amount, unit = match.groups()
+    return int(amount or 1) * _DURATION_UNITS[unit]
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    제한 정책.
+
+    Attributes:
+        limit (int): 윈도우 내 허용 횟수
+        window (int): 윈도우 길이(초)
+        lockout (int): 한도 초과 시 추가로 차단할 시간(초). 0이면 윈도우가 지나면 해제된다.
+    """
+    limit: int
+    window: int
+    lockout: int = 0
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        '5/30m' 문자열 또는 {'rate': '5/30m', 'lockout': '30m'} 딕셔너리로부터 정책을 만든다.
+        """
+        if isinstance(spec, cls):
+            return spec
+        lockout = 0
+        if isinstance(spec, dict):
+            lockout = parse_duration(spec.get('lockout', 0))
+            spec = spec['rate']
+        limit, window = spec.split('/')
+        return cls(limit=int(limit), window=parse_duration(window), lockout=lockout)
+
+
+@dataclass(frozen=True)
+class RateLimitStatus:
+    """
+    제한 검사 결과.
+
+    Attributes:
+        allowed (bool): 요청 허용 여부
+        remaining (int): 윈도우 내 남은 허용 횟수
+        retry_after (int): 차단된 경우 재시도까지 남은 시간(초)
+    """
+    allowed: bool
+    remaining: int
+    retry_after: int = 0
+
+
+class BaseRateLimitBackend:
+    """
+    제한 백엔드 인터페이스.
+
+    check 는 기록 없이 현재 상태만 조회하고, hit 는 요청 1회를 기록한 뒤 상태를 반환한다.
+    release 는 같은 now 로 기록한 hit 1회를 되돌린다. (그 hit 로 걸린 잠금도 해제)
+    """
+
+    def check(self, key, rate, now=None):
+        raise NotImplementedError
+
+    def hit(self, key, rate, now=None):
+        raise NotImplementedError
+
+    def release(self, key, rate, now):
+        raise NotImplementedError
+
+    def reset(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(BaseRateLimitBackend):
+    """
+    프로세스 메모리에 키별 타임스탬프 로그를 유지하는 백엔드.
+
+    키 해시로 나눈 여러 개의 락(lock striping)을 사용해 서로 다른 키에 대한
+    요청이 하나의 전역 락에 직렬화되지 않도록 한다.
+    단일 프로세스 또는 개발 환경용이며, 다중 워커 환경에서는 CacheRateLimitBackend 를 사용한다.
+    """
+    STRIPES = 32
+    SWEEP_EVERY = 1024
+
+    def __init__(self):
+        self._locks = [threading.Lock() for _ in range(self.STRIPES)]
+        self._logs = [{} for _ in range(self.STRIPES)]
+        self._lockouts = [{} for _ in range(self.STRIPES)]
+        self._hits = [0] * self.STRIPES
+
+    def _stripe(self, key):
+        return hash(key) % self.STRIPES
+
+    def _sweep(self, stripe, now):
+        # 다시 요청하지 않는 키의 로그가 남아 메모리가 늘어나지 않도록 주기적으로 정리한다.
+        logs = self._logs[stripe]
+        for key in [k for k, (log, window) in logs.items() if not log or log[-1] <= now - window]:
+            del logs[key]
+        lockouts = self._lockouts[stripe]
+        for key in [k for k, (until, _) in lockouts.items() if until <= now]:
+            del lockouts[key]
+
+    def _evaluate(self, stripe, key, rate, now, record):
+        locked_until, _ = self._lockouts[stripe].get(key, (0, None))
+        if locked_until > now:
+            return RateLimitStatus(False, 0, math.ceil(locked_until - now))
+
+        entry = self._logs[stripe].get(key)
+        log = entry[0] if entry else deque()
+        boundary = now - rate.window
+        while log and log[0] <= boundary:
+            log.popleft()
+
+        if len(log) >= rate.limit:
+            retry_after = math.ceil(log[0] + rate.window - now)
+            return RateLimitStatus(False, 0, max(retry_after, 1))
+        if not record:
+            return RateLimitStatus(True, rate.limit - len(log))
+
+        self._hits[stripe] += 1
+        if self._hits[stripe] % self.SWEEP_EVERY == 0:
+            self._sweep(stripe, now)
+
+        log.append(now)
+        if len(log) >= rate.limit and rate.lockout:
+            # 한도에 도달한 순간부터 잠금 시간 동안 차단한다. (release 로 되돌릴 수 있게 로그를 함께 보관)
+            self._lockouts[stripe][key] = (now + rate.lockout, log)
+            self._logs[stripe].pop(key, None)
+            return RateLimitStatus(True, 0)
+        self._logs[stripe][key] = (log, rate.window)
+        return RateLimitStatus(True, rate.limit - len(log))
+
+    def check(self, key, rate, now=None):
+        now = time.time() if now is None else now
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._evaluate(stripe, key, rate, now, record=False)
+
+    def hit(self, key, rate, now=None):
+        now = time.time() if now is None else now
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            return self._evaluate(stripe, key, rate, now, record=True)
+
+    def release(self, key, rate, now):
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            locked_until, log = self._lockouts[stripe].get(key, (0, None))
+            if rate.lockout and locked_until == now + rate.lockout:
+                # 되돌리는 hit 가 건 잠금이면 해제하고 잠금 직전의 로그를 복원한다.
+                del self._lockouts[stripe][key]
+            else:
+                entry = self._logs[stripe].get(key)
+                log = entry[0] if entry else None
+            if log and now in log:
+                log.remove(now)
+            if log:
+                self._logs[stripe][key] = (log, rate.window)
+            else:
+                self._logs[stripe].pop(key, None)
+
+    def reset(self, key):
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._logs[stripe].pop(key, None)
+            self._lockouts[stripe].pop(key, None)
+
+    def clear(self):
+        for stripe, lock in enumerate(self._locks):
+            with lock:
+                self._logs[stripe].clear()
+                self._lockouts[stripe].clear()
+
+
+class CacheRateLimitBackend(BaseRateLimitBackend):
+    """
+    Django 캐시(Redis, Memcached 등)를 공유 저장소로 사용하는 백엔드.
+
+    키별 전체 로그 대신 현재/직전 고정 윈도우 카운터 두 개만 저장하고,
+    직전 윈도우 카운트를 겹치는 비율만큼 가중해 슬라이딩 윈도우를 근사한다.
+    증가 연산은 캐시의 원자적 incr 를 사용하므로 여러 워커가 같은 키를 공유할 수 있다.
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias or getattr(settings, 'RATE_LIMIT_CACHE', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _window_keys(self, key, rate, now):
+        index = int(now // rate.window)
+        return index, f'{key}:{index}', f'{key}:{index - 1}'
+
+    def _estimate(self, key, rate, now):
+        index, current_key, previous_key = self._window_keys(key, rate, now)
+        counts = self.cache.get_many([current_key, previous_key])
+        elapsed = (now - index * rate.window) / rate.window
+        weighted = counts.get(previous_key, 0) * (1 - elapsed) + counts.get(current_key, 0)
+        return weighted, current_key, (index + 1) * rate.window - now
+
+    def _locked(self, key, now):
+        locked_until = self.cache.get(f'{key}:lock')
+        if locked_until and locked_until > now:
+            return RateLimitStatus(False, 0, math.ceil(locked_until - now))
+        return None
+
+    def check(self, key, rate, now=None):
+        now = time.time() if now is None else now
+        locked = self._locked(key, now)
+        if locked:
+            return locked
+        weighted, _, until_next = self._estimate(key, rate, now)
+        if weighted >= rate.limit:
+            return RateLimitStatus(False, 0, max(math.ceil(until_next), 1))
+        return RateLimitStatus(True, int(rate.limit - weighted))
+
+    def hit(self, key, rate, now=None):
+        now = time.time() if now is None else now
+        status_ = self.check(key, rate, now)
+        if not status_.allowed:
+            return status_
+        _, current_key, _ = self._window_keys(key, rate, now)
+        # 윈도우 두 개 길이만큼 보존해야 다음 윈도우에서 직전 카운트로 쓸 수 있다.
+        self.cache.add(current_key, 0, timeout=rate.window * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, timeout=rate.window * 2)
+        weighted, _, _ = self._estimate(key, rate, now)
+        if weighted >= rate.limit and rate.lockout:
+            self.cache.set(f'{key}:lock', now + rate.lockout, timeout=rate.lockout)
+        return RateLimitStatus(True, max(int(rate.limit - weighted), 0))
+
+    def release(self, key, rate, now):
+        _, current_key, _ = self._window_keys(key, rate, now)
+        try:
+            self.cache.decr(current_key)
+        except ValueError:
+            pass
+        if rate.lockout and self.cache.get(f'{key}:lock') == now + rate.lockout:
+            self.cache.delete(f'{key}:lock')
+
+    def reset(self, key):
+        # 윈도우 카운터는 TTL 로 만료되므로 잠금만 해제한다.
+        self.cache.delete(f'{key}:lock')
+
+    def clear(self):
+        self.cache.clear()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    settings.RATE_LIMIT_BACKEND 에 지정된 백엔드 인스턴스를 반환한다. (프로세스당 1개)
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'RATE_LIMIT_BACKEND', 'apps.core.ratelimit.InMemoryRateLimitBackend')
+                _backend = import_string(path)()
+    return _backend
+
+
+def get_rate(scope):
+    """
+    settings.RATE_LIMITS 에서 스코프의 정책을 읽는다. 정의되지 않은 스코프는 None.
+    """
+    spec = getattr(settings, 'RATE_LIMITS', {}).get(scope)
+    return Rate.parse(spec) if spec else None
+
+
+# -----------------------------------------------------------------------------
+# 제한 키 추출
+# -----------------------------------------------------------------------------
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def _ip_ident(request):
+    # DRF 스로틀과 동일한 방식(NUM_PROXIES 설정 반영)으로 클라이언트 IP를 구한다.
+    return BaseThrottle().get_ident(request)
+
+
+def _phone_ident(request):
+    phone = str(request.data.get('phone_number') or '')
+    digits = re.sub(r'\D', '', phone)
+    return digits or None
+
+
+def _device_ident(request):
+    device_id = request.data.get('device_id')
+    return _digest(str(device_id)) if device_id else None
+
+
+KEY_FUNCTIONS = {
+    'ip': _ip_ident,
+    'phone': _phone_ident,
+    'device': _device_ident,
+}
+
+
+def build_keys(scope, request, keys):
+    """
+    요청에서 제한 키 목록을 만든다. 값이 없는 키 종류(예: 전화번호 미입력)는 건너뛴다.
+    """
+    result = []
+    for kind in keys:
+        ident = KEY_FUNCTIONS[kind](request)
+        if ident:
+            result.append(f'rl:{scope}:{kind}:{ident}')
+    return result
+
+
+def too_many_requests(retry_after):
+    """
+    제한 초과 응답(HTTP 429)을 만든다.
+    """
+    return Response({
+        "error": "TOO_MANY_REQUESTS",
+        "retry_after": retry_after,
+        "tts_message": "요청 횟수를 초과했습니다. 잠시 후 다시 시도해주세요."
+    }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(retry_after)})
+
+
+def rate_limit(scope, keys=('ip',), count='always'):
+    """
+    ViewSet 액션에 슬라이딩 윈도우 제한을 적용하는 데코레이터.
+
+    제한을 초과한 요청은 액션 본문(시리얼라이저 검증, PIN 해싱 등)을 실행하기 전에
+    429 응답으로 반환된다.
+
+    Args:
+        scope (str): settings.RATE_LIMITS 의 스코프 이름
+        keys (tuple): 제한 키 종류 ('ip', 'phone', 'device')
+        count (str): 'always' 는 모든 요청을, 'failure' 는 4xx 응답만 기록한다.
+            'failure' 도 실행 전에 1회를 미리 기록(예약)하고, 4xx 가 아니면 돌려준다.
+
+    Returns:
+        function: 데코레이터
+    """
+    if count not in ('always', 'failure'):
+        raise ValueError("count 는 'always' 또는 'failure' 여야 합니다.")
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(view, request, *args, **kwargs):
+            rate = get_rate(scope)
+            if rate is None:
+                return func(view, request, *args, **kwargs)
+
+            backend = get_backend()
+            limit_keys = build_keys(scope, request, keys)
+            # 모든 키를 먼저 확인해 한 키에서 차단된 요청이 다른 키의 한도를 소모하지 않게 한다.
+            for key in limit_keys:
+                result = backend.check(key, rate)
+                if not result.allowed:
+                    return too_many_requests(result.retry_after)
+
+            # 실행 전에 예약해야 동시에 들어온 요청들이 모두 검사를 통과해 한도를 넘지 못한다.
+            now = time.time()
+            reserved = []
+            for key in limit_keys:
+                result = backend.hit(key, rate, now)
+                if not result.allowed:
+                    for done in reserved:
+                        backend.release(done, rate, now)
+                    return too_many_requests(result.retry_after)
+                reserved.append(key)
+
+            try:
+                response = func(view, request, *args, **kwargs)
+            except Exception:
+                if count == 'failure':
+                    for key in reserved:
+                        backend.release(key, rate, now)
+                raise
+            if count == 'failure' and not 400 <= response.status_code < 500:
+                for key in reserved:
+                    backend.release(key, rate, now)
+            return response
+        return wrapper
+    return decorator
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    settings.RATE_LIMITS 정책을 사용하는 DRF 스로틀 클래스.
+
+    View 의 throttle_scope 에 해당하는 정책을 적용하며, 인증된 사용자는 사용자 ID,
+    그 외에는 IP 를 키로 사용한다. throttle_scope 가 없는 View 에는 적용되지 않는다.
+    """
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = getattr(view, 'throttle_scope', None)
+        rate = get_rate(scope) if scope else None
+        if rate is None:
+            return True
+
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        result = get_backend().hit(f'rl:{scope}:{ident}', rate)
+        if not result.allowed:
+            self.retry_after = result.retry_after
+        return result.allowed
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,65 @@
+"""
+사전 생성 OpenAPI 스키마 모듈.
+
+SpectacularAPIView 는 요청마다 모든 View 를 순회해 스키마를 만든다. 이 모듈은 배포 빌드 단계
+(`python manage.py build_schema`)에서 스키마를 한 번 생성해 파일로 저장하고,
+요청 시에는 파일 내용과 ETag 만 반환한다. 파일은 수정 시간이 바뀔 때만 다시 읽는다.
+
+Functions:
+    build_schema: 스키마를 생성해 파일로 저장
+    load_schema: 저장된 스키마 내용과 ETag (캐시)
+"""
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+
+_cached = None
+_cached_lock = threading.Lock()
+
+
+def schema_path():
+    return str(getattr(settings, 'OPENAPI_SCHEMA_PATH', os.path.join(settings.BASE_DIR, 'build', 'openapi.json')))
+
+
+def build_schema(path=None):
+    """
+    drf-spectacular 로 OpenAPI 스키마(JSON)를 생성해 path 에 저장한다.
+
+    Returns:
+        tuple: (저장 경로, 바이트 수)
+    """
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+
+    path = str(path or schema_path())
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    body = OpenApiJsonRenderer().render(schema, renderer_context={})
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp = f'{path}.tmp'
+    with open(temp, 'wb') as fp:
+        fp.write(body)
+    os.replace(temp, path)
+    return path, len(body)
+
+
+def load_schema():
+    """
+    저장된 스키마의 (내용, ETag) 를 반환한다. 파일이 없으면 None.
+    """
+    global _cached
+    path = schema_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _cached
+    if cached is not None and cached[0] == (path, mtime):
+        return cached[1], cached[2]
+    with _cached_lock:
+        with open(path, 'rb') as fp:
+            body = fp.read()
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        _cached = ((path, mtime), body, etag)
+    return body, etag
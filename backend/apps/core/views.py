@@ -0,0 +1,119 @@
+"""
+공용 View 모듈.
+"""
+import hmac
+import logging
+import os
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_GET
+from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from . import metrics, profiling, schema
+
+logger = logging.getLogger(__name__)
+
+
+@require_GET
+def metrics_view(request):
+    """
+    측정값을 Prometheus 텍스트 형식으로 반환한다.
+
+    Authorization: Bearer <settings.METRICS_TOKEN> 헤더가 있거나 관리자로 로그인한 요청만 조회할 수 있다.
+    리버스 프록시 뒤에서는 모든 요청의 REMOTE_ADDR 가 프록시 주소이므로 주소만으로 허용하지 않는다.
+    settings.METRICS_ALLOWED_IPS 를 지정하면 그 주소에서 온 요청으로 한 번 더 제한한다.
+    """
+    allowed = getattr(settings, 'METRICS_ALLOWED_IPS', None)
+    if allowed and request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    if not _metrics_authorized(request):
+        return HttpResponseForbidden()
+    body = metrics.render(metrics.collect())
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _metrics_authorized(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), token.encode()):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_active and user.is_staff)
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """
+    저장된 요청 프로파일 조회 API. (관리자 전용)
+
+    list 는 메타데이터 목록(최신 순)을, retrieve 는 프로파일 결과 파일을 내려준다.
+    cProfile 결과(.prof)는 pstats/snakeviz 로, 샘플러 결과(.folded)는 flamegraph 도구로 연다.
+    """
+    permission_classes = [IsAdminUser]
+    schema = None
+    lookup_value_regex = r'[0-9]{20}-[0-9a-f]{8}'
+
+    def list(self, request):
+        ring = profiling.get_ring()
+        entries = [ring.metadata(profile_id) for profile_id in reversed(ring.ids())]
+        return Response([entry for entry in entries if entry])
+
+    def retrieve(self, request, pk=None):
+        ring = profiling.get_ring()
+        metadata = ring.metadata(pk)
+        if metadata is None:
+            raise Http404
+        path = ring.path(pk, profiling.EXTENSIONS.get(metadata.get('mode'), '.prof'))
+        if not os.path.exists(path):
+            raise Http404
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=os.path.basename(path))
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    클래스 기반 View 를 첫 요청 시점에 import 하는 View 를 반환한다.
+
+    문서(Swagger UI)처럼 드물게 쓰이는 View 의 모듈을 URLconf 로딩 시점에 import 하지 않아
+    워커 기동 시간을 줄인다.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    wrapper.__qualname__ = dotted_path.rsplit('.', 1)[-1]
+    return wrapper
+
+
+_runtime_schema_view = lazy_view('drf_spectacular.views.SpectacularAPIView')
+
+
+@require_GET
+def schema_view(request):
+    """
+    사전 생성된 OpenAPI 스키마를 ETag 와 함께 반환한다.
+
+    If-None-Match 가 일치하면 304 를 반환한다. 사전 생성 파일이 없으면
+    (build_schema 를 실행하지 않은 개발 환경 등) 요청 시점에 스키마를 생성한다.
+    """
+    loaded = schema.load_schema()
+    if loaded is None:
+        logger.warning("prebuilt OpenAPI schema not found at %s; generating at runtime", schema.schema_path())
+        return _runtime_schema_view(request)
+    body, etag = loaded
+    cache_control = f"public, max-age={getattr(settings, 'OPENAPI_SCHEMA_MAX_AGE', 300)}"
+    # 압축 미들웨어가 ETag 를 약한 ETag 로 바꾸므로 약한 비교를 한다.
+    if etag in [tag.removeprefix('W/') for tag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/vnd.oai.openapi+json')
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
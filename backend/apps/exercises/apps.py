@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import pre_delete
 
 class ExercisesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.exercises'
     label = 'exercises'
+
+    def ready(self):
+        if getattr(settings, 'HISTORY_SHARDS', None):
+            from .models import Playlist, PlaylistItem
+            from .sharding import detach_routine
+
+            pre_delete.connect(detach_routine, sender=Playlist, dispatch_uid='exercises.detach_playlist')
+            pre_delete.connect(detach_routine, sender=PlaylistItem, dispatch_uid='exercises.detach_playlist_item')
@@ -0,0 +1,443 @@
+"""
+운동 카탈로그 가져오기/내보내기 모듈.
+
+콘텐츠 담당자가 스프레드시트로 관리하는 카탈로그(카테고리, 운동, 미디어)를 파일 하나로
+내보내고, 수정한 파일을 DB 와 비교해 한 번에 반영한다.
+
+파일 형식:
+    JSON: {"version": 3, "categories": [...], "exercises": [{..., "media": [...]}]}
+    CSV : record 열(catalog / category / exercise / media)로 행 종류를 구분하는 단일 표
+
+운동은 exercise_id 가 있으면 그것으로, 없으면 code 로 식별한다. (새 운동은 code 가 필요하다)
+미디어는 (운동, media_type, locale) 로 식별한다.
+
+가져오기는 DB 전체를 한 번씩 읽어 메모리에서 비교하고, 생성/변경/비활성화를
+한 트랜잭션에서 bulk_create / bulk_update 로 적용한 뒤 카탈로그 버전을 한 번 올린다.
+파일에 없는 운동은 is_active=False 로 비활성화한다. (partial 가져오기는 제외)
+파일의 version 은 내보낼 때의 카탈로그 버전이며, 그 사이 다른 가져오기가 있었으면 거부한다.
+
+Classes:
+    CatalogError: 카탈로그 파일 오류
+    CatalogDiff: 가져오기 변경 내역
+
+Functions:
+    read_catalog / write_catalog: 파일 읽기/쓰기
+    export_catalog: 현재 카탈로그
+    diff_catalog: 파일과 DB 비교
+    import_catalog: 비교 결과 적용
+"""
+import csv
+import hashlib
+import io
+import json
+import uuid
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import CatalogVersion, ExerciseCategory, Exercise, ExerciseMedia, bump_media_version
+
+BULK_BATCH_SIZE = 1000
+FORMATS = ('json', 'csv')
+
+CATEGORY_FIELDS = ('display_name',)
+EXERCISE_FIELDS = (
+    'code', 'category_id', 'exercise_name', 'exercise_description', 'first_description', 'main_form',
+    'form_description', 'stay_form', 'fixed_form', 'exercise_guide_text', 'met', 'is_active',
+)
+MEDIA_FIELDS = ('url', 's3_key', 'duration_ms', 'checksum')
+MEDIA_TYPES = {media_type for media_type, _ in ExerciseMedia.MEDIA_TYPE_CHOICES}
+CSV_COLUMNS = (
+    'record', 'version', 'category_id', 'display_name', 'exercise_id', *EXERCISE_FIELDS[:1], *EXERCISE_FIELDS[2:],
+    'media_type', 'locale', *MEDIA_FIELDS,
+)
+
+
+class CatalogError(ValueError):
+    """카탈로그 파일 오류. errors 에 행 단위 메시지 목록을 담는다."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__('\n'.join(self.errors))
+
+
+def current_version():
+    """현재 카탈로그 버전. 가져오기 이력이 없으면 0."""
+    return CatalogVersion.objects.aggregate(version=Max('version'))['version'] or 0
+
+
+# -----------------------------------------------------------------------------
+# 내보내기
+# -----------------------------------------------------------------------------
+
+def export_catalog():
+    """
+    현재 카탈로그를 JSON 형식의 dict 로 반환한다.
+    """
+    media_by_exercise = {}
+    for media in ExerciseMedia.objects.order_by('media_type', 'locale', 'created_at').values('exercise_id', 'media_type', 'locale', *MEDIA_FIELDS):
+        key = (media.pop('exercise_id'), media['media_type'], media['locale'])
+        media_by_exercise.setdefault(key[0], {}).setdefault(key[1:], media)
+    exercises = []
+    for exercise in Exercise.objects.order_by('category_id', 'code', 'exercise_name', 'exercise_id').values('exercise_id', *EXERCISE_FIELDS):
+        exercise_id = exercise['exercise_id']
+        exercises.append({
+            **exercise,
+            'exercise_id': str(exercise_id),
+            'media': list(media_by_exercise.get(exercise_id, {}).values()),
+        })
+    return {
+        'version': current_version(),
+        'categories': list(ExerciseCategory.objects.order_by('category_id').values('category_id', *CATEGORY_FIELDS)),
+        'exercises': exercises,
+    }
+
+
+def write_catalog(catalog, fp, fmt='json'):
+    """카탈로그 dict 를 텍스트 파일 객체에 쓴다."""
+    if fmt == 'json':
+        json.dump(catalog, fp, ensure_ascii=False, indent=2)
+        fp.write('\n')
+        return
+    writer = csv.DictWriter(fp, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerow({'record': 'catalog', 'version': catalog['version']})
+    for category in catalog['categories']:
+        writer.writerow({'record': 'category', **category})
+    for exercise in catalog['exercises']:
+        writer.writerow({'record': 'exercise', **exercise})
+        for media in exercise['media']:
+            writer.writerow({
+                'record': 'media', 'exercise_id': exercise['exercise_id'], 'code': exercise['code'], **media,
+            })
+
+
+# -----------------------------------------------------------------------------
+# 읽기
+# -----------------------------------------------------------------------------
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _bool(value, default=True):
+    if isinstance(value, bool):
+        return value
+    text = _text(value)
+    if text is None:
+        return default
+    if text.lower() in ('1', 'true', 'y', 'yes'):
+        return True
+    if text.lower() in ('0', 'false', 'n', 'no'):
+        return False
+    raise ValueError(f"참/거짓 값이 아닙니다: {value!r}")
+
+
+def _int(value):
+    text = _text(value)
+    return None if text is None else int(text)
+
+
+def _float(value):
+    text = _text(value)
+    return None if text is None else float(text)
+
+
+def _uuid(value):
+    text = _text(value)
+    return None if text is None else uuid.UUID(text)
+
+
+def _read_rows(data, fmt):
+    """파일 내용을 (version, categories, exercises, media) 원시 행 목록으로 나눈다."""
+    if fmt == 'json':
+        document = json.loads(data)
+        media = []
+        for exercise in document.get('exercises', []):
+            for row in exercise.get('media', []):
+                media.append({'exercise_id': exercise.get('exercise_id'), 'code': exercise.get('code'), **row})
+        return document.get('version'), document.get('categories', []), document.get('exercises', []), media
+
+    version, categories, exercises, media = None, [], [], []
+    for row in csv.DictReader(io.StringIO(data)):
+        record = _text(row.get('record'))
+        if record == 'catalog':
+            version = row.get('version')
+        elif record == 'category':
+            categories.append(row)
+        elif record == 'exercise':
+            exercises.append(row)
+        elif record == 'media':
+            media.append(row)
+    return version, categories, exercises, media
+
+
+def read_catalog(data, fmt='json'):
+    """
+    카탈로그 파일 내용을 검증하고 정규화한다.
+
+    Returns:
+        dict: version, categories({category_id: 값}), exercises(목록), media(목록), checksum
+
+    Raises:
+        CatalogError: 형식 오류, 중복 키, 필수 값 누락
+    """
+    if fmt not in FORMATS:
+        raise CatalogError([f"지원하지 않는 형식입니다: {fmt}"])
+    try:
+        version, raw_categories, raw_exercises, raw_media = _read_rows(data, fmt)
+    except (ValueError, csv.Error) as exc:
+        raise CatalogError([f"파일을 읽을 수 없습니다: {exc}"])
+
+    errors = []
+    categories = {}
+    for index, row in enumerate(raw_categories, 1):
+        category_id = _text(row.get('category_id'))
+        if not category_id or not _text(row.get('display_name')):
+            errors.append(f"category #{index}: category_id 와 display_name 이 필요합니다.")
+        elif category_id in categories:
+            errors.append(f"category #{index}: 중복된 category_id {category_id}")
+        else:
+            categories[category_id] = {'display_name': _text(row.get('display_name'))}
+
+    exercises, keys = [], set()
+    for index, row in enumerate(raw_exercises, 1):
+        try:
+            exercise = {
+                'exercise_id': _uuid(row.get('exercise_id')),
+                **{name: _text(row.get(name)) for name in EXERCISE_FIELDS if name not in ('met', 'is_active')},
+                'met': _float(row.get('met')),
+                'is_active': _bool(row.get('is_active')),
+            }
+        except ValueError as exc:
+            errors.append(f"exercise #{index}: {exc}")
+            continue
+        key = exercise['exercise_id'] or exercise['code']
+        if key is None:
+            errors.append(f"exercise #{index}: 새 운동에는 code 가 필요합니다.")
+        elif not exercise['exercise_name'] or not exercise['category_id']:
+            errors.append(f"exercise #{index}: exercise_name 과 category_id 가 필요합니다.")
+        elif {exercise['exercise_id'], exercise['code']} & keys:
+            errors.append(f"exercise #{index}: 중복된 운동 {key}")
+        else:
+            keys.update(value for value in (exercise['exercise_id'], exercise['code']) if value is not None)
+            exercises.append(exercise)
+
+    media, media_keys = [], set()
+    for index, row in enumerate(raw_media, 1):
+        try:
+            item = {
+                'exercise_key': _uuid(row.get('exercise_id')) or _text(row.get('code')),
+                'media_type': (_text(row.get('media_type')) or '').upper(),
+                'locale': _text(row.get('locale')) or 'ko-KR',
+                'url': _text(row.get('url')),
+                's3_key': _text(row.get('s3_key')),
+                'duration_ms': _int(row.get('duration_ms')),
+                'checksum': _text(row.get('checksum')),
+            }
+        except ValueError as exc:
+            errors.append(f"media #{index}: {exc}")
+            continue
+        key = (item['exercise_key'], item['media_type'], item['locale'])
+        if item['media_type'] not in MEDIA_TYPES:
+            errors.append(f"media #{index}: 알 수 없는 media_type {row.get('media_type')!r}")
+        elif item['exercise_key'] not in keys:
+            errors.append(f"media #{index}: 파일에 없는 운동 {item['exercise_key']}")
+        elif key in media_keys:
+            errors.append(f"media #{index}: 중복된 미디어 {key}")
+        else:
+            media_keys.add(key)
+            media.append(item)
+
+    if errors:
+        raise CatalogError(errors)
+    try:
+        version = _int(version)
+    except ValueError:
+        raise CatalogError([f"version 이 정수가 아닙니다: {version!r}"])
+    return {
+        'version': version,
+        'categories': categories,
+        'exercises': exercises,
+        'media': media,
+        'checksum': hashlib.sha256(data.encode()).hexdigest(),
+    }
+
+
+# -----------------------------------------------------------------------------
+# 비교 / 적용
+# -----------------------------------------------------------------------------
+
+@dataclass
+class CatalogDiff:
+    """가져오기 변경 내역. 각 목록은 저장할 모델 인스턴스다."""
+    categories_created: list = field(default_factory=list)
+    categories_updated: list = field(default_factory=list)
+    exercises_created: list = field(default_factory=list)
+    exercises_updated: list = field(default_factory=list)
+    exercises_deactivated: list = field(default_factory=list)
+    media_created: list = field(default_factory=list)
+    media_updated: list = field(default_factory=list)
+    exercise_fields: set = field(default_factory=set)
+    media_fields: set = field(default_factory=set)
+
+    def summary(self):
+        return {
+            name: len(getattr(self, name))
+            for name in (
+                'categories_created', 'categories_updated', 'exercises_created', 'exercises_updated',
+                'exercises_deactivated', 'media_created', 'media_updated',
+            )
+        }
+
+    def __bool__(self):
+        return any(self.summary().values())
+
+
+def _same(current, value):
+    # 파일에서는 빈 문자열과 빈 값을 구분하지 않는다.
+    return current == value or (current in ('', None) and value in ('', None))
+
+
+def _apply_fields(instance, values, fields):
+    changed = [name for name in fields if not _same(getattr(instance, name), values[name])]
+    for name in changed:
+        setattr(instance, name, values[name])
+    return changed
+
+
+def diff_catalog(catalog, partial=False):
+    """
+    정규화한 카탈로그와 DB 를 메모리에서 비교한다.
+
+    Args:
+        catalog (dict): read_catalog 결과
+        partial (bool): True 이면 파일에 없는 운동을 비활성화하지 않는다.
+
+    Returns:
+        CatalogDiff: 변경 내역
+
+    Raises:
+        CatalogError: 존재하지 않는 카테고리 참조, 다른 운동이 쓰는 code 사용
+    """
+    diff = CatalogDiff()
+    categories = {category.category_id: category for category in ExerciseCategory.objects.all()}
+    for category_id, values in catalog['categories'].items():
+        current = categories.get(category_id)
+        if current is None:
+            categories[category_id] = ExerciseCategory(category_id=category_id, **values)
+            diff.categories_created.append(categories[category_id])
+        elif _apply_fields(current, values, CATEGORY_FIELDS):
+            diff.categories_updated.append(current)
+
+    errors = []
+    existing = list(Exercise.objects.all())
+    by_id = {exercise.exercise_id: exercise for exercise in existing}
+    by_code = {exercise.code: exercise for exercise in existing if exercise.code}
+    resolved = {}
+    seen = set()
+    for values in catalog['exercises']:
+        if values['category_id'] not in categories:
+            errors.append(f"exercise {values['code'] or values['exercise_id']}: 없는 카테고리 {values['category_id']}")
+            continue
+        current = by_id.get(values['exercise_id']) if values['exercise_id'] else by_code.get(values['code'])
+        owner = by_code.get(values['code']) if values['code'] else None
+        if owner is not None and owner is not current:
+            errors.append(f"exercise {values['exercise_id']}: code {values['code']} 는 다른 운동이 사용 중입니다.")
+            continue
+        if current is None:
+            current = Exercise(exercise_id=values['exercise_id'] or uuid.uuid4(), **{name: values[name] for name in EXERCISE_FIELDS})
+            diff.exercises_created.append(current)
+        else:
+            changed = _apply_fields(current, values, EXERCISE_FIELDS)
+            if changed:
+                diff.exercise_fields.update(changed)
+                diff.exercises_updated.append(current)
+        seen.add(current.exercise_id)
+        for key in (values['exercise_id'], values['code']):
+            if key is not None:
+                resolved[key] = current
+    if errors:
+        raise CatalogError(errors)
+
+    if not partial:
+        for exercise in existing:
+            if exercise.exercise_id not in seen and exercise.is_active:
+                exercise.is_active = False
+                diff.exercises_deactivated.append(exercise)
+
+    media = {}
+    for item in ExerciseMedia.objects.order_by('created_at'):
+        media.setdefault((item.exercise_id, item.media_type, item.locale), item)
+    for values in catalog['media']:
+        exercise = resolved[values['exercise_key']]
+        current = media.get((exercise.exercise_id, values['media_type'], values['locale']))
+        if current is None:
+            diff.media_created.append(ExerciseMedia(
+                exercise_id=exercise.exercise_id, media_type=values['media_type'], locale=values['locale'],
+                **{name: values[name] for name in MEDIA_FIELDS}
+            ))
+        else:
+            changed = _apply_fields(current, values, MEDIA_FIELDS)
+            if changed:
+                diff.media_fields.update(changed)
+                diff.media_updated.append(current)
+    return diff
+
+
+def import_catalog(catalog, partial=False, force=False, dry_run=False):
+    """
+    카탈로그 파일 내용을 DB 에 반영하고 변경이 있으면 카탈로그 버전을 한 번 올린다.
+
+    Args:
+        catalog (dict): read_catalog 결과
+        partial (bool): 파일에 없는 운동을 비활성화하지 않음
+        force (bool): 파일의 기준 버전이 현재 버전과 달라도 적용
+        dry_run (bool): 변경 내역만 계산
+
+    Returns:
+        tuple: (CatalogDiff, 적용 후 카탈로그 버전)
+
+    Raises:
+        CatalogError: 기준 버전 불일치 또는 diff_catalog 오류
+    """
+    with transaction.atomic():
+        # 동시에 실행된 가져오기가 같은 버전을 만들지 않도록 이력 테이블을 잠근다.
+        version = current_version()
+        list(CatalogVersion.objects.select_for_update().filter(version=version))
+        if catalog['version'] is not None and catalog['version'] != version and not force:
+            raise CatalogError([
+                f"파일의 기준 버전(v{catalog['version']})이 현재 카탈로그 버전(v{version})과 다릅니다. "
+                "최신 카탈로그를 다시 내보내 수정해주세요."
+            ])
+        diff = diff_catalog(catalog, partial=partial)
+        if dry_run or not diff:
+            return diff, version
+
+        now = timezone.now()
+        # bulk_update 는 auto_now 를 갱신하지 않으므로 updated_at 을 직접 기록한다.
+        for row in [*diff.categories_updated, *diff.exercises_updated, *diff.exercises_deactivated]:
+            row.updated_at = now
+        ExerciseCategory.objects.bulk_create(diff.categories_created, batch_size=BULK_BATCH_SIZE)
+        ExerciseCategory.objects.bulk_update(
+            diff.categories_updated, [*CATEGORY_FIELDS, 'updated_at'], batch_size=BULK_BATCH_SIZE
+        )
+        Exercise.objects.bulk_create(diff.exercises_created, batch_size=BULK_BATCH_SIZE)
+        Exercise.objects.bulk_update(
+            diff.exercises_updated, sorted(diff.exercise_fields | {'updated_at'}), batch_size=BULK_BATCH_SIZE
+        )
+        Exercise.objects.bulk_update(diff.exercises_deactivated, ['is_active', 'updated_at'], batch_size=BULK_BATCH_SIZE)
+        ExerciseMedia.objects.bulk_create(diff.media_created, batch_size=BULK_BATCH_SIZE)
+        if diff.media_updated:
+            ExerciseMedia.objects.bulk_update(diff.media_updated, sorted(diff.media_fields), batch_size=BULK_BATCH_SIZE)
+
+        version += 1
+        CatalogVersion.objects.create(version=version, checksum=catalog['checksum'], summary=diff.summary())
+        # 미디어 버전 토큰은 템플릿/재생 계획 캐시와 운동 ETag 에도 쓰이므로 운동만 바뀐 경우에도 올린다.
+        bump_media_version()
+    return diff, version
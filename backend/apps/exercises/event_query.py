@@ -0,0 +1,142 @@
+"""
+세션 이벤트 조회 모듈.
+
+한 세션의 이벤트를 타입/시간 범위로 걸러 (event_time_ms, event_id) 키셋 순서로 페이지 조회하거나,
+타임라인 표시용으로 시간 구간(bucket)별 타입별 개수로 다운샘플링한다.
+
+    - 페이지 조회는 (session, event_time_ms) 인덱스 순서를 그대로 따르므로 OFFSET 없이
+      마지막 행의 (event_time_ms, event_id) 커서 다음부터 읽는다.
+    - 타입 필터는 압축 행(type 코드)과 변환 전 행(event_type 문자열)을 모두 찾으며,
+      각각 (session, type, event_time_ms) 인덱스와 legacy 부분 인덱스를 사용한다.
+    - 다운샘플링은 구간 번호별 GROUP BY 를 DB 에서 수행하므로 3시간 세션도 구간 수만큼의 행만 읽는다.
+
+Functions:
+    encode_cursor / decode_cursor: 키셋 커서
+    filter_events: 조건에 맞는 이벤트 쿼리셋
+    query_page: 키셋 페이지 조회
+    downsample: 구간별 타입별 개수
+"""
+import base64
+import math
+import uuid
+
+from django.db.models import BigIntegerField, Count, ExpressionWrapper, F, Max, Min, Q
+
+from .events import type_codes, type_name
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+MAX_BUCKETS = 500
+EVENT_FIELDS = ('event_id', 'session_item_id', 'event_time_ms', 'type', 'payload_bin', 'event_type', 'payload')
+
+
+def encode_cursor(event):
+    """이벤트 다음부터 읽는 불투명 커서."""
+    return base64.urlsafe_b64encode(f"{event.event_time_ms}:{event.event_id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        tuple: (event_time_ms, event_id)
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        event_time_ms, event_id = text.split(':', 1)
+        return int(event_time_ms), uuid.UUID(event_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"잘못된 커서입니다: {cursor!r}") from exc
+
+
+def filter_events(session, types=None, since_ms=None, until_ms=None, session_item_id=None):
+    """
+    세션 이벤트 중 조건에 맞는 쿼리셋 (정렬 없음).
+
+    Args:
+        session: 대상 세션
+        types (list): 이벤트 타입 이름 목록 (없으면 전체)
+        since_ms (int): 이 시각 이후 (포함)
+        until_ms (int): 이 시각 이전 (제외)
+        session_item_id (UUID): 특정 세션 항목의 이벤트만
+    """
+    # 세션이 있는 기록 DB 에서 조회한다. (apps.exercises.sharding)
+    events = session.events.all()
+    if types:
+        events = events.filter(Q(type_id__in=type_codes(types)) | Q(type__isnull=True, event_type__in=types))
+    if since_ms is not None:
+        events = events.filter(event_time_ms__gte=since_ms)
+    if until_ms is not None:
+        events = events.filter(event_time_ms__lt=until_ms)
+    if session_item_id is not None:
+        events = events.filter(session_item_id=session_item_id)
+    return events
+
+
+def query_page(events, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    이벤트를 (event_time_ms, event_id) 순서로 limit 개 조회한다.
+
+    Returns:
+        tuple: (이벤트 목록, 다음 페이지 커서 또는 None)
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    if cursor:
+        event_time_ms, event_id = decode_cursor(cursor)
+        events = events.filter(
+            Q(event_time_ms__gt=event_time_ms) | Q(event_time_ms=event_time_ms, event_id__gt=event_id)
+        )
+    page = list(events.only(*EVENT_FIELDS).order_by('event_time_ms', 'event_id')[:limit + 1])
+    if len(page) > limit:
+        page = page[:limit]
+        return page, encode_cursor(page[-1])
+    return page, None
+
+
+def downsample(events, buckets, since_ms=None, until_ms=None):
+    """
+    이벤트를 최대 buckets 개의 같은 길이 구간으로 나눠 구간별 타입별 개수를 센다.
+
+    범위가 주어지지 않으면 조건에 맞는 이벤트의 처음/마지막 시각을 쓴다. 이벤트가 없는 구간은 생략한다.
+
+    Returns:
+        dict: from_ms, to_ms, bucket_ms, buckets([{start_ms, end_ms, total, counts: {타입: 개수}}])
+    """
+    if since_ms is None or until_ms is None:
+        bounds = events.aggregate(first=Min('event_time_ms'), last=Max('event_time_ms'))
+        if bounds['first'] is None:
+            return {'from_ms': since_ms, 'to_ms': until_ms, 'bucket_ms': None, 'buckets': []}
+        since_ms = bounds['first'] if since_ms is None else since_ms
+        until_ms = bounds['last'] + 1 if until_ms is None else until_ms
+    bucket_ms = max(1, math.ceil((until_ms - since_ms) / buckets))
+
+    # 정수끼리의 나눗셈이므로 SQLite/PostgreSQL 모두 구간 번호(몫)를 반환한다.
+    bucket = ExpressionWrapper((F('event_time_ms') - since_ms) / bucket_ms, output_field=BigIntegerField())
+    rows = (
+        events.order_by().annotate(bucket=bucket)
+        .values('bucket', 'type_id', 'event_type').annotate(count=Count('pk'))
+    )
+    grouped = {}
+    for row in rows:
+        name = type_name(row['type_id']) if row['type_id'] is not None else row['event_type']
+        counts = grouped.setdefault(row['bucket'], {})
+        counts[name] = counts.get(name, 0) + row['count']
+    return {
+        'from_ms': since_ms,
+        'to_ms': until_ms,
+        'bucket_ms': bucket_ms,
+        'buckets': [
+            {
+                'start_ms': since_ms + index * bucket_ms,
+                'end_ms': min(until_ms, since_ms + (index + 1) * bucket_ms),
+                'total': sum(counts.values()),
+                'counts': counts,
+            }
+            for index, counts in sorted(grouped.items())
+        ],
+    }
+
@@ -0,0 +1,186 @@
+"""
+세션 이벤트 압축 저장 모듈.
+
+이벤트 행의 대부분은 반복되는 타입 문자열("PAUSE", "SPEED_CHANGE" 등)과 JSON 키가 차지한다.
+이 모듈은 타입을 EventType 사전의 작은 정수 코드로, 페이로드를 바이너리 코덱으로 저장한다.
+
+페이로드 바이너리는 첫 바이트가 형식 태그다.
+    0x00: JSON 대체 형식 (공백 없는 UTF-8 JSON)
+    그 외: PAYLOAD_SCHEMAS 의 고정 필드 구조체 (struct, little-endian)
+페이로드가 스키마의 키/타입/범위와 정확히 일치할 때만 구조체로 저장하고, 그 외에는 JSON 으로 저장한다.
+태그 번호는 저장된 데이터의 해석에 쓰이므로 한 번 배정한 번호는 바꾸거나 재사용하지 않는다.
+
+EventType 사전은 모든 사용자가 공유하고 코드 범위(SmallAutoField)가 작으므로,
+EVENT_TYPES 에 정의된 타입만 사전에 추가한다. (API 는 그 외의 타입을 400 으로 거부한다)
+
+Functions:
+    encode_payload / decode_payload: 페이로드 코덱
+    intern_type / type_codes / type_name: 이벤트 타입 코드 사전 (프로세스 캐시)
+    build_event: 압축 형식의 ExerciseSessionEvent 인스턴스 생성
+    decode_event: 압축/legacy 행을 (타입 이름, 페이로드) 로 읽기
+"""
+import json
+import struct
+import threading
+
+from .models import EventType, ExerciseSessionEvent
+
+JSON_TAG = 0
+
+# 클라이언트가 기록할 수 있는 이벤트 타입 (docs/ERD.SQL exercise_session_events.event_type)
+EVENT_TYPES = (
+    'PLAY', 'PAUSE', 'RESUME', 'SEEK_SEGMENT', 'SPEED_CHANGE', 'VUI_WAKE', 'VUI_CMD', 'LOAD_FAIL', 'UNKNOWN',
+)
+
+# 필드 종류: (struct 형식, 저장 값 변환, 복원 값 변환, 허용 검사)
+_U32_MAX = 2 ** 32 - 1
+FIELD_KINDS = {
+    # 0 이상 정수 (ms 위치 등)
+    'u32': ('I', int, int, lambda v: type(v) is int and 0 <= v <= _U32_MAX),
+    # 소수 둘째 자리까지의 배속 (0.00 ~ 655.35)
+    'rate': ('H', lambda v: round(v * 100), lambda v: v / 100, lambda v: type(v) is float and 0 <= v <= 655.35 and round(v * 100) / 100 == v),
+}
+
+# 태그: (필드 목록, 사용하는 이벤트 타입)
+PAYLOAD_SCHEMAS = {
+    1: ((('position_ms', 'u32'),), ('PLAY', 'PAUSE', 'RESUME', 'VUI_WAKE')),
+    2: ((('from_ms', 'u32'), ('to_ms', 'u32')), ('SEEK_SEGMENT',)),
+    3: ((('from_rate', 'rate'), ('to_rate', 'rate')), ('SPEED_CHANGE',)),
+}
+
+
+def _compile(fields):
+    return struct.Struct('<' + ''.join(FIELD_KINDS[kind][0] for _, kind in fields))
+
+
+_STRUCTS = {tag: _compile(fields) for tag, (fields, _) in PAYLOAD_SCHEMAS.items()}
+_TAGS_BY_TYPE = {}
+for _tag, (_, _event_types) in PAYLOAD_SCHEMAS.items():
+    for _event_type in _event_types:
+        _TAGS_BY_TYPE.setdefault(_event_type, []).append(_tag)
+
+
+def encode_payload(event_type, payload):
+    """
+    페이로드를 바이너리로 인코딩한다. None 은 None 으로 둔다.
+
+    Args:
+        event_type (str): 이벤트 타입 이름 (사용할 스키마 결정)
+        payload: JSON 직렬화 가능한 값
+
+    Returns:
+        bytes | None: 태그 1바이트 + 본문
+    """
+    if payload is None:
+        return None
+    if isinstance(payload, dict):
+        for tag in _TAGS_BY_TYPE.get(event_type, ()):
+            fields = PAYLOAD_SCHEMAS[tag][0]
+            if payload.keys() != {name for name, _ in fields}:
+                continue
+            if all(FIELD_KINDS[kind][3](payload[name]) for name, kind in fields):
+                values = [FIELD_KINDS[kind][1](payload[name]) for name, kind in fields]
+                return bytes([tag]) + _STRUCTS[tag].pack(*values)
+    return bytes([JSON_TAG]) + json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def decode_payload(data):
+    """
+    encode_payload 로 인코딩한 바이너리를 원래 값으로 복원한다.
+    """
+    if data is None:
+        return None
+    data = bytes(data)
+    tag = data[0]
+    if tag == JSON_TAG:
+        return json.loads(data[1:].decode())
+    fields = PAYLOAD_SCHEMAS[tag][0]
+    values = _STRUCTS[tag].unpack(data[1:])
+    return {name: FIELD_KINDS[kind][2](value) for (name, kind), value in zip(fields, values)}
+
+
+# -----------------------------------------------------------------------------
+# 이벤트 타입 사전
+# -----------------------------------------------------------------------------
+
+_codes = {}
+_names = {}
+_types_lock = threading.Lock()
+
+
+def _remember(code, name):
+    with _types_lock:
+        _codes[name] = code
+        _names[code] = name
+
+
+def intern_type(name):
+    """
+    이벤트 타입 이름의 코드를 반환한다. 사전에 아직 없는 EVENT_TYPES 의 타입이면 추가한다.
+
+    Raises:
+        ValueError: EVENT_TYPES 에 없는 타입
+    """
+    code = _codes.get(name)
+    if code is None:
+        if name not in EVENT_TYPES:
+            raise ValueError(f'unknown event type: {name!r}')
+        code = EventType.objects.get_or_create(name=name)[0].code
+        _remember(code, name)
+    return code
+
+
+def type_codes(names):
+    """
+    이벤트 타입 이름들의 코드 목록. 사전에 없는 이름은 추가하지 않고 제외한다. (조회 필터용)
+    """
+    missing = [name for name in names if name not in _codes]
+    if missing:
+        for code, name in EventType.objects.filter(name__in=missing).values_list('code', 'name'):
+            _remember(code, name)
+    return [_codes[name] for name in names if name in _codes]
+
+
+def type_name(code):
+    """
+    이벤트 타입 코드의 이름을 반환한다. 캐시에 없으면 사전 전체를 다시 읽는다.
+    """
+    name = _names.get(code)
+    if name is None:
+        for known_code, known_name in EventType.objects.values_list('code', 'name'):
+            _remember(known_code, known_name)
+        name = _names.get(code)
+    return name
+
+
+def clear_cache():
+    """이벤트 타입 사전 캐시를 비운다."""
+    with _types_lock:
+        _codes.clear()
+        _names.clear()
+
+
+# -----------------------------------------------------------------------------
+# 이벤트 행
+# -----------------------------------------------------------------------------
+
+def build_event(session, event_type, event_time_ms, payload=None, session_item_id=None):
+    """
+    압축 형식의 ExerciseSessionEvent 인스턴스를 만든다. (저장은 호출자가 bulk_create 등으로 한다)
+    """
+    return ExerciseSessionEvent(
+        session=session,
+        session_item_id=session_item_id,
+        event_time_ms=event_time_ms,
+        type_id=intern_type(event_type),
+        payload_bin=encode_payload(event_type, payload),
+    )
+
+
+def decode_event(event):
+    """
+    이벤트 행을 (타입 이름, 페이로드) 로 읽는다. 변환 전(legacy) 행도 같은 방식으로 읽는다.
+    """
+    if event.type_id is None:
+        return event.event_type, event.payload
+    return type_name(event.type_id), decode_payload(event.payload_bin)
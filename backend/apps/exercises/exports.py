@@ -0,0 +1,172 @@
+"""
+운동 기록 전체 내보내기 모듈.
+
+사용자의 세션, 세션 항목, 이벤트 전체를 CSV 또는 NDJSON 으로 스트리밍한다.
+세션은 (started_at, session_id) 키셋 페이지 단위로 읽고, 페이지마다 해당 세션들의
+항목과 이벤트를 .iterator() (PostgreSQL 에서는 서버 사이드 커서)로 흘려보내므로
+기록 크기와 관계없이 메모리 사용량은 페이지 크기로 제한된다.
+
+레코드 순서는 페이지마다 세션 → 항목 → 이벤트이며, 모든 레코드에 session_id 가 있어
+소비자가 세션 단위로 묶을 수 있다.
+
+Functions:
+    iter_records: 내보낼 레코드 스트림
+    render_ndjson / render_csv: 레코드를 텍스트 줄로 변환
+    gzip_stream: 바이트 스트림을 gzip 으로 즉시 압축
+"""
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .events import decode_event
+from .models import ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent
+from .sharding import shard_for_user
+
+PAGE_SIZE = 500
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+SESSION_FIELDS = (
+    'session_id', 'playlist_id', 'template_id', 'mode', 'started_at', 'ended_at',
+    'duration_ms', 'is_valid', 'abnormal_end_reason',
+)
+ITEM_FIELDS = (
+    'session_item_id', 'session_id', 'exercise_id', 'sequence_no', 'started_at', 'ended_at',
+    'duration_ms', 'is_skipped', 'skip_reason', 'rest_sec',
+)
+CSV_COLUMNS = (
+    'record', 'session_id', 'session_item_id', 'event_id', 'playlist_id', 'template_id', 'mode',
+    'exercise_id', 'sequence_no', 'started_at', 'ended_at', 'duration_ms', 'is_valid',
+    'abnormal_end_reason', 'is_skipped', 'skip_reason', 'rest_sec', 'event_time_ms', 'event_type', 'payload',
+)
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def iter_session_pages(user, start=None, end=None, page_size=None):
+    """
+    사용자의 세션을 (started_at, session_id) 키셋 순서의 페이지로 반환한다.
+
+    Args:
+        user: 대상 사용자
+        start (datetime): 이 시각 이후 시작한 세션만 (포함)
+        end (datetime): 이 시각 이전 시작한 세션만 (제외)
+        page_size (int): 페이지당 세션 수 (기본값 PAGE_SIZE)
+
+    Yields:
+        list: 세션 dict 목록
+    """
+    page_size = page_size or PAGE_SIZE
+    sessions = ExerciseSession.objects.using(shard_for_user(user.pk)).filter(user=user)
+    if start is not None:
+        sessions = sessions.filter(started_at__gte=start)
+    if end is not None:
+        sessions = sessions.filter(started_at__lt=end)
+    sessions = sessions.order_by('started_at', 'session_id').values(*SESSION_FIELDS)
+
+    last = None
+    while True:
+        page = sessions
+        if last is not None:
+            page = page.filter(
+                Q(started_at__gt=last['started_at'])
+                | Q(started_at=last['started_at'], session_id__gt=last['session_id'])
+            )
+        page = list(page[:page_size])
+        if not page:
+            return
+        yield page
+        last = page[-1]
+
+
+def iter_records(user, start=None, end=None, page_size=None, chunk_size=CHUNK_SIZE):
+    """
+    내보낼 레코드(dict)를 순서대로 생성한다. 각 레코드의 'record' 는 session / item / event 이다.
+    """
+    using = shard_for_user(user.pk)
+    for page in iter_session_pages(user, start, end, page_size):
+        session_ids = [session['session_id'] for session in page]
+        for session in page:
+            yield {'record': 'session', **session}
+
+        items = (
+            ExerciseSessionItem.objects.using(using).filter(session_id__in=session_ids)
+            .order_by('session_id', 'sequence_no').values(*ITEM_FIELDS)
+        )
+        for item in items.iterator(chunk_size=chunk_size):
+            yield {'record': 'item', **item}
+
+        events = (
+            ExerciseSessionEvent.objects.using(using).filter(session_id__in=session_ids)
+            .only('event_id', 'session_id', 'session_item_id', 'event_time_ms', 'type', 'payload_bin', 'event_type', 'payload')
+            .order_by('session_id', 'event_time_ms', 'created_at')
+        )
+        for event in events.iterator(chunk_size=chunk_size):
+            event_type, payload = decode_event(event)
+            yield {
+                'record': 'event',
+                'event_id': event.event_id,
+                'session_id': event.session_id,
+                'session_item_id': event.session_item_id,
+                'event_time_ms': event.event_time_ms,
+                'event_type': event_type,
+                'payload': payload,
+            }
+
+
+def render_ndjson(records):
+    """레코드를 NDJSON 줄로 변환한다."""
+    for record in records:
+        yield _encoder.encode(record) + '\n'
+
+
+class _Line:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 버퍼."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return _encoder.encode(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def render_csv(records):
+    """레코드를 CSV_COLUMNS 열의 CSV 줄로 변환한다. 레코드에 없는 열은 빈 값이다."""
+    writer = csv.writer(_Line())
+    yield writer.writerow(CSV_COLUMNS)
+    for record in records:
+        yield writer.writerow([_csv_value(record.get(column)) for column in CSV_COLUMNS])
+
+
+def encode_chunks(lines, flush_bytes=FLUSH_BYTES):
+    """텍스트 줄을 UTF-8 로 인코딩하고 flush_bytes 단위로 묶어 반환한다."""
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= flush_bytes:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_stream(chunks, level=6):
+    """바이트 청크를 gzip 형식으로 즉시 압축해 반환한다."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
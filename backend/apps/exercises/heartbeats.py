@@ -0,0 +1,209 @@
+"""
+운동 세션 핑(heartbeat) 및 비정상 종료 세션 정리 모듈. (BE_V1_LOG_001)
+
+앱 강제 종료 등으로 종료 시간이 기록되지 않은 세션은 마지막 핑 시간을 종료 시간으로
+추정해 닫는다. 핑마다 DB 행을 갱신하지 않도록 최근 핑 시간은 프로세스 메모리 테이블에
+모아 두고, HEARTBEAT_FLUSH_INTERVAL 마다 한 번의 bulk UPDATE 로 반영한다.
+
+flush 는 테이블에 핑이 들어오면 예약되는 타이머가 실행하므로, 핑이 끊긴 세션의 마지막 핑도
+다음 핑을 기다리지 않고 주기 안에 반영된다. 프로세스가 정상 종료될 때도 남은 핑을 반영한다.
+정리 작업(sweep_stale_sessions)은 다른 프로세스의 테이블을 읽을 수 없으므로
+SESSION_STALE_AFTER 는 HEARTBEAT_FLUSH_INTERVAL 보다 충분히 길어야 한다.
+
+Classes:
+    HeartbeatTable: 세션별 최근 핑 시간 메모리 테이블
+
+Functions:
+    record_heartbeat: 핑 기록 (주기 flush 예약)
+    sweep_stale_sessions: 오래 핑이 없는 미종료 세션을 일괄 종료
+"""
+import atexit
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, Value, When
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
+
+from apps.core.background import QueueFull, get_queue
+from apps.core.lru import LRUCache
+
+from .models import ExerciseSession
+from .sharding import history_databases
+from .timeline import derive_metrics
+
+logger = logging.getLogger(__name__)
+
+UPDATE_BATCH_SIZE = 500
+MIN_VALID_DURATION_MS = 10_000
+
+
+def _case(field_values, output_field):
+    return Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in field_values],
+        output_field=output_field,
+    )
+
+
+class HeartbeatTable:
+    """
+    세션별 최근 핑 시간을 모아 두는 메모리 테이블.
+
+    flush 는 테이블을 통째로 교체한 뒤 교체 전 내용을 기록하므로, 기록 중에 들어온
+    핑은 다음 flush 로 넘어간다. 테이블에 핑이 있는 동안에는 항상 한 번의 flush 가 예약되어 있다.
+    """
+
+    def __init__(self):
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def touch(self, session_id, at):
+        with self._lock:
+            previous = self._seen.get(session_id)
+            if previous is None or at > previous:
+                self._seen[session_id] = at
+
+    def schedule(self, interval):
+        """interval 초 뒤 백그라운드 flush 를 예약한다. 이미 예약되어 있으면 그대로 둔다."""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(interval, self._submit_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _submit_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            get_queue('heartbeats').submit(self.flush)
+        except QueueFull:
+            # 대기열이 가득 차면 다음 핑이 다시 예약한다.
+            logger.warning("heartbeat queue is full; %d pings left buffered", len(self._seen))
+
+    def flush(self):
+        """
+        모인 핑 시간을 아직 종료되지 않은 세션에만 bulk UPDATE 로 반영한다.
+
+        Returns:
+            int: 갱신된 세션 수
+        """
+        with self._lock:
+            seen, self._seen = self._seen, {}
+        field = ExerciseSession._meta.get_field('last_heartbeat_at')
+        entries = list(seen.items())
+        updated = 0
+        # 세션의 기록 DB 를 알 수 없으므로 모든 기록 DB 에 같은 UPDATE 를 보낸다. (없는 ID 는 갱신되지 않음)
+        for using in history_databases():
+            for start in range(0, len(entries), UPDATE_BATCH_SIZE):
+                batch = entries[start:start + UPDATE_BATCH_SIZE]
+                updated += ExerciseSession.objects.using(using).filter(
+                    pk__in=[pk for pk, _ in batch], ended_at__isnull=True
+                ).update(last_heartbeat_at=_case(batch, field))
+        return updated
+
+    def __len__(self):
+        return len(self._seen)
+
+
+heartbeats = HeartbeatTable()
+
+# 세션 소유자 확인을 핑마다 조회하지 않도록 session_id -> user_id 를 캐시한다.
+_owners = LRUCache(maxsize=10000)
+
+
+def session_owner(session_id):
+    """
+    세션 소유자 ID 를 반환한다. 처음 한 번만 조회하고 이후에는 캐시를 사용한다.
+    """
+    owner = _owners.get(session_id)
+    if owner is None:
+        owner = (
+            ExerciseSession.objects.filter(pk=session_id, ended_at__isnull=True)
+            .values_list('user_id', flat=True).first()
+        )
+        if owner is not None:
+            _owners.set(session_id, owner)
+    return owner
+
+
+def record_heartbeat(session_id, at=None):
+    """
+    세션 핑을 메모리 테이블에 기록하고, 예약된 flush 가 없으면 HEARTBEAT_FLUSH_INTERVAL 뒤로 예약한다.
+    """
+    heartbeats.touch(session_id, at or timezone.now())
+    heartbeats.schedule(getattr(settings, 'HEARTBEAT_FLUSH_INTERVAL', 30))
+
+
+@atexit.register
+def _flush_at_exit():
+    # 워커가 정상 종료될 때 아직 반영하지 않은 핑을 기록한다.
+    pending = len(heartbeats)
+    if not pending:
+        return
+    try:
+        heartbeats.flush()
+    except Exception:
+        logger.exception("failed to flush %d buffered heartbeats at exit", pending)
+
+
+def sweep_stale_sessions(threshold=None, now=None):
+    """
+    마지막 핑(없으면 시작 시간)이 threshold 보다 오래된 미종료 세션을 일괄 종료한다.
+
+    종료 시간은 마지막 핑 시간(없으면 시작 시간)으로 추정하고, 핑이 있었던 세션은
+    APP_KILLED, 한 번도 없었던 세션은 UNKNOWN 으로 표시한다.
+    총 운동 시간이 10초 미만이면 is_valid=False 로 표시한다.
+    종료한 세션은 항목별 파생 지표도 계산한다. (apps.exercises.timeline)
+
+    Args:
+        threshold (timedelta): 핑 공백 허용 시간 (기본값 settings.SESSION_STALE_AFTER)
+        now (datetime): 기준 시각
+
+    Returns:
+        int: 종료 처리된 세션 수
+    """
+    heartbeats.flush()
+    threshold = threshold or timedelta(seconds=getattr(settings, 'SESSION_STALE_AFTER', 600))
+    cutoff = (now or timezone.now()) - threshold
+
+    stale = (
+        ExerciseSession.objects.filter(ended_at__isnull=True)
+        .annotate(last_seen=Coalesce('last_heartbeat_at', 'started_at'))
+        .filter(last_seen__lt=cutoff)
+        .values_list('session_id', 'started_at', 'last_heartbeat_at')
+    )
+    fields = {name: ExerciseSession._meta.get_field(name) for name in ('ended_at', 'duration_ms', 'is_valid', 'abnormal_end_reason')}
+    closed = 0
+
+    def close(using, batch):
+        ended, durations, valid, reasons = [], [], [], []
+        for session_id, started_at, last_heartbeat_at in batch:
+            ended_at = last_heartbeat_at or started_at
+            duration_ms = int((ended_at - started_at).total_seconds() * 1000)
+            ended.append((session_id, ended_at))
+            durations.append((session_id, duration_ms))
+            valid.append((session_id, duration_ms >= MIN_VALID_DURATION_MS))
+            reasons.append((session_id, 'APP_KILLED' if last_heartbeat_at else 'UNKNOWN'))
+        return ExerciseSession.objects.using(using).filter(
+            pk__in=[row[0] for row in batch], ended_at__isnull=True
+        ).update(
+            ended_at=_case(ended, fields['ended_at']),
+            duration_ms=_case(durations, fields['duration_ms']),
+            is_valid=_case(valid, fields['is_valid']),
+            abnormal_end_reason=_case(reasons, fields['abnormal_end_reason']),
+            updated_at=Now(),
+        )
+
+    # 종료 처리된 행은 조건에서 빠지므로 기록 DB 마다 같은 조회를 배치 크기만큼 반복한다.
+    for using in history_databases():
+        while True:
+            batch = list(stale.using(using)[:UPDATE_BATCH_SIZE])
+            if not batch:
+                break
+            closed += close(using, batch)
+            derive_metrics([row[0] for row in batch], using=using)
+    return closed
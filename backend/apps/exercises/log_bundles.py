@@ -0,0 +1,245 @@
+"""
+세션 로그 번들 생성 모듈. (BE_V1_LOG_002)
+
+세션 1건의 전체 로그(세션 요약, 운동 항목, 이벤트)를 압축된 NDJSON 파일로 만들고
+ExerciseLogObject 를 PENDING 상태로 등록한다. 업로드는 별도 업로더가 PENDING 객체를 처리한다.
+
+항목과 이벤트는 .iterator(chunk_size=...) 로 스트리밍하면서 압축기에 바로 쓰고,
+압축기가 내보내는 바이트를 파일에 쓰는 동시에 SHA-256 과 크기를 계산한다.
+따라서 로그 전체를 메모리에 올리지 않고 한 번의 패스로 파일, 체크섬, 크기를 얻는다.
+
+zstd 압축은 선택 의존성(zstandard)이 설치된 경우에만 사용할 수 있다.
+
+Functions:
+    iter_records: 세션 로그 레코드 스트림
+    build_bundle: 세션 1건의 번들 생성 및 ExerciseLogObject 등록
+    build_bundles: 여러 세션의 번들을 프로세스 풀에서 생성
+"""
+import gzip
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+from .events import decode_event
+from .models import ExerciseSession, ExerciseLogObject
+from .sharding import find_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+COMPRESSIONS = {
+    'gzip': ('ndjson+gzip', '.ndjson.gz'),
+    'zstd': ('ndjson+zstd', '.ndjson.zst'),
+}
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+SESSION_FIELDS = (
+    'session_id', 'user_id', 'playlist_id', 'template_id', 'template_version', 'mode',
+    'started_at', 'ended_at', 'duration_ms', 'is_valid', 'abnormal_end_reason',
+)
+ITEM_FIELDS = (
+    'session_item_id', 'exercise_id', 'playlist_item_id', 'sequence_no', 'started_at',
+    'ended_at', 'duration_ms', 'is_skipped', 'skip_reason', 'rest_sec',
+)
+
+
+class DigestWriter:
+    """
+    쓰는 바이트를 파일에 기록하면서 SHA-256 과 크기를 함께 계산하는 파일 객체.
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.fileobj.write(data)
+
+    def flush(self):
+        self.fileobj.flush()
+
+
+def check_compression(compression):
+    """
+    압축 형식을 사용할 수 있는지 확인한다.
+
+    Raises:
+        ValueError: 지원하지 않는 형식
+        ImproperlyConfigured: zstd 를 요청했지만 zstandard 가 설치되지 않은 경우
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"지원하지 않는 압축 형식입니다: {compression}")
+    if compression == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured("zstd 압축을 사용하려면 zstandard 패키지를 설치해야 합니다.")
+
+
+def _compressor(compression, writer):
+    check_compression(compression)
+    if compression == 'zstd':
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).stream_writer(writer, closefd=False)
+    # mtime=0 으로 고정해 같은 로그는 같은 체크섬을 갖게 한다.
+    return gzip.GzipFile(fileobj=writer, mode='wb', mtime=0)
+
+
+def iter_records(session, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    세션 로그 레코드를 순서대로 생성한다.
+
+    첫 레코드는 세션 요약(record='session'), 이후 운동 항목(record='item'),
+    이벤트(record='event', 발생 시간 순)가 이어진다.
+    """
+    yield {'record': 'session', **{field: getattr(session, field) for field in SESSION_FIELDS}}
+    items = session.items.order_by('sequence_no').values(*ITEM_FIELDS)
+    for item in items.iterator(chunk_size=chunk_size):
+        yield {'record': 'item', **item}
+    events = (
+        session.events
+        .only('event_id', 'session_item_id', 'event_time_ms', 'type', 'payload_bin', 'event_type', 'payload')
+        .order_by('event_time_ms', 'created_at')
+    )
+    for event in events.iterator(chunk_size=chunk_size):
+        event_type, payload = decode_event(event)
+        yield {
+            'record': 'event',
+            'event_id': event.event_id,
+            'session_item_id': event.session_item_id,
+            'event_time_ms': event.event_time_ms,
+            'event_type': event_type,
+            'payload': payload,
+        }
+
+
+def bundle_key(session, compression):
+    """번들의 객체 키 (예: session-logs/<user_id>/<session_id>.ndjson.gz)."""
+    prefix = getattr(settings, 'LOG_BUNDLE_PREFIX', 'session-logs')
+    return f'{prefix}/{session.user_id}/{session.session_id}{COMPRESSIONS[compression][1]}'
+
+
+def bundle_path(key):
+    """객체 키에 해당하는 로컬 스테이징 파일 경로."""
+    directory = getattr(settings, 'LOG_BUNDLE_DIR', os.path.join(settings.BASE_DIR, 'var', 'log_bundles'))
+    return os.path.join(str(directory), *key.split('/'))
+
+
+def build_bundle(session, compression='gzip', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    세션 1건의 로그 번들을 만들고 ExerciseLogObject 를 PENDING 으로 등록한다.
+
+    이미 업로드된(UPLOADED) 로그 객체가 있으면 다시 만들지 않는다.
+
+    Args:
+        session (ExerciseSession): 종료된 세션
+        compression (str): 'gzip' 또는 'zstd'
+        chunk_size (int): DB 스트리밍 청크 크기
+
+    Returns:
+        ExerciseLogObject: 등록된 로그 객체
+    """
+    # 로그 객체는 세션과 같은 기록 DB 에 둔다. (apps.exercises.sharding)
+    log_objects = ExerciseLogObject.objects.db_manager(session._state.db)
+    existing = log_objects.filter(session=session).first()
+    if existing is not None and existing.upload_status == 'UPLOADED':
+        return existing
+
+    key = bundle_key(session, compression)
+    path = bundle_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f'{path}.tmp'
+    with open(temp, 'wb') as fp:
+        writer = DigestWriter(fp)
+        compressor = _compressor(compression, writer)
+        with compressor:
+            for record in iter_records(session, chunk_size):
+                compressor.write(_encoder.encode(record).encode() + b'\n')
+    os.replace(temp, path)
+
+    log_object, _ = log_objects.update_or_create(
+        session=session,
+        defaults={
+            's3_key': key,
+            'content_type': COMPRESSIONS[compression][0],
+            'bytes': writer.size,
+            'checksum': writer.sha256.hexdigest(),
+            'upload_status': 'PENDING',
+        },
+    )
+    return log_object
+
+
+def _build_one(session_id, compression, chunk_size):
+    session = find_session(session_id)
+    if session is None:
+        raise ExerciseSession.DoesNotExist(f'session {session_id} not found')
+    return str(build_bundle(session, compression, chunk_size).pk)
+
+
+def _init_worker():
+    import django
+
+    # spawn 방식 워커는 Django 를 새로 초기화해야 한다. (fork 방식에서는 이미 준비되어 있다)
+    django.setup()
+
+
+def build_bundles(session_ids, compression='gzip', workers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    여러 세션의 번들을 생성한다. workers 가 1이면 현재 프로세스에서 순서대로 만든다.
+
+    프로세스 풀을 만들기 전에 DB 연결을 닫아, 각 워커가 부모의 연결을 공유하지 않고
+    자신의 연결을 새로 열도록 한다.
+
+    Args:
+        session_ids (list): 세션 ID 목록
+        compression (str): 'gzip' 또는 'zstd'
+        workers (int): 워커 프로세스 수 (기본값 CPU 수)
+        chunk_size (int): DB 스트리밍 청크 크기
+        progress (callable): 세션마다 (session_id, log_object_id, error) 로 호출되는 콜백
+
+    Returns:
+        tuple: (성공 수, 실패 수)
+    """
+    check_compression(compression)
+    built = failed = 0
+
+    def report(session_id, log_object_id, error):
+        nonlocal built, failed
+        if error is None:
+            built += 1
+        else:
+            failed += 1
+            logger.warning("log bundle for session %s failed: %s", session_id, error)
+        if progress:
+            progress(session_id, log_object_id, error)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for session_id in session_ids:
+            try:
+                report(session_id, _build_one(session_id, compression, chunk_size), None)
+            except Exception as exc:
+                report(session_id, None, exc)
+        return built, failed
+
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(_build_one, session_id, compression, chunk_size): session_id for session_id in session_ids}
+        for future in as_completed(futures):
+            try:
+                report(futures[future], future.result(), None)
+            except Exception as exc:
+                report(futures[future], None, exc)
+    return built, failed
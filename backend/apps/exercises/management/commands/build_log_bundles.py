@@ -0,0 +1,53 @@
+"""
+세션 로그 번들 일괄 생성 명령. (BE_V1_LOG_002)
+
+로그 객체가 없는 종료된 세션의 번들을 프로세스 풀에서 병렬로 생성한다.
+기록 DB 를 샤딩한 경우 모든 기록 DB 에서 대상 세션을 모은다. (apps.exercises.sharding)
+
+Usage:
+    python manage.py build_log_bundles [--workers 4] [--compression gzip|zstd] [--limit 1000]
+    python manage.py build_log_bundles --session <session_id> --session <session_id>
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.exercises.log_bundles import COMPRESSIONS, DEFAULT_CHUNK_SIZE, build_bundles, check_compression
+from apps.exercises.models import ExerciseSession
+from apps.exercises.sharding import history_databases
+
+
+class Command(BaseCommand):
+    help = '종료된 세션의 로그 번들을 생성하고 업로드 대기(PENDING) 상태로 등록한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', action='append', default=[], help='대상 세션 ID (여러 번 지정 가능)')
+        parser.add_argument('--workers', type=int, default=None, help='워커 프로세스 수 (기본값 CPU 수)')
+        parser.add_argument('--compression', choices=sorted(COMPRESSIONS), default='gzip')
+        parser.add_argument('--limit', type=int, default=1000, help='한 번에 처리할 최대 세션 수')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='DB 스트리밍 청크 크기')
+
+    def handle(self, *args, **options):
+        try:
+            check_compression(options['compression'])
+        except Exception as exc:
+            raise CommandError(str(exc))
+
+        session_ids = list(options['session'])
+        if not session_ids:
+            for using in history_databases():
+                remaining = options['limit'] - len(session_ids)
+                if remaining <= 0:
+                    break
+                session_ids += list(
+                    ExerciseSession.objects.using(using).filter(ended_at__isnull=False, log_object__isnull=True)
+                    .order_by('ended_at').values_list('session_id', flat=True)[:remaining]
+                )
+        if not session_ids:
+            self.stdout.write('no sessions to bundle')
+            return
+
+        built, failed = build_bundles(
+            session_ids, compression=options['compression'],
+            workers=options['workers'], chunk_size=options['chunk_size'],
+        )
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f"built {built} bundles, {failed} failed"))
@@ -0,0 +1,70 @@
+"""
+세션 이벤트 저장 크기 보고 명령.
+
+최근 이벤트 표본을 읽어 legacy 형식(타입 문자열 + JSON 페이로드)과 압축 형식
+(타입 코드 2바이트 + 바이너리 페이로드)의 크기를 비교하고, 100만 건당 절감량을 출력한다.
+행 헤더, 기본키 등 두 형식에 공통인 부분은 제외한 컬럼 값 크기만 비교한다.
+기록 DB 를 샤딩한 경우 표본은 기록 DB 마다 --sample 건씩 읽는다.
+
+Usage:
+    python manage.py event_storage_report [--sample 100000]
+"""
+import json
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from apps.exercises.events import decode_event, encode_payload
+from apps.exercises.models import ExerciseSessionEvent
+from apps.exercises.sharding import history_databases
+
+TYPE_CODE_BYTES = 2
+PER_MILLION = 1_000_000
+
+
+def event_sizes(event):
+    """이벤트 1건의 (타입 이름, legacy 바이트, 압축 바이트)."""
+    event_type, payload = decode_event(event)
+    legacy = len(event_type.encode())
+    compact = TYPE_CODE_BYTES
+    if payload is not None:
+        legacy += len(json.dumps(payload, ensure_ascii=False).encode())
+        compact += len(encode_payload(event_type, payload))
+    return event_type, legacy, compact
+
+
+class Command(BaseCommand):
+    help = '세션 이벤트의 legacy/압축 저장 크기를 비교한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=100000, help='표본 이벤트 수 (최근 순)')
+
+    def handle(self, *args, **options):
+        totals = defaultdict(lambda: [0, 0, 0])
+        for using in history_databases():
+            events = (
+                ExerciseSessionEvent.objects.using(using).order_by('-created_at')
+                .only('type', 'payload_bin', 'event_type', 'payload')[:options['sample']]
+            )
+            for event in events.iterator(chunk_size=2000):
+                event_type, legacy, compact = event_sizes(event)
+                entry = totals[event_type]
+                entry[0] += 1
+                entry[1] += legacy
+                entry[2] += compact
+
+        count = sum(entry[0] for entry in totals.values())
+        if not count:
+            self.stdout.write('no events')
+            return
+        self.stdout.write(f"{'event_type':<20} {'count':>9} {'legacy B/evt':>13} {'compact B/evt':>14} {'saved MB/1M':>12}")
+        for event_type, (n, legacy, compact) in sorted(totals.items(), key=lambda item: -item[1][0]):
+            saved = (legacy - compact) / n * PER_MILLION / 2 ** 20
+            self.stdout.write(f"{event_type:<20} {n:>9} {legacy / n:>13.1f} {compact / n:>14.1f} {saved:>12.1f}")
+        legacy = sum(entry[1] for entry in totals.values())
+        compact = sum(entry[2] for entry in totals.values())
+        saved = (legacy - compact) / count * PER_MILLION / 2 ** 20
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} events sampled: {legacy / count:.1f} -> {compact / count:.1f} bytes/event, "
+            f"{saved:.1f} MB saved per million events"
+        ))
@@ -0,0 +1,32 @@
+"""
+운동 카탈로그 내보내기 명령.
+
+현재 카탈로그(카테고리, 운동, 미디어)를 현재 카탈로그 버전과 함께 JSON 또는 CSV 로 내보낸다.
+수정한 파일은 import_catalog 로 다시 가져온다.
+
+Usage:
+    python manage.py export_catalog [--format json|csv] [--output catalog.json]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.exercises.catalog import FORMATS, export_catalog, write_catalog
+
+
+class Command(BaseCommand):
+    help = '운동 카탈로그를 JSON 또는 CSV 파일로 내보낸다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='json', help='파일 형식 (기본값 json)')
+        parser.add_argument('--output', default=None, help='출력 파일 경로 (기본값 표준 출력)')
+
+    def handle(self, *args, **options):
+        catalog = export_catalog()
+        if options['output'] is None:
+            write_catalog(catalog, self.stdout, options['format'])
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as fp:
+            write_catalog(catalog, fp, options['format'])
+        self.stderr.write(self.style.SUCCESS(
+            f"exported catalog v{catalog['version']}: {len(catalog['categories'])} categories, "
+            f"{len(catalog['exercises'])} exercises -> {options['output']}"
+        ))
@@ -0,0 +1,46 @@
+"""
+운동 카탈로그 가져오기 명령.
+
+export_catalog 로 내보낸 뒤 수정한 파일을 DB 와 비교해 생성/변경/비활성화를 한 트랜잭션으로
+적용하고 카탈로그 버전을 한 번 올린다. 파일을 내보낸 뒤 다른 가져오기가 있었으면 거부한다.
+
+Usage:
+    python manage.py import_catalog <path> [--format json|csv] [--dry-run] [--partial] [--force]
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.exercises.catalog import FORMATS, CatalogError, import_catalog, read_catalog
+
+
+class Command(BaseCommand):
+    help = '운동 카탈로그 파일을 DB 에 반영한다. (upsert + 파일에 없는 운동 비활성화)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='카탈로그 파일 경로')
+        parser.add_argument('--format', choices=FORMATS, default=None, help='파일 형식 (기본값 확장자로 판단)')
+        parser.add_argument('--dry-run', action='store_true', help='DB 에 반영하지 않고 변경 내역만 출력')
+        parser.add_argument('--partial', action='store_true', help='파일에 없는 운동을 비활성화하지 않음')
+        parser.add_argument('--force', action='store_true', help='파일의 기준 버전이 현재 버전과 달라도 적용')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('csv' if options['path'].lower().endswith('.csv') else 'json')
+        if not os.path.isfile(options['path']):
+            raise CommandError(f"파일이 없습니다: {options['path']}")
+        with open(options['path'], encoding='utf-8-sig', newline='') as fp:
+            data = fp.read()
+        try:
+            diff, version = import_catalog(
+                read_catalog(data, fmt), partial=options['partial'], force=options['force'], dry_run=options['dry_run']
+            )
+        except CatalogError as exc:
+            raise CommandError(f"카탈로그를 가져올 수 없습니다:\n{exc}")
+
+        summary = ', '.join(f"{name} {count}" for name, count in diff.summary().items())
+        if options['dry_run']:
+            self.stdout.write(f"[dry-run] {summary}")
+        elif not diff:
+            self.stdout.write(f"no changes (catalog v{version})")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"catalog v{version}: {summary}"))
@@ -0,0 +1,46 @@
+"""
+운동 미디어 파일 일괄 등록 명령.
+
+<root>/<locale>/<media_type>/<exercise_id>.<확장자> 구조의 디렉터리를 스캔해
+ExerciseMedia 의 s3_key, checksum, duration_ms 를 채운다. 크기와 수정 시각이 같은 파일은 건너뛴다.
+
+Usage:
+    python manage.py ingest_media <root> [--workers 8] [--force] [--dry-run]
+"""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.exercises.media_ingest import ingest
+
+
+class Command(BaseCommand):
+    help = '미디어 디렉터리의 파일을 해시하고 재생 시간을 읽어 ExerciseMedia 에 등록한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('root', help='미디어 루트 디렉터리')
+        parser.add_argument('--workers', type=int, default=None, help='해시 워커 프로세스 수 (기본값 CPU 수)')
+        parser.add_argument('--force', action='store_true', help='바뀌지 않은 파일도 다시 해시')
+        parser.add_argument('--dry-run', action='store_true', help='DB 에 반영하지 않고 결과만 출력')
+        parser.add_argument('--verbose-rejects', action='store_true', help='제외된 파일 목록 출력')
+
+    def handle(self, *args, **options):
+        if not os.path.isdir(options['root']):
+            raise CommandError(f"디렉터리가 아닙니다: {options['root']}")
+        started = time.perf_counter()
+        report = ingest(options['root'], workers=options['workers'], force=options['force'], dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        if options['verbose_rejects']:
+            for relative, reason in report.rejected:
+                self.stdout.write(f"rejected {relative} ({reason})")
+        for relative, error in report.failed:
+            self.stderr.write(f"failed {relative}: {error}")
+        style = self.style.SUCCESS if not report.failed else self.style.WARNING
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(style(
+            f"{prefix}scanned {report.scanned} files in {elapsed:.1f}s: created {report.created}, "
+            f"updated {report.updated}, unchanged {report.unchanged}, "
+            f"rejected {len(report.rejected)}, failed {len(report.failed)}"
+        ))
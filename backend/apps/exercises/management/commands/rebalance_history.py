@@ -0,0 +1,36 @@
+"""
+운동 기록 재배치 명령. (apps.exercises.sharding)
+
+HISTORY_SHARDS 를 바꾼 뒤 자기 샤드가 아닌 DB 에 기록이 있는 사용자의 세션, 세션 항목,
+세션 이벤트, 로그 객체를 해당 사용자의 샤드로 옮긴다. 사용자 단위로 복사 후 삭제하므로
+중간에 중단되면 다시 실행해 이어서 옮긴다. 옮기는 동안 해당 사용자의 운동 기록 쓰기는 없어야 한다.
+
+Usage:
+    python manage.py rebalance_history [--dry-run] [--batch-size 2000]
+    python manage.py rebalance_history --user <user_id> --user <user_id>
+"""
+from django.core.management.base import BaseCommand
+
+from apps.exercises.sharding import MOVE_BATCH_SIZE, misplaced_users, move_user_history
+
+
+class Command(BaseCommand):
+    help = '샤드 구성에 맞지 않는 DB 에 있는 사용자 운동 기록을 사용자의 샤드로 옮긴다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help='대상 사용자 ID (여러 번 지정 가능)')
+        parser.add_argument('--dry-run', action='store_true', help='옮길 사용자만 출력')
+        parser.add_argument('--batch-size', type=int, default=MOVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        users = 0
+        for user_id, source, target in list(misplaced_users(options['user'] or None)):
+            users += 1
+            if options['dry_run']:
+                self.stdout.write(f"{user_id}: {source} -> {target}")
+                continue
+            moved = move_user_history(user_id, source, target, batch_size=options['batch_size'])
+            rows = ', '.join(f"{name} {count}" for name, count in moved.items())
+            self.stdout.write(f"{user_id}: {source} -> {target} ({rows})")
+        verb = 'to move' if options['dry_run'] else 'moved'
+        self.stdout.write(self.style.SUCCESS(f"{users} users {verb}"))
@@ -0,0 +1,26 @@
+"""
+비정상 종료 세션 정리 명령. (BE_V1_LOG_001)
+
+마지막 핑 이후 일정 시간이 지난 미종료 세션을 마지막 핑 시간으로 종료 처리한다.
+주기 실행(cron 등)을 전제로 한다.
+
+Usage:
+    python manage.py sweep_sessions [--minutes 10]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.exercises.heartbeats import sweep_stale_sessions
+
+
+class Command(BaseCommand):
+    help = '오래 핑이 없는 미종료 세션을 비정상 종료로 처리한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=None, help='핑 공백 허용 시간(분)')
+
+    def handle(self, *args, **options):
+        threshold = timedelta(minutes=options['minutes']) if options['minutes'] else None
+        closed = sweep_stale_sessions(threshold=threshold)
+        self.stdout.write(self.style.SUCCESS(f"closed {closed} stale sessions"))
@@ -0,0 +1,183 @@
+"""
+운동 미디어 로케일 선택 모듈.
+
+ExerciseMedia 는 로케일별로 여러 행을 가질 수 있지만, 응답에는 (운동, 미디어 타입)마다
+요청 로케일에 가장 잘 맞는 미디어 하나만 담는다. 요청 로케일은 Accept-Language 로 정하며
+폴백 순서는 다음과 같다.
+
+    en-US → en → (MEDIA_DEFAULT_LOCALE) ko-KR → ko → 아무 로케일
+
+전체 미디어를 한 번 읽어 (운동, 미디어 타입) → {로케일/언어: 미디어} 맵을 만들고,
+폴백 순서별 선택 결과를 미리 계산해 프로세스 내에 보관하므로 요청마다 미디어를 조회하지 않는다.
+미디어가 바뀌면 DB 의 버전 토큰(MediaVersion)이 바뀌고, 각 프로세스는 토큰을
+MEDIA_VERSION_TTL 초 동안 프로세스 캐시에 두었다가 다시 읽어 바뀌었으면 맵을 다시 만든다.
+bulk_create / update 처럼 save() 를 거치지 않는 변경은 같은 트랜잭션 안에서 bump_media_version() 을 호출해야 한다.
+
+Functions:
+    parse_accept_language: Accept-Language 헤더 파싱
+    fallback_chain: 로케일 폴백 순서
+    request_locales: 요청의 로케일 폴백 순서
+    get_media_map: 현재 버전의 로케일 미디어 맵
+"""
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.lru import LRUCache
+
+from .models import ExerciseMedia, MediaVersion, MEDIA_VERSION_CACHE_KEY
+
+MAX_LANGUAGES = 5
+MEDIA_FIELDS = ('media_id', 'media_type', 'locale', 'url', 'duration_ms', 's3_key')
+MEDIA_TYPE_ORDER = {media_type: index for index, (media_type, _) in enumerate(ExerciseMedia.MEDIA_TYPE_CHOICES)}
+
+
+def default_locale():
+    return getattr(settings, 'MEDIA_DEFAULT_LOCALE', 'ko-KR').lower()
+
+
+def parse_accept_language(header, limit=MAX_LANGUAGES):
+    """
+    Accept-Language 헤더를 선호 순서의 (소문자) 언어 태그 목록으로 변환한다.
+
+    q=0 과 '*' 는 제외하고, 같은 q 값은 헤더 순서를 유지한다.
+    """
+    languages = []
+    for position, part in enumerate((header or '').split(',')):
+        tag, _, params = part.strip().partition(';')
+        tag = tag.strip().lower().replace('_', '-')
+        if not tag or tag == '*':
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if quality > 0:
+            languages.append((-quality, position, tag))
+    return [tag for _, _, tag in sorted(languages)[:limit]]
+
+
+def fallback_chain(languages):
+    """
+    언어 태그 목록을 폴백 순서로 확장한다. 각 태그 뒤에 주 언어를 넣고, 마지막에 기본 로케일을 붙인다.
+
+    Returns:
+        tuple: 중복 없는 소문자 태그 목록 (캐시 키로 사용)
+    """
+    chain = []
+    for tag in [*languages, default_locale()]:
+        for candidate in (tag, tag.split('-')[0]):
+            if candidate not in chain:
+                chain.append(candidate)
+    return tuple(chain)
+
+
+def request_locales(request):
+    """요청의 로케일 폴백 순서. 요청이 없으면 기본 로케일 순서."""
+    header = request.META.get('HTTP_ACCEPT_LANGUAGE', '') if request is not None else ''
+    return fallback_chain(parse_accept_language(header))
+
+
+class LocaleMediaMap:
+    """
+    특정 미디어 버전의 (운동, 미디어 타입) → 로케일별 미디어 맵과 폴백 순서별 선택 결과.
+    """
+
+    def __init__(self, version, rows):
+        self.version = version
+        self._candidates = {}
+        self._tags = set()
+        locales = set()
+        # 로케일 순으로 읽으므로 'en' 행이 'en-gb' 행보다 먼저 언어 폴백 자리를 차지한다.
+        for row in rows:
+            media = {field: row[field] for field in MEDIA_FIELDS}
+            media['media_id'] = str(media['media_id'])
+            locale = row['locale'].lower()
+            locales.add(locale)
+            entry = self._candidates.setdefault((row['exercise_id'], row['media_type']), {})
+            entry.setdefault(locale, media)
+            entry.setdefault(locale.split('-')[0], media)
+            self._tags.update((locale, locale.split('-')[0]))
+        self._resolved = LRUCache(maxsize=64)
+        for locale in locales:
+            self.resolve(fallback_chain([locale]))
+
+    def effective(self, chain):
+        """
+        폴백 순서에서 미디어가 있는 태그만 남긴다. 선택 결과가 같은 순서는 같은 키가 되므로
+        임의의 Accept-Language 값이 캐시 항목을 늘리지 않는다.
+        """
+        return tuple(tag for tag in chain if tag in self._tags)
+
+    def resolve(self, chain):
+        """
+        폴백 순서에 대한 {exercise_id: [미디어, ...]} 선택 결과. (미디어 타입 순)
+        """
+        chain = self.effective(chain)
+        resolved = self._resolved.get(chain)
+        if resolved is not None:
+            return resolved
+        resolved = {}
+        for (exercise_id, _), entry in self._candidates.items():
+            media = next((entry[tag] for tag in chain if tag in entry), None)
+            if media is None:
+                # 폴백 순서의 어떤 로케일에도 없으면 있는 미디어 중 하나를 사용한다.
+                media = next(iter(entry.values()))
+            resolved.setdefault(exercise_id, []).append(media)
+        for media_list in resolved.values():
+            media_list.sort(key=lambda media: MEDIA_TYPE_ORDER.get(media['media_type'], len(MEDIA_TYPE_ORDER)))
+        self._resolved.set(chain, resolved)
+        return resolved
+
+    def media_for(self, exercise_id, chain):
+        """운동의 미디어 목록 (미디어 타입마다 하나)."""
+        return self.resolve(chain).get(exercise_id, [])
+
+
+_current = None
+_build_lock = threading.Lock()
+
+
+def media_version():
+    """
+    DB 의 미디어 버전 토큰. 없으면 새로 만든다.
+
+    토큰은 MEDIA_VERSION_TTL 초 동안 캐시에 두므로 다른 프로세스의 변경은 그 안에 반영된다.
+    """
+    version = cache.get(MEDIA_VERSION_CACHE_KEY)
+    if version is None:
+        row, _ = MediaVersion.objects.get_or_create(
+            pk=MediaVersion.SINGLETON_ID, defaults={'token': uuid.uuid4().hex}
+        )
+        version = row.token
+        cache.set(MEDIA_VERSION_CACHE_KEY, version, timeout=getattr(settings, 'MEDIA_VERSION_TTL', 5))
+    return version
+
+
+def get_media_map():
+    """
+    현재 미디어 버전의 LocaleMediaMap 을 반환한다. 버전이 바뀌었으면 다시 만든다.
+    """
+    global _current
+    version = media_version()
+    current = _current
+    if current is not None and current.version == version:
+        return current
+    with _build_lock:
+        if _current is None or _current.version != version:
+            rows = ExerciseMedia.objects.order_by('locale', 'created_at', 'media_id').values('exercise_id', *MEDIA_FIELDS)
+            _current = LocaleMediaMap(version, rows.iterator(chunk_size=2000))
+        return _current
+
+
+def clear_cache():
+    """프로세스 내 미디어 맵과 캐시된 버전 토큰을 비운다."""
+    global _current
+    with _build_lock:
+        _current = None
+    cache.delete(MEDIA_VERSION_CACHE_KEY)
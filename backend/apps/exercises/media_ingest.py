@@ -0,0 +1,375 @@
+"""
+운동 미디어 파일 일괄 등록 모듈.
+
+미디어 디렉터리를 스캔해 ExerciseMedia 의 s3_key, checksum(SHA-256), duration_ms, 크기를 채운다.
+디렉터리 구조는 다음과 같으며, 업로드 시 같은 상대 경로를 MEDIA_S3_PREFIX 아래에 올린다.
+
+    <root>/<locale>/<media_type>/<exercise_id>.<확장자>
+    예: media/ko-KR/guide_audio/3f2c...e1.mp3
+
+처리 순서:
+    1. os.scandir 로 트리를 훑으며 크기와 수정 시각을 모은다. (파일 내용은 읽지 않음)
+    2. 기존 행과 크기/수정 시각이 같은 파일은 건너뛴다.
+    3. 나머지 파일은 프로세스 풀에서 mmap 청크 단위로 해시하고, 오디오는 헤더만 읽어 길이를 구한다.
+       (WAV: fmt/data 청크, MP3: Xing/Info/VBRI 프레임 수 또는 CBR 비트레이트)
+    4. 생성/변경 행을 한 트랜잭션에서 bulk_create / bulk_update 하고 미디어 버전을 한 번 올린다.
+
+Functions:
+    scan: 디렉터리 트리에서 등록 대상 파일 수집
+    wav_duration_ms / mp3_duration_ms: 오디오 헤더에서 재생 시간 계산
+    inspect_file: 파일 해시와 재생 시간 (워커 프로세스에서 실행)
+    ingest: 스캔부터 DB 반영까지 전체 실행
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .models import Exercise, ExerciseMedia, bump_media_version
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+BULK_BATCH_SIZE = 1000
+AUDIO_EXTENSIONS = {'.wav', '.mp3'}
+MEDIA_EXTENSIONS = AUDIO_EXTENSIONS | {'.png', '.jpg', '.jpeg', '.webp', '.svg', '.json'}
+MEDIA_TYPES = {media_type for media_type, _ in ExerciseMedia.MEDIA_TYPE_CHOICES}
+UPDATED_FIELDS = ('s3_key', 'url', 'checksum', 'duration_ms', 'bytes', 'source_mtime_ns')
+
+
+@dataclass(frozen=True)
+class MediaFile:
+    """스캔한 미디어 파일."""
+    path: str
+    relative: str
+    exercise_id: uuid.UUID
+    media_type: str
+    locale: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class IngestReport:
+    """등록 결과."""
+    scanned: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+# -----------------------------------------------------------------------------
+# 스캔
+# -----------------------------------------------------------------------------
+
+def _walk(directory):
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def scan(root):
+    """
+    디렉터리 트리에서 등록 대상 파일을 모은다.
+
+    Returns:
+        tuple: (MediaFile 목록, [(상대 경로, 사유), ...] 형식의 제외 목록)
+    """
+    root = os.path.abspath(root)
+    files, rejected = [], []
+    for entry in _walk(root):
+        relative = os.path.relpath(entry.path, root).replace(os.sep, '/')
+        parts = relative.split('/')
+        stem, extension = os.path.splitext(parts[-1])
+        if len(parts) != 3:
+            rejected.append((relative, 'layout'))
+            continue
+        if extension.lower() not in MEDIA_EXTENSIONS:
+            rejected.append((relative, 'extension'))
+            continue
+        media_type = parts[1].upper()
+        if media_type not in MEDIA_TYPES:
+            rejected.append((relative, 'media_type'))
+            continue
+        try:
+            exercise_id = uuid.UUID(stem)
+        except ValueError:
+            rejected.append((relative, 'exercise_id'))
+            continue
+        stat = entry.stat(follow_symlinks=False)
+        files.append(MediaFile(entry.path, relative, exercise_id, media_type, parts[0], stat.st_size, stat.st_mtime_ns))
+    return files, rejected
+
+
+# -----------------------------------------------------------------------------
+# 파일 검사 (워커 프로세스)
+# -----------------------------------------------------------------------------
+
+def file_sha256(path):
+    """파일을 mmap 으로 열어 HASH_CHUNK_SIZE 단위로 SHA-256 을 계산한다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fp:
+        size = os.fstat(fp.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, size, HASH_CHUNK_SIZE):
+                    digest.update(view[offset:offset + HASH_CHUNK_SIZE])
+            finally:
+                view.release()
+    return digest.hexdigest()
+
+
+def wav_duration_ms(fp):
+    """
+    RIFF/WAVE 헤더의 fmt 청크(byte rate)와 data 청크 크기로 재생 시간을 계산한다.
+    """
+    header = fp.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        return None
+    byte_rate = None
+    while True:
+        chunk = fp.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+        if chunk_id == b'fmt ':
+            fmt = fp.read(chunk_size)
+            if len(fmt) < 12:
+                return None
+            byte_rate = struct.unpack('<I', fmt[8:12])[0]
+            if chunk_size % 2:
+                fp.seek(1, os.SEEK_CUR)
+        elif chunk_id == b'data':
+            if not byte_rate:
+                return None
+            return chunk_size * 1000 // byte_rate
+        else:
+            # 청크는 2바이트 경계로 정렬된다.
+            fp.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+# MPEG Layer III 비트레이트(kbps)와 샘플레이트. 버전 비트: 3=MPEG1, 2=MPEG2, 0=MPEG2.5
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_BITRATES[0] = _MP3_BITRATES[2]
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+MP3_SEARCH_BYTES = 64 * 1024
+
+
+def _parse_mp3_header(data, offset):
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = (b1 >> 3) & 0x3
+    layer = (b1 >> 1) & 0x3
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    return {
+        'version': version,
+        'bitrate': _MP3_BITRATES[version][bitrate_index] * 1000,
+        'sample_rate': _MP3_SAMPLE_RATES[version][sample_rate_index],
+        'samples': 1152 if version == 3 else 576,
+        'mono': (b3 >> 6) == 3,
+    }
+
+
+def mp3_duration_ms(fp, size):
+    """
+    MP3 (MPEG Layer III) 의 재생 시간을 프레임을 디코딩하지 않고 계산한다.
+
+    첫 프레임의 Xing/Info 또는 VBRI 헤더에 프레임 수가 있으면 그것으로, 없으면 CBR 로 보고
+    오디오 바이트 수와 비트레이트로 계산한다. ID3v2/ID3v1 태그는 제외한다.
+    """
+    start = 0
+    header = fp.read(10)
+    if header[:3] == b'ID3' and len(header) == 10:
+        tag_size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        start = 10 + tag_size + (10 if header[5] & 0x10 else 0)
+    fp.seek(start)
+    data = fp.read(MP3_SEARCH_BYTES)
+
+    offset = data.find(b'\xff')
+    frame = None
+    while 0 <= offset <= len(data) - 4:
+        if data[offset + 1] & 0xE0 == 0xE0:
+            frame = _parse_mp3_header(data, offset)
+            if frame is not None:
+                break
+        offset = data.find(b'\xff', offset + 1)
+    if frame is None:
+        return None
+
+    side_info = (32 if not frame['mono'] else 17) if frame['version'] == 3 else (17 if not frame['mono'] else 9)
+    xing = offset + 4 + side_info
+    frames = None
+    if data[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', data[xing + 4:xing + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack('>I', data[xing + 8:xing + 12])[0]
+    elif data[offset + 36:offset + 40] == b'VBRI':
+        frames = struct.unpack('>I', data[offset + 50:offset + 54])[0]
+    if frames:
+        return frames * frame['samples'] * 1000 // frame['sample_rate']
+
+    audio_bytes = size - (start + offset)
+    if size >= 128:
+        fp.seek(size - 128)
+        if fp.read(3) == b'TAG':
+            audio_bytes -= 128
+    return audio_bytes * 8 * 1000 // frame['bitrate']
+
+
+def audio_duration_ms(path, size):
+    """확장자에 맞는 헤더 파서로 재생 시간을 계산한다. 알 수 없으면 None."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'rb') as fp:
+        if extension == '.wav':
+            return wav_duration_ms(fp)
+        if extension == '.mp3':
+            return mp3_duration_ms(fp, size)
+    return None
+
+
+def inspect_file(path, size):
+    """
+    파일의 SHA-256 과 (오디오인 경우) 재생 시간을 계산한다. 워커 프로세스에서 실행된다.
+
+    Returns:
+        tuple: (checksum, duration_ms)
+    """
+    checksum = file_sha256(path)
+    duration_ms = None
+    if os.path.splitext(path)[1].lower() in AUDIO_EXTENSIONS:
+        try:
+            duration_ms = audio_duration_ms(path, size)
+        except (OSError, struct.error, IndexError, ZeroDivisionError):
+            duration_ms = None
+    return checksum, duration_ms
+
+
+def _inspect(job):
+    path, size = job
+    try:
+        return inspect_file(path, size), None
+    except OSError as exc:
+        return None, str(exc)
+
+
+def _inspect_all(files, workers):
+    jobs = [(media_file.path, media_file.size) for media_file in files]
+    if workers == 1 or len(jobs) < 2:
+        return list(map(_inspect, jobs))
+    # 포크된 워커가 부모의 DB 연결을 물려받지 않도록 먼저 닫는다.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_inspect, jobs, chunksize=max(1, min(64, len(jobs) // (workers * 4)))))
+
+
+# -----------------------------------------------------------------------------
+# 등록
+# -----------------------------------------------------------------------------
+
+def s3_key_for(relative):
+    prefix = getattr(settings, 'MEDIA_S3_PREFIX', 'media').strip('/')
+    return f'{prefix}/{relative}' if prefix else relative
+
+
+def url_for(s3_key):
+    base = getattr(settings, 'MEDIA_BASE_URL', None)
+    return f"{base.rstrip('/')}/{s3_key}" if base else None
+
+
+def ingest(root, workers=None, force=False, dry_run=False):
+    """
+    미디어 디렉터리를 ExerciseMedia 에 반영한다.
+
+    Args:
+        root (str): 미디어 루트 디렉터리
+        workers (int): 해시 워커 프로세스 수 (기본값 CPU 수)
+        force (bool): 크기/수정 시각이 같아도 다시 해시
+        dry_run (bool): DB 에 반영하지 않고 결과만 계산
+
+    Returns:
+        IngestReport: 등록 결과
+    """
+    report = IngestReport()
+    files, report.rejected = scan(root)
+    report.scanned = len(files)
+
+    exercise_ids = set(Exercise.objects.values_list('exercise_id', flat=True))
+    existing = {}
+    for media in ExerciseMedia.objects.order_by('created_at').only('exercise_id', 'media_type', 'locale', *UPDATED_FIELDS):
+        existing.setdefault((media.exercise_id, media.media_type, media.locale), media)
+
+    pending = []
+    for media_file in files:
+        if media_file.exercise_id not in exercise_ids:
+            report.rejected.append((media_file.relative, 'unknown_exercise'))
+            continue
+        current = existing.get((media_file.exercise_id, media_file.media_type, media_file.locale))
+        unchanged = (
+            current is not None and not force
+            and current.bytes == media_file.size
+            and current.source_mtime_ns == media_file.mtime_ns
+            and current.s3_key == s3_key_for(media_file.relative)
+        )
+        if unchanged:
+            report.unchanged += 1
+        else:
+            pending.append((media_file, current))
+
+    results = _inspect_all([media_file for media_file, _ in pending], workers or os.cpu_count() or 1)
+    created, updated = [], []
+    for (media_file, current), (result, error) in zip(pending, results):
+        if error is not None:
+            report.failed.append((media_file.relative, error))
+            logger.warning("media ingest failed for %s: %s", media_file.relative, error)
+            continue
+        checksum, duration_ms = result
+        s3_key = s3_key_for(media_file.relative)
+        values = {
+            's3_key': s3_key,
+            'url': url_for(s3_key) or (current.url if current is not None else None),
+            'checksum': checksum,
+            'duration_ms': duration_ms,
+            'bytes': media_file.size,
+            'source_mtime_ns': media_file.mtime_ns,
+        }
+        if current is None:
+            created.append(ExerciseMedia(
+                exercise_id=media_file.exercise_id, media_type=media_file.media_type,
+                locale=media_file.locale, **values
+            ))
+        else:
+            for name, value in values.items():
+                setattr(current, name, value)
+            updated.append(current)
+
+    report.created, report.updated = len(created), len(updated)
+    if dry_run or not (created or updated):
+        return report
+    with transaction.atomic():
+        ExerciseMedia.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+        ExerciseMedia.objects.bulk_update(updated, UPDATED_FIELDS, batch_size=BULK_BATCH_SIZE)
+        # bulk 연산은 save() 를 거치지 않으므로 로케일 미디어 맵 갱신을 직접 알린다.
+        bump_media_version()
+    return report
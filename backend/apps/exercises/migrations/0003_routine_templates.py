@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:57
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisesession',
+            name='template_version',
+            field=models.IntegerField(blank=True, null=True, verbose_name='루틴 템플릿 버전'),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='template_version',
+            field=models.IntegerField(blank=True, null=True, verbose_name='원본 템플릿 버전'),
+        ),
+        migrations.CreateModel(
+            name='RoutineTemplate',
+            fields=[
+                ('template_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=50, unique=True, verbose_name='템플릿 코드')),
+                ('title', models.CharField(max_length=255, verbose_name='제목')),
+                ('version', models.IntegerField(default=1, verbose_name='버전')),
+                ('is_active', models.BooleanField(default=True, verbose_name='활성 여부')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='routine_templates', to='exercises.exercisecategory', verbose_name='카테고리')),
+            ],
+            options={
+                'verbose_name': '루틴 템플릿',
+                'verbose_name_plural': '루틴 템플릿 목록',
+                'db_table': 'routine_templates',
+            },
+        ),
+        migrations.AddField(
+            model_name='exercisesession',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='exercises.routinetemplate', verbose_name='루틴 템플릿'),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='forks', to='exercises.routinetemplate', verbose_name='원본 템플릿'),
+        ),
+        migrations.CreateModel(
+            name='RoutineTemplateItem',
+            fields=[
+                ('template_item_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('sequence_no', models.IntegerField(verbose_name='순서')),
+                ('set_count', models.IntegerField(verbose_name='세트 수')),
+                ('reps_count', models.IntegerField(blank=True, null=True, verbose_name='회수')),
+                ('duration_sec', models.IntegerField(blank=True, null=True, verbose_name='수행 시간(초)')),
+                ('rest_sec', models.IntegerField(default=10, verbose_name='휴식 시간(초)')),
+                ('cue_overrides', models.JSONField(blank=True, null=True, verbose_name='큐 오버라이드')),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='template_items', to='exercises.exercise', verbose_name='운동')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='exercises.routinetemplate', verbose_name='템플릿')),
+            ],
+            options={
+                'verbose_name': '루틴 템플릿 항목',
+                'verbose_name_plural': '루틴 템플릿 항목 목록',
+                'db_table': 'routine_template_items',
+                'ordering': ['sequence_no'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='routinetemplate',
+            index=models.Index(fields=['is_active'], name='routine_tem_is_acti_d7cf42_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='routinetemplateitem',
+            unique_together={('template', 'sequence_no')},
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0003_routine_templates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisesession',
+            name='last_heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='최근 핑 시간'),
+        ),
+        migrations.AddIndex(
+            model_name='exercisesession',
+            index=models.Index(condition=models.Q(('ended_at__isnull', True)), fields=['started_at'], name='session_open_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0004_session_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventType',
+            fields=[
+                ('code', models.SmallAutoField(primary_key=True, serialize=False, verbose_name='타입 코드')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='타입 이름')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '이벤트 타입',
+                'verbose_name_plural': '이벤트 타입 목록',
+                'db_table': 'exercise_event_types',
+            },
+        ),
+        migrations.AddField(
+            model_name='exercisesessionevent',
+            name='payload_bin',
+            field=models.BinaryField(blank=True, null=True, verbose_name='페이로드(바이너리)'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesessionevent',
+            name='event_type',
+            field=models.CharField(blank=True, max_length=50, null=True, verbose_name='이벤트 타입(legacy)'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesessionevent',
+            name='payload',
+            field=models.JSONField(blank=True, null=True, verbose_name='페이로드(legacy)'),
+        ),
+        migrations.AddField(
+            model_name='exercisesessionevent',
+            name='type',
+            field=models.ForeignKey(blank=True, db_column='event_type_code', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='exercises.eventtype', verbose_name='이벤트 타입 코드'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""
+기존 세션 이벤트 행을 압축 형식(타입 코드 + 바이너리 페이로드)으로 변환한다.
+
+이벤트 행은 마이그레이션 중인 DB 에서, 타입 사전(EventType)은 라우터가 정한 DB 에서 읽는다.
+큰 테이블에서 하나의 긴 트랜잭션을 잡지 않도록 비원자(atomic=False) 마이그레이션으로 두고,
+기본키 순서의 청크마다 별도 트랜잭션으로 커밋한다. 중단되면 다시 실행해 이어서 변환한다.
+"""
+from django.db import DEFAULT_DB_ALIAS, migrations, transaction
+
+from apps.exercises.events import decode_payload, encode_payload
+
+CHUNK_SIZE = 2000
+
+
+def _alias(schema_editor):
+    # 마이그레이션 밖에서 직접 호출하면(schema_editor=None) default DB 를 변환한다.
+    return schema_editor.connection.alias if schema_editor is not None else DEFAULT_DB_ALIAS
+
+
+def convert_events(apps, schema_editor):
+    EventType = apps.get_model('exercises', 'EventType')
+    ExerciseSessionEvent = apps.get_model('exercises', 'ExerciseSessionEvent')
+    using = _alias(schema_editor)
+    codes = dict(EventType.objects.values_list('name', 'code'))
+    legacy = ExerciseSessionEvent.objects.using(using).filter(type__isnull=True).order_by('pk')
+    last_pk = None
+    while True:
+        chunk = legacy.filter(pk__gt=last_pk) if last_pk else legacy
+        rows = list(chunk.only('pk', 'event_type', 'payload')[:CHUNK_SIZE])
+        if not rows:
+            break
+        with transaction.atomic(using=using):
+            for row in rows:
+                name = row.event_type or 'UNKNOWN'
+                if name not in codes:
+                    codes[name] = EventType.objects.get_or_create(name=name)[0].code
+                row.type_id = codes[name]
+                row.payload_bin = encode_payload(name, row.payload)
+                row.event_type = None
+                row.payload = None
+            ExerciseSessionEvent.objects.using(using).bulk_update(rows, ['type', 'payload_bin', 'event_type', 'payload'])
+        last_pk = rows[-1].pk
+
+
+def restore_events(apps, schema_editor):
+    EventType = apps.get_model('exercises', 'EventType')
+    ExerciseSessionEvent = apps.get_model('exercises', 'ExerciseSessionEvent')
+    using = _alias(schema_editor)
+    names = dict(EventType.objects.values_list('code', 'name'))
+    converted = ExerciseSessionEvent.objects.using(using).filter(type__isnull=False).order_by('pk')
+    while True:
+        rows = list(converted.only('pk', 'type', 'payload_bin')[:CHUNK_SIZE])
+        if not rows:
+            break
+        with transaction.atomic(using=using):
+            for row in rows:
+                row.event_type = names[row.type_id]
+                row.payload = decode_payload(row.payload_bin)
+                row.type_id = None
+                row.payload_bin = None
+            ExerciseSessionEvent.objects.using(using).bulk_update(rows, ['type', 'payload_bin', 'event_type', 'payload'])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('exercises', '0005_compact_session_events'),
+    ]
+
+    operations = [
+        # 이벤트 테이블이 있는 DB(샤딩 시 기록 샤드)에서만 실행한다. (apps.exercises.sharding)
+        migrations.RunPython(convert_events, restore_events, hints={'model_name': 'exercisesessionevent'}),
+    ]
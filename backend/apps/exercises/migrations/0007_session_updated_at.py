@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0006_convert_session_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisesession',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='수정일'),
+            preserve_default=False,
+        ),
+    ]
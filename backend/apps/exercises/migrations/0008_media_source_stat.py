@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0007_session_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisemedia',
+            name='bytes',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='크기(Bytes)'),
+        ),
+        migrations.AddField(
+            model_name='exercisemedia',
+            name='source_mtime_ns',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='원본 수정 시각(ns)'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0008_media_source_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('version', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='버전')),
+                ('checksum', models.CharField(max_length=64, verbose_name='파일 체크섬')),
+                ('summary', models.JSONField(default=dict, verbose_name='변경 요약')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '카탈로그 버전',
+                'verbose_name_plural': '카탈로그 버전 목록',
+                'db_table': 'exercise_catalog_versions',
+            },
+        ),
+        migrations.AddField(
+            model_name='exercise',
+            name='code',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True, verbose_name='운동 코드'),
+        ),
+    ]
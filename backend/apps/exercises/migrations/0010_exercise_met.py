@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0009_exercise_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='met',
+            field=models.FloatField(blank=True, null=True, verbose_name='MET'),
+        ),
+    ]
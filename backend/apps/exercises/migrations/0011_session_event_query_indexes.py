@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0010_exercise_met'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercisesessionevent',
+            index=models.Index(fields=['session', 'type', 'event_time_ms'], name='session_event_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exercisesessionevent',
+            index=models.Index(condition=models.Q(('type__isnull', True)), fields=['session', 'event_type', 'event_time_ms'], name='session_event_legacy_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0011_session_event_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisesession',
+            name='metrics_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='지표 계산 일시'),
+        ),
+        migrations.AddField(
+            model_name='exercisesessionitem',
+            name='active_ms',
+            field=models.IntegerField(blank=True, null=True, verbose_name='활성 시간(ms)'),
+        ),
+        migrations.AddField(
+            model_name='exercisesessionitem',
+            name='avg_playback_rate',
+            field=models.FloatField(blank=True, null=True, verbose_name='평균 배속'),
+        ),
+        migrations.AddField(
+            model_name='exercisesessionitem',
+            name='command_counts',
+            field=models.JSONField(blank=True, null=True, verbose_name='음성 명령별 횟수'),
+        ),
+        migrations.AddField(
+            model_name='exercisesessionitem',
+            name='paused_ms',
+            field=models.IntegerField(blank=True, null=True, verbose_name='일시정지 시간(ms)'),
+        ),
+        migrations.AddField(
+            model_name='exercisesessionitem',
+            name='seek_count',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='탐색 횟수'),
+        ),
+    ]
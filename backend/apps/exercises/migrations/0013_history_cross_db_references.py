@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0012_session_item_metrics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exercisesession',
+            name='playlist',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='exercises.playlist', verbose_name='플레이리스트'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesession',
+            name='template',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='exercises.routinetemplate', verbose_name='루틴 템플릿'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesession',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='exercise_sessions', to=settings.AUTH_USER_MODEL, verbose_name='사용자'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesessionevent',
+            name='type',
+            field=models.ForeignKey(blank=True, db_column='event_type_code', db_constraint=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='exercises.eventtype', verbose_name='이벤트 타입 코드'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesessionitem',
+            name='exercise',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='session_logs', to='exercises.exercise', verbose_name='운동'),
+        ),
+        migrations.AlterField(
+            model_name='exercisesessionitem',
+            name='playlist_item',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='exercises.playlistitem', verbose_name='플레이리스트 항목'),
+        ),
+    ]
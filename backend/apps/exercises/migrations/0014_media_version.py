@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0013_history_cross_db_references'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaVersion',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=32, verbose_name='토큰')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '미디어 버전',
+                'verbose_name_plural': '미디어 버전',
+                'db_table': 'exercise_media_version',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0014_media_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisecategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='수정일'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:23
+
+from django.conf import settings
+from django.db import migrations, models, router
+
+
+def archive_duplicate_forks(apps, schema_editor):
+    # 제약 추가 전에 같은 템플릿의 활성 복사본이 여러 개면 가장 먼저 만든 것만 활성으로 둔다.
+    Playlist = apps.get_model('exercises', 'Playlist')
+    using = schema_editor.connection.alias
+    if not router.allow_migrate_model(using, Playlist):
+        return
+    active = (
+        Playlist.objects.using(using)
+        .filter(status='ACTIVE', template__isnull=False)
+        .order_by('user_id', 'template_id', 'created_at', 'pk')
+        .values_list('pk', 'user_id', 'template_id')
+    )
+    seen = set()
+    duplicates = []
+    for pk, user_id, template_id in active.iterator():
+        if (user_id, template_id) in seen:
+            duplicates.append(pk)
+        seen.add((user_id, template_id))
+    if duplicates:
+        Playlist.objects.using(using).filter(pk__in=duplicates).update(status='ARCHIVED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0015_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(archive_duplicate_forks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='playlist',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'ACTIVE')), fields=('user', 'template'), name='playlist_active_fork_uniq'),
+        ),
+    ]
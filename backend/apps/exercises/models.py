@@ -6,8 +6,27 @@
 ERD 설계에 따라 모든 테이블은 UUID를 기본키로 사용한다.
 """
 import uuid
-from django.db import models
+from django.db import models, router, transaction
 from django.conf import settings
+from django.core.cache import cache
+
+from .sharding import HistoryQuerySet
+
+# 미디어 버전 토큰의 프로세스 캐시 키 (원본은 MediaVersion 행, apps.exercises.media 의 로케일 맵 재생성 기준)
+MEDIA_VERSION_CACHE_KEY = 'exercise-media:version'
+
+
+def bump_media_version():
+    """
+    미디어 버전 토큰을 갱신한다. save() 를 거치지 않는 일괄 변경 후에는 같은 트랜잭션 안에서 호출한다.
+
+    토큰은 DB(MediaVersion)에 저장하므로 다른 프로세스도 MEDIA_VERSION_TTL 이내에 새 토큰을 읽는다.
+    이 프로세스의 캐시는 바로 비우고, 그 사이 커밋 전의 토큰이 다시 캐시될 수 있으므로 커밋 후에 한 번 더 비운다.
+    """
+    using = router.db_for_write(MediaVersion)
+    MediaVersion.objects.using(using).update_or_create(pk=MediaVersion.SINGLETON_ID, defaults={'token': uuid.uuid4().hex})
+    cache.delete(MEDIA_VERSION_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(MEDIA_VERSION_CACHE_KEY), using=using)
 
 # -----------------------------------------------------------------------------
 # 1. 운동 기본 정보 (Master Data)
@@ -20,6 +39,8 @@ class ExerciseCategory(models.Model):
     category_id = models.CharField(max_length=50, primary_key=True, verbose_name="카테고리 ID")
     display_name = models.CharField(max_length=255, verbose_name="표시 이름")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+    # 운동 응답에 카테고리 이름이 포함되므로 운동 ETag 계산에 쓴다. (apps.exercises.views.ExerciseViewSet)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
 
     class Meta:
         db_table = 'exercise_category'
@@ -35,6 +56,8 @@ class Exercise(models.Model):
     개별 운동 종목 정보를 담는 모델.
     """
     exercise_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # 카탈로그 파일(apps.exercises.catalog)에서 운동을 식별하는 코드
+    code = models.CharField(max_length=50, unique=True, blank=True, null=True, verbose_name="운동 코드")
     category = models.ForeignKey(ExerciseCategory, on_delete=models.CASCADE, related_name='exercises', verbose_name="카테고리")
     exercise_name = models.CharField(max_length=255, verbose_name="운동명")
     exercise_description = models.TextField(blank=True, null=True, verbose_name="운동 설명")
@@ -47,6 +70,8 @@ class Exercise(models.Model):
     fixed_form = models.TextField(blank=True, null=True, verbose_name="고정 동작 설명")
     
     exercise_guide_text = models.TextField(blank=True, null=True, verbose_name="TTS 가이드 텍스트")
+    # 운동 강도 (칼로리 추정용, 없으면 카테고리/기본 MET 사용 - apps.exercises.reports)
+    met = models.FloatField(blank=True, null=True, verbose_name="MET")
     is_active = models.BooleanField(default=True, verbose_name="활성 여부")
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
@@ -69,6 +94,7 @@ class Exercise(models.Model):
 class ExerciseMedia(models.Model):
     """
     운동 관련 미디어 (픽토그램, 가이드 오디오 등) 정보를 담는 모델.
+    저장/삭제 시 미디어 버전 토큰을 갱신해 로케일 미디어 맵(apps.exercises.media)을 다시 만들게 한다.
     """
     MEDIA_TYPE_CHOICES = [
         ('PICTOGRAM', '픽토그램'),
@@ -85,6 +111,9 @@ class ExerciseMedia(models.Model):
     url = models.CharField(max_length=1024, blank=True, null=True, verbose_name="URL")
     duration_ms = models.IntegerField(blank=True, null=True, verbose_name="재생 시간(ms)")
     checksum = models.CharField(max_length=64, blank=True, null=True, verbose_name="체크섬")
+    # 원본 파일 크기/수정 시각 (ingest_media 가 바뀌지 않은 파일을 다시 해시하지 않기 위해 사용)
+    bytes = models.BigIntegerField(blank=True, null=True, verbose_name="크기(Bytes)")
+    source_mtime_ns = models.BigIntegerField(blank=True, null=True, verbose_name="원본 수정 시각(ns)")
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
 
@@ -96,11 +125,116 @@ class ExerciseMedia(models.Model):
             models.Index(fields=['exercise', 'media_type', 'locale']),
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_media_version()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_media_version()
+        return result
+
+
+class CatalogVersion(models.Model):
+    """
+    운동 카탈로그(카테고리, 운동, 미디어) 가져오기 이력.
+
+    카탈로그 가져오기(import_catalog)가 변경을 적용할 때마다 한 행이 추가되며,
+    가장 큰 version 이 현재 카탈로그 버전이다.
+    """
+    version = models.PositiveIntegerField(primary_key=True, verbose_name="버전")
+    checksum = models.CharField(max_length=64, verbose_name="파일 체크섬")
+    summary = models.JSONField(default=dict, verbose_name="변경 요약")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+
+    class Meta:
+        db_table = 'exercise_catalog_versions'
+        verbose_name = '카탈로그 버전'
+        verbose_name_plural = '카탈로그 버전 목록'
+
+    def __str__(self):
+        return f"catalog v{self.version}"
+
+
+class MediaVersion(models.Model):
+    """
+    미디어 버전 토큰. (한 행)
+
+    미디어가 바뀔 때마다 bump_media_version() 이 token 을 새로 만들고,
+    각 프로세스는 이 값을 기준으로 로케일 미디어 맵과 재생 계획 캐시를 다시 만든다.
+    """
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    token = models.CharField(max_length=32, verbose_name="토큰")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        db_table = 'exercise_media_version'
+        verbose_name = '미디어 버전'
+        verbose_name_plural = '미디어 버전'
+
+    def __str__(self):
+        return self.token
+
 
 # -----------------------------------------------------------------------------
 # 2. 플레이리스트 (Routine)
 # -----------------------------------------------------------------------------
 
+class RoutineTemplate(models.Model):
+    """
+    시스템 추천(커리큘럼) 루틴 템플릿. (BE_V1_SETUP_003)
+
+    모든 사용자가 공유하며 직접 조회한다. 사용자가 템플릿을 편집할 때만
+    사용자 소유 Playlist 로 복사(copy-on-write)된다.
+    항목이 바뀔 때마다 version 을 올려 캐시와 복사본의 기준 버전을 식별한다.
+    """
+    template_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    code = models.CharField(max_length=50, unique=True, verbose_name="템플릿 코드")
+    title = models.CharField(max_length=255, verbose_name="제목")
+    category = models.ForeignKey(ExerciseCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='routine_templates', verbose_name="카테고리")
+    version = models.IntegerField(default=1, verbose_name="버전")
+    is_active = models.BooleanField(default=True, verbose_name="활성 여부")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        db_table = 'routine_templates'
+        verbose_name = '루틴 템플릿'
+        verbose_name_plural = '루틴 템플릿 목록'
+        indexes = [
+            models.Index(fields=['is_active']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (v{self.version})"
+
+
+class RoutineTemplateItem(models.Model):
+    """
+    루틴 템플릿에 속한 운동 항목. PlaylistItem 과 같은 구성을 가진다.
+    """
+    template_item_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    template = models.ForeignKey(RoutineTemplate, on_delete=models.CASCADE, related_name='items', verbose_name="템플릿")
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='template_items', verbose_name="운동")
+
+    sequence_no = models.IntegerField(verbose_name="순서")
+    set_count = models.IntegerField(verbose_name="세트 수")
+    reps_count = models.IntegerField(blank=True, null=True, verbose_name="회수")
+    duration_sec = models.IntegerField(blank=True, null=True, verbose_name="수행 시간(초)")
+    rest_sec = models.IntegerField(default=10, verbose_name="휴식 시간(초)")
+    cue_overrides = models.JSONField(blank=True, null=True, verbose_name="큐 오버라이드")
+
+    class Meta:
+        db_table = 'routine_template_items'
+        verbose_name = '루틴 템플릿 항목'
+        verbose_name_plural = '루틴 템플릿 항목 목록'
+        ordering = ['sequence_no']
+        unique_together = [('template', 'sequence_no')]
+
+
 class Playlist(models.Model):
     """
     사용자의 운동 플레이리스트(루틴)를 정의하는 모델.
@@ -120,6 +254,8 @@ class Playlist(models.Model):
     mode = models.CharField(max_length=20, choices=MODE_CHOICES, verbose_name="모드")
     title = models.CharField(max_length=255, verbose_name="제목")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE', verbose_name="상태")
+    template = models.ForeignKey(RoutineTemplate, on_delete=models.SET_NULL, null=True, blank=True, related_name='forks', verbose_name="원본 템플릿")
+    template_version = models.IntegerField(blank=True, null=True, verbose_name="원본 템플릿 버전")
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
@@ -131,6 +267,12 @@ class Playlist(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
         ]
+        constraints = [
+            # 사용자당 템플릿의 활성 복사본은 하나다. (동시에 처음 편집해도 하나만 생성)
+            models.UniqueConstraint(
+                fields=['user', 'template'], condition=models.Q(status='ACTIVE'), name='playlist_active_fork_uniq'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.user.username})"
@@ -183,8 +325,11 @@ class ExerciseSession(models.Model):
     ]
 
     session_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='exercise_sessions', verbose_name="사용자")
-    playlist = models.ForeignKey(Playlist, on_delete=models.SET_NULL, null=True, blank=True, related_name='sessions', verbose_name="플레이리스트")
+    # 운동 기록은 사용자별 샤드 DB 에 저장될 수 있으므로 default DB 모델 참조에는 FK 제약을 두지 않는다. (apps.exercises.sharding)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_constraint=False, related_name='exercise_sessions', verbose_name="사용자")
+    playlist = models.ForeignKey(Playlist, on_delete=models.SET_NULL, db_constraint=False, null=True, blank=True, related_name='sessions', verbose_name="플레이리스트")
+    template = models.ForeignKey(RoutineTemplate, on_delete=models.SET_NULL, db_constraint=False, null=True, blank=True, related_name='sessions', verbose_name="루틴 템플릿")
+    template_version = models.IntegerField(blank=True, null=True, verbose_name="루틴 템플릿 버전")
     mode = models.CharField(max_length=20, choices=MODE_CHOICES, verbose_name="모드")
     
     started_at = models.DateTimeField(verbose_name="시작 시간")
@@ -193,8 +338,15 @@ class ExerciseSession(models.Model):
     is_valid = models.BooleanField(default=True, verbose_name="유효 여부")
     abnormal_end_reason = models.CharField(max_length=20, choices=ABNORMAL_END_REASON_CHOICES, blank=True, null=True, verbose_name="비정상 종료 사유")
     device_id_hash = models.CharField(max_length=64, blank=True, null=True, verbose_name="디바이스 해시")
+    last_heartbeat_at = models.DateTimeField(blank=True, null=True, verbose_name="최근 핑 시간")
+    # 항목별 파생 지표 계산 일시 (apps.exercises.timeline, 종료 시 한 번 계산)
+    metrics_at = models.DateTimeField(blank=True, null=True, verbose_name="지표 계산 일시")
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    # 생성은 사용자의 기록 DB 에 저장한다. (apps.exercises.sharding)
+    objects = HistoryQuerySet.as_manager()
 
     class Meta:
         db_table = 'exercise_sessions'
@@ -202,6 +354,8 @@ class ExerciseSession(models.Model):
         verbose_name_plural = '운동 세션 목록'
         indexes = [
             models.Index(fields=['user', 'started_at']),
+            # 종료되지 않은 세션만 담는 부분 인덱스 (비정상 종료 세션 정리용)
+            models.Index(fields=['started_at'], name='session_open_idx', condition=models.Q(ended_at__isnull=True)),
         ]
 
     def __str__(self):
@@ -220,8 +374,8 @@ class ExerciseSessionItem(models.Model):
 
     session_item_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     session = models.ForeignKey(ExerciseSession, on_delete=models.CASCADE, related_name='items', verbose_name="세션")
-    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='session_logs', verbose_name="운동")
-    playlist_item = models.ForeignKey(PlaylistItem, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="플레이리스트 항목")
+    exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, db_constraint=False, related_name='session_logs', verbose_name="운동")
+    playlist_item = models.ForeignKey(PlaylistItem, on_delete=models.SET_NULL, db_constraint=False, null=True, blank=True, verbose_name="플레이리스트 항목")
     
     sequence_no = models.IntegerField(verbose_name="순서")
     started_at = models.DateTimeField(blank=True, null=True, verbose_name="시작 시간")
@@ -232,6 +386,16 @@ class ExerciseSessionItem(models.Model):
     skip_reason = models.CharField(max_length=20, choices=SKIP_REASON_CHOICES, blank=True, null=True, verbose_name="스킵 사유")
     rest_sec = models.IntegerField(default=10, verbose_name="휴식 시간(초)")
 
+    # 세션 종료 시 이벤트에서 계산한 파생 지표 (apps.exercises.timeline)
+    active_ms = models.IntegerField(blank=True, null=True, verbose_name="활성 시간(ms)")
+    paused_ms = models.IntegerField(blank=True, null=True, verbose_name="일시정지 시간(ms)")
+    avg_playback_rate = models.FloatField(blank=True, null=True, verbose_name="평균 배속")
+    seek_count = models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="탐색 횟수")
+    command_counts = models.JSONField(blank=True, null=True, verbose_name="음성 명령별 횟수")
+
+    # 생성은 세션/사용자의 기록 DB 에 저장한다. (apps.exercises.sharding)
+    objects = HistoryQuerySet.as_manager()
+
     class Meta:
         db_table = 'exercise_session_items'
         verbose_name = '세션 운동 항목'
@@ -241,26 +405,59 @@ class ExerciseSessionItem(models.Model):
         ]
 
 
+class EventType(models.Model):
+    """
+    세션 이벤트 타입 사전. 이벤트 행에는 타입 이름 대신 작은 정수 코드를 저장한다.
+    """
+    code = models.SmallAutoField(primary_key=True, verbose_name="타입 코드")
+    name = models.CharField(max_length=50, unique=True, verbose_name="타입 이름")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
+
+    class Meta:
+        db_table = 'exercise_event_types'
+        verbose_name = '이벤트 타입'
+        verbose_name_plural = '이벤트 타입 목록'
+
+    def __str__(self):
+        return self.name
+
+
 class ExerciseSessionEvent(models.Model):
     """
     세션 진행 중 발생한 상세 이벤트 로그 (재생, 일시정지, VUI 명령 등).
+
+    타입은 EventType 코드(type), 페이로드는 바이너리 코덱(payload_bin)으로 저장한다.
+    event_type / payload 컬럼은 변환 전 행(legacy)에만 값이 있으며,
+    읽을 때는 apps.exercises.events.decode_event 로 두 형식을 구분 없이 읽는다.
     """
     event_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     session = models.ForeignKey(ExerciseSession, on_delete=models.CASCADE, related_name='events', verbose_name="세션")
     session_item = models.ForeignKey(ExerciseSessionItem, on_delete=models.CASCADE, null=True, blank=True, related_name='events', verbose_name="세션 항목")
     
     event_time_ms = models.BigIntegerField(verbose_name="이벤트 발생 시간(세션 시작 후 ms)")
-    event_type = models.CharField(max_length=50, verbose_name="이벤트 타입")
-    payload = models.JSONField(blank=True, null=True, verbose_name="페이로드")
+    type = models.ForeignKey(EventType, on_delete=models.PROTECT, db_constraint=False, null=True, blank=True, db_column='event_type_code', related_name='+', verbose_name="이벤트 타입 코드")
+    payload_bin = models.BinaryField(blank=True, null=True, verbose_name="페이로드(바이너리)")
+    event_type = models.CharField(max_length=50, blank=True, null=True, verbose_name="이벤트 타입(legacy)")
+    payload = models.JSONField(blank=True, null=True, verbose_name="페이로드(legacy)")
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
 
+    # 생성은 세션/사용자의 기록 DB 에 저장한다. (apps.exercises.sharding)
+    objects = HistoryQuerySet.as_manager()
+
     class Meta:
         db_table = 'exercise_session_events'
         verbose_name = '세션 이벤트'
         verbose_name_plural = '세션 이벤트 목록'
         indexes = [
             models.Index(fields=['session', 'event_time_ms']),
+            # 타입 필터 조회용 (apps.exercises.event_query)
+            models.Index(fields=['session', 'type', 'event_time_ms'], name='session_event_type_idx'),
+            # 변환 전(legacy) 행만 담는 부분 인덱스. 타입 이름으로 걸러 조회한다.
+            models.Index(
+                fields=['session', 'event_type', 'event_time_ms'], name='session_event_legacy_idx',
+                condition=models.Q(type__isnull=True)
+            ),
         ]
 
 
@@ -290,6 +487,9 @@ class ExerciseLogObject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
     uploaded_at = models.DateTimeField(blank=True, null=True, verbose_name="업로드 일시")
 
+    # 생성은 세션/사용자의 기록 DB 에 저장한다. (apps.exercises.sharding)
+    objects = HistoryQuerySet.as_manager()
+
     class Meta:
         db_table = 'exercise_log_objects'
         verbose_name = '운동 로그 객체'
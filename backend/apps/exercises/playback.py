@@ -0,0 +1,185 @@
+"""
+루틴 재생 계획(Playback Plan) 컴파일 모듈. (BE_V1_EXERCISE_005)
+
+Transition Manager 가 필요로 하는 전체 재생 대기열(운동 순서, 세트/횟수, 수행 시간,
+휴식과 "다음 동작은 …" 안내, 예상 총 소요 시간)을 서버에서 한 번에 계산한다.
+계획은 세그먼트(EXERCISE/REST)의 평면 목록이며 각 세그먼트는 루틴 시작 기준
+절대 오프셋(초)을 가진다. 운동 정보와 미디어는 exercises 에 한 번만 담고
+세그먼트는 exercise_id 로 참조한다.
+
+미디어는 요청 로케일에 맞춰 로케일 미디어 맵(apps.exercises.media)에서 고른다.
+컴파일 결과는 (루틴 ID, 버전, 로케일, 미디어 버전, 카탈로그 버전) 단위로 프로세스 내 LRU 캐시에 보관한다.
+루틴 버전은 Playlist.updated_at(항목 변경 시 갱신), 템플릿은 RoutineTemplate.version 이다.
+카탈로그 버전은 운동의 최종 수정 일시(MAX(updated_at))이므로 다른 프로세스에서 운동 이름/가이드를
+수정해도 다음 조회부터 다시 컴파일한다.
+
+Functions:
+    estimate_exercise_seconds: 한 세트의 예상 수행 시간
+    compile_plan: 항목 목록을 재생 계획으로 변환
+    get_playlist_plan: 루틴 재생 계획 (캐시)
+    get_template_plan: 템플릿 재생 계획 (캐시)
+"""
+from django.db.models import Max
+
+from apps.core.lru import LRUCache
+
+from .media import fallback_chain, get_media_map
+from .models import Exercise, PlaylistItem, RoutineTemplateItem
+
+SECONDS_PER_REP = 3
+DEFAULT_EXERCISE_SECONDS = 30
+PLAN_CACHE_SIZE = 1024
+
+_plans = LRUCache(maxsize=PLAN_CACHE_SIZE)
+
+
+def _media_by_type(exercise, media_map, locales):
+    return {
+        media['media_type']: {'url': media['url'], 's3_key': media['s3_key'], 'duration_ms': media['duration_ms']}
+        for media in media_map.media_for(exercise.exercise_id, locales)
+    }
+
+
+def estimate_exercise_seconds(item, media):
+    """
+    한 세트의 예상 수행 시간(초)을 계산한다.
+
+    duration_sec 이 지정되면 그대로, 횟수 기반이면 횟수 × SECONDS_PER_REP,
+    둘 다 없으면 가이드 오디오 길이, 그마저 없으면 DEFAULT_EXERCISE_SECONDS 를 사용한다.
+    """
+    if item.duration_sec:
+        return item.duration_sec
+    if item.reps_count:
+        return item.reps_count * SECONDS_PER_REP
+    audio = media.get('GUIDE_AUDIO')
+    if audio and audio['duration_ms']:
+        return -(-audio['duration_ms'] // 1000)
+    return DEFAULT_EXERCISE_SECONDS
+
+
+def compile_plan(items, locales=None, media_map=None):
+    """
+    순서대로 정렬된 루틴 항목을 재생 계획으로 변환한다.
+
+    Args:
+        items (list): PlaylistItem 또는 RoutineTemplateItem 목록 (exercise 로드됨)
+        locales (tuple): 미디어 로케일 폴백 순서 (기본값 MEDIA_DEFAULT_LOCALE)
+        media_map (LocaleMediaMap): 사용할 미디어 맵 (기본값 현재 버전)
+
+    Returns:
+        dict: exercises(운동 정보/미디어), segments(세그먼트 목록), total_duration_sec
+    """
+    locales = locales or fallback_chain([])
+    media_map = media_map or get_media_map()
+    exercises = {}
+    segments = []
+    offset = 0
+    for index, item in enumerate(items):
+        exercise = item.exercise
+        key = str(exercise.exercise_id)
+        if key not in exercises:
+            exercises[key] = {
+                'exercise_name': exercise.exercise_name,
+                'guide_text': exercise.exercise_guide_text,
+                'media': _media_by_type(exercise, media_map, locales),
+            }
+        seconds = estimate_exercise_seconds(item, exercises[key]['media'])
+        next_item = items[index + 1] if index + 1 < len(items) else None
+
+        for set_no in range(1, item.set_count + 1):
+            segment = {
+                'type': 'EXERCISE',
+                'offset_sec': offset,
+                'duration_sec': seconds,
+                'exercise_id': key,
+                'item_index': index,
+                'set_no': set_no,
+                'set_count': item.set_count,
+            }
+            if item.reps_count:
+                segment['reps_count'] = item.reps_count
+            if item.cue_overrides:
+                segment['cue_overrides'] = item.cue_overrides
+            segments.append(segment)
+            offset += seconds
+
+            last_set = set_no == item.set_count
+            if (last_set and next_item is None) or not item.rest_sec:
+                continue
+            if last_set:
+                announcement = f"수고하셨습니다. 다음 동작은 {next_item.exercise.exercise_name}입니다. 준비하세요."
+            else:
+                announcement = f"잠시 쉬겠습니다. 다음은 {set_no + 1}세트입니다."
+            segments.append({
+                'type': 'REST',
+                'offset_sec': offset,
+                'duration_sec': item.rest_sec,
+                'announcement': announcement,
+            })
+            offset += item.rest_sec
+
+    return {
+        'exercises': exercises,
+        'segments': segments,
+        'total_duration_sec': offset,
+    }
+
+
+def catalog_version():
+    """운동 카탈로그 버전 (운동의 최종 수정 일시, 운동이 없으면 None)."""
+    return Exercise.objects.aggregate(version=Max('updated_at'))['version']
+
+
+def _cached(key, build):
+    key = (*key, catalog_version())
+    plan = _plans.get(key)
+    if plan is None:
+        plan = build()
+        _plans.set(key, plan)
+    return plan
+
+
+def get_playlist_plan(playlist, locales=None):
+    """
+    루틴의 재생 계획을 반환한다. 같은 버전(updated_at)과 로케일의 계획은 캐시에서 제공한다.
+    """
+    version = playlist.updated_at.isoformat()
+    media_map = get_media_map()
+    locales = media_map.effective(locales or fallback_chain([]))
+
+    def build():
+        items = list(
+            PlaylistItem.objects.filter(playlist=playlist)
+            .select_related('exercise')
+            .order_by('sequence_no')
+        )
+        plan = compile_plan(items, locales, media_map)
+        plan.update({'playlist_id': str(playlist.playlist_id), 'title': playlist.title, 'version': version})
+        return plan
+
+    return _cached(('playlist', playlist.playlist_id, version, locales, media_map.version), build)
+
+
+def get_template_plan(template, locales=None):
+    """
+    루틴 템플릿의 재생 계획을 반환한다. 같은 버전과 로케일의 계획은 캐시에서 제공한다.
+    """
+    media_map = get_media_map()
+    locales = media_map.effective(locales or fallback_chain([]))
+
+    def build():
+        items = list(
+            RoutineTemplateItem.objects.filter(template=template)
+            .select_related('exercise')
+            .order_by('sequence_no')
+        )
+        plan = compile_plan(items, locales, media_map)
+        plan.update({'template_id': str(template.template_id), 'title': template.title, 'version': template.version})
+        return plan
+
+    return _cached(('template', template.template_id, template.version, locales, media_map.version), build)
+
+
+def clear_cache():
+    """재생 계획 캐시를 비운다."""
+    _plans.clear()
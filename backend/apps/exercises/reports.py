@@ -0,0 +1,151 @@
+"""
+운동 리포트(칼로리/운동량 추정) 모듈. (BE_V1_LOG_002, BE_V1_USER_003)
+
+스킵하지 않은 세션 항목의 수행 시간과 운동 강도(MET)로 소모 칼로리를 추정하고
+세션, 날짜, 카테고리별로 합산한다.
+
+    kcal = MET × 3.5 × 체중(kg) / 200 × 수행 시간(분)    (ACSM 산식)
+
+운동의 MET 은 Exercise.met → EXERCISE_CATEGORY_MET[카테고리] → EXERCISE_DEFAULT_MET 순으로 정한다.
+항목 행은 한 번의 쿼리로 열(column) 단위로 읽고, 계산과 그룹 합산은 NumPy 배열 연산
+(np.unique + np.bincount)으로 처리하므로 1년치 항목도 행 단위 파이썬 루프 없이 집계한다.
+항목은 사용자의 기록 DB 에서, 운동의 카테고리/MET 은 default DB 의 카탈로그에서 따로 읽는다. (apps.exercises.sharding)
+
+Functions:
+    met_values: 항목별 MET 배열
+    estimate: 기간 리포트 계산
+    tts_summary: 리포트 음성 안내 문구
+"""
+import numpy as np
+from django.conf import settings
+from django.db.models.functions import TruncDate
+
+from .models import Exercise, ExerciseSessionItem
+from .sharding import shard_for_user
+
+DEFAULT_WEIGHT_KG = 65
+ITEM_COLUMNS = ('session_id', 'exercise_id', 'duration_ms', 'day')
+
+
+def met_values(category_ids, mets):
+    """
+    항목별 MET 배열. 운동의 MET 이 없으면 카테고리 MET, 그것도 없으면 기본 MET 을 쓴다.
+
+    Args:
+        category_ids (np.ndarray): 항목별 카테고리 ID (object)
+        mets (np.ndarray): 항목별 Exercise.met (float, 없으면 nan)
+
+    Returns:
+        np.ndarray: 항목별 MET (float)
+    """
+    default = float(getattr(settings, 'EXERCISE_DEFAULT_MET', 3.5))
+    table = getattr(settings, 'EXERCISE_CATEGORY_MET', {})
+    categories, inverse = np.unique(category_ids.astype(str), return_inverse=True)
+    category_mets = np.array([float(table.get(category, default)) for category in categories], dtype=float)
+    return np.where(np.isnan(mets), category_mets[inverse], mets)
+
+
+def _group(keys, *columns):
+    """
+    keys 별로 columns 를 합산한다.
+
+    Returns:
+        tuple: (정렬된 키 배열, 키별 개수, 열별 합계 배열...)
+    """
+    labels, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(labels))
+    return (labels, counts, *(np.bincount(inverse, weights=column, minlength=len(labels)) for column in columns))
+
+
+def _load(user, start=None, end=None):
+    """기간 내 유효 세션의 스킵하지 않은 항목을 열 단위 배열로 읽는다."""
+    queryset = ExerciseSessionItem.objects.using(shard_for_user(user.pk)).filter(session__user=user, session__is_valid=True, is_skipped=False)
+    if start is not None:
+        queryset = queryset.filter(session__started_at__gte=start)
+    if end is not None:
+        queryset = queryset.filter(session__started_at__lt=end)
+    rows = queryset.annotate(day=TruncDate('session__started_at')).values_list(*ITEM_COLUMNS)
+    columns = list(zip(*rows)) or [()] * len(ITEM_COLUMNS)
+    session_ids, exercise_ids, durations, days = columns
+
+    # 운동별 (카테고리, MET) 을 한 번 읽어 항목 배열로 펼친다.
+    exercises, inverse = np.unique(np.array([str(pk) for pk in exercise_ids], dtype=object), return_inverse=True)
+    catalog = {
+        str(pk): (category_id, met)
+        for pk, category_id, met in Exercise.objects.filter(pk__in=list(exercises)).values_list('pk', 'category_id', 'met')
+    }
+    exercise_rows = [catalog.get(pk, (None, None)) for pk in exercises]
+    return (
+        np.array([str(session_id) for session_id in session_ids], dtype=object),
+        np.array([row[0] for row in exercise_rows], dtype=object)[inverse],
+        np.array([row[1] for row in exercise_rows], dtype=float)[inverse],
+        np.array(durations, dtype=float),
+        np.array([day.isoformat() for day in days], dtype=object),
+    )
+
+
+def estimate(user, start=None, end=None):
+    """
+    사용자의 기간 운동 리포트를 계산한다.
+
+    Args:
+        user: 대상 사용자 (weight_kg 사용, 없으면 DEFAULT_WEIGHT_KG)
+        start (datetime): 이 시각 이후 시작한 세션만 (포함)
+        end (datetime): 이 시각 이전 시작한 세션만 (제외)
+
+    Returns:
+        dict: weight_kg, total, by_day, by_category, by_session
+            (각 항목은 items, duration_ms, calories, met_minutes 포함)
+    """
+    weight = user.weight_kg or DEFAULT_WEIGHT_KG
+    session_ids, category_ids, mets, durations, days = _load(user, start, end)
+
+    # 수행 시간이 없는 항목은 0 으로 본다.
+    minutes = np.clip(np.nan_to_num(durations), 0, None) / 60000
+    met_minutes = met_values(category_ids, mets) * minutes
+    calories = met_minutes * 3.5 * weight / 200
+
+    def rows(key, labels, counts, duration_ms, kcal, effort, **extra):
+        return [
+            {
+                key: label, **{name: values[index] for name, values in extra.items()},
+                'items': int(counts[index]),
+                'duration_ms': int(round(duration_ms[index])),
+                'calories': round(float(kcal[index]), 1),
+                'met_minutes': round(float(effort[index]), 1),
+            }
+            for index, label in enumerate(labels)
+        ]
+
+    sessions = _group(session_ids, minutes * 60000, calories, met_minutes)
+    # 세션의 날짜는 세션 시작일이므로 세션 첫 항목의 날짜를 쓴다.
+    _, first = np.unique(session_ids, return_index=True)
+    session_days = days[first]
+    by_day = _group(days, minutes * 60000, calories, met_minutes)
+    sessions_per_day = np.bincount(np.searchsorted(by_day[0], session_days), minlength=len(by_day[0]))
+
+    return {
+        'weight_kg': weight,
+        'total': {
+            'sessions': len(sessions[0]),
+            'items': len(session_ids),
+            'duration_ms': int(round(minutes.sum() * 60000)),
+            'calories': round(float(calories.sum()), 1),
+            'met_minutes': round(float(met_minutes.sum()), 1),
+        },
+        'by_day': rows('date', *by_day, sessions=[int(count) for count in sessions_per_day]),
+        'by_category': rows('category_id', *_group(category_ids.astype(str), minutes * 60000, calories, met_minutes)),
+        'by_session': rows('session_id', *sessions, date=list(session_days)),
+    }
+
+
+def tts_summary(report):
+    """리포트 합계를 음성 안내 문구로 만든다."""
+    total = report['total']
+    if not total['sessions']:
+        return "이 기간에는 운동 기록이 없습니다."
+    minutes = round(total['duration_ms'] / 60000)
+    return (
+        f"{len(report['by_day'])}일 동안 {total['sessions']}번 운동했습니다. "
+        f"총 {minutes}분 운동하며 약 {round(total['calories'])}킬로칼로리를 소모했습니다."
+    )
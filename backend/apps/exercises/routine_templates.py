@@ -0,0 +1,210 @@
+"""
+시스템 추천(커리큘럼) 루틴 템플릿 모듈. (BE_V1_SETUP_003)
+
+커리큘럼 루틴은 사용자마다 Playlist/PlaylistItem 으로 복사하지 않고, 공유 템플릿
+(RoutineTemplate)을 모든 사용자가 직접 읽는다. 사용자가 템플릿을 편집할 때만
+사용자 소유 Playlist 로 복사(copy-on-write)한다.
+
+직렬화된 템플릿은 프로세스 전역 캐시에 (template_id, 로케일) 단위로 버전과 함께 보관한다.
+조회 시 활성 템플릿의 (ID, 버전) 목록만 가볍게 확인하고, 버전이 바뀐 템플릿만 다시 읽는다.
+
+Functions:
+    get_template_payloads: 활성 템플릿 목록의 직렬화 데이터 (캐시)
+    get_template_payload: 단일 템플릿의 직렬화 데이터 (캐시)
+    bump_version: 템플릿 항목 변경 후 버전 증가
+    fork_template: 템플릿을 사용자 소유 Playlist 로 복사
+    customize_template: 복사(필요 시)와 항목 변경을 한 트랜잭션으로 적용
+"""
+import threading
+import uuid
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .media import fallback_chain, get_media_map
+from .models import RoutineTemplate, Playlist, PlaylistItem
+from .routines import apply_item_diff, cache_items, gapped_sequence
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+COPIED_FIELDS = ('set_count', 'reps_count', 'duration_sec', 'rest_sec', 'cue_overrides')
+
+
+def _load(template_ids, locales, media_map):
+    from .serializers import RoutineTemplateSerializer
+
+    templates = (
+        RoutineTemplate.objects.filter(template_id__in=template_ids)
+        .select_related('category')
+        .prefetch_related('items__exercise__category')
+    )
+    context = {'locales': locales, 'media_map': media_map}
+    loaded = {}
+    for template in templates:
+        data = dict(RoutineTemplateSerializer(template, context=context).data)
+        loaded[(template.template_id, locales)] = ((template.version, media_map.version), data)
+    with _cache_lock:
+        _cache.update(loaded)
+    return loaded
+
+
+def _resolve(versions, locales=None):
+    """
+    {template_id: version} 에 맞는 캐시 데이터를 반환하고, 없거나 낡은 항목만 다시 읽는다.
+
+    미디어는 로케일별로 다르므로 캐시 키는 (template_id, 로케일 폴백 순서)이고,
+    템플릿 버전과 미디어 버전이 모두 같아야 캐시를 사용한다.
+    """
+    media_map = get_media_map()
+    locales = media_map.effective(locales or fallback_chain([]))
+    cached = dict(_cache)
+    stale = [
+        pk for pk, version in versions.items()
+        if cached.get((pk, locales), (None,))[0] != (version, media_map.version)
+    ]
+    if stale:
+        cached.update(_load(stale, locales, media_map))
+    return {pk: cached[(pk, locales)][1] for pk in versions if (pk, locales) in cached}
+
+
+def get_template_payloads(locales=None):
+    """
+    활성 템플릿 목록의 직렬화 데이터를 반환한다.
+
+    Args:
+        locales (tuple): 미디어 로케일 폴백 순서 (apps.exercises.media.request_locales)
+
+    Returns:
+        list: 템플릿 직렬화 데이터 목록 (제목 순)
+    """
+    versions = dict(
+        RoutineTemplate.objects.filter(is_active=True).order_by('title').values_list('template_id', 'version')
+    )
+    payloads = _resolve(versions, locales)
+    return [payloads[pk] for pk in versions if pk in payloads]
+
+
+def get_template_payload(template_id, locales=None):
+    """
+    단일 활성 템플릿의 직렬화 데이터를 반환한다. 없으면 None.
+    """
+    try:
+        template_id = uuid.UUID(str(template_id))
+    except ValueError:
+        return None
+    version = (
+        RoutineTemplate.objects.filter(template_id=template_id, is_active=True)
+        .values_list('version', flat=True).first()
+    )
+    if version is None:
+        return None
+    return _resolve({template_id: version}, locales).get(template_id)
+
+
+def clear_cache():
+    """프로세스 전역 템플릿 캐시를 비운다."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def bump_version(template):
+    """
+    템플릿 항목을 변경한 뒤 호출해 버전을 올린다. 캐시는 다음 조회 시 갱신된다.
+    """
+    RoutineTemplate.objects.filter(pk=template.pk).update(version=F('version') + 1)
+    template.refresh_from_db(fields=['version', 'updated_at'])
+
+
+def fork_template(template, user):
+    """
+    템플릿을 사용자 소유 Playlist 로 복사한다. 이미 복사한 활성 루틴이 있으면 그것을 반환한다.
+
+    Args:
+        template (RoutineTemplate): 원본 템플릿
+        user (User): 루틴 소유자
+
+    Returns:
+        tuple: (Playlist, 새로 생성 여부)
+    """
+    playlist, forked = _fork(template, user)
+    return playlist, forked is not None
+
+
+def _active_fork(template, user):
+    """사용자가 템플릿에서 복사한 활성 루틴 (없으면 None)."""
+    return Playlist.objects.filter(user=user, template=template, status='ACTIVE').first()
+
+
+def _fork(template, user):
+    """
+    fork_template 의 본체.
+
+    Returns:
+        tuple: (Playlist, {template_item_id: playlist_item_id} 또는 None(기존 루틴))
+    """
+    existing = _active_fork(template, user)
+    if existing is not None:
+        return existing, None
+
+    template_items = list(template.items.select_related('exercise__category'))
+    try:
+        with transaction.atomic():
+            playlist = Playlist.objects.create(
+                user=user, mode='CURRICULUM', title=template.title,
+                template=template, template_version=template.version
+            )
+            items = [
+                PlaylistItem(
+                    playlist=playlist,
+                    exercise=source.exercise,
+                    sequence_no=gapped_sequence(index),
+                    **{field: getattr(source, field) for field in COPIED_FIELDS}
+                )
+                for index, source in enumerate(template_items)
+            ]
+            PlaylistItem.objects.bulk_create(items)
+    except IntegrityError:
+        # 동시에 처음 편집한 다른 요청이 먼저 복사했다. (playlist_active_fork_uniq)
+        return _active_fork(template, user), None
+    cache_items(playlist, items)
+    return playlist, {source.pk: item.pk for source, item in zip(template_items, items)}
+
+
+def _translate_diff(diff, item_ids):
+    """diff 의 항목 ID 중 템플릿 항목 ID 를 복사된 루틴 항목 ID 로 바꾼다."""
+    def translate(pk):
+        return item_ids.get(pk, pk)
+
+    return {
+        **diff,
+        'delete': [translate(pk) for pk in diff.get('delete', [])],
+        'update': [{**entry, 'playlist_item_id': translate(entry['playlist_item_id'])} for entry in diff.get('update', [])],
+        'move': [{**entry, 'playlist_item_id': translate(entry['playlist_item_id'])} for entry in diff.get('move', [])],
+    }
+
+
+def customize_template(template, user, diff):
+    """
+    템플릿을 편집한다. 처음 편집할 때 사용자 소유 루틴으로 복사하고 항목 변경(diff)을 적용한다.
+
+    복사와 변경은 한 트랜잭션이므로 변경이 거부되면 복사한 루틴도 남지 않는다.
+    처음 복사할 때는 클라이언트가 복사본의 항목 ID 를 알 수 없으므로, diff 의 playlist_item_id 자리에
+    템플릿 항목 ID(template_item_id)를 쓰면 복사된 항목으로 바꿔 적용한다.
+
+    Args:
+        template (RoutineTemplate): 원본 템플릿
+        user (User): 루틴 소유자
+        diff (dict): PlaylistItemDiffSerializer 로 검증된 delete / update / move / insert 목록
+
+    Returns:
+        tuple: (Playlist, 새로 생성 여부)
+
+    Raises:
+        serializers.ValidationError: 루틴에 없는 항목을 참조한 경우
+    """
+    with transaction.atomic():
+        playlist, forked = _fork(template, user)
+        if any(diff.values()):
+            apply_item_diff(playlist, _translate_diff(diff, forked or {}))
+    return playlist, forked is not None
@@ -0,0 +1,188 @@
+"""
+루틴(Playlist) 항목 편집 모듈.
+
+PlaylistItem 은 (playlist, sequence_no) 가 유일하므로, 연속 번호를 쓰면 항목 하나를
+맨 앞으로 옮길 때 모든 행의 번호를 다시 매겨야 한다. 이 모듈은 SEQUENCE_GAP 간격의
+희소 번호를 사용해 대부분의 이동/삽입이 해당 행 하나만 갱신하도록 하고,
+이웃 사이에 남은 번호가 없을 때만 전체 번호를 재배치(rebalance)한다.
+
+Functions:
+    gapped_sequence: n 번째 항목의 기본 순서 번호
+    apply_item_diff: 삽입/이동/삭제/수정 묶음을 한 트랜잭션으로 적용
+"""
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import Exercise, Playlist, PlaylistItem
+
+SEQUENCE_GAP = 1024
+EDITABLE_FIELDS = ('set_count', 'reps_count', 'duration_sec', 'rest_sec', 'cue_overrides')
+
+
+def gapped_sequence(index):
+    """0부터 시작하는 위치의 기본 순서 번호를 반환한다."""
+    return (index + 1) * SEQUENCE_GAP
+
+
+def cache_items(playlist, items):
+    """
+    정렬된 항목 목록을 playlist.items 의 prefetch 캐시로 설정한다.
+    응답 직렬화 시 항목을 다시 조회하지 않기 위해 사용한다.
+    """
+    queryset = playlist.items.all()
+    queryset._result_cache = list(items)
+    queryset._prefetch_done = True
+    playlist._prefetched_objects_cache = {'items': queryset}
+
+
+def load_exercises(exercise_ids):
+    """
+    운동 ID 목록을 한 번의 IN 쿼리로 조회해 {exercise_id: Exercise} 로 반환한다.
+
+    Raises:
+        serializers.ValidationError: 존재하지 않거나 비활성화된 운동이 포함된 경우
+    """
+    wanted = set(exercise_ids)
+    if not wanted:
+        return {}
+    exercises = {
+        exercise.exercise_id: exercise
+        for exercise in Exercise.objects.filter(exercise_id__in=wanted, is_active=True)
+        .select_related('category')
+    }
+    missing = wanted - exercises.keys()
+    if missing:
+        raise serializers.ValidationError({'exercise_id': [f'존재하지 않는 운동입니다: {pk}' for pk in sorted(map(str, missing))]})
+    return exercises
+
+
+def _assign_sequences(ordered, dirty):
+    """
+    dirty 항목에만 이웃 사이의 빈 번호를 배정한다.
+
+    Returns:
+        bool: 빈 번호가 부족해 전체 재배치를 한 경우 True
+    """
+    index = 0
+    while index < len(ordered):
+        if ordered[index] not in dirty:
+            index += 1
+            continue
+        start = index
+        while index < len(ordered) and ordered[index] in dirty:
+            index += 1
+        low = ordered[start - 1].sequence_no if start > 0 else 0
+        count = index - start
+        if index < len(ordered):
+            high = ordered[index].sequence_no
+            step = (high - low) // (count + 1)
+            if step < 1:
+                for position, item in enumerate(ordered):
+                    item.sequence_no = gapped_sequence(position)
+                return True
+        else:
+            step = SEQUENCE_GAP
+        for offset in range(count):
+            ordered[start + offset].sequence_no = low + step * (offset + 1)
+    return False
+
+
+def apply_item_diff(playlist, diff):
+    """
+    루틴 항목 변경 묶음을 적용한다.
+
+    diff 는 PlaylistItemDiffSerializer 로 검증된 데이터이며, 삭제 → 수정 → 이동 → 삽입 순서로
+    메모리상의 정렬 목록에 반영한 뒤, 변경된 행만 bulk 연산으로 한 트랜잭션에 기록한다.
+    이동/삽입의 position 은 해당 연산 시점 목록에서의 0부터 시작하는 위치다.
+
+    Args:
+        playlist (Playlist): 편집할 루틴
+        diff (dict): delete / update / move / insert 목록
+
+    Returns:
+        list: 적용 후 순서대로 정렬된 PlaylistItem 목록
+    """
+    with transaction.atomic():
+        Playlist.objects.select_for_update().filter(pk=playlist.pk).first()
+        ordered = list(
+            PlaylistItem.objects.filter(playlist=playlist)
+            .select_related('exercise__category')
+            .order_by('sequence_no')
+        )
+        by_id = {item.playlist_item_id: item for item in ordered}
+
+        referenced = set(diff.get('delete', []))
+        referenced.update(entry['playlist_item_id'] for entry in diff.get('update', []))
+        referenced.update(entry['playlist_item_id'] for entry in diff.get('move', []))
+        unknown = referenced - by_id.keys()
+        if unknown:
+            raise serializers.ValidationError({'playlist_item_id': [f'루틴에 없는 항목입니다: {pk}' for pk in sorted(map(str, unknown))]})
+        exercises = load_exercises(entry['exercise_id'] for entry in diff.get('insert', []))
+
+        deleted = set(diff.get('delete', []))
+        ordered = [item for item in ordered if item.playlist_item_id not in deleted]
+
+        updated_fields = set()
+        updated = set()
+        for entry in diff.get('update', []):
+            item = by_id[entry['playlist_item_id']]
+            if item.playlist_item_id in deleted:
+                continue
+            for field in EDITABLE_FIELDS:
+                if field in entry:
+                    setattr(item, field, entry[field])
+                    updated_fields.add(field)
+            updated.add(item)
+
+        dirty = set()
+        for entry in diff.get('move', []):
+            item = by_id[entry['playlist_item_id']]
+            if item.playlist_item_id in deleted:
+                continue
+            ordered.remove(item)
+            ordered.insert(min(entry['position'], len(ordered)), item)
+            dirty.add(item)
+
+        created = []
+        for entry in diff.get('insert', []):
+            item = PlaylistItem(
+                playlist=playlist,
+                exercise=exercises[entry['exercise_id']],
+                sequence_no=0,
+                **{field: entry[field] for field in EDITABLE_FIELDS if field in entry}
+            )
+            ordered.insert(min(entry['position'], len(ordered)), item)
+            dirty.add(item)
+            created.append(item)
+
+        moved = [item for item in ordered if item in dirty and item not in created]
+        old_sequences = {item.playlist_item_id: item.sequence_no for item in ordered if item not in created}
+        rebalanced = _assign_sequences(ordered, dirty)
+        if rebalanced:
+            moved = [item for item in ordered if item not in created]
+
+        if deleted:
+            PlaylistItem.objects.filter(playlist=playlist, playlist_item_id__in=deleted).delete()
+
+        if moved:
+            # 새 번호가 다른 이동 항목의 기존 번호와 겹치면 유일성 제약을 피하도록 임시 음수 번호를 거친다.
+            targets = {item.sequence_no for item in moved}
+            if targets & {old_sequences[item.playlist_item_id] for item in moved}:
+                final = {item.playlist_item_id: item.sequence_no for item in moved}
+                for position, item in enumerate(moved):
+                    item.sequence_no = -(position + 1)
+                PlaylistItem.objects.bulk_update(moved, ['sequence_no'])
+                for item in moved:
+                    item.sequence_no = final[item.playlist_item_id]
+
+        changed = list(updated | set(moved))
+        fields = sorted(updated_fields | ({'sequence_no'} if moved else set()))
+        if changed and fields:
+            PlaylistItem.objects.bulk_update(changed, fields)
+        if created:
+            PlaylistItem.objects.bulk_create(created)
+
+        playlist.save(update_fields=['updated_at'])
+
+    cache_items(playlist, ordered)
+    return ordered
@@ -4,12 +4,18 @@
 이 모듈은 운동 카테고리, 상세 정보, 루틴(Playlist), 세션(ExerciseSession) 등
 운동 기능과 관련된 데이터의 변환 및 검증 로직을 담고 있다.
 """
+from django.db import transaction
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from .models import (
     ExerciseCategory, Exercise, ExerciseMedia,
-    Playlist, PlaylistItem,
+    RoutineTemplate, RoutineTemplateItem, Playlist, PlaylistItem,
     ExerciseSession, ExerciseSessionItem
 )
+from . import event_query
+from .events import EVENT_TYPES, decode_event
+from .media import get_media_map, request_locales
+from .routines import cache_items, gapped_sequence, load_exercises
 
 class ExerciseCategorySerializer(serializers.ModelSerializer):
     """운동 카테고리 정보 시리얼라이저"""
@@ -24,9 +30,14 @@ class ExerciseMediaSerializer(serializers.ModelSerializer):
         fields = ('media_id', 'media_type', 'locale', 'url', 'duration_ms')
 
 class ExerciseSerializer(serializers.ModelSerializer):
-    """운동 상세 정보 시리얼라이저"""
+    """
+    운동 상세 정보 시리얼라이저.
+
+    media_contents 는 요청 로케일(context 의 'locales', 없으면 요청의 Accept-Language)에 맞춰
+    미디어 타입마다 하나씩, 로케일 미디어 맵(apps.exercises.media)에서 조회 없이 채운다.
+    """
     category = ExerciseCategorySerializer(read_only=True)
-    media_contents = ExerciseMediaSerializer(many=True, read_only=True)
+    media_contents = serializers.SerializerMethodField()
 
     class Meta:
         model = Exercise
@@ -37,8 +48,42 @@ class ExerciseSerializer(serializers.ModelSerializer):
             'media_contents'
         )
 
+    @extend_schema_field(ExerciseMediaSerializer(many=True))
+    def get_media_contents(self, obj):
+        # 중첩/목록 직렬화에서도 context 는 루트와 공유되므로 맵과 로케일은 한 번만 계산한다.
+        context = self.context
+        if 'locales' not in context:
+            context['locales'] = request_locales(context.get('request'))
+        if 'media_map' not in context:
+            context['media_map'] = get_media_map()
+        fields = ExerciseMediaSerializer.Meta.fields
+        return [
+            {field: media[field] for field in fields}
+            for media in context['media_map'].media_for(obj.exercise_id, context['locales'])
+        ]
+
+class RoutineTemplateItemSerializer(serializers.ModelSerializer):
+    """루틴 템플릿 항목 시리얼라이저"""
+    exercise = ExerciseSerializer(read_only=True)
+
+    class Meta:
+        model = RoutineTemplateItem
+        fields = (
+            'template_item_id', 'exercise', 'sequence_no', 'set_count',
+            'reps_count', 'duration_sec', 'rest_sec', 'cue_overrides'
+        )
+
+class RoutineTemplateSerializer(serializers.ModelSerializer):
+    """루틴 템플릿(시스템 추천 루틴) 시리얼라이저"""
+    category = ExerciseCategorySerializer(read_only=True)
+    items = RoutineTemplateItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = RoutineTemplate
+        fields = ('template_id', 'code', 'title', 'category', 'version', 'items')
+
 class PlaylistItemSerializer(serializers.ModelSerializer):
-    """플레이리스트 항목 시리얼라이저"""
+    """플레이리스트 항목 시리얼라이저 (sequence_no 는 서버가 목록 순서대로 부여)"""
     exercise = ExerciseSerializer(read_only=True)
     exercise_id = serializers.UUIDField(write_only=True)
 
@@ -49,17 +94,60 @@ class PlaylistItemSerializer(serializers.ModelSerializer):
             'sequence_no', 'set_count', 'reps_count', 
             'duration_sec', 'rest_sec', 'cue_overrides'
         )
+        read_only_fields = ('sequence_no',)
 
 class PlaylistSerializer(serializers.ModelSerializer):
-    """플레이리스트(루틴) 시리얼라이저"""
-    items = PlaylistItemSerializer(many=True, read_only=True)
+    """
+    플레이리스트(루틴) 시리얼라이저.
+
+    생성 시 순서가 있는 items 목록을 함께 받아 한 요청으로 루틴을 만든다. (BE_V1_SETUP_004)
+    모든 exercise_id 는 한 번의 IN 쿼리로 검증하고, 항목은 한 트랜잭션에서 bulk_create 한다.
+    항목 변경은 루틴 항목 일괄 변경(items/diff) API 를 사용한다.
+    """
+    items = PlaylistItemSerializer(many=True, required=False)
 
     class Meta:
         model = Playlist
         fields = (
-            'playlist_id', 'mode', 'title', 'status', 'items', 'created_at'
+            'playlist_id', 'mode', 'title', 'status', 'template', 'template_version',
+            'items', 'created_at'
         )
-        read_only_fields = ('user', 'created_at')
+        read_only_fields = ('user', 'template', 'template_version', 'created_at')
+
+    def validate(self, attrs):
+        items = attrs.get('items')
+        if items is not None and self.instance is not None:
+            raise serializers.ValidationError({'items': ['루틴 항목 변경은 items/diff API 를 사용해주세요.']})
+        if items:
+            self._exercises = load_exercises(item['exercise_id'] for item in items)
+        instance = self.instance
+        if instance is not None and instance.template_id and attrs.get('status') == 'ACTIVE' and instance.status != 'ACTIVE':
+            # 템플릿의 활성 복사본은 사용자당 하나다. (playlist_active_fork_uniq)
+            active = Playlist.objects.filter(user_id=instance.user_id, template_id=instance.template_id, status='ACTIVE')
+            if active.exists():
+                raise serializers.ValidationError({'status': ['이 템플릿으로 만든 활성 루틴이 이미 있습니다.']})
+        return attrs
+
+    def create(self, validated_data):
+        """
+        루틴과 항목을 한 트랜잭션으로 생성한다. 응답은 다시 조회하지 않고 생성한 객체로 만든다.
+        """
+        items_data = validated_data.pop('items', [])
+        exercises = getattr(self, '_exercises', {})
+        with transaction.atomic():
+            playlist = Playlist.objects.create(**validated_data)
+            items = [
+                PlaylistItem(
+                    playlist=playlist,
+                    exercise=exercises[data.pop('exercise_id')],
+                    sequence_no=gapped_sequence(index),
+                    **data
+                )
+                for index, data in enumerate(items_data)
+            ]
+            PlaylistItem.objects.bulk_create(items)
+        cache_items(playlist, items)
+        return playlist
 
 class ExerciseSessionItemSerializer(serializers.ModelSerializer):
     """운동 세션 항목 시리얼라이저"""
@@ -70,8 +158,11 @@ class ExerciseSessionItemSerializer(serializers.ModelSerializer):
         fields = (
             'session_item_id', 'exercise', 'exercise_name', 'playlist_item',
             'sequence_no', 'started_at', 'ended_at', 'duration_ms',
-            'is_skipped', 'skip_reason', 'rest_sec'
+            'is_skipped', 'skip_reason', 'rest_sec',
+            'active_ms', 'paused_ms', 'avg_playback_rate', 'seek_count', 'command_counts'
         )
+        # 파생 지표는 세션 종료 시 이벤트에서 계산된다. (apps.exercises.timeline)
+        read_only_fields = ('active_ms', 'paused_ms', 'avg_playback_rate', 'seek_count', 'command_counts')
 
 class ExerciseSessionSerializer(serializers.ModelSerializer):
     """운동 세션 시리얼라이저"""
@@ -80,8 +171,123 @@ class ExerciseSessionSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExerciseSession
         fields = (
-            'session_id', 'playlist', 'mode', 
+            'session_id', 'playlist', 'template', 'template_version', 'mode', 
             'started_at', 'ended_at', 'duration_ms', 
             'is_valid', 'abnormal_end_reason', 'items'
         )
-        read_only_fields = ('user', 'session_id', 'items')
+        read_only_fields = ('user', 'session_id', 'template_version', 'items')
+
+    def validate(self, attrs):
+        # 템플릿으로 진행한 세션은 시작 시점의 템플릿 버전을 함께 기록한다.
+        template = attrs.get('template')
+        if template is not None:
+            attrs['template_version'] = template.version
+        return attrs
+
+class SessionCloseSerializer(serializers.Serializer):
+    """세션 종료 요청 (ended_at 이 없으면 현재 시각, abnormal_end_reason 이 없으면 NORMAL)"""
+    ended_at = serializers.DateTimeField(required=False)
+    abnormal_end_reason = serializers.ChoiceField(choices=ExerciseSession.ABNORMAL_END_REASON_CHOICES, default='NORMAL')
+
+    def validate_ended_at(self, value):
+        if value < self.context['session'].started_at:
+            raise serializers.ValidationError('종료 시간은 시작 시간 이후여야 합니다.')
+        return value
+
+class ExerciseSessionEventSerializer(serializers.Serializer):
+    """세션 이벤트 시리얼라이저 (압축 저장된 타입/페이로드를 복원해 반환)"""
+    event_id = serializers.UUIDField(read_only=True)
+    session_item = serializers.UUIDField(source='session_item_id', required=False, allow_null=True)
+    event_time_ms = serializers.IntegerField(min_value=0)
+    event_type = serializers.ChoiceField(choices=EVENT_TYPES)
+    payload = serializers.JSONField(required=False, allow_null=True)
+
+    def to_representation(self, instance):
+        event_type, payload = decode_event(instance)
+        return {
+            'event_id': str(instance.event_id),
+            'session_item': str(instance.session_item_id) if instance.session_item_id else None,
+            'event_time_ms': instance.event_time_ms,
+            'event_type': event_type,
+            'payload': payload,
+        }
+
+class SessionEventQuerySerializer(serializers.Serializer):
+    """
+    세션 이벤트 조회 조건.
+    types: 쉼표로 구분한 이벤트 타입, since_ms/until_ms: 세션 시작 후 시간 범위 (until 제외),
+    cursor/limit: 키셋 페이지, buckets: 지정하면 구간별 타입별 개수로 다운샘플링
+    """
+    types = serializers.CharField(required=False)
+    since_ms = serializers.IntegerField(min_value=0, required=False)
+    until_ms = serializers.IntegerField(min_value=0, required=False)
+    session_item = serializers.UUIDField(required=False)
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=event_query.MAX_LIMIT, default=event_query.DEFAULT_LIMIT)
+    buckets = serializers.IntegerField(min_value=1, max_value=event_query.MAX_BUCKETS, required=False)
+
+    def validate_types(self, value):
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def validate(self, attrs):
+        if attrs.get('since_ms') is not None and attrs.get('until_ms') is not None and attrs['since_ms'] >= attrs['until_ms']:
+            raise serializers.ValidationError({'until_ms': 'until_ms 는 since_ms 보다 커야 합니다.'})
+        return attrs
+
+class SessionExportQuerySerializer(serializers.Serializer):
+    """
+    운동 기록 내보내기 조건.
+    output: csv | ndjson, start/end: 세션 시작일 기준 기간 (end 포함), user: 대상 사용자 (관리자 전용)
+    """
+    output = serializers.ChoiceField(choices=('ndjson', 'csv'), default='ndjson')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    user = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'end': '종료일은 시작일 이후여야 합니다.'})
+        return attrs
+
+class SessionReportQuerySerializer(serializers.Serializer):
+    """
+    운동 리포트 조건.
+    start/end: 세션 시작일 기준 기간 (end 포함, 없으면 전체 기간)
+    """
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'end': '종료일은 시작일 이후여야 합니다.'})
+        return attrs
+
+class PlaylistItemFieldsSerializer(serializers.Serializer):
+    """루틴 항목의 수정 가능 필드 (세트, 횟수, 수행 시간, 휴식 시간, 큐 오버라이드)"""
+    set_count = serializers.IntegerField(min_value=1, required=False)
+    reps_count = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    duration_sec = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    rest_sec = serializers.IntegerField(min_value=0, required=False)
+    cue_overrides = serializers.JSONField(required=False, allow_null=True)
+
+class PlaylistItemUpdateSerializer(PlaylistItemFieldsSerializer):
+    """루틴 항목 수정 연산"""
+    playlist_item_id = serializers.UUIDField()
+
+class PlaylistItemMoveSerializer(serializers.Serializer):
+    """루틴 항목 이동 연산 (position: 0부터 시작하는 목표 위치)"""
+    playlist_item_id = serializers.UUIDField()
+    position = serializers.IntegerField(min_value=0)
+
+class PlaylistItemInsertSerializer(PlaylistItemFieldsSerializer):
+    """루틴 항목 삽입 연산 (position: 0부터 시작하는 목표 위치)"""
+    exercise_id = serializers.UUIDField()
+    position = serializers.IntegerField(min_value=0)
+    set_count = serializers.IntegerField(min_value=1)
+
+class PlaylistItemDiffSerializer(serializers.Serializer):
+    """루틴 항목 일괄 변경(삽입/이동/삭제/수정) 요청 시리얼라이저"""
+    delete = serializers.ListField(child=serializers.UUIDField(), required=False)
+    update = PlaylistItemUpdateSerializer(many=True, required=False)
+    move = PlaylistItemMoveSerializer(many=True, required=False)
+    insert = PlaylistItemInsertSerializer(many=True, required=False)
@@ -0,0 +1,343 @@
+"""
+운동 기록 샤딩 모듈.
+
+세션, 세션 항목, 세션 이벤트, 로그 객체(운동 기록)는 사용자 단위로 HISTORY_SHARDS 중 한 DB 에
+저장하고, 사용자/운동 카탈로그/루틴 등 나머지 모델은 default DB 에 둔다.
+샤드는 사용자 UUID 의 안정 해시(jump consistent hash)로 정하므로 프로세스와 무관하게 같고,
+샤드를 추가할 때 옮겨야 하는 사용자는 약 1/N 이다. (rebalance_history 명령)
+
+HISTORY_SHARDS 가 없으면(기본 설정) 모든 기록은 default DB 에 있으며 이 모듈의 함수는 'default' 를 반환한다.
+샤딩 설정은 config.settings_sharded 를 참고한다.
+
+라우터는 다음 순서로 기록 모델의 DB 를 정한다.
+    1. 힌트 인스턴스가 사용자이거나 기록 모델이면 그 사용자 ID 의 샤드
+    2. 요청 처리 중이면 로그인한 사용자의 샤드 (HistoryShardMiddleware), 또는 pin_user() 로 고정한 샤드
+요청 밖(정리 작업, 회원탈퇴 삭제 등)에서 사용자/세션으로 정할 수 없는 조회는 .using(shard_for_user(...)) 또는
+history_databases() 순회로 DB 를 명시해야 한다.
+DB 를 지정하지 않은 create()/bulk_create() 는 HistoryQuerySet 이 (첫) 인스턴스를 힌트로 넘겨
+요청 밖에서도 사용자의 샤드에 저장한다.
+사용자를 모르는 세션 ID 조회(관리자의 다른 사용자 세션 조회, 배치 작업)는 find_session 을 사용한다.
+
+기록 → 사용자/카탈로그/루틴 참조는 DB 를 넘나들므로 FK 제약(db_constraint)을 두지 않는다.
+default DB 에도 빈 기록 테이블을 만들어 사용자/루틴 삭제 시 ORM 의 cascade 조회가 실패하지 않게 하고,
+루틴 삭제 시의 참조 해제(SET_NULL)는 detach_routine 수신기가 모든 기록 DB 에 반영한다.
+
+Classes:
+    HistoryShardRouter: 기록 모델 DB 라우터
+    HistoryQuerySet: 생성/일괄 생성을 인스턴스의 샤드로 보내는 기록 모델 QuerySet
+    HistoryShardMiddleware: 요청 사용자의 샤드를 라우터에 알리는 미들웨어
+
+Functions:
+    history_databases: 기록 DB 목록
+    shard_for_user: 사용자의 기록 DB
+    pin_user: 블록 안의 힌트 없는 기록 조회를 특정 사용자의 샤드로 고정
+    find_session: 사용자를 모르는 세션 ID 를 모든 기록 DB 에서 조회
+    misplaced_users: 샤드 구성 변경 후 옮겨야 하는 사용자 목록
+    move_user_history: 사용자 기록을 다른 DB 로 이동
+    detach_routine: 삭제되는 루틴/루틴 항목의 기록 참조 해제 (pre_delete 수신기)
+"""
+import contextlib
+import contextvars
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, models, router, transaction
+
+HISTORY_MODELS = ('exercisesession', 'exercisesessionitem', 'exercisesessionevent', 'exerciselogobject')
+MOVE_BATCH_SIZE = 2000
+
+# 고정된 샤드 별칭(str) 또는 요청 객체(사용자는 조회 시점에 읽는다)
+_pinned = contextvars.ContextVar('history_shard', default=None)
+
+
+def history_databases():
+    """기록 DB 별칭 목록. 샤딩하지 않으면 ['default']."""
+    return list(getattr(settings, 'HISTORY_SHARDS', None) or [DEFAULT_DB_ALIAS])
+
+
+def is_history_model(model):
+    return model._meta.app_label == 'exercises' and model._meta.model_name in HISTORY_MODELS
+
+
+def jump_hash(key, buckets):
+    """
+    Jump consistent hash (Lamping & Veach). 버킷 수가 n → n+1 로 늘 때 키의 1/(n+1) 만 이동한다.
+    """
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def shard_for_user(user_id, databases=None):
+    """
+    사용자의 기록 DB 별칭. 사용자 UUID 의 SHA-256 앞 8바이트를 키로 쓰므로 프로세스와 무관하게 같다.
+    """
+    databases = databases or history_databases()
+    if len(databases) == 1:
+        return databases[0]
+    if not isinstance(user_id, uuid.UUID):
+        user_id = uuid.UUID(str(user_id))
+    key = int.from_bytes(hashlib.sha256(user_id.bytes).digest()[:8], 'big')
+    return databases[jump_hash(key, len(databases))]
+
+
+@contextlib.contextmanager
+def pin_user(user_or_id):
+    """블록 안의 힌트 없는 기록 조회/저장을 사용자의 샤드로 보낸다."""
+    user_id = getattr(user_or_id, 'pk', user_or_id)
+    token = _pinned.set(shard_for_user(user_id))
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def find_session(session_id):
+    """
+    세션 ID 로 모든 기록 DB 를 차례로 조회한다. (배치 작업 등 사용자를 모를 때)
+
+    Returns:
+        ExerciseSession: 세션 (없으면 None, 인스턴스의 _state.db 가 기록 DB)
+    """
+    from .models import ExerciseSession
+
+    for using in history_databases():
+        session = ExerciseSession.objects.using(using).filter(pk=session_id).first()
+        if session is not None:
+            return session
+    return None
+
+
+def _pinned_shard():
+    pinned = _pinned.get()
+    if pinned is None or isinstance(pinned, str):
+        return pinned
+    user = getattr(pinned, 'user', None)
+    if user is not None and user.is_authenticated:
+        return shard_for_user(user.pk)
+    return None
+
+
+def _lookup_shard(lookups):
+    """조회 조건의 사용자/세션 인스턴스 또는 user_id 로 샤드를 정한다. 알 수 없으면 None."""
+    for field in ('user', 'session'):
+        value = lookups.get(field)
+        if isinstance(value, models.Model):
+            shard = _instance_shard(value)
+            if shard is not None:
+                return shard
+    user_id = lookups.get('user_id')
+    return shard_for_user(user_id) if user_id is not None else None
+
+
+class HistoryQuerySet(models.QuerySet):
+    """
+    기록 모델 QuerySet.
+
+    기본 create()/bulk_create() 는 힌트 없이 DB 를 정하므로 요청 밖에서는 default DB 에 저장된다.
+    DB 를 지정하지 않았으면 (첫) 인스턴스를 힌트로 라우터에 물어 사용자의 샤드에 저장한다.
+    조회도 사용자/세션으로 거르면(filter(user=...), filter(session=...)) 그 샤드에서 읽는다.
+    """
+
+    def filter(self, *args, **kwargs):
+        queryset = super().filter(*args, **kwargs)
+        if self._db is None and len(history_databases()) > 1:
+            using = _lookup_shard(kwargs)
+            if using is not None:
+                queryset = queryset.using(using)
+        return queryset
+
+    def create(self, **kwargs):
+        if self._db is None:
+            using = router.db_for_write(self.model, instance=self.model(**kwargs))
+            return self.using(using).create(**kwargs)
+        return super().create(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        if self._db is None and objs:
+            using = router.db_for_write(self.model, instance=objs[0])
+            return self.using(using).bulk_create(objs, *args, **kwargs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+def _instance_shard(instance):
+    """힌트 인스턴스에서 사용자를 찾아 샤드를 정한다. 알 수 없으면 None."""
+    model = type(instance)
+    if model._meta.label == settings.AUTH_USER_MODEL:
+        return shard_for_user(instance.pk)
+    if not is_history_model(model):
+        return None
+    if getattr(instance, 'user_id', None) is not None:
+        return shard_for_user(instance.user_id)
+    session_field = model._meta.get_field('session')
+    if session_field.is_cached(instance):
+        return _instance_shard(session_field.get_cached_value(instance))
+    return instance._state.db
+
+
+class HistoryShardRouter:
+    """
+    기록 모델을 사용자 샤드로, 나머지 모델을 default DB 로 보내는 라우터.
+    """
+
+    def _db(self, model, hints):
+        if not is_history_model(model):
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        shard = _instance_shard(instance) if instance is not None else None
+        return shard or _pinned_shard()
+
+    def db_for_read(self, model, **hints):
+        return self._db(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 기록 → 사용자/카탈로그/루틴 참조는 DB 를 넘나든다. (db_constraint=False)
+        if is_history_model(type(obj1)) or is_history_model(type(obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if model_name is None:
+            return None
+        if app_label == 'exercises' and model_name in HISTORY_MODELS:
+            return db == DEFAULT_DB_ALIAS or db in history_databases()
+        return db == DEFAULT_DB_ALIAS
+
+
+def detach_routine(sender, instance, using, **kwargs):
+    """
+    루틴(Playlist) 또는 루틴 항목(PlaylistItem)이 삭제될 때 default 외 기록 DB 의 참조를 끊는다.
+
+    default DB 의 참조는 ORM 의 SET_NULL 이 처리한다. (ExercisesConfig.ready 에서 샤딩 시에만 연결)
+    """
+    from .models import ExerciseSession, ExerciseSessionItem, Playlist
+
+    if sender is Playlist:
+        model, column = ExerciseSession, 'playlist_id'
+    else:
+        model, column = ExerciseSessionItem, 'playlist_item_id'
+    for alias in history_databases():
+        if alias != using:
+            model.objects.using(alias).filter(**{column: instance.pk}).update(**{column: None})
+
+
+class HistoryShardMiddleware:
+    """
+    요청을 처리하는 동안 힌트 없는 기록 조회를 로그인한 사용자의 샤드로 보낸다.
+
+    DRF 는 뷰 안에서 인증하므로 사용자는 라우터가 조회할 때 읽는다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _pinned.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+
+# -----------------------------------------------------------------------------
+# 재배치
+# -----------------------------------------------------------------------------
+
+def _history_querysets(user_id, using):
+    from .models import ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent, ExerciseLogObject
+
+    sessions = ExerciseSession.objects.using(using).filter(user_id=user_id)
+    session_ids = sessions.values('pk')
+    # 부모 → 자식 순서 (복사 순서, 삭제는 역순)
+    return [
+        sessions,
+        ExerciseSessionItem.objects.using(using).filter(session_id__in=session_ids),
+        ExerciseSessionEvent.objects.using(using).filter(session_id__in=session_ids),
+        ExerciseLogObject.objects.using(using).filter(session_id__in=session_ids),
+    ]
+
+
+def user_ids_in(using):
+    """DB 에 기록이 있는 사용자 ID 목록."""
+    from .models import ExerciseSession
+
+    return list(ExerciseSession.objects.using(using).order_by().values_list('user_id', flat=True).distinct())
+
+
+def misplaced_users(user_ids=None):
+    """
+    현재 샤드 구성에서 자기 샤드가 아닌 DB 에 기록이 있는 사용자를 찾는다.
+
+    Args:
+        user_ids (list): 확인할 사용자 ID (기본값: 기록 DB 의 모든 사용자)
+
+    Yields:
+        tuple: (user_id, 현재 DB, 옮길 DB)
+    """
+    wanted = {str(user_id) for user_id in user_ids} if user_ids else None
+    databases = history_databases()
+    for using in databases:
+        for user_id in user_ids_in(using):
+            if wanted is not None and str(user_id) not in wanted:
+                continue
+            target = shard_for_user(user_id, databases)
+            if target != using:
+                yield user_id, using, target
+
+
+def move_user_history(user_id, source, target, batch_size=MOVE_BATCH_SIZE):
+    """
+    사용자의 기록을 source DB 에서 target DB 로 옮긴다.
+
+    부모부터 batch_size 건씩 target 에 복사(이미 있는 행은 건너뜀)한 뒤 source 에서 자식부터 삭제한다.
+    두 DB 에 걸친 트랜잭션은 없으므로 중간에 실패하면 같은 호출을 다시 실행해 이어서 옮긴다.
+    이동 중에는 해당 사용자의 기록 쓰기가 없어야 한다.
+
+    Returns:
+        dict: 모델별 이동 행 수
+    """
+    if source == target:
+        return {}
+    moved = {}
+    querysets = _history_querysets(user_id, source)
+    for queryset in querysets:
+        model = queryset.model
+        last_pk = None
+        while True:
+            page = queryset.order_by('pk')
+            if last_pk is not None:
+                page = page.filter(pk__gt=last_pk)
+            rows = list(page[:batch_size])
+            if not rows:
+                break
+            # bulk_create 는 auto_now/auto_now_add 필드를 현재 시각으로 덮어쓰므로 원래 값을 되돌려 다시 쓴다.
+            auto_fields = [
+                field.attname for field in model._meta.concrete_fields
+                if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+            ]
+            stamps = [[getattr(row, name) for name in auto_fields] for row in rows]
+            with transaction.atomic(using=target):
+                model.objects.using(target).bulk_create(rows, ignore_conflicts=True)
+                if auto_fields:
+                    for row, values in zip(rows, stamps):
+                        for name, value in zip(auto_fields, values):
+                            setattr(row, name, value)
+                    model.objects.using(target).bulk_update(rows, auto_fields, batch_size=500)
+            moved[model._meta.model_name] = moved.get(model._meta.model_name, 0) + len(rows)
+            last_pk = rows[-1].pk
+    for queryset in reversed(querysets):
+        while True:
+            pks = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic(using=source):
+                queryset.model.objects.using(source).filter(pk__in=pks)._raw_delete(source)
+    return moved
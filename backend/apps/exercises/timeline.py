@@ -0,0 +1,206 @@
+"""
+세션 타임라인 재구성 및 항목별 파생 지표 모듈.
+
+세션 항목에는 시작/종료 시간만 있고, 일시정지, 배속 변경, 탐색, 음성 명령 같은 실제 진행 과정은
+ExerciseSessionEvent 에 있다. 세션이 종료될 때 이벤트를 시간순으로 한 번만 읽으며 상태 기계로
+접어(fold) 항목별 지표를 계산하고 항목 행에 저장한다. 이후 조회는 이벤트를 다시 읽지 않는다.
+
+    - 활성 시간(active_ms): 재생 상태로 보낸 시간
+    - 일시정지 시간(paused_ms): PAUSE 이후 PLAY/RESUME 까지의 시간
+    - 평균 배속(avg_playback_rate): 활성 시간 가중 평균 (SPEED_CHANGE 반영)
+    - 탐색 횟수(seek_count), 음성 명령별 횟수(command_counts)
+
+이벤트의 항목은 session_item_id 로 정하고, 없으면 그 시각에 진행 중인 항목으로 본다.
+항목 구간(started_at ~ ended_at)은 항목 시작 이벤트로 스트림에 합쳐지므로 이벤트가 없는 항목도
+구간만큼 활성 시간으로 계산된다. 배속은 항목이 바뀌어도 유지되고, 재생 상태는 항목마다 재생으로 시작한다.
+
+Functions:
+    fold_events: 이벤트 스트림을 항목별 지표로 접기
+    derive_session_metrics: 종료된 세션의 지표 계산 및 저장
+    derive_metrics: 여러 세션에 대해 derive_session_metrics 실행
+"""
+import heapq
+
+from django.db import transaction
+from django.utils import timezone
+
+from .events import decode_event
+from .models import ExerciseSession, ExerciseSessionItem
+
+CHUNK_SIZE = 2000
+METRIC_FIELDS = ('active_ms', 'paused_ms', 'avg_playback_rate', 'seek_count', 'command_counts')
+PLAYING_TYPES = ('PLAY', 'RESUME')
+ITEM_START = object()
+
+
+class _ItemFold:
+    """한 항목의 누적 상태."""
+    __slots__ = ('end_ms', 'at', 'playing', 'active_ms', 'paused_ms', 'rate_ms', 'seek_count', 'command_counts')
+
+    def __init__(self, end_ms):
+        self.end_ms = end_ms
+        self.at = None
+        self.playing = True
+        self.active_ms = 0
+        self.paused_ms = 0
+        self.rate_ms = 0.0
+        self.seek_count = 0
+        self.command_counts = {}
+
+    def advance(self, t, rate):
+        """t 까지 현재 상태로 보낸 시간을 누적한다. (항목 종료 시각 이후는 제외)"""
+        if self.end_ms is not None:
+            t = min(t, self.end_ms)
+        elapsed = t - self.at
+        if elapsed <= 0:
+            return
+        if self.playing:
+            self.active_ms += elapsed
+            self.rate_ms += elapsed * rate
+        else:
+            self.paused_ms += elapsed
+        self.at = t
+
+    def result(self):
+        return {
+            'active_ms': self.active_ms,
+            'paused_ms': self.paused_ms,
+            'avg_playback_rate': round(self.rate_ms / self.active_ms, 2) if self.active_ms else None,
+            'seek_count': self.seek_count,
+            'command_counts': self.command_counts,
+        }
+
+
+def _offset_ms(at, base):
+    return None if at is None else int((at - base).total_seconds() * 1000)
+
+
+def fold_events(session, items, events, initial_rate=1.0):
+    """
+    이벤트 스트림을 한 번 읽어 항목별 지표를 계산한다.
+
+    Args:
+        session: 세션 (started_at, duration_ms 사용)
+        items (list): 세션 항목 목록
+        events (iterable): (event_time_ms, 타입 이름, session_item_id, 페이로드) 를 시간순으로 생성
+        initial_rate (float): 세션 시작 배속
+
+    Returns:
+        dict: {session_item_id: 지표 dict} (구간도 이벤트도 없는 항목은 제외)
+    """
+    folds = {}
+    starts = []
+    for item in items:
+        start_ms = _offset_ms(item.started_at, session.started_at)
+        folds[item.session_item_id] = _ItemFold(_offset_ms(item.ended_at, session.started_at))
+        if start_ms is not None:
+            starts.append((start_ms, item.sequence_no, ITEM_START, item.session_item_id, None))
+    starts.sort(key=lambda row: row[:2])
+    stream = heapq.merge(starts, ((t, 0, *rest) for t, *rest in events), key=lambda row: row[0])
+
+    touched = set()
+    current = None
+    rate = initial_rate
+    last_t = 0
+    for t, _, event_type, item_id, payload in stream:
+        last_t = max(last_t, t)
+        if item_id is not None and item_id not in folds:
+            # 세션 항목 목록에 없는 항목의 이벤트는 무시한다.
+            continue
+        target = item_id or current
+        if target is None:
+            continue
+        fold = folds[target]
+        if target != current:
+            if current is not None:
+                folds[current].advance(t, rate)
+            current = target
+            fold.at = t if fold.at is None else max(fold.at, t)
+            fold.playing = True
+            touched.add(target)
+        else:
+            fold.advance(t, rate)
+        if event_type is ITEM_START:
+            continue
+
+        if event_type in PLAYING_TYPES:
+            fold.playing = True
+        elif event_type == 'PAUSE':
+            fold.playing = False
+        elif event_type == 'SPEED_CHANGE' and isinstance(payload, dict) and payload.get('to_rate'):
+            rate = float(payload['to_rate'])
+        elif event_type == 'SEEK_SEGMENT':
+            fold.seek_count += 1
+        elif event_type == 'VUI_CMD':
+            command = payload.get('command') if isinstance(payload, dict) else None
+            command = str(command) if command else 'UNKNOWN'
+            fold.command_counts[command] = fold.command_counts.get(command, 0) + 1
+
+    if current is not None:
+        fold = folds[current]
+        end = fold.end_ms if fold.end_ms is not None else (session.duration_ms or last_t)
+        fold.advance(end, rate)
+    return {item_id: folds[item_id].result() for item_id in touched}
+
+
+def _event_stream(session):
+    events = (
+        session.events.only('event_time_ms', 'session_item_id', 'type', 'payload_bin', 'event_type', 'payload')
+        .order_by('event_time_ms', 'event_id')
+    )
+    for event in events.iterator(chunk_size=CHUNK_SIZE):
+        event_type, payload = decode_event(event)
+        yield event.event_time_ms, event_type, event.session_item_id, payload
+
+
+def derive_session_metrics(session, force=False):
+    """
+    종료된 세션의 항목별 지표를 계산해 항목 행에 저장하고 세션의 metrics_at 을 기록한다.
+
+    Args:
+        session: 종료된(ended_at 이 있는) 세션
+        force (bool): 이미 계산한 세션도 다시 계산
+
+    Returns:
+        int: 지표를 저장한 항목 수 (계산하지 않았으면 0)
+    """
+    if session.ended_at is None or (session.metrics_at is not None and not force):
+        return 0
+    items = list(session.items.order_by('sequence_no'))
+    metrics = fold_events(session, items, _event_stream(session))
+    changed = []
+    for item in items:
+        values = metrics.get(item.session_item_id)
+        if values is None:
+            continue
+        for name, value in values.items():
+            setattr(item, name, value)
+        changed.append(item)
+
+    now = timezone.now()
+    using = session._state.db
+    with transaction.atomic(using=using):
+        ExerciseSessionItem.objects.using(using).bulk_update(changed, METRIC_FIELDS, batch_size=500)
+        # 항목 지표는 세션 응답에 포함되므로 세션의 updated_at 도 갱신한다. (조건부 GET 검증자)
+        ExerciseSession.objects.using(using).filter(pk=session.pk).update(metrics_at=now, updated_at=now)
+    session.metrics_at = session.updated_at = now
+    return len(changed)
+
+
+def derive_metrics(session_ids, using=None):
+    """
+    종료됐지만 지표가 없는 세션들의 지표를 계산한다. (비정상 종료 세션 정리 후 호출)
+
+    Args:
+        session_ids (list): 세션 ID 목록
+        using (str): 세션이 있는 기록 DB (기본값: 라우터가 정한 DB)
+
+    Returns:
+        int: 지표를 계산한 세션 수
+    """
+    sessions = ExerciseSession.objects.db_manager(using).filter(pk__in=session_ids, ended_at__isnull=False, metrics_at__isnull=True)
+    derived = 0
+    for session in sessions.iterator(chunk_size=100):
+        derive_session_metrics(session)
+        derived += 1
+    return derived
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ExerciseViewSet, RoutineViewSet, SessionViewSet
+from .views import ExerciseViewSet, RoutineTemplateViewSet, RoutineViewSet, SessionViewSet
 
 app_name = 'exercises'
 
 router = DefaultRouter()
+router.register(r'routine-templates', RoutineTemplateViewSet, basename='routine-template')
 router.register(r'routines', RoutineViewSet, basename='routine')
 router.register(r'sessions', SessionViewSet, basename='session')
 router.register(r'', ExerciseViewSet, basename='exercise')
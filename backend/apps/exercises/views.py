@@ -4,19 +4,67 @@
 이 모듈은 운동 목록 조회, 루틴(Playlist) 관리, 운동 세션(Session) 관리 등
 주요 기능에 대한 ViewSet을 정의한다.
 """
-from rest_framework import viewsets
+import datetime
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Exercise, Playlist, ExerciseSession
+from apps.core import compression
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.idempotency import idempotent
+from apps.users.permissions import IsProfileCompleted
+from . import event_query, exports, reports
+from .events import build_event
+from .heartbeats import MIN_VALID_DURATION_MS, record_heartbeat, session_owner
+from .media import media_version, request_locales
+from .models import Exercise, ExerciseCategory, RoutineTemplate, Playlist, ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent
+from .playback import get_playlist_plan, get_template_plan
+from .routine_templates import customize_template, get_template_payload, get_template_payloads
+from .routines import apply_item_diff
+from .sharding import find_session
 from .serializers import (
-    ExerciseSerializer, PlaylistSerializer, ExerciseSessionSerializer
+    ExerciseSerializer, PlaylistSerializer, ExerciseSessionSerializer, SessionCloseSerializer,
+    PlaylistItemDiffSerializer, RoutineTemplateSerializer, ExerciseSessionEventSerializer,
+    SessionEventQuerySerializer, SessionExportQuerySerializer, SessionReportQuerySerializer
 )
+from .timeline import derive_session_metrics
+
+
+def _date_range(params):
+    # 날짜 조건(start, end 포함)을 세션 시작 시각 범위 [start, end) 로 바꾼다.
+    def day_start(day):
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+    start = day_start(params['start']) if params.get('start') else None
+    end = day_start(params['end'] + datetime.timedelta(days=1)) if params.get('end') else None
+    return start, end
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
 
-class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
+def _media_conditional_parts(view):
+    # 응답의 미디어는 요청 로케일과 미디어 버전에 따라 달라진다. (apps.exercises.media)
+    return [request_locales(view.request), media_version()]
+
+
+class ExerciseViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     운동 정보 조회용 ViewSet.
     누구나 접근 가능하며, 카테고리별 필터링을 지원한다.
+    응답에는 ETag / Last-Modified 가 붙고, 변경이 없으면 304 를 반환한다. (apps.core.conditional)
     """
-    queryset = Exercise.objects.all().select_related('category').prefetch_related('media_contents')
+    queryset = Exercise.objects.all().select_related('category')
     serializer_class = ExerciseSerializer
     permission_classes = [AllowAny] 
 
@@ -27,29 +75,320 @@ class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(category_id=category_id)
         return queryset
 
-class RoutineViewSet(viewsets.ModelViewSet):
+    conditional_vary = ('Accept-Language',)
+
+    def get_conditional_parts(self):
+        return [*super().get_conditional_parts(), *_media_conditional_parts(self)]
+
+    def get_conditional_sources(self, obj=None):
+        # 응답의 카테고리 이름은 운동의 updated_at 을 갱신하지 않으므로 카테고리 수정 일시를 함께 집계한다.
+        if obj is not None:
+            return [(ExerciseCategory.objects.filter(pk=obj.category_id), 'updated_at')]
+        exercises = self.filter_queryset(self.get_queryset())
+        return [(exercises, 'updated_at'), (exercises, 'category__updated_at')]
+
+class RoutineTemplateViewSet(viewsets.GenericViewSet):
+    """
+    시스템 추천(커리큘럼) 루틴 템플릿 ViewSet.
+
+    템플릿은 모든 사용자가 공유하며, 조회 결과는 프로세스 전역 캐시에서 제공된다.
+    사용자가 템플릿을 편집(customize)할 때만 사용자 소유 루틴으로 복사된다.
+    """
+    queryset = RoutineTemplate.objects.filter(is_active=True)
+    serializer_class = RoutineTemplateSerializer
+    permission_classes = [IsAuthenticated, IsProfileCompleted]
+    lookup_value_regex = '[0-9a-f-]{36}'
+
+    def list(self, request):
+        return Response(get_template_payloads(request_locales(request)))
+
+    def retrieve(self, request, pk=None):
+        payload = get_template_payload(pk, request_locales(request))
+        if payload is None:
+            raise Http404
+        return Response(payload)
+
+    @action(detail=True, methods=['post'])
+    def customize(self, request, pk=None):
+        """
+        템플릿을 편집한다. 처음 편집할 때 사용자 소유 루틴으로 복사하고(copy-on-write),
+        요청 본문의 항목 변경(items/diff 와 같은 형식)을 복사본에 적용한다.
+        처음 편집할 때는 항목을 템플릿 항목 ID 로 지정할 수 있고, 변경이 거부되면 복사하지 않는다.
+
+        Returns:
+            Response: 사용자 루틴 (새로 복사한 경우 HTTP 201)
+        """
+        template = self.get_object()
+        serializer = PlaylistItemDiffSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        playlist, created = customize_template(template, request.user, serializer.validated_data)
+        return Response(
+            PlaylistSerializer(playlist, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['get'])
+    def plan(self, request, pk=None):
+        """템플릿의 재생 계획(타임라인)을 반환한다. (apps.exercises.playback)"""
+        return Response(get_template_plan(self.get_object(), request_locales(request)))
+
+class RoutineViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     나만의 루틴(Playlist) 관리용 ViewSet.
-    인증된 사용자만 접근 가능하며, 자신의 루틴만 조회/수정 가능하다.
+    인증되고 필수 프로필 정보를 입력한 사용자만 접근 가능하며, 자신의 루틴만 조회/수정 가능하다.
+    항목 변경(items/diff)도 루틴의 updated_at 을 갱신하므로 조회 응답의 ETag 는 루틴 단위로 계산한다.
     """
     serializer_class = PlaylistSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsProfileCompleted]
+    conditional_vary = ('Accept-Language',)
 
     def get_queryset(self):
         return Playlist.objects.filter(user=self.request.user, status='ACTIVE')
 
+    def get_conditional_parts(self):
+        return [*super().get_conditional_parts(), *_media_conditional_parts(self)]
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class SessionViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['post'], url_path='items/diff')
+    def apply_diff(self, request, pk=None):
+        """
+        루틴 항목의 삽입/이동/삭제/수정을 한 번에 적용한다.
+
+        희소 순서 번호(apps.exercises.routines)를 사용하므로 대부분의 이동은 해당 항목만 갱신하며,
+        모든 변경은 하나의 트랜잭션에서 bulk 연산으로 기록된다.
+        """
+        playlist = self.get_object()
+        serializer = PlaylistItemDiffSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        apply_item_diff(playlist, serializer.validated_data)
+        return Response(PlaylistSerializer(playlist, context=self.get_serializer_context()).data)
+
+    @action(detail=True, methods=['get'])
+    def plan(self, request, pk=None):
+        """
+        루틴의 재생 계획(타임라인)을 반환한다. (BE_V1_EXERCISE_005)
+
+        운동 순서, 세트/휴식 세그먼트와 절대 오프셋, 휴식 안내 문구, 예상 총 소요 시간을
+        포함하며, 같은 루틴 버전의 계획은 캐시에서 제공된다.
+        """
+        return Response(get_playlist_plan(self.get_object(), request_locales(request)))
+
+class SessionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     운동 세션(기록) 관리용 ViewSet.
+    인증되고 필수 프로필 정보를 입력한 사용자만 접근 가능하다.
+    조회 응답에는 ETag / Last-Modified 가 붙는다. (apps.core.conditional)
     """
     serializer_class = ExerciseSessionSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsProfileCompleted]
 
     def get_queryset(self):
         return ExerciseSession.objects.filter(user=self.request.user).order_by('-started_at')
 
+    def get_conditional_sources(self, obj=None):
+        # 세션 항목은 세션의 updated_at 을 갱신하지 않으므로 종료 시간과 개수를 함께 집계한다.
+        if obj is not None:
+            return [(ExerciseSessionItem.objects.filter(session=obj), 'ended_at')]
+        sessions = self.filter_queryset(self.get_queryset())
+        return [(sessions, 'updated_at'), (ExerciseSessionItem.objects.filter(session__in=sessions), 'ended_at')]
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    def perform_update(self, serializer):
+        # 수정으로 종료 시간이 기록되면 항목별 파생 지표를 계산한다.
+        was_open = serializer.instance.ended_at is None
+        session = serializer.save()
+        if was_open and session.ended_at is not None:
+            derive_session_metrics(session)
+
+    @action(detail=True, methods=['post'])
+    @idempotent
+    def close(self, request, pk=None):
+        """
+        세션을 종료한다.
+
+        종료 시간과 소요 시간을 기록하고, 세션 이벤트를 한 번 읽어 항목별 파생 지표
+        (활성/일시정지 시간, 평균 배속, 탐색/음성 명령 횟수)를 계산해 저장한다.
+        """
+        session = self.get_object()
+        if session.ended_at is not None:
+            return Response({
+                "error": "SESSION_ALREADY_CLOSED",
+                "tts_message": "이미 종료된 운동입니다."
+            }, status=status.HTTP_409_CONFLICT)
+        serializer = SessionCloseSerializer(data=request.data, context={'session': session})
+        serializer.is_valid(raise_exception=True)
+
+        session.ended_at = serializer.validated_data.get('ended_at') or timezone.now()
+        session.duration_ms = int((session.ended_at - session.started_at).total_seconds() * 1000)
+        session.is_valid = session.duration_ms >= MIN_VALID_DURATION_MS
+        session.abnormal_end_reason = serializer.validated_data['abnormal_end_reason']
+        session.save(update_fields=['ended_at', 'duration_ms', 'is_valid', 'abnormal_end_reason', 'updated_at'])
+        derive_session_metrics(session)
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=['post'])
+    def heartbeat(self, request, pk=None):
+        """
+        진행 중인 세션의 핑을 기록한다. (BE_V1_LOG_001)
+
+        핑은 메모리 테이블에 모았다가 주기적으로 DB 에 반영되며, 세션 소유자 확인도
+        캐시되므로 대부분의 핑은 DB 를 조회하지 않는다.
+        """
+        try:
+            session_id = uuid.UUID(str(pk))
+        except ValueError:
+            raise Http404
+        if session_owner(session_id) != request.user.pk:
+            raise Http404
+        record_heartbeat(session_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['get', 'post'])
+    @idempotent
+    def events(self, request, pk=None):
+        """
+        세션 이벤트를 조회(GET)하거나 일괄 기록(POST)한다.
+
+        이벤트는 타입 코드와 바이너리 페이로드로 압축 저장되며, 조회 시 원래 형태로 복원된다.
+        POST 본문은 이벤트 목록이다.
+        """
+        session = self.get_object()
+        if request.method == 'GET':
+            events = session.events.order_by('event_time_ms', 'created_at')
+            return Response(ExerciseSessionEventSerializer(events, many=True).data)
+
+        serializer = ExerciseSessionEventSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        item_ids = {entry['session_item_id'] for entry in serializer.validated_data if entry.get('session_item_id')}
+        if item_ids:
+            found = set(ExerciseSessionItem.objects.filter(session=session, pk__in=item_ids).values_list('pk', flat=True))
+            if item_ids - found:
+                return Response({
+                    "error": "SESSION_ITEM_NOT_FOUND",
+                    "tts_message": "세션에 없는 운동 항목이 포함되어 있습니다."
+                }, status=status.HTTP_400_BAD_REQUEST)
+        events = [
+            build_event(
+                session, entry['event_type'], entry['event_time_ms'],
+                payload=entry.get('payload'), session_item_id=entry.get('session_item_id')
+            )
+            for entry in serializer.validated_data
+        ]
+        ExerciseSessionEvent.objects.bulk_create(events)
+        return Response({'created': len(events)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'], url_path='events/query')
+    def event_query(self, request, pk=None):
+        """
+        세션 이벤트를 타입/시간 범위로 걸러 조회한다.
+
+        (event_time_ms, event_id) 키셋 커서로 페이지를 나누며(next_cursor), buckets 를 지정하면
+        이벤트 목록 대신 최대 buckets 개 구간의 타입별 개수(타임라인)를 반환한다.
+        관리자는 다른 사용자의 세션도 조회할 수 있다.
+        """
+        query = SessionEventQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        if request.user.is_staff:
+            # 다른 사용자의 세션은 관리자 본인의 기록 DB 에 없을 수 있으므로 모든 기록 DB 에서 찾는다.
+            session = find_session(pk) if _is_uuid(pk) else None
+            if session is None:
+                raise Http404
+        else:
+            session = self.get_object()
+
+        events = event_query.filter_events(
+            session, types=params.get('types'), since_ms=params.get('since_ms'),
+            until_ms=params.get('until_ms'), session_item_id=params.get('session_item')
+        )
+        if params.get('buckets'):
+            return Response(event_query.downsample(
+                events, params['buckets'], since_ms=params.get('since_ms'), until_ms=params.get('until_ms')
+            ))
+        try:
+            page, next_cursor = event_query.query_page(events, cursor=params.get('cursor'), limit=params['limit'])
+        except ValueError:
+            return Response({
+                "error": "INVALID_CURSOR",
+                "tts_message": "잘못된 페이지 요청입니다."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'results': ExerciseSessionEventSerializer(page, many=True).data,
+            'next_cursor': next_cursor,
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        운동 기록 전체(세션, 항목, 이벤트)를 CSV 또는 NDJSON 으로 스트리밍한다.
+
+        키셋 페이지 단위로 읽어 메모리 사용량이 기록 크기와 무관하며,
+        클라이언트가 gzip 을 허용하면(Accept-Encoding, q 값 반영) 즉시 압축해 보낸다.
+        gzip 도 비압축(identity)도 허용하지 않으면 406 을 반환한다.
+        관리자는 user 파라미터로 다른 사용자의 기록을 내보낼 수 있다.
+        """
+        query = SessionExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        user = request.user
+        if params.get('user') and params['user'] != request.user.pk:
+            if not request.user.is_staff:
+                return Response({
+                    "error": "FORBIDDEN",
+                    "tts_message": "다른 사용자의 기록은 내보낼 수 없습니다."
+                }, status=status.HTTP_403_FORBIDDEN)
+            user = get_user_model().objects.filter(pk=params['user']).first()
+            if user is None:
+                raise Http404
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        gzip = compression.negotiate(accept_encoding, ('gzip',)) == 'gzip'
+        if not gzip and not compression.identity_acceptable(accept_encoding):
+            return Response({
+                "error": "NOT_ACCEPTABLE",
+                "tts_message": "지원하지 않는 전송 형식입니다."
+            }, status=status.HTTP_406_NOT_ACCEPTABLE)
+
+        start, end = _date_range(params)
+        records = exports.iter_records(user, start, end)
+        if params['output'] == 'csv':
+            lines, content_type, extension = exports.render_csv(records), 'text/csv; charset=utf-8', 'csv'
+        else:
+            lines, content_type, extension = exports.render_ndjson(records), 'application/x-ndjson', 'ndjson'
+        chunks = exports.encode_chunks(lines)
+
+        response = StreamingHttpResponse(exports.gzip_stream(chunks) if gzip else chunks, content_type=content_type)
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        response['Vary'] = 'Accept-Encoding'
+        response['Content-Disposition'] = f'attachment; filename="workout-history.{extension}"'
+        return response
+
+    @action(detail=False, methods=['get'])
+    def report(self, request):
+        """
+        기간 운동 리포트를 반환한다. (BE_V1_LOG_002, BE_V1_USER_003)
+
+        스킵하지 않은 항목의 수행 시간과 운동 강도(MET), 사용자 체중으로 소모 칼로리를 추정해
+        합계와 날짜/카테고리/세션별 집계, 음성 안내 문구(tts_message)를 함께 반환한다.
+        """
+        query = SessionReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start, end = _date_range(query.validated_data)
+        report = reports.estimate(request.user, start, end)
+        report['tts_message'] = reports.tts_summary(report)
+        return Response(report)
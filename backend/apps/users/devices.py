@@ -0,0 +1,134 @@
+"""
+신뢰 기기 레지스트리 모듈. (BE_V1_AUTH_002, BE_V1_AUTH_008)
+
+로그인할 때마다 device_id 가 이 사용자의 인증된 기기인지 판단한다.
+사용자별 기기 해시 목록을 프로세스 캐시에 두므로, 캐시가 없을 때만 (user, device_hash)
+유니크 인덱스의 사용자 접두사로 한 번 조회하고 이후 신뢰 기기 로그인은 DB 를 조회하지 않는다.
+캐시에 없는 기기는 다른 프로세스에서 방금 인증됐을 수 있으므로 같은 인덱스로 한 건만 다시 확인한다.
+
+최근 사용 일시(last_seen_at)는 TRUSTED_DEVICE_TOUCH_INTERVAL 보다 오래됐을 때만 갱신해
+로그인마다 쓰기가 생기지 않게 한다. 캐시 항목은 TRUSTED_DEVICE_CACHE_TTL 이 지나면 다시 읽으므로
+다른 프로세스에서 정리(prune)된 기기는 최대 그 시간 안에 반영된다.
+
+Functions:
+    is_trusted: 신뢰 기기 여부 확인 (필요 시 최근 사용 일시 갱신)
+    trust_device: SMS 인증을 마친 기기 등록
+    prune_stale_devices: 오래 사용하지 않은 기기 일괄 삭제
+    clear_cache: 프로세스 캐시 비우기
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.core.lru import LRUCache
+
+from .models import TrustedDevice
+
+PRUNE_BATCH_SIZE = 1000
+
+# user_id -> (캐시 적재 시각(monotonic), {device_hash: last_seen_at})
+_devices = LRUCache(maxsize=10000)
+
+
+def _cache_ttl():
+    return getattr(settings, 'TRUSTED_DEVICE_CACHE_TTL', 300)
+
+
+def _user_devices(user_id):
+    cached = _devices.get(user_id)
+    if cached is not None and time.monotonic() - cached[0] < _cache_ttl():
+        return cached[1]
+    devices = dict(TrustedDevice.objects.filter(user_id=user_id).values_list('device_hash', 'last_seen_at'))
+    _devices.set(user_id, (time.monotonic(), devices))
+    return devices
+
+
+def is_trusted(user, device_hash, now=None):
+    """
+    기기가 사용자의 신뢰 기기인지 확인한다. 신뢰 기기이면 최근 사용 일시를 (주기적으로) 갱신한다.
+
+    Args:
+        user (User): 로그인한 사용자
+        device_hash (str): hash_device_id 결과
+        now (datetime): 기준 시각
+
+    Returns:
+        bool: 신뢰 기기 여부
+    """
+    devices = _user_devices(user.pk)
+    last_seen_at = devices.get(device_hash)
+    if last_seen_at is None:
+        # 다른 프로세스에서 SMS 인증을 마친 기기는 이 프로세스 캐시에 없다.
+        last_seen_at = (
+            TrustedDevice.objects.filter(user_id=user.pk, device_hash=device_hash)
+            .values_list('last_seen_at', flat=True).first()
+        )
+        if last_seen_at is None:
+            return False
+        devices[device_hash] = last_seen_at
+    now = now or timezone.now()
+    interval = timedelta(seconds=getattr(settings, 'TRUSTED_DEVICE_TOUCH_INTERVAL', 24 * 60 * 60))
+    if now - last_seen_at >= interval:
+        TrustedDevice.objects.filter(user_id=user.pk, device_hash=device_hash).update(
+            last_seen_at=Greatest(F('last_seen_at'), now)
+        )
+        devices[device_hash] = now
+    return True
+
+
+def trust_device(user, device_hash, now=None):
+    """
+    SMS 인증을 마친 기기를 신뢰 기기로 등록한다. 이미 있으면 인증/사용 일시만 갱신한다.
+
+    Returns:
+        TrustedDevice: 등록된 기기
+    """
+    now = now or timezone.now()
+    device, created = TrustedDevice.objects.get_or_create(
+        user_id=user.pk, device_hash=device_hash,
+        defaults={'verified_at': now, 'last_seen_at': now},
+    )
+    if not created:
+        device.verified_at = device.last_seen_at = now
+        device.save(update_fields=['verified_at', 'last_seen_at'])
+    cached = _devices.get(user.pk)
+    if cached is not None:
+        cached[1][device_hash] = now
+    return device
+
+
+def prune_stale_devices(max_idle=None, now=None, batch_size=PRUNE_BATCH_SIZE):
+    """
+    최근 사용 일시가 max_idle 보다 오래된 기기를 batch_size 건씩 삭제한다.
+
+    Args:
+        max_idle (timedelta): 허용 미사용 기간 (기본값 settings.TRUSTED_DEVICE_MAX_IDLE_DAYS)
+        now (datetime): 기준 시각
+        batch_size (int): 한 번에 삭제할 행 수
+
+    Returns:
+        int: 삭제된 기기 수
+    """
+    max_idle = max_idle or timedelta(days=getattr(settings, 'TRUSTED_DEVICE_MAX_IDLE_DAYS', 180))
+    cutoff = (now or timezone.now()) - max_idle
+    stale = TrustedDevice.objects.filter(last_seen_at__lt=cutoff).order_by('last_seen_at')
+    deleted = 0
+    while True:
+        batch = list(stale.values_list('pk', 'user_id')[:batch_size])
+        if not batch:
+            break
+        deleted += TrustedDevice.objects.filter(pk__in=[pk for pk, _ in batch], last_seen_at__lt=cutoff).delete()[0]
+        for user_id in {user_id for _, user_id in batch}:
+            _devices.delete(user_id)
+        if len(batch) < batch_size:
+            break
+    return deleted
+
+
+def clear_cache():
+    """사용자별 기기 캐시를 비운다."""
+    _devices.clear()
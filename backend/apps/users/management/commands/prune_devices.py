@@ -0,0 +1,27 @@
+"""
+오래된 신뢰 기기 정리 명령.
+
+최근 사용 일시가 기준 기간보다 오래된 신뢰 기기를 배치 단위로 삭제한다.
+삭제된 기기로 로그인하면 다시 SMS 기기 인증을 거친다. 주기 실행(cron 등)을 전제로 한다.
+
+Usage:
+    python manage.py prune_devices [--days 180] [--batch-size 1000]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.users.devices import PRUNE_BATCH_SIZE, prune_stale_devices
+
+
+class Command(BaseCommand):
+    help = '오래 사용하지 않은 신뢰 기기를 삭제한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='허용 미사용 기간(일)')
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        max_idle = timedelta(days=options['days']) if options['days'] else None
+        deleted = prune_stale_devices(max_idle=max_idle, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"pruned {deleted} trusted devices"))
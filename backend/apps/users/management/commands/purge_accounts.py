@@ -0,0 +1,39 @@
+"""
+회원탈퇴 데이터 삭제 작업 실행 명령.
+
+대기 중(PENDING)이거나 실패(FAILED)한 삭제 작업을 마지막 진행 단계부터 재개한다.
+워커 재시작 등으로 RUNNING 상태에서 멈춘 작업은 --include-running 으로 함께 재개한다.
+
+Usage:
+    python manage.py purge_accounts [--chunk-size 5000] [--include-running]
+"""
+from django.core.management.base import BaseCommand
+
+from apps.users.models import AccountPurgeJob
+from apps.users.purge import DEFAULT_CHUNK_SIZE, run_purge_job
+
+
+class Command(BaseCommand):
+    help = '회원탈퇴 사용자의 데이터를 청크 단위로 삭제한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--include-running', action='store_true')
+
+    def handle(self, *args, **options):
+        statuses = ['PENDING', 'FAILED']
+        if options['include_running']:
+            statuses.append('RUNNING')
+
+        def report(job, step_name, rows):
+            self.stdout.write(f"  {job.user_id} {step_name}: {rows} rows (total {job.deleted_rows[step_name]})")
+
+        jobs = AccountPurgeJob.objects.filter(status__in=statuses).order_by('created_at')
+        for job in jobs:
+            self.stdout.write(f"purging {job.user_id} from step {job.step}")
+            try:
+                run_purge_job(job, chunk_size=options['chunk_size'], progress=report)
+            except Exception as exc:
+                self.stderr.write(f"  failed: {exc}")
+                continue
+            self.stdout.write(self.style.SUCCESS(f"  done: {job.deleted_rows}"))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:54
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountPurgeJob',
+            fields=[
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('user_id', models.UUIDField(unique=True, verbose_name='사용자 ID')),
+                ('status', models.CharField(choices=[('PENDING', '대기 중'), ('RUNNING', '진행 중'), ('DONE', '완료'), ('FAILED', '실패')], default='PENDING', max_length=20, verbose_name='상태')),
+                ('step', models.IntegerField(default=0, verbose_name='진행 단계')),
+                ('deleted_rows', models.JSONField(default=dict, verbose_name='단계별 삭제 건수')),
+                ('last_error', models.TextField(blank=True, null=True, verbose_name='최근 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료 일시')),
+            ],
+            options={
+                'verbose_name': '회원탈퇴 삭제 작업',
+                'verbose_name_plural': '회원탈퇴 삭제 작업 목록',
+                'db_table': 'account_purge_jobs',
+                'indexes': [models.Index(fields=['status'], name='account_pur_status_a6d7b0_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_account_purge_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='수정일'),
+            preserve_default=False,
+        ),
+    ]
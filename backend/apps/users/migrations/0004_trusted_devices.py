@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:33
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrustedDevice',
+            fields=[
+                ('trusted_device_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('device_hash', models.CharField(max_length=64, verbose_name='디바이스 해시')),
+                ('verified_at', models.DateTimeField(verbose_name='인증 일시')),
+                ('last_seen_at', models.DateTimeField(verbose_name='최근 사용 일시')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trusted_devices', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '신뢰 기기',
+                'verbose_name_plural': '신뢰 기기 목록',
+                'db_table': 'user_trusted_devices',
+                'indexes': [models.Index(fields=['last_seen_at'], name='user_truste_last_se_ea0a4d_idx')],
+                'unique_together': {('user', 'device_hash')},
+            },
+        ),
+    ]
@@ -8,11 +8,15 @@ UUID를 기본키로 사용한다.
 Classes:
     User: 사용자 모델 (UUID PK)
     UserAuthProvider: 사용자 인증 제공자 정보
+    TrustedDevice: SMS 인증을 마친 사용자 기기
+    AccountPurgeJob: 회원탈퇴 데이터 삭제 작업
 """
 import uuid
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+PROFILE_REQUIRED_FIELDS = ('height_cm', 'weight_kg', 'birthdate', 'gender')
+
 class User(AbstractUser):
     """
     사용자 정보를 저장하는 모델.
@@ -30,7 +34,8 @@ class User(AbstractUser):
         gender (str): 성별 (M/F/U)
         height_cm (int): 키 (cm)
         weight_kg (int): 몸무게 (kg)
-        is_profile_completed (bool): 프로필 완성 여부
+        is_profile_completed (bool): 프로필 완성 여부 (필수 정보 4종 입력 시 저장 시점에 자동 갱신)
+        updated_at (datetime): 수정일 (조회 API 의 ETag / Last-Modified 기준)
     """
     
     # 기본키 UUID로 변경
@@ -55,6 +60,7 @@ class User(AbstractUser):
     height_cm = models.IntegerField(null=True, blank=True, verbose_name='키(cm)')
     weight_kg = models.IntegerField(null=True, blank=True, verbose_name='몸무게(kg)')
     is_profile_completed = models.BooleanField(default=False, verbose_name='프로필 완성 여부')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
     class Meta:
         db_table = 'users'
@@ -68,6 +74,20 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        """
+        필수 프로필 정보(키, 몸무게, 생년월일, 성별) 입력 여부로 is_profile_completed 를 갱신한다. (BE_V1_AUTH_004)
+        """
+        self.is_profile_completed = all(getattr(self, field) not in (None, '') for field in PROFILE_REQUIRED_FIELDS)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # 일부 필드만 저장해도 updated_at 은 함께 갱신한다.
+            extra = {'updated_at'}
+            if set(update_fields) & set(PROFILE_REQUIRED_FIELDS):
+                extra.add('is_profile_completed')
+            kwargs['update_fields'] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
+
 class UserAuthProvider(models.Model):
     """
     사용자의 소셜 로그인 연동 정보를 저장하는 모델.
@@ -107,3 +127,82 @@ class UserAuthProvider(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.provider}"
+
+
+class TrustedDevice(models.Model):
+    """
+    SMS 기기 인증을 마친 사용자 기기. (BE_V1_AUTH_002, BE_V1_AUTH_008)
+
+    로그인 시 device_id 의 해시가 이 목록에 없으면 새 기기로 판단한다.
+    조회와 갱신은 apps.users.devices 를 통해 사용자별 프로세스 캐시를 거친다.
+
+    Attributes:
+        trusted_device_id (UUID): 고유 ID (PK)
+        user (User): 기기 소유 사용자
+        device_hash (str): device_id 의 HMAC-SHA256 해시 (apps.users.verification.hash_device_id)
+        verified_at (datetime): 최근 SMS 인증 일시
+        last_seen_at (datetime): 최근 로그인 일시 (오래된 기기 정리 기준)
+    """
+    trusted_device_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trusted_devices', verbose_name='사용자')
+    device_hash = models.CharField(max_length=64, verbose_name='디바이스 해시')
+    verified_at = models.DateTimeField(verbose_name='인증 일시')
+    last_seen_at = models.DateTimeField(verbose_name='최근 사용 일시')
+
+    class Meta:
+        db_table = 'user_trusted_devices'
+        verbose_name = '신뢰 기기'
+        verbose_name_plural = '신뢰 기기 목록'
+        unique_together = [('user', 'device_hash')]
+        indexes = [
+            models.Index(fields=['last_seen_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.device_hash[:8]}"
+
+
+class AccountPurgeJob(models.Model):
+    """
+    회원탈퇴한 사용자의 데이터를 단계적으로 삭제하는 작업. (BE_V1_AUTH_006)
+
+    탈퇴 요청 시 계정은 즉시 비활성화되고, 이 작업이 하위 테이블부터 청크 단위로
+    데이터를 삭제한다. 진행 단계와 테이블별 삭제 건수를 기록하므로 중단되더라도
+    마지막 단계부터 재개할 수 있다. 사용자 행이 마지막에 삭제되므로 user_id 는 FK가 아니다.
+
+    Attributes:
+        job_id (UUID): 작업 고유 ID (PK)
+        user_id (UUID): 삭제 대상 사용자 ID
+        status (str): 작업 상태 (PENDING/RUNNING/DONE/FAILED)
+        step (int): 다음에 실행할 삭제 단계 번호
+        deleted_rows (dict): 단계별 삭제(갱신) 건수
+        last_error (str): 마지막 오류 메시지
+    """
+    STATUS_CHOICES = [
+        ('PENDING', '대기 중'),
+        ('RUNNING', '진행 중'),
+        ('DONE', '완료'),
+        ('FAILED', '실패'),
+    ]
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user_id = models.UUIDField(unique=True, verbose_name='사용자 ID')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', verbose_name='상태')
+    step = models.IntegerField(default=0, verbose_name='진행 단계')
+    deleted_rows = models.JSONField(default=dict, verbose_name='단계별 삭제 건수')
+    last_error = models.TextField(null=True, blank=True, verbose_name='최근 오류')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='완료 일시')
+
+    class Meta:
+        db_table = 'account_purge_jobs'
+        verbose_name = '회원탈퇴 삭제 작업'
+        verbose_name_plural = '회원탈퇴 삭제 작업 목록'
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"Purge {self.user_id} ({self.status})"
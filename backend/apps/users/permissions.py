@@ -0,0 +1,49 @@
+"""
+사용자 관련 권한 클래스 모듈.
+
+Classes:
+    ProfileIncomplete: 필수 프로필 정보 누락 예외 (HTTP 403)
+    IsProfileCompleted: 필수 프로필 정보 입력 여부를 확인하는 라우트 가드
+"""
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import BasePermission
+
+
+class ProfileIncomplete(APIException):
+    """필수 프로필 정보가 입력되지 않은 사용자의 메인 기능 접근"""
+    status_code = status.HTTP_403_FORBIDDEN
+    default_code = 'PROFILE_INCOMPLETE'
+    default_detail = {
+        "error": "PROFILE_INCOMPLETE",
+        "redirect": "profile_setup",
+        "tts_message": "정확한 가이드를 위해 추가 정보를 입력해야 합니다. 입력 화면으로 이동합니다."
+    }
+
+
+class IsProfileCompleted(BasePermission):
+    """
+    필수 프로필 정보(키, 몸무게, 생년월일, 성별) 입력 여부를 확인하는 라우트 가드. (BE_V1_AUTH_002/004)
+
+    DB 를 조회하지 않고 다음 순서로 완성 여부를 판단한다.
+        1. 인증 토큰 클레임(request.auth['profile_completed'])
+        2. 인증 단계에서 이미 로드된 request.user 의 is_profile_completed
+
+    인증되지 않은 요청은 판단하지 않으므로 IsAuthenticated 와 함께 사용한다.
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return True
+
+        completed = None
+        claims = request.auth
+        if hasattr(claims, 'get'):
+            completed = claims.get('profile_completed')
+        if completed is None:
+            completed = getattr(user, 'is_profile_completed', False)
+
+        if not completed:
+            raise ProfileIncomplete()
+        return True
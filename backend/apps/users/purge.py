@@ -0,0 +1,276 @@
+"""
+회원탈퇴 데이터 삭제(purge) 모듈. (BE_V1_AUTH_006)
+
+User 삭제를 ORM 의 cascade 로 처리하면 Collector 가 모든 하위 행(세션 이벤트 등)을
+메모리에 올리고 하나의 긴 트랜잭션을 잡는다. 이 모듈은 하위 테이블부터 상위 테이블
+순서로, 고정 크기 청크 단위의 raw DELETE 를 실행한다.
+청크마다 삭제와 진행 상황 기록을 같은 트랜잭션으로 커밋하므로 중단 후 재개가 가능하다.
+
+운동 기록을 샤딩한 경우(apps.exercises.sharding) 기록 단계는 사용자의 기록 DB 에서 실행하고,
+다른 사용자 기록의 루틴 참조 해제는 모든 기록 DB 에서 실행한다. 이때 루틴은 default DB 에 있으므로
+사용자의 루틴 ID 를 미리 읽어 조건에 넣고, DB 의 바인드 파라미터 한도를 넘지 않도록
+MAX_IN_PARAMS 개씩 나눠 실행한다. 기록 DB 의 청크는 진행 상황보다 먼저 커밋되므로
+중단되더라도 재개 시 같은 청크를 다시 삭제할 뿐이다.
+
+Functions:
+    deactivate_account: 계정을 즉시 비활성화하고 삭제 작업을 생성
+    run_purge_job: 삭제 작업 실행 (재개 가능)
+    enqueue_purge_job: 삭제 작업을 백그라운드 큐에 등록
+"""
+import logging
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from apps.core.background import QueueFull, get_queue
+from apps.core.models import IdempotencyKey
+from apps.exercises.models import (
+    Playlist, PlaylistItem,
+    ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent, ExerciseLogObject
+)
+from apps.exercises.sharding import history_databases, shard_for_user
+from .models import UserAuthProvider, TrustedDevice, AccountPurgeJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+# 쿼리 하나의 IN (...) 값 수. SQLite 구버전의 바인드 파라미터 한도(999)보다 작게 둔다.
+MAX_IN_PARAMS = 500
+
+
+@dataclass(frozen=True)
+class PurgeStep:
+    """
+    삭제 단계.
+
+    Attributes:
+        name (str): 단계 이름 (진행 상황 키)
+        model: 대상 모델
+        condition (str): 대상 행을 고르는 WHERE 조건 (%(user)s 자리에 사용자 ID, %(owner)s 자리에 멱등성 키 주체 파라미터)
+        set_null (str): 지정 시 DELETE 대신 해당 컬럼을 NULL 로 갱신 (다른 사용자의 참조 해제)
+        using (str): 실행할 DB 별칭
+        in_column (str): 지정 시 condition 대신 in_column IN (values) 조건을 사용
+        values (tuple): in_column 과 비교할 미리 읽은 값 (MAX_IN_PARAMS 개씩 나눠 실행)
+    """
+    name: str
+    model: object
+    condition: str = None
+    set_null: str = None
+    using: str = DEFAULT_DB_ALIAS
+    in_column: str = None
+    values: tuple = ()
+
+
+def _t(model):
+    return model._meta.db_table
+
+
+def _pk(model):
+    return model._meta.pk.column
+
+
+def _user_sessions():
+    return f"SELECT {_pk(ExerciseSession)} FROM {_t(ExerciseSession)} WHERE user_id = %(user)s"
+
+
+def _user_playlists():
+    return f"SELECT {_pk(Playlist)} FROM {_t(Playlist)} WHERE user_id = %(user)s"
+
+
+def _user_playlist_items():
+    return f"SELECT {_pk(PlaylistItem)} FROM {_t(PlaylistItem)} WHERE playlist_id IN ({_user_playlists()})"
+
+
+def _in_values(column, name, values):
+    """
+    column IN (...) 조건과 파라미터. 다른 DB 의 서브쿼리 대신 미리 읽은 값을 쓴다.
+
+    Returns:
+        tuple: (조건, 파라미터 dict)
+    """
+    params = {f'{name}_{index}': value for index, value in enumerate(values)}
+    return f"{column} IN ({', '.join(f'%({key})s' for key in params)})", params
+
+
+def _detach_steps(user_id):
+    """
+    다른 사용자의 기록이 이 사용자의 루틴을 참조하는 경우 ORM 의 SET_NULL 과 같이 참조만 끊는 단계.
+    """
+    databases = history_databases()
+    if databases == [DEFAULT_DB_ALIAS]:
+        return [
+            PurgeStep(
+                'detach_session_items', ExerciseSessionItem,
+                f"playlist_item_id IN ({_user_playlist_items()})", set_null='playlist_item_id'
+            ),
+            PurgeStep(
+                'detach_sessions', ExerciseSession,
+                f"playlist_id IN ({_user_playlists()})", set_null='playlist_id'
+            ),
+        ]
+    # 단계 수는 기록 DB 수로만 정해지므로 재개할 때도 같은 단계 목록이 만들어진다.
+    # (값 배치는 단계 안에서 나누므로 루틴 수가 달라져도 단계 번호가 바뀌지 않는다.)
+    items = tuple(PlaylistItem.objects.filter(playlist__user_id=user_id).values_list('pk', flat=True))
+    playlists = tuple(Playlist.objects.filter(user_id=user_id).values_list('pk', flat=True))
+    steps = []
+    for using in databases:
+        steps.append(PurgeStep(
+            'detach_session_items', ExerciseSessionItem,
+            set_null='playlist_item_id', using=using, in_column='playlist_item_id', values=items,
+        ))
+        steps.append(PurgeStep(
+            'detach_sessions', ExerciseSession,
+            set_null='playlist_id', using=using, in_column='playlist_id', values=playlists,
+        ))
+    return steps
+
+
+def build_steps(user_id):
+    """
+    하위 테이블부터 상위 테이블 순서의 삭제 단계 목록을 만든다.
+
+    Args:
+        user_id (UUID): 탈퇴한 사용자 ID (기록 DB 결정)
+    """
+    history = shard_for_user(user_id)
+    return [
+        PurgeStep('session_events', ExerciseSessionEvent, f"session_id IN ({_user_sessions()})", using=history),
+        PurgeStep('session_items', ExerciseSessionItem, f"session_id IN ({_user_sessions()})", using=history),
+        PurgeStep('log_objects', ExerciseLogObject, f"session_id IN ({_user_sessions()})", using=history),
+        PurgeStep('sessions', ExerciseSession, "user_id = %(user)s", using=history),
+        *_detach_steps(user_id),
+        PurgeStep('playlist_items', PlaylistItem, f"playlist_id IN ({_user_playlists()})"),
+        PurgeStep('playlists', Playlist, "user_id = %(user)s"),
+        PurgeStep('auth_providers', UserAuthProvider, "user_id = %(user)s"),
+        PurgeStep('trusted_devices', TrustedDevice, "user_id = %(user)s"),
+        # 저장된 응답 본문에 개인 기록이 담길 수 있으므로 만료를 기다리지 않고 삭제한다.
+        PurgeStep('idempotency_keys', IdempotencyKey, "owner = %(owner)s"),
+    ]
+
+
+def _chunk_sql(step, condition):
+    table, pk = _t(step.model), _pk(step.model)
+    subquery = f"SELECT {pk} FROM {table} WHERE {condition} LIMIT %(limit)s"
+    if step.set_null:
+        return f"UPDATE {table} SET {step.set_null} = NULL WHERE {pk} IN ({subquery})"
+    return f"DELETE FROM {table} WHERE {pk} IN ({subquery})"
+
+
+def _run_chunk(step, connection, cursor, params, chunk_size):
+    """
+    단계의 청크 하나(최대 chunk_size 행)를 실행하고 처리한 행 수를 반환한다.
+
+    values 단계는 값 배치마다 쿼리를 실행해 chunk_size 를 채운다. 참조 해제된 행은 다시
+    조건에 걸리지 않으므로 다음 청크가 앞쪽 배치부터 다시 훑어도 같은 행을 두 번 처리하지 않는다.
+    """
+    if not step.in_column:
+        cursor.execute(_chunk_sql(step, step.condition), {**params, 'limit': chunk_size})
+        return cursor.rowcount
+    rows = 0
+    for start in range(0, len(step.values), MAX_IN_PARAMS):
+        condition, batch = _in_values(step.in_column, 'value', step.values[start:start + MAX_IN_PARAMS])
+        # 값은 루틴 ID 이며, 모든 기본키가 UUID 이므로 대상 모델의 기본키 형식으로 변환한다.
+        for key, value in batch.items():
+            batch[key] = step.model._meta.pk.get_db_prep_value(value, connection)
+        cursor.execute(_chunk_sql(step, condition), {**params, **batch, 'limit': chunk_size - rows})
+        rows += cursor.rowcount
+        if rows >= chunk_size:
+            break
+    return rows
+
+
+def deactivate_account(user):
+    """
+    계정을 즉시 비활성화하고 삭제 작업을 생성한다.
+
+    로그인 식별 정보(전화번호, PIN 해시)도 즉시 제거해 같은 번호로 재가입할 수 있게 한다.
+
+    Args:
+        user (User): 탈퇴할 사용자
+
+    Returns:
+        AccountPurgeJob: 생성된(또는 기존) 삭제 작업
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.phone_number = None
+        user.pin_hash = None
+        user.save(update_fields=['is_active', 'phone_number', 'pin_hash'])
+        job, _ = AccountPurgeJob.objects.get_or_create(user_id=user.pk)
+    return job
+
+
+def run_purge_job(job, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    삭제 작업을 job.step 단계부터 실행한다.
+
+    각 청크는 삭제와 job 진행 상황 갱신을 하나의 트랜잭션으로 커밋한다.
+    청크 결과가 chunk_size 보다 적으면 해당 단계를 완료로 보고 다음 단계로 넘어간다.
+
+    Args:
+        job (AccountPurgeJob): 실행할 작업
+        chunk_size (int): 청크당 최대 행 수
+        progress (callable): 청크마다 (job, step_name, rows) 로 호출되는 콜백
+
+    Returns:
+        AccountPurgeJob: 완료된 작업
+    """
+    User = get_user_model()
+    steps = build_steps(job.user_id)
+
+    job.status = 'RUNNING'
+    job.save(update_fields=['status', 'updated_at'])
+    try:
+        while job.step < len(steps):
+            step = steps[job.step]
+            connection = connections[step.using]
+            params = {
+                'user': User._meta.pk.get_db_prep_value(job.user_id, connection),
+                'owner': f'user:{job.user_id}',
+            }
+            with transaction.atomic():
+                # 기록 DB 의 삭제를 먼저 커밋한 뒤 진행 상황을 커밋한다. (같은 DB 이면 하나의 트랜잭션)
+                with transaction.atomic(using=step.using), connection.cursor() as cursor:
+                    rows = _run_chunk(step, connection, cursor, params, chunk_size)
+                job.deleted_rows[step.name] = job.deleted_rows.get(step.name, 0) + rows
+                if rows < chunk_size:
+                    job.step += 1
+                job.save(update_fields=['step', 'deleted_rows', 'updated_at'])
+            if progress:
+                progress(job, step.name, rows)
+
+        with transaction.atomic():
+            # 남은 행은 사용자 1건과 소량의 권한/그룹 연결뿐이므로 ORM 삭제로 마무리한다.
+            User.objects.filter(pk=job.user_id).delete()
+            job.status = 'DONE'
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'finished_at', 'updated_at'])
+    except Exception as exc:
+        job.status = 'FAILED'
+        job.last_error = str(exc)
+        job.save(update_fields=['status', 'last_error', 'updated_at'])
+        raise
+    return job
+
+
+def _run_by_id(job_id):
+    job = AccountPurgeJob.objects.get(pk=job_id)
+    if job.status != 'DONE':
+        run_purge_job(job)
+
+
+def enqueue_purge_job(job):
+    """
+    삭제 작업을 백그라운드 큐('purge')에 등록한다.
+    큐가 가득 차면 작업은 PENDING 으로 남고 purge_accounts 명령으로 처리된다.
+    """
+    transaction.on_commit(lambda: _submit(job.pk))
+
+
+def _submit(job_id):
+    try:
+        get_queue('purge').submit(_run_by_id, job_id)
+    except QueueFull:
+        logger.warning("purge queue is full; job %s left pending", job_id)
@@ -3,6 +3,7 @@
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 
 User = get_user_model()
 
@@ -11,11 +12,12 @@ class UserSignupSerializer(serializers.ModelSerializer):
     회원가입 요청 데이터를 처리하는 시리얼라이저.
     """
     password = serializers.CharField(write_only=True)
+    pin_number = serializers.RegexField(r'^\d{4,}$', write_only=True, required=False)
 
     class Meta:
         model = User
         fields = (
-            'id', 'username', 'password', 'name', 'phone_number',
+            'id', 'username', 'password', 'name', 'phone_number', 'pin_number',
             'height_cm', 'weight_kg', 'gender', 'birthdate'
         )
         extra_kwargs = {
@@ -35,6 +37,31 @@ class UserSignupSerializer(serializers.ModelSerializer):
             height_cm=validated_data.get('height_cm'),
             weight_kg=validated_data.get('weight_kg'),
             gender=validated_data.get('gender'),
-            birthdate=validated_data.get('birthdate')
+            birthdate=validated_data.get('birthdate'),
+            pin_hash=make_password(validated_data['pin_number']) if validated_data.get('pin_number') else None
         )
         return user
+
+
+class LoginSerializer(serializers.Serializer):
+    """
+    전화번호 + PIN 로그인 요청 데이터를 검증하는 시리얼라이저.
+    """
+    phone_number = serializers.CharField(max_length=20)
+    pin_number = serializers.RegexField(r'^\d{4,}$')
+    device_id = serializers.CharField(max_length=255, required=False)
+
+
+class SMSSendSerializer(serializers.Serializer):
+    """
+    기기 인증번호 발송 요청 데이터를 검증하는 시리얼라이저.
+    """
+    phone_number = serializers.CharField(max_length=20)
+    device_id = serializers.CharField(max_length=255)
+
+
+class SMSVerifySerializer(SMSSendSerializer):
+    """
+    기기 인증번호 확인 요청 데이터를 검증하는 시리얼라이저.
+    """
+    verification_code = serializers.RegexField(r'^\d{6}$')
@@ -0,0 +1,79 @@
+"""
+SMS 발송 모듈.
+
+인증번호 등 SMS 발송을 담당하는 제공자(Provider)와 비동기 발송 함수를 정의한다.
+실제 발송은 백그라운드 큐('sms')의 워커에서 수행되므로, 요청 처리 시간은
+제공자의 응답 지연과 무관하다.
+
+Classes:
+    BaseSMSProvider: SMS 제공자 인터페이스
+    LocalStubSMSProvider: 로컬 개발/테스트용 제공자 (로그 및 메모리 발송함에 기록)
+
+Functions:
+    get_provider: settings.SMS_PROVIDER 에 지정된 제공자 조회
+    enqueue_sms: SMS 발송을 백그라운드 큐에 등록
+"""
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from apps.core.background import get_queue
+
+logger = logging.getLogger(__name__)
+
+
+class BaseSMSProvider:
+    """SMS 제공자 인터페이스"""
+
+    def send(self, phone_number, message):
+        raise NotImplementedError
+
+
+class LocalStubSMSProvider(BaseSMSProvider):
+    """
+    실제 발송 없이 로그와 메모리 발송함(outbox)에 기록하는 제공자.
+
+    Attributes:
+        outbox (deque): 최근 발송 내역 (phone_number, message), 최대 100건
+    """
+
+    def __init__(self):
+        self.outbox = deque(maxlen=100)
+
+    def send(self, phone_number, message):
+        self.outbox.append((phone_number, message))
+        logger.info("SMS(stub) to %s: %s", phone_number, message)
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """
+    settings.SMS_PROVIDER 에 지정된 제공자 인스턴스를 반환한다. (프로세스당 1개)
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                path = getattr(settings, 'SMS_PROVIDER', 'apps.users.sms.LocalStubSMSProvider')
+                _provider = import_string(path)()
+    return _provider
+
+
+def _deliver(phone_number, message):
+    get_provider().send(phone_number, message)
+
+
+def enqueue_sms(phone_number, message):
+    """
+    SMS 발송을 백그라운드 큐에 등록하고 즉시 반환한다.
+
+    Raises:
+        QueueFull: 발송 대기열이 가득 찬 경우
+    """
+    get_queue('sms').submit(_deliver, phone_number, message)
@@ -0,0 +1,198 @@
+"""
+SMS 기기 인증번호 저장소 모듈. (BE_V1_AUTH_008)
+
+인증번호는 (전화번호, 디바이스 해시) 단위로 발급되며 6자리 숫자, 유효시간 3분이다.
+인증번호 원문은 저장하지 않고 해시만 보관한다.
+
+Classes:
+    VerificationResult: 인증번호 검증 결과 코드
+    InMemoryVerificationCodeStore: 프로세스 메모리 저장소 (TTL 순서 인덱스)
+    CacheVerificationCodeStore: Django 캐시 기반 공유 저장소
+
+Functions:
+    hash_device_id: device_id 를 저장용 해시로 변환
+    generate_code: 6자리 인증번호 생성
+    get_store: settings.VERIFICATION_CODE_STORE 에 지정된 저장소 조회
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+CODE_LENGTH = 6
+CODE_TTL_SECONDS = 180
+
+
+class VerificationResult:
+    """인증번호 검증 결과 코드"""
+    OK = 'OK'
+    MISMATCH = 'MISMATCH'
+    EXPIRED = 'EXPIRED'
+
+
+def hash_device_id(device_id):
+    """
+    device_id 를 SECRET_KEY 기반 HMAC-SHA256 해시(64자)로 변환한다.
+
+    Args:
+        device_id (str): 클라이언트 디바이스 ID
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    return hmac.new(settings.SECRET_KEY.encode(), str(device_id).encode(), hashlib.sha256).hexdigest()
+
+
+def generate_code():
+    """6자리 숫자 인증번호를 생성한다."""
+    return f'{secrets.randbelow(10 ** CODE_LENGTH):0{CODE_LENGTH}d}'
+
+
+def _digest(code):
+    return hashlib.sha256(str(code).encode()).hexdigest()
+
+
+class InMemoryVerificationCodeStore:
+    """
+    프로세스 메모리에 인증번호를 보관하는 저장소.
+
+    모든 항목의 TTL 이 같으므로 삽입 순서가 곧 만료 순서다.
+    OrderedDict 하나로 키 조회(O(1))와 만료 순서 인덱스를 함께 유지하며,
+    재발급 시 항목을 끝으로 옮겨 순서를 보존한다.
+    만료는 조회 시점에 개별 항목을 확인하는 방식(lazy)과, sweep_interval 마다
+    앞에서부터 만료된 항목만 잘라내는 방식(periodic)을 함께 사용한다.
+    """
+
+    def __init__(self, ttl=CODE_TTL_SECONDS, sweep_interval=30):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def _sweep(self, now):
+        while self._entries:
+            _, expires_at = next(iter(self._entries.values()))
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
+        self._last_sweep = now
+
+    def _maybe_sweep(self, now):
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
+
+    def issue(self, phone_number, device_hash, code, now=None):
+        """
+        인증번호를 저장한다. 같은 키로 발급된 기존 인증번호는 대체된다.
+
+        Returns:
+            int: 유효시간(초)
+        """
+        now = time.time() if now is None else now
+        key = (phone_number, device_hash)
+        with self._lock:
+            self._maybe_sweep(now)
+            self._entries.pop(key, None)
+            self._entries[key] = (_digest(code), now + self.ttl)
+        return self.ttl
+
+    def verify(self, phone_number, device_hash, code, now=None):
+        """
+        인증번호를 검증한다. 성공한 인증번호는 즉시 폐기되어 재사용할 수 없다.
+
+        Returns:
+            str: VerificationResult 코드
+        """
+        now = time.time() if now is None else now
+        key = (phone_number, device_hash)
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return VerificationResult.EXPIRED
+            digest, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return VerificationResult.EXPIRED
+            if not hmac.compare_digest(digest, _digest(code)):
+                return VerificationResult.MISMATCH
+            del self._entries[key]
+            return VerificationResult.OK
+
+    def purge_expired(self, now=None):
+        """만료된 항목을 즉시 정리한다."""
+        with self._lock:
+            self._sweep(time.time() if now is None else now)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheVerificationCodeStore:
+    """
+    Django 캐시(Redis 등)에 인증번호를 보관하는 저장소.
+
+    여러 워커가 발급/검증을 나누어 처리하는 배포 환경용이며, 만료는 캐시 TTL 에 맡긴다.
+    """
+
+    def __init__(self, ttl=CODE_TTL_SECONDS, alias=None):
+        self.ttl = ttl
+        self.alias = alias or getattr(settings, 'VERIFICATION_CODE_CACHE', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, phone_number, device_hash):
+        return f'sms-code:{phone_number}:{device_hash}'
+
+    def issue(self, phone_number, device_hash, code, now=None):
+        self.cache.set(self._key(phone_number, device_hash), _digest(code), timeout=self.ttl)
+        return self.ttl
+
+    def verify(self, phone_number, device_hash, code, now=None):
+        key = self._key(phone_number, device_hash)
+        digest = self.cache.get(key)
+        if digest is None:
+            return VerificationResult.EXPIRED
+        if not hmac.compare_digest(digest, _digest(code)):
+            return VerificationResult.MISMATCH
+        self.cache.delete(key)
+        return VerificationResult.OK
+
+    def purge_expired(self, now=None):
+        pass
+
+    def clear(self):
+        self.cache.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    settings.VERIFICATION_CODE_STORE 에 지정된 저장소 인스턴스를 반환한다. (프로세스당 1개)
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = getattr(
+                    settings, 'VERIFICATION_CODE_STORE',
+                    'apps.users.verification.InMemoryVerificationCodeStore'
+                )
+                _store = import_string(path)()
+    return _store
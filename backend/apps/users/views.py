@@ -12,18 +12,34 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import get_user_model
-from .serializers import UserSignupSerializer
+from django.contrib.auth.hashers import check_password, make_password
+from apps.core.background import QueueFull
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.idempotency import idempotent
+from apps.core.ratelimit import rate_limit
+from .serializers import (
+    UserSignupSerializer, LoginSerializer, SMSSendSerializer, SMSVerifySerializer
+)
+from .devices import is_trusted, trust_device
+from .purge import deactivate_account, enqueue_purge_job
+from .sms import enqueue_sms
+from .verification import VerificationResult, generate_code, get_store, hash_device_id
 
 User = get_user_model()
 
-class UserViewSet(mixins.RetrieveModelMixin,
+class UserViewSet(ConditionalGetMixin,
+                  mixins.RetrieveModelMixin,
                   mixins.UpdateModelMixin,
                   viewsets.GenericViewSet):
     """
     사용자 관련 API 요청을 처리하는 ViewSet.
 
-    회원가입(signup), 내 정보 조회(retrieve), 정보 수정(update) 기능을 제공한다.
-    signup 액션은 누구나 접근 가능하며, 그 외 액션은 인증된 사용자만 접근 가능하다.
+    회원가입(signup), 로그인(login), 기기 SMS 인증(sms_send, sms_verify),
+    내 정보 조회(retrieve), 정보 수정(update), 회원탈퇴(withdraw) 기능을 제공한다.
+    signup, login, SMS 인증 액션은 누구나 접근 가능하며, 그 외 액션은 인증된 사용자만 접근 가능하다.
+    signup, login, SMS 인증은 요청 제한(apps.core.ratelimit)이 적용되어, 한도를 초과한 요청은
+    PIN/비밀번호 해싱이나 인증번호 검증 전에 거부된다.
+    내 정보 조회(retrieve)는 updated_at 기반 ETag / Last-Modified 로 조건부 GET 을 지원한다.
 
     Attributes:
         serializer_class: 사용할 시리얼라이저 클래스 (UserSignupSerializer)
@@ -32,7 +48,12 @@ class UserViewSet(mixins.RetrieveModelMixin,
     Methods:
         get_permissions: 액션별 권한 설정
         signup: 회원가입 처리
+        login: 전화번호 + PIN 로그인 처리
+        sms_send: 기기 인증번호 발송
+        sms_verify: 기기 인증번호 확인
+        withdraw: 회원탈퇴 처리
     """
+    PUBLIC_ACTIONS = ('signup', 'login', 'sms_send', 'sms_verify')
     serializer_class = UserSignupSerializer
     queryset = User.objects.all()
     
@@ -40,16 +61,18 @@ class UserViewSet(mixins.RetrieveModelMixin,
         """
         현재 액션에 따른 권한 클래스를 반환한다.
 
-        회원가입(signup)은 AllowAny, 그 외에는 IsAuthenticated를 적용한다.
+        PUBLIC_ACTIONS(회원가입, 로그인, SMS 인증)는 AllowAny, 그 외에는 IsAuthenticated를 적용한다.
 
         Returns:
             list: 적용할 권한 클래스 목록
         """
-        if self.action == 'signup':
+        if self.action in self.PUBLIC_ACTIONS:
             return [AllowAny()]
         return [IsAuthenticated()]
 
     @action(detail=False, methods=['post'])
+    @idempotent
+    @rate_limit('signup', keys=('ip', 'phone'))
     def signup(self, request):
         """
         신규 회원가입을 처리한다.
@@ -74,3 +97,157 @@ class UserViewSet(mixins.RetrieveModelMixin,
             "access": "temp_access_token",
             "refresh": "temp_refresh_token"
         }, status=status.HTTP_201_CREATED)
+
+
+    @action(detail=False, methods=['post'])
+    @rate_limit('login', keys=('ip',))
+    @rate_limit('login_failure', keys=('phone', 'device'), count='failure')
+    def login(self, request):
+        """
+        전화번호와 PIN 번호로 로그인한다.
+
+        IP 단위 전체 시도 횟수와 전화번호/디바이스 단위 실패 횟수를 함께 제한하며,
+        제한에 걸린 요청은 PIN 해시 검증(PBKDF2) 없이 429로 반환된다.
+        device_id 가 있으면 신뢰 기기 여부(is_new_device)를 함께 반환한다. (apps.users.devices)
+
+        Args:
+            request: HTTP 요청 객체
+
+        Returns:
+            Response: 토큰 및 프로필 완성 여부 (HTTP 200), 실패 시 HTTP 401
+        """
+        serializer = LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        user = User.objects.filter(phone_number=data['phone_number'], is_active=True).first()
+        if user is None or not user.pin_hash:
+            # 존재하지 않는 사용자도 해싱 비용을 동일하게 들여 응답 시간으로 가입 여부가 드러나지 않게 한다.
+            make_password(data['pin_number'])
+            verified = False
+        else:
+            verified = check_password(data['pin_number'], user.pin_hash)
+
+        if not verified:
+            return Response({
+                "error": "INVALID_CREDENTIALS",
+                "tts_message": "로그인이 실패했습니다. 전화번호 또는 PIN 번호가 잘못되었습니다. 다시 확인해주세요."
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
+        if user.is_profile_completed:
+            tts_message = "로그인이 완료되었습니다. 메인 페이지로 이동합니다."
+        else:
+            tts_message = "로그인이 완료되었습니다. 정확한 가이드를 위해 사용자 데이터 수집 화면으로 전환됩니다."
+        body = {
+            "user_id": user.id,
+            "is_profile_completed": user.is_profile_completed,
+            "access": "temp_access_token",
+            "refresh": "temp_refresh_token",
+            "tts_message": tts_message
+        }
+        if data.get('device_id'):
+            # 새 기기이면 클라이언트가 SMS 기기 인증(sms_send, sms_verify)을 진행한다.
+            body["is_new_device"] = not is_trusted(user, hash_device_id(data['device_id']))
+        return Response(body, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='sms/send')
+    @rate_limit('sms_send', keys=('ip', 'phone'))
+    def sms_send(self, request):
+        """
+        새 기기 인증용 6자리 인증번호를 발급하고 SMS 발송을 백그라운드 큐에 등록한다.
+
+        발송 완료를 기다리지 않고 즉시 응답한다. 가입 여부가 드러나지 않도록
+        등록되지 않은 전화번호에도 같은 응답을 반환하며, 이 경우 발송하지 않는다.
+
+        Args:
+            request: HTTP 요청 객체
+
+        Returns:
+            Response: 발송 안내 및 유효시간 (HTTP 202), 발송 대기열 포화 시 HTTP 503
+        """
+        serializer = SMSSendSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        phone_number = serializer.validated_data['phone_number']
+        device_hash = hash_device_id(serializer.validated_data['device_id'])
+
+        expires_in = get_store().ttl
+        if User.objects.filter(phone_number=phone_number, is_active=True).exists():
+            code = generate_code()
+            try:
+                enqueue_sms(phone_number, f"[시선] 인증번호는 {code} 입니다.")
+            except QueueFull:
+                return Response({
+                    "error": "SMS_UNAVAILABLE",
+                    "tts_message": "인증번호를 발송할 수 없습니다. 잠시 후 다시 시도해주세요."
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            expires_in = get_store().issue(phone_number, device_hash, code)
+
+        return Response({
+            "expires_in": expires_in,
+            "tts_message": "인증번호가 발송되었습니다."
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='sms/verify')
+    @rate_limit('sms_verify', keys=('phone', 'device'), count='failure')
+    def sms_verify(self, request):
+        """
+        기기 인증번호를 확인하고 device_hash 를 발급한다. 인증된 기기는 신뢰 기기로 등록된다.
+
+        실패(4xx) 응답은 전화번호/디바이스 단위로 기록되며, 5회 실패 시 30분간 차단된다.
+
+        Args:
+            request: HTTP 요청 객체
+
+        Returns:
+            Response: device_hash (HTTP 200), 인증번호 불일치/만료 시 HTTP 400
+        """
+        serializer = SMSVerifySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        device_hash = hash_device_id(data['device_id'])
+
+        result = get_store().verify(data['phone_number'], device_hash, data['verification_code'])
+        if result == VerificationResult.EXPIRED:
+            return Response({
+                "error": "VERIFICATION_CODE_EXPIRED",
+                "tts_message": "인증번호가 만료되었습니다. 재발송을 요청해주세요."
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if result == VerificationResult.MISMATCH:
+            return Response({
+                "error": "VERIFICATION_CODE_MISMATCH",
+                "tts_message": "인증번호가 올바르지 않습니다. 다시 입력해주세요."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        user = User.objects.filter(phone_number=data['phone_number'], is_active=True).first()
+        if user is not None:
+            trust_device(user, device_hash)
+        return Response({
+            "device_hash": device_hash,
+            "tts_message": "기기 인증이 완료되었습니다."
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def withdraw(self, request):
+        """
+        회원탈퇴를 처리한다. (BE_V1_AUTH_006)
+
+        계정은 즉시 비활성화되고, 연결된 데이터는 백그라운드 삭제 작업(apps.users.purge)이
+        청크 단위로 삭제한다.
+
+        Args:
+            request: HTTP 요청 객체 (confirm: true 필요)
+
+        Returns:
+            Response: 탈퇴 안내 (HTTP 202), 탈퇴 의사 미확인 시 HTTP 400
+        """
+        if request.data.get('confirm') not in (True, 'true', 'True', '1'):
+            return Response({
+                "error": "CONFIRMATION_REQUIRED",
+                "tts_message": "회원탈퇴를 진행하려면, 탈퇴 의사를 확인해 주세요."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        job = deactivate_account(request.user)
+        enqueue_purge_job(job)
+        return Response({
+            "tts_message": "회원탈퇴가 완료되었습니다. 그동안 시선을 이용해 주셔서 감사합니다."
+        }, status=status.HTTP_202_ACCEPTED)
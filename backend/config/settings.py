@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,7 +32,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -41,11 +42,15 @@ INSTALLED_APPS = [
     'rest_framework',
     'drf_spectacular',
     # Local
+    'apps.core.apps.CoreConfig',
     'apps.users.apps.UsersConfig',
     'apps.exercises.apps.ExercisesConfig',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
+    'apps.core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -131,6 +136,21 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_CLASSES': [
+        'apps.core.ratelimit.SlidingWindowThrottle',
+    ],
+}
+
+# Rate limiting (apps.core.ratelimit)
+# 다중 워커 배포에서는 'apps.core.ratelimit.CacheRateLimitBackend' 와 공유 캐시(Redis)를 사용한다.
+RATE_LIMIT_BACKEND = 'apps.core.ratelimit.InMemoryRateLimitBackend'
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMITS = {
+    'signup': '10/h',
+    'login': '30/m',
+    'login_failure': {'rate': '5/30m', 'lockout': '30m'},
+    'sms_send': '5/h',
+    'sms_verify': {'rate': '5/30m', 'lockout': '30m'},
 }
 
 SPECTACULAR_SETTINGS = {
@@ -140,3 +160,88 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# 배포 빌드 시 `python manage.py build_schema` 로 생성한다. (apps.core.schema)
+OPENAPI_SCHEMA_PATH = BASE_DIR / 'build' / 'openapi.json'
+OPENAPI_SCHEMA_MAX_AGE = 300
+
+
+# Background queues (apps.core.background)
+BACKGROUND_QUEUE_EAGER = False
+BACKGROUND_QUEUES = {
+    'sms': {'workers': 4, 'maxsize': 1000},
+    'purge': {'workers': 1, 'maxsize': 100},
+    'heartbeats': {'workers': 1, 'maxsize': 10},
+}
+
+# Exercise session heartbeats (BE_V1_LOG_001)
+HEARTBEAT_FLUSH_INTERVAL = 30
+SESSION_STALE_AFTER = 600
+
+# Response compression (apps.core.compression)
+# brotli 패키지가 설치되어 있으면 br 을 우선 협상한다.
+COMPRESSION_ENABLED = True
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Idempotency-Key (apps.core.idempotency)
+# 만료된 키는 `python manage.py sweep_idempotency_keys` 로 주기적으로 삭제한다.
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IDEMPOTENCY_WAIT_TIMEOUT = 10
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# Exercise media locale (apps.exercises.media)
+# Accept-Language 의 어떤 로케일에도 미디어가 없을 때 사용하는 로케일
+MEDIA_DEFAULT_LOCALE = 'ko-KR'
+# 미디어 버전 토큰(DB)을 프로세스 캐시에 두는 시간(초). 다른 워커의 미디어 변경은 이 시간 안에 반영된다.
+MEDIA_VERSION_TTL = 5
+# ingest_media 가 등록하는 s3_key 접두사와 공개 URL 기준 주소 (None 이면 url 을 채우지 않는다)
+MEDIA_S3_PREFIX = 'media'
+MEDIA_BASE_URL = os.environ.get('MEDIA_BASE_URL')
+
+# Workout reports (apps.exercises.reports)
+# Exercise.met 이 비어 있는 운동에 쓰는 카테고리별 MET 과 기본 MET
+EXERCISE_CATEGORY_MET = {}
+EXERCISE_DEFAULT_MET = 3.5
+
+# Session history sharding (apps.exercises.sharding)
+# 운동 기록(세션/항목/이벤트/로그 객체)을 나눠 저장할 DB 별칭 목록. 비어 있으면 모든 기록을 default DB 에 둔다.
+# 샤딩 구성은 config.settings_sharded 를 참고하고, 샤드 수를 바꾼 뒤에는 `python manage.py rebalance_history` 를 실행한다.
+HISTORY_SHARDS = []
+
+# Session log bundles (BE_V1_LOG_002)
+# 번들은 LOG_BUNDLE_DIR 에 스테이징되고, 업로더가 같은 키로 S3 에 올린다.
+LOG_BUNDLE_DIR = BASE_DIR / 'var' / 'log_bundles'
+LOG_BUNDLE_PREFIX = 'session-logs'
+
+# SMS device verification (BE_V1_AUTH_008)
+# 다중 워커 배포에서는 'apps.users.verification.CacheVerificationCodeStore' 를 사용한다.
+SMS_PROVIDER = 'apps.users.sms.LocalStubSMSProvider'
+VERIFICATION_CODE_STORE = 'apps.users.verification.InMemoryVerificationCodeStore'
+
+# Trusted devices (apps.users.devices)
+# 오래 사용하지 않은 기기는 `python manage.py prune_devices` 로 주기적으로 삭제한다.
+TRUSTED_DEVICE_CACHE_TTL = 300
+TRUSTED_DEVICE_TOUCH_INTERVAL = 24 * 60 * 60
+TRUSTED_DEVICE_MAX_IDLE_DAYS = 180
+
+# Request metrics (apps.core.metrics)
+# gunicorn 등 다중 프로세스 배포에서는 METRICS_MULTIPROCESS_DIR 을 지정하고 배포 시작 시 비운다.
+# 수집기는 Authorization: Bearer <METRICS_TOKEN> 으로 조회한다. (토큰이 없으면 관리자만 조회 가능)
+# METRICS_ALLOWED_IPS 는 추가 제한이며, 프록시 뒤에서는 REMOTE_ADDR 가 프록시 주소임에 유의한다.
+METRICS_ENABLED = True
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = []
+METRICS_MULTIPROCESS_DIR = os.environ.get('METRICS_MULTIPROCESS_DIR')
+METRICS_DUMP_INTERVAL = 5
+
+# Request profiling (apps.core.profiling)
+# 서명 헤더 값은 `python manage.py profiling_token` 으로 발급한다.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == '1'
+PROFILING_MODE = 'cprofile'  # 'cprofile' | 'sampler'
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_HEADER = 'X-Profile-Token'
+PROFILING_TOKEN_MAX_AGE = 3600
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_RING_SIZE = 50
+PROFILING_SAMPLER_INTERVAL = 0.005
@@ -0,0 +1,37 @@
+"""
+운동 기록 샤딩 설정. (apps.exercises.sharding)
+
+사용자/운동 카탈로그/루틴은 default DB 에, 운동 기록은 HISTORY_SHARD_COUNT 개의 기록 DB 에 둔다.
+로컬에서는 DB 마다 SQLite 파일을 하나씩 사용한다.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=config.settings_sharded python manage.py migrate
+    DJANGO_SETTINGS_MODULE=config.settings_sharded python manage.py migrate --database history_0
+    DJANGO_SETTINGS_MODULE=config.settings_sharded python manage.py migrate --database history_1
+    python -m pytest tests/exercises/test_sharding.py --ds=config.settings_sharded --create-db
+    python -m pytest --ds=config.settings_sharded --create-db   (DB 테스트는 모든 기록 DB 에 접근한다. tests/conftest.py)
+
+기록 DB 의 마이그레이션은 default DB 의 이벤트 타입 사전을 읽으므로 default 를 먼저 마이그레이션한다.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES, MIDDLEWARE
+
+HISTORY_SHARD_COUNT = int(os.environ.get('HISTORY_SHARD_COUNT', 2))
+HISTORY_SHARDS = [f'history_{index}' for index in range(HISTORY_SHARD_COUNT)]
+
+DATABASES = {
+    **DATABASES,
+    **{
+        alias: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / f'{alias}.sqlite3',
+        }
+        for alias in HISTORY_SHARDS
+    },
+}
+DATABASE_ROUTERS = ['apps.exercises.sharding.HistoryShardRouter']
+
+# 요청 사용자의 샤드를 라우터에 알린다. (뷰는 샤딩을 알지 못한다)
+MIDDLEWARE = [*MIDDLEWARE, 'apps.exercises.sharding.HistoryShardMiddleware']
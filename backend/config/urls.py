@@ -14,18 +14,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import path
-
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+from apps.core.views import lazy_view, metrics_view, schema_view
+
+# 관리자 모듈은 앱 로딩(SimpleAdminConfig) 대신 URLconf 로딩 시점에 등록한다.
+admin.autodiscover()
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('metrics', metrics_view, name='metrics'),
+    path('api/schema/', schema_view, name='schema'),
+    path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
     path('api/users/', include('apps.users.urls')),
     path('api/exercises/', include('apps.exercises.urls')),
+    path('api/core/', include('apps.core.urls')),
 ]
 
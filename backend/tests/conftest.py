@@ -0,0 +1,43 @@
+import datetime
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from apps.core.ratelimit import get_backend
+from apps.users.verification import get_store
+
+
+def pytest_collection_modifyitems(items):
+    """
+    기록 샤딩 설정(config.settings_sharded)으로 실행하면 DB 를 쓰는 테스트가 모든 기록 DB 에 접근할 수 있게 한다.
+    """
+    if not getattr(settings, 'HISTORY_SHARDS', None):
+        return
+    for item in items:
+        marker = item.get_closest_marker('django_db')
+        if marker is None and 'db' not in getattr(item, 'fixturenames', ()):
+            continue
+        kwargs = dict(marker.kwargs) if marker is not None else {}
+        kwargs['databases'] = '__all__'
+        item.add_marker(pytest.mark.django_db(**kwargs), append=False)
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """테스트 간 요청 제한 카운터, 인증번호, 캐시가 공유되지 않도록 초기화한다."""
+    get_backend().clear()
+    get_store().clear()
+    cache.clear()
+    yield
+    get_backend().clear()
+    get_store().clear()
+    cache.clear()
+
+
+@pytest.fixture
+def profile_user(db):
+    """필수 프로필 정보(키, 몸무게, 생년월일, 성별)를 모두 입력한 사용자."""
+    return get_user_model().objects.create_user(
+        username='athlete', password='pw', phone_number='01077778888',
+        height_cm=170, weight_kg=65, birthdate=datetime.date(1990, 1, 1), gender='F'
+    )
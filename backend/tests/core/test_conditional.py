@@ -0,0 +1,133 @@
+import gzip
+import json
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core.compression import negotiate
+from apps.exercises.models import ExerciseCategory, Exercise, ExerciseMedia, ExerciseSession, ExerciseSessionItem
+
+
+@pytest.fixture
+def catalog(db):
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    return [
+        Exercise.objects.create(category=category, exercise_name=f'운동{i}', exercise_description='설명 ' * 40)
+        for i in range(10)
+    ]
+
+
+@pytest.mark.django_db
+def test_exercise_list_not_modified(catalog):
+    """
+    운동 목록 조건부 GET 테스트.
+    같은 ETag 로 요청하면 시리얼라이저를 실행하지 않고 304 를 반환하고, 미디어가 추가되거나
+    카테고리 이름이 바뀌면 ETag 가 바뀌는지 검증합니다. 목록에는 Last-Modified 를 붙이지 않습니다.
+    """
+    client = APIClient()
+    url = reverse('exercises:exercise-list')
+    response = client.get(url)
+    etag = response['ETag']
+    assert response.status_code == 200
+    assert etag.startswith('W/"')
+    assert 'Last-Modified' not in response
+
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+    assert cached['ETag'] == etag
+    assert not cached.content
+    # 검증자 집계 쿼리(운동, 카테고리)만 실행되고 목록 조회는 실행되지 않는다.
+    assert len(queries.captured_queries) == 2
+
+    ExerciseMedia.objects.create(exercise=catalog[0], media_type='PICTOGRAM', url='https://cdn/p.png')
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed['ETag'] != etag
+
+    category = catalog[0].category
+    category.display_name = '근력 운동'
+    category.save()
+    renamed = client.get(url, HTTP_IF_NONE_MATCH=changed['ETag'])
+    assert renamed.status_code == 200
+    assert renamed.data[0]['category']['display_name'] == '근력 운동'
+
+    detail_url = reverse('exercises:exercise-detail', kwargs={'pk': catalog[1].pk})
+    detail = client.get(detail_url)
+    assert client.get(detail_url, HTTP_IF_MODIFIED_SINCE=detail['Last-Modified']).status_code == 304
+    category.display_name = '근력'
+    category.save()
+    assert client.get(detail_url, HTTP_IF_NONE_MATCH=detail['ETag']).status_code == 200
+
+    # 목록은 If-Modified-Since 만으로 304 를 반환하지 않는다. (행 삭제는 MAX(updated_at)을 바꾸지 않는다)
+    catalog[-1].delete()
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=detail['Last-Modified']).status_code == 200
+
+
+@pytest.mark.django_db
+def test_session_conditional(profile_user, catalog):
+    """
+    세션 조건부 GET 테스트.
+    If-Modified-Since 로 상세 조회 시 304 를 반환하고, 세션 항목이 추가되면 목록 ETag 가 바뀌는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    session = ExerciseSession.objects.create(user=profile_user, mode='MANUAL', started_at=timezone.now())
+
+    detail = client.get(reverse('exercises:session-detail', kwargs={'pk': session.pk}))
+    cached = client.get(
+        reverse('exercises:session-detail', kwargs={'pk': session.pk}), HTTP_IF_MODIFIED_SINCE=detail['Last-Modified']
+    )
+    assert cached.status_code == 304
+
+    url = reverse('exercises:session-list')
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    ExerciseSessionItem.objects.create(
+        session=session, exercise=catalog[0], sequence_no=1, ended_at=timezone.now() + timedelta(seconds=5)
+    )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_profile_etag_changes_on_update(profile_user):
+    """
+    내 정보 조건부 GET 테스트.
+    일부 필드만 저장(update_fields)해도 updated_at 이 갱신되어 ETag 가 바뀌는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('users:user-detail', kwargs={'pk': profile_user.pk})
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    profile_user.weight_kg = 60
+    profile_user.save(update_fields=['weight_kg'])
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_response_compression(catalog, settings):
+    """
+    응답 압축 테스트.
+    임계값 이상의 JSON 응답은 gzip 으로 압축되고, 임계값 미만이거나 클라이언트가 허용하지 않으면 그대로 보내는지 검증합니다.
+    """
+    client = APIClient()
+    url = reverse('exercises:exercise-list')
+    plain = client.get(url)
+    compressed = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=1.0, identity;q=0.5')
+
+    assert compressed['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed['Vary']
+    assert len(compressed.content) < len(plain.content)
+    assert json.loads(gzip.decompress(compressed.content)) == json.loads(plain.content)
+    assert compressed['ETag'] == plain['ETag']
+
+    settings.COMPRESSION_MIN_SIZE = len(plain.content) + 1
+    assert not client.get(url, HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding')
+
+    assert negotiate('gzip;q=0, deflate') is None
+    assert negotiate('*') in ('br', 'gzip')
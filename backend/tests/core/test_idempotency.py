@@ -0,0 +1,98 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core.idempotency import sweep_expired
+from apps.core.models import IdempotencyKey
+from apps.exercises.models import ExerciseSession
+
+
+@pytest.fixture
+def client(profile_user):
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    return client
+
+
+def _session_body(mode='MANUAL'):
+    return {'mode': mode, 'started_at': '2026-01-01T09:00:00Z'}
+
+
+@pytest.mark.django_db
+def test_idempotent_replay(client, profile_user):
+    """
+    재시도 응답 재생 테스트.
+    같은 키로 재시도하면 세션을 다시 만들지 않고 첫 응답을 그대로 돌려주는지 검증합니다.
+    """
+    url = reverse('exercises:session-list')
+    first = client.post(url, _session_body(), format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+    second = client.post(url, _session_body(), format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+
+    assert first.status_code == second.status_code == 201
+    assert second.data == first.data
+    assert second['Idempotent-Replayed'] == 'true'
+    assert ExerciseSession.objects.filter(user=profile_user).count() == 1
+
+    record = IdempotencyKey.objects.get(key='retry-1')
+    assert record.owner == f'user:{profile_user.pk}'
+    assert record.status == 'COMPLETED'
+
+    # 키가 없으면 기존처럼 매번 생성된다.
+    client.post(url, _session_body(), format='json')
+    assert ExerciseSession.objects.filter(user=profile_user).count() == 2
+
+
+@pytest.mark.django_db
+def test_idempotent_key_reused(client):
+    """
+    키 재사용 테스트.
+    같은 키로 다른 본문을 보내면 422 IDEMPOTENCY_KEY_MISMATCH 를 반환하는지 검증합니다.
+    """
+    url = reverse('exercises:session-list')
+    client.post(url, _session_body(), format='json', HTTP_IDEMPOTENCY_KEY='retry-2')
+    response = client.post(url, _session_body('CURRICULUM'), format='json', HTTP_IDEMPOTENCY_KEY='retry-2')
+
+    assert response.status_code == 422
+    assert response.data['error'] == 'IDEMPOTENCY_KEY_MISMATCH'
+
+
+@pytest.mark.django_db
+def test_idempotent_in_progress(client, profile_user, settings):
+    """
+    처리 중 키 테스트.
+    첫 요청이 아직 처리 중이면 대기 시간 이후 409 를 반환하고, 중단된 요청의 키는 새로 처리하는지 검증합니다.
+    """
+    settings.IDEMPOTENCY_WAIT_TIMEOUT = 0.1
+    url = reverse('exercises:session-list')
+    response = client.post(url, _session_body(), format='json', HTTP_IDEMPOTENCY_KEY='retry-3')
+    record = IdempotencyKey.objects.get(key='retry-3')
+    IdempotencyKey.objects.filter(pk=record.pk).update(status='IN_PROGRESS', response_body=None)
+
+    response = client.post(url, _session_body(), format='json', HTTP_IDEMPOTENCY_KEY='retry-3')
+    assert response.status_code == 409
+    assert response.data['error'] == 'IDEMPOTENCY_KEY_IN_PROGRESS'
+
+    IdempotencyKey.objects.filter(pk=record.pk).update(created_at=timezone.now() - timedelta(hours=1))
+    response = client.post(url, _session_body(), format='json', HTTP_IDEMPOTENCY_KEY='retry-3')
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response
+
+
+@pytest.mark.django_db
+def test_sweep_expired(profile_user):
+    """
+    만료 키 정리 테스트.
+    만료된 키만 청크 단위로 삭제되는지 검증합니다.
+    """
+    now = timezone.now()
+    owner = f'user:{profile_user.pk}'
+    for index in range(5):
+        IdempotencyKey.objects.create(owner=owner, key=f'old-{index}', fingerprint='x', expires_at=now - timedelta(minutes=1))
+    IdempotencyKey.objects.create(owner=owner, key='fresh', fingerprint='x', expires_at=now + timedelta(hours=1))
+
+    assert sweep_expired(chunk_size=2) == 5
+    assert list(IdempotencyKey.objects.values_list('key', flat=True)) == ['fresh']
+    call_command('sweep_idempotency_keys')
+    assert IdempotencyKey.objects.count() == 1
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core import metrics
+from apps.core.metrics import MetricsRegistry, render
+
+
+@pytest.fixture
+def clean_registry():
+    metrics.registry.clear()
+    yield metrics.registry
+    metrics.registry.clear()
+
+
+def test_registry_merges_thread_shards():
+    """
+    스레드 샤드 합산 테스트.
+    여러 스레드에서 기록한 카운터와 히스토그램이 수집 시 합산되고, 종료된 스레드의 값도 유지되는지 검증합니다.
+    """
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    labels = (('view', 'V.list'),)
+
+    def work():
+        for _ in range(100):
+            registry.inc('http_requests_total', labels)
+            registry.observe('http_request_duration_seconds', labels, 0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.observe('http_request_duration_seconds', labels, 0.05)
+
+    snapshot = registry.snapshot()
+    assert snapshot['counters'][('http_requests_total', labels)] == 400
+    assert snapshot['histograms'][('http_request_duration_seconds', labels)][:3] == [1, 400, 0]
+    # 종료된 스레드 샤드는 retired 로 합쳐져도 값이 유지된다.
+    assert registry.snapshot()['counters'][('http_requests_total', labels)] == 400
+
+    text = render(snapshot, buckets=(0.1, 1.0))
+    assert 'http_request_duration_seconds_bucket{view="V.list",le="0.1"} 1' in text
+    assert 'http_request_duration_seconds_bucket{view="V.list",le="1.0"} 401' in text
+    assert 'http_request_duration_seconds_bucket{view="V.list",le="+Inf"} 401' in text
+    assert 'http_request_duration_seconds_count{view="V.list"} 401' in text
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_labels_by_action(profile_user, clean_registry, settings):
+    """
+    요청 계측 테스트.
+    ViewSet 액션 라벨로 요청 수, DB 쿼리 수, 시리얼라이저 시간이 기록되고 텍스트 형식으로 노출되는지 검증합니다.
+    """
+    settings.METRICS_TOKEN = 'scrape-secret'
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    assert client.get(reverse('exercises:routine-list')).status_code == 200
+
+    response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    text = response.content.decode()
+    assert 'http_requests_total{view="RoutineViewSet.list",method="GET",status="200"} 1' in text
+    assert 'http_request_duration_seconds_count{view="RoutineViewSet.list"} 1' in text
+    assert 'db_queries_total{view="RoutineViewSet.list"}' in text
+    assert 'serializer_duration_seconds_total{view="RoutineViewSet.list"}' in text
+
+    snapshot = metrics.collect()
+    assert snapshot['counters'][('db_queries_total', (('view', 'RoutineViewSet.list'),))] >= 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_forbidden(client, settings, django_user_model):
+    """
+    수집 엔드포인트 접근 제한 테스트.
+    로컬 프록시를 거친 요청(REMOTE_ADDR=127.0.0.1)이라도 토큰이 없거나 틀리면 403 을 반환하고,
+    관리자 로그인 또는 올바른 토큰이면 조회되며, 허용되지 않은 주소에서는 토큰이 있어도 403 인지 검증합니다.
+    """
+    settings.METRICS_TOKEN = 'scrape-secret'
+    url = reverse('metrics')
+    assert client.get(url, REMOTE_ADDR='127.0.0.1').status_code == 403
+    assert client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code == 403
+    assert client.get(url, HTTP_AUTHORIZATION='Bearer scrape-secret').status_code == 200
+
+    admin = django_user_model.objects.create_user(username='ops', password='pw', is_staff=True)
+    client.force_login(admin)
+    assert client.get(url).status_code == 200
+    client.logout()
+
+    settings.METRICS_ALLOWED_IPS = ['10.0.0.1']
+    assert client.get(url, HTTP_AUTHORIZATION='Bearer scrape-secret').status_code == 403
+
+
+def test_multiprocess_merge(tmp_path, settings, clean_registry):
+    """
+    다중 프로세스 모드 테스트.
+    다른 프로세스가 기록한 스냅샷 파일과 현재 프로세스의 측정값이 합산되는지 검증합니다.
+    """
+    settings.METRICS_MULTIPROCESS_DIR = str(tmp_path)
+    labels = (('view', 'V.list'),)
+    other = MetricsRegistry()
+    other.inc('db_queries_total', labels, 3)
+    (tmp_path / 'metrics-99999.json').write_text(json.dumps(metrics._encode(other.snapshot())))
+
+    metrics.registry.inc('db_queries_total', labels, 2)
+    snapshot = metrics.collect()
+
+    assert snapshot['counters'][('db_queries_total', labels)] == 5
+    assert (tmp_path / f'metrics-{os.getpid()}.json').exists()
@@ -0,0 +1,108 @@
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.middleware import ProfilingMiddleware
+from apps.core.profiling import get_ring, make_token
+
+
+@pytest.fixture
+def profiling_settings(settings, tmp_path):
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_DIR = tmp_path
+    settings.PROFILING_RING_SIZE = 2
+    settings.PROFILING_SAMPLE_RATE = 0.0
+    return settings
+
+
+def slow_view(request):
+    sum(i * i for i in range(20000))
+    return HttpResponse('ok')
+
+
+def test_disabled_middleware_not_used(settings):
+    """
+    비활성화 테스트.
+    PROFILING_ENABLED 가 False 이면 미들웨어가 체인에서 제외되는지 검증합니다.
+    """
+    settings.PROFILING_ENABLED = False
+    with pytest.raises(MiddlewareNotUsed):
+        ProfilingMiddleware(slow_view)
+
+
+def test_signed_header_profiles_request(profiling_settings):
+    """
+    서명 헤더 프로파일링 테스트.
+    유효한 서명 헤더를 가진 요청만 프로파일링되어 결과와 메타데이터가 저장되는지 검증합니다.
+    """
+    middleware = ProfilingMiddleware(slow_view)
+    factory = RequestFactory()
+
+    response = middleware(factory.get('/api/exercises/', HTTP_X_PROFILE_TOKEN=make_token()))
+    profile_id = response['X-Profile-Id']
+    metadata = get_ring().metadata(profile_id)
+    assert metadata['trigger'] == 'header'
+    assert metadata['path'] == '/api/exercises/'
+    assert metadata['status'] == 200
+    assert (profiling_settings.PROFILING_DIR / f'{profile_id}.prof').exists()
+
+    forged = middleware(factory.get('/api/exercises/', HTTP_X_PROFILE_TOKEN='profile:forged:sig'))
+    assert 'X-Profile-Id' not in forged
+    assert 'X-Profile-Id' not in middleware(factory.get('/api/exercises/'))
+
+
+def test_profile_save_error_keeps_response(profiling_settings, monkeypatch, caplog):
+    """
+    프로파일 저장 실패 테스트.
+    프로파일 저장소에 쓰지 못해도 요청은 원래 응답(200)을 받고 오류는 로그로 남는지 검증합니다.
+    """
+    middleware = ProfilingMiddleware(slow_view)
+
+    def broken_save(*args, **kwargs):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(middleware.ring, 'save', broken_save)
+    response = middleware(RequestFactory().get('/api/exercises/', HTTP_X_PROFILE_TOKEN=make_token()))
+    assert response.status_code == 200
+    assert 'X-Profile-Id' not in response
+    assert 'failed to save request profile' in caplog.text
+
+
+def test_ring_keeps_latest(profiling_settings):
+    """
+    프로파일 저장소 크기 제한 테스트.
+    표본 추출된 프로파일이 PROFILING_RING_SIZE 를 넘으면 오래된 것부터 삭제되는지 검증합니다.
+    """
+    profiling_settings.PROFILING_SAMPLE_RATE = 1.0
+    profiling_settings.PROFILING_MODE = 'sampler'
+    middleware = ProfilingMiddleware(slow_view)
+    ids = [middleware(RequestFactory().get('/')).get('X-Profile-Id') for _ in range(3)]
+
+    ring = get_ring()
+    assert ring.ids() == sorted(ids)[1:]
+    assert ring.metadata(ids[-1])['mode'] == 'sampler'
+    assert len(list(profiling_settings.PROFILING_DIR.iterdir())) == 4
+
+
+@pytest.mark.django_db
+def test_profile_download_admin_only(profiling_settings, profile_user, django_user_model):
+    """
+    프로파일 다운로드 권한 테스트.
+    관리자만 프로파일 목록과 결과 파일을 조회할 수 있는지 검증합니다.
+    """
+    middleware = ProfilingMiddleware(slow_view)
+    profile_id = middleware(RequestFactory().get('/', HTTP_X_PROFILE_TOKEN=make_token()))['X-Profile-Id']
+    client = APIClient()
+
+    client.force_authenticate(user=profile_user)
+    assert client.get(reverse('core:profile-list')).status_code == 403
+
+    admin = django_user_model.objects.create_superuser(username='admin', password='pw')
+    client.force_authenticate(user=admin)
+    listed = client.get(reverse('core:profile-list'))
+    assert [entry['profile_id'] for entry in listed.data] == [profile_id]
+    download = client.get(reverse('core:profile-detail', kwargs={'pk': profile_id}))
+    assert download.status_code == 200
+    assert download['Content-Disposition'].startswith('attachment')
@@ -0,0 +1,150 @@
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.response import Response
+from apps.core import ratelimit
+from apps.core.ratelimit import (
+    Rate, InMemoryRateLimitBackend, CacheRateLimitBackend, parse_duration, rate_limit
+)
+
+
+def test_parse_rate():
+    """
+    정책 문자열 파싱 테스트.
+    '5/30m' 형식과 잠금 시간이 포함된 딕셔너리 형식을 모두 지원하는지 검증합니다.
+    """
+    assert parse_duration('m') == 60
+    assert parse_duration('30m') == 1800
+    assert Rate.parse('5/30m') == Rate(limit=5, window=1800)
+    assert Rate.parse({'rate': '5/m', 'lockout': '30m'}) == Rate(limit=5, window=60, lockout=1800)
+
+
+def test_in_memory_sliding_window():
+    """
+    슬라이딩 윈도우 테스트.
+    한도 초과 시 차단되고, 가장 오래된 기록이 윈도우를 벗어나면 다시 허용되는지 검증합니다.
+    """
+    backend = InMemoryRateLimitBackend()
+    rate = Rate(limit=3, window=60)
+
+    for offset in (0, 10, 20):
+        assert backend.hit('k', rate, now=1000 + offset).allowed
+
+    blocked = backend.hit('k', rate, now=1030)
+    assert not blocked.allowed
+    assert blocked.retry_after == 30
+
+    # 첫 기록(1000)이 윈도우를 벗어나면 1회 허용
+    assert backend.hit('k', rate, now=1061).allowed
+    assert not backend.hit('k', rate, now=1062).allowed
+    # 다른 키는 영향 없음
+    assert backend.check('other', rate, now=1062).remaining == 3
+
+
+def test_in_memory_lockout():
+    """
+    잠금 테스트.
+    한도에 도달하면 윈도우와 무관하게 잠금 시간 동안 차단되는지 검증합니다.
+    """
+    backend = InMemoryRateLimitBackend()
+    rate = Rate(limit=5, window=60, lockout=1800)
+
+    for i in range(5):
+        assert backend.hit('sms', rate, now=1000 + i).allowed
+
+    status = backend.check('sms', rate, now=1100)
+    assert not status.allowed
+    assert status.retry_after == 1704
+    assert backend.check('sms', rate, now=2805).allowed
+
+
+def test_cache_backend_shared_counter():
+    """
+    공유 캐시 백엔드 테스트.
+    같은 캐시를 사용하는 서로 다른 백엔드 인스턴스가 카운터를 공유하는지 검증합니다.
+    """
+    cache.clear()
+    rate = Rate(limit=2, window=60)
+    first, second = CacheRateLimitBackend(), CacheRateLimitBackend()
+
+    assert first.hit('shared', rate, now=6000).allowed
+    assert second.hit('shared', rate, now=6001).allowed
+    assert not first.hit('shared', rate, now=6002).allowed
+    cache.clear()
+
+
+def test_release_undoes_hit_and_its_lockout():
+    """
+    예약 반환 테스트.
+    release 가 같은 시각의 hit 를 되돌리고, 그 hit 로 걸린 잠금도 해제하는지 두 백엔드 모두 검증합니다.
+    """
+    cache.clear()
+    rate = Rate(limit=2, window=60, lockout=1800)
+    for backend in (InMemoryRateLimitBackend(), CacheRateLimitBackend()):
+        assert backend.hit('r', rate, now=6000).allowed
+        assert backend.hit('r', rate, now=6001).allowed
+        assert not backend.check('r', rate, now=6002).allowed
+
+        backend.release('r', rate, now=6001)
+        status = backend.check('r', rate, now=6002)
+        assert status.allowed
+        assert status.remaining == 1
+    cache.clear()
+
+
+def _limited_view(status_codes, during=None):
+    codes = iter(status_codes)
+
+    @rate_limit('test', keys=('ip', 'phone'), count='failure')
+    def action(view, request):
+        if during:
+            during()
+        return Response(status=next(codes))
+    return action
+
+
+def _request(phone, ip='10.0.0.1'):
+    request = RequestFactory().post('/', REMOTE_ADDR=ip)
+    request.data = {'phone_number': phone}
+    return request
+
+
+def test_failure_count_reserves_before_running(settings, monkeypatch):
+    """
+    실패 집계 예약 테스트.
+    실행 중인 요청이 한도를 미리 차지해 동시 요청이 한도를 넘지 못하고, 성공하면 반환되는지 검증합니다.
+    """
+    settings.RATE_LIMITS = {'test': '1/m'}
+    monkeypatch.setattr(ratelimit, '_backend', InMemoryRateLimitBackend())
+    concurrent = []
+
+    # 첫 요청이 실행되는 동안 들어온 요청은 차단된다.
+    first = _limited_view([200], during=lambda: concurrent.append(
+        _limited_view([400])(None, _request('01012345678')).status_code
+    ))
+    assert first(None, _request('01012345678')).status_code == 200
+    assert concurrent == [429]
+    # 성공한 요청의 예약은 반환된다.
+    assert _limited_view([400])(None, _request('01012345678')).status_code == 400
+    assert _limited_view([400])(None, _request('01012345678')).status_code == 429
+
+
+def test_blocked_key_does_not_consume_other_keys(settings, monkeypatch):
+    """
+    다중 키 제한 테스트.
+    한 키가 차단된 요청은 다른 키의 한도를 소모하지 않는지 검증합니다.
+    """
+    settings.RATE_LIMITS = {'test': '2/m'}
+    monkeypatch.setattr(ratelimit, '_backend', InMemoryRateLimitBackend())
+
+    @rate_limit('test', keys=('ip', 'phone'))
+    def action(view, request):
+        return Response(status=200)
+
+    assert action(None, _request('01011112222', ip='10.0.0.1')).status_code == 200
+    assert action(None, _request('01011112222', ip='10.0.0.2')).status_code == 200
+    # 전화번호 키가 막힌 요청들은 IP 한도를 쓰지 않는다.
+    for _ in range(3):
+        assert action(None, _request('01011112222', ip='10.0.0.1')).status_code == 429
+    assert action(None, _request('01033334444', ip='10.0.0.1')).status_code == 200
+    assert action(None, _request('01055556666', ip='10.0.0.1')).status_code == 429
@@ -0,0 +1,54 @@
+import json
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from apps.core.management.commands.importtime import parse_importtime
+
+
+@pytest.fixture
+def schema_file(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_PATH = tmp_path / 'openapi.json'
+    return settings.OPENAPI_SCHEMA_PATH
+
+
+@pytest.mark.django_db
+def test_prebuilt_schema_served_with_etag(client, schema_file):
+    """
+    사전 생성 스키마 테스트.
+    build_schema 로 만든 파일이 ETag 와 함께 제공되고, 같은 ETag 로 요청하면 304 를 반환하는지 검증합니다.
+    """
+    call_command('build_schema')
+    assert '/api/exercises/routines/' in json.loads(schema_file.read_bytes())['paths']
+
+    response = client.get(reverse('schema'))
+    assert response.status_code == 200
+    assert response.content == schema_file.read_bytes()
+    etag = response['ETag']
+
+    cached = client.get(reverse('schema'), HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+    assert cached['ETag'] == etag
+
+
+@pytest.mark.django_db
+def test_schema_runtime_fallback(client, schema_file):
+    """
+    스키마 파일이 없을 때의 테스트.
+    사전 생성 파일이 없으면 요청 시점에 스키마를 생성해 반환하는지 검증합니다.
+    """
+    response = client.get(reverse('schema'), {'format': 'json'})
+    assert response.status_code == 200
+    assert 'paths' in json.loads(response.content)
+
+
+def test_parse_importtime():
+    """
+    import 시간 출력 파싱 테스트.
+    `-X importtime` 출력에서 모듈별 self/cumulative 시간을 읽는지 검증합니다.
+    """
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      1500 |      42000 | django.urls\n"
+    )
+    assert parse_importtime(output) == [('_io', 120, 120), ('django.urls', 1500, 42000)]
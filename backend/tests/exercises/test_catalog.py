@@ -0,0 +1,92 @@
+import io
+import json
+import pytest
+from apps.exercises.catalog import CatalogError, export_catalog, import_catalog, read_catalog, write_catalog
+from apps.exercises.media import media_version
+from apps.exercises.models import CatalogVersion, ExerciseCategory, Exercise, ExerciseMedia
+
+
+def _seed():
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, code='SQUAT', exercise_name='스쿼트')
+    lunge = Exercise.objects.create(category=category, code='LUNGE', exercise_name='런지')
+    ExerciseMedia.objects.create(exercise=squat, media_type='GUIDE_AUDIO', url='https://cdn/squat.mp3')
+    return squat, lunge
+
+
+def _dump(fmt):
+    fp = io.StringIO()
+    write_catalog(export_catalog(), fp, fmt)
+    return fp.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fmt', ['json', 'csv'])
+def test_catalog_round_trip(fmt):
+    """
+    카탈로그 내보내기/가져오기 왕복 테스트.
+    내보낸 파일을 그대로 가져오면 변경이 없고 카탈로그 버전도 오르지 않는지 검증합니다.
+    """
+    _seed()
+    diff, version = import_catalog(read_catalog(_dump(fmt), fmt))
+    assert not diff
+    assert version == 0
+    assert not CatalogVersion.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_catalog_import_upsert():
+    """
+    카탈로그 가져오기 테스트.
+    생성/변경/비활성화를 한 번에 적용하고 카탈로그 버전을 한 번만 올리며 미디어 버전 토큰을 갱신하는지 검증합니다.
+    """
+    squat, lunge = _seed()
+    before = media_version()
+    document = json.loads(_dump('json'))
+    document['exercises'] = [exercise for exercise in document['exercises'] if exercise['code'] != 'LUNGE']
+    document['exercises'][0]['exercise_name'] = '와이드 스쿼트'
+    document['exercises'][0]['media'][0]['duration_ms'] = 4200
+    document['exercises'].append({
+        'code': 'PLANK', 'category_id': 'STR', 'exercise_name': '플랭크',
+        'media': [{'media_type': 'GUIDE_AUDIO', 'locale': 'en-US', 'url': 'https://cdn/plank.mp3'}],
+    })
+
+    diff, version = import_catalog(read_catalog(json.dumps(document)))
+
+    assert version == 1
+    assert diff.summary()['exercises_created'] == 1
+    assert diff.summary()['exercises_updated'] == 1
+    assert diff.summary()['exercises_deactivated'] == 1
+    assert CatalogVersion.objects.get().summary == diff.summary()
+    squat.refresh_from_db()
+    lunge.refresh_from_db()
+    assert squat.exercise_name == '와이드 스쿼트'
+    assert squat.updated_at > squat.created_at
+    assert squat.media_contents.get().duration_ms == 4200
+    assert lunge.is_active is False
+    assert Exercise.objects.get(code='PLANK').media_contents.get().locale == 'en-US'
+    assert media_version() != before
+
+
+@pytest.mark.django_db
+def test_catalog_import_rejects_invalid():
+    """
+    카탈로그 가져오기 거부 테스트.
+    다른 가져오기 이후의 오래된 파일과 잘못된 행을 변경 없이 거부하는지 검증합니다.
+    """
+    _seed()
+    stale = _dump('json')
+    document = json.loads(stale)
+    document['exercises'][0]['exercise_name'] = '변경'
+    import_catalog(read_catalog(json.dumps(document)))
+
+    with pytest.raises(CatalogError):
+        import_catalog(read_catalog(stale))
+    assert CatalogVersion.objects.count() == 1
+
+    document = json.loads(_dump('json'))
+    document['exercises'].append({'category_id': 'STR', 'exercise_name': '코드 없음'})
+    document['exercises'][0]['media'].append({'media_type': 'VIDEO'})
+    with pytest.raises(CatalogError) as excinfo:
+        read_catalog(json.dumps(document))
+    assert len(excinfo.value.errors) == 2
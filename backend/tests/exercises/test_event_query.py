@@ -0,0 +1,79 @@
+import datetime
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises import events
+from apps.exercises.models import ExerciseSession, ExerciseSessionEvent
+
+
+@pytest.fixture
+def long_session(profile_user):
+    """3시간 세션: 1초마다 PLAY, 10초마다 PAUSE, 변환 전(legacy) VUI_CMD 3건"""
+    events.clear_cache()
+    session = ExerciseSession.objects.create(user=profile_user, mode='MANUAL', started_at=timezone.now())
+    rows = [events.build_event(session, 'PLAY', ms, {'position_ms': ms}) for ms in range(0, 3 * 3600 * 1000, 1000)]
+    rows += [events.build_event(session, 'PAUSE', ms, {'position_ms': ms}) for ms in range(0, 3 * 3600 * 1000, 10000)]
+    rows += [
+        ExerciseSessionEvent(session=session, event_time_ms=ms, event_type='VUI_CMD', payload={'command': '다음'})
+        for ms in (500, 5500, 3 * 3600 * 1000 - 1)
+    ]
+    ExerciseSessionEvent.objects.bulk_create(rows, batch_size=2000)
+    yield session
+    events.clear_cache()
+
+
+@pytest.mark.django_db
+def test_event_query_pages(profile_user, long_session):
+    """
+    세션 이벤트 조회 테스트.
+    타입/시간 범위 필터를 압축/legacy 행에 함께 적용하고 키셋 커서로 빠짐없이 페이지를 나누는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-event-query', args=[long_session.pk])
+
+    seen, cursor = [], None
+    while True:
+        params = {'types': 'PAUSE,VUI_CMD', 'since_ms': 0, 'until_ms': 60000, 'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get(url, params)
+        assert response.status_code == 200
+        seen += [(event['event_time_ms'], event['event_type']) for event in response.data['results']]
+        cursor = response.data['next_cursor']
+        if cursor is None:
+            break
+    assert seen == [(0, 'PAUSE'), (500, 'VUI_CMD'), (5500, 'VUI_CMD')] + [(ms, 'PAUSE') for ms in range(10000, 60000, 10000)]
+
+    assert client.get(url, {'types': 'UNKNOWN'}).data == {'results': [], 'next_cursor': None}
+    assert client.get(url, {'cursor': '!!'}).data['error'] == 'INVALID_CURSOR'
+    assert client.get(url, {'since_ms': 10, 'until_ms': 5}).status_code == 400
+
+    stranger = get_user_model().objects.create_user(username='stranger', password='pw')
+    client.force_authenticate(user=stranger)
+    assert client.get(url).status_code in (403, 404)
+
+
+@pytest.mark.django_db
+def test_event_query_downsample(profile_user, long_session):
+    """
+    타임라인 다운샘플링 테스트.
+    3시간 세션을 지정한 개수 이하의 구간으로 나눠 구간별 타입별 개수만 반환하는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-event-query', args=[long_session.pk])
+
+    data = client.get(url, {'buckets': 60}).data
+    assert len(data['buckets']) == 60
+    assert data['bucket_ms'] == 180000
+    assert data['buckets'][0]['counts'] == {'PLAY': 180, 'PAUSE': 18, 'VUI_CMD': 2}
+    assert data['buckets'][-1]['counts'] == {'PLAY': 180, 'PAUSE': 18, 'VUI_CMD': 1}
+    assert sum(bucket['total'] for bucket in data['buckets']) == ExerciseSessionEvent.objects.filter(session=long_session).count()
+
+    data = client.get(url, {'buckets': 4, 'types': 'PAUSE', 'since_ms': 0, 'until_ms': 40000}).data
+    assert [(bucket['start_ms'], bucket['counts']) for bucket in data['buckets']] == [
+        (0, {'PAUSE': 1}), (10000, {'PAUSE': 1}), (20000, {'PAUSE': 1}), (30000, {'PAUSE': 1})
+    ]
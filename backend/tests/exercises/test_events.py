@@ -0,0 +1,136 @@
+import importlib
+import types
+import pytest
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises import events
+from apps.exercises.events import decode_payload, encode_payload
+from apps.exercises.models import EventType, ExerciseSession, ExerciseSessionEvent
+
+
+@pytest.fixture
+def session(profile_user):
+    events.clear_cache()
+    yield ExerciseSession.objects.create(user=profile_user, mode='MANUAL', started_at=timezone.now())
+    events.clear_cache()
+
+
+@pytest.mark.parametrize('event_type, payload, size', [
+    ('PAUSE', {'position_ms': 15000}, 5),
+    ('SEEK_SEGMENT', {'from_ms': 1000, 'to_ms': 60000}, 9),
+    ('SPEED_CHANGE', {'from_rate': 1.0, 'to_rate': 1.25}, 5),
+    # 스키마와 다른 키/타입/범위는 JSON 으로 저장
+    ('SPEED_CHANGE', {'from_rate': 1.0, 'to_rate': 1.255}, None),
+    ('PAUSE', {'position_ms': 15000, 'reason': 'VUI'}, None),
+    ('PAUSE', {'position_ms': -1}, None),
+    ('LOAD_FAIL', {'media_type': 'GUIDE_AUDIO', 'error': '타임아웃'}, None),
+    ('PLAY', [1, 2], None),
+])
+def test_payload_codec_round_trip(event_type, payload, size):
+    """
+    페이로드 코덱 테스트.
+    스키마에 맞는 페이로드는 고정 크기 구조체로, 그 외에는 JSON 으로 저장되고 원래 값으로 복원되는지 검증합니다.
+    """
+    data = encode_payload(event_type, payload)
+    assert decode_payload(data) == payload
+    if size is None:
+        assert data[0] == events.JSON_TAG
+    else:
+        assert len(data) == size
+
+
+@pytest.mark.django_db
+def test_events_api_round_trip(profile_user, session):
+    """
+    이벤트 기록/조회 API 테스트.
+    이벤트가 타입 코드와 바이너리로 저장되고, 조회 시 legacy 행과 함께 원래 형태로 복원되는지 검증합니다.
+    """
+    ExerciseSessionEvent.objects.create(session=session, event_time_ms=0, event_type='PLAY', payload={'position_ms': 0})
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-events', kwargs={'pk': session.pk})
+
+    response = client.post(url, [
+        {'event_time_ms': 1000, 'event_type': 'PAUSE', 'payload': {'position_ms': 1000}},
+        {'event_time_ms': 2000, 'event_type': 'VUI_CMD', 'payload': {'command': '다음'}},
+        {'event_time_ms': 3000, 'event_type': 'PAUSE'},
+    ], format='json')
+    assert response.status_code == 201
+    assert EventType.objects.count() == 2
+    stored = ExerciseSessionEvent.objects.get(session=session, event_time_ms=1000)
+    assert stored.event_type is None and stored.payload is None
+    assert len(bytes(stored.payload_bin)) == 5
+
+    response = client.get(url)
+    assert [(e['event_type'], e['payload']) for e in response.data] == [
+        ('PLAY', {'position_ms': 0}),
+        ('PAUSE', {'position_ms': 1000}),
+        ('VUI_CMD', {'command': '다음'}),
+        ('PAUSE', None),
+    ]
+
+
+@pytest.mark.django_db
+def test_events_reject_unknown_type(profile_user, session):
+    """
+    알 수 없는 이벤트 타입 거부 테스트.
+    정의되지 않은 타입을 보내면 400 을 반환하고 이벤트 타입 사전에 추가하지 않는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-events', kwargs={'pk': session.pk})
+
+    response = client.post(url, [
+        {'event_time_ms': 0, 'event_type': 'PLAY'},
+        {'event_time_ms': 1000, 'event_type': 'RANDOM_1234'},
+    ], format='json')
+    assert response.status_code == 400
+    assert not EventType.objects.exists()
+    assert not ExerciseSessionEvent.objects.filter(session=session).exists()
+    with pytest.raises(ValueError):
+        events.intern_type('RANDOM_1234')
+
+
+@pytest.mark.django_db
+def test_convert_legacy_events(session):
+    """
+    legacy 이벤트 변환 마이그레이션 테스트.
+    기존 행이 청크 단위로 타입 코드와 바이너리 페이로드로 변환되고 값이 보존되는지 검증합니다.
+    """
+    migration = importlib.import_module('apps.exercises.migrations.0006_convert_session_events')
+    ExerciseSessionEvent.objects.bulk_create([
+        ExerciseSessionEvent(session=session, event_time_ms=i, event_type='SPEED_CHANGE' if i % 2 else 'PAUSE',
+                             payload={'from_rate': 1.0, 'to_rate': 1.5} if i % 2 else {'position_ms': i})
+        for i in range(5)
+    ])
+    migration.CHUNK_SIZE = 2
+    try:
+        migration.convert_events(django_apps, types.SimpleNamespace(connection=connections[session._state.db]))
+    finally:
+        migration.CHUNK_SIZE = 2000
+
+    assert not ExerciseSessionEvent.objects.filter(session=session, type__isnull=True).exists()
+    decoded = sorted(
+        (event.event_time_ms,) + events.decode_event(event) for event in ExerciseSessionEvent.objects.filter(session=session)
+    )
+    assert decoded[1] == (1, 'SPEED_CHANGE', {'from_rate': 1.0, 'to_rate': 1.5})
+    assert decoded[4] == (4, 'PAUSE', {'position_ms': 4})
+
+
+@pytest.mark.django_db
+def test_event_storage_report(session, capsys):
+    """
+    저장 크기 보고 명령 테스트.
+    이벤트 타입별 legacy/압축 크기와 100만 건당 절감량을 출력하는지 검증합니다.
+    """
+    ExerciseSessionEvent.objects.bulk_create([
+        events.build_event(session, 'PAUSE', i, {'position_ms': i * 1000}) for i in range(10)
+    ])
+    call_command('event_storage_report')
+    output = capsys.readouterr().out
+    assert 'PAUSE' in output
+    assert '10 events sampled: 25.7 -> 7.0 bytes/event' in output
@@ -0,0 +1,120 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises import events, exports
+from apps.exercises.models import ExerciseCategory, Exercise, ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent
+
+
+@pytest.fixture
+def history(profile_user, monkeypatch):
+    """2025-03-01 ~ 03-05 매일 세션 1건(항목 1건, 이벤트 2건)"""
+    monkeypatch.setattr(exports, 'PAGE_SIZE', 2)
+    events.clear_cache()
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    sessions = []
+    for day in range(1, 6):
+        started = timezone.make_aware(datetime.datetime(2025, 3, day, 9, 0))
+        session = ExerciseSession.objects.create(
+            user=profile_user, mode='MANUAL', started_at=started,
+            ended_at=started + datetime.timedelta(minutes=10), duration_ms=600000
+        )
+        item = ExerciseSessionItem.objects.create(session=session, exercise=squat, sequence_no=1)
+        ExerciseSessionEvent.objects.bulk_create([
+            events.build_event(session, 'PAUSE', 1000, {'position_ms': 1000}, item.pk),
+            events.build_event(session, 'VUI_CMD', 2000, {'command': '다음'}),
+        ])
+        sessions.append(session)
+    yield sessions
+    events.clear_cache()
+
+
+def _body(response):
+    assert response.streaming
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_export_ndjson_period(profile_user, history):
+    """
+    NDJSON 내보내기 테스트.
+    기간 조건에 맞는 세션과 그 항목/이벤트만 키셋 페이지 순서대로 스트리밍되는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    response = client.get(reverse('exercises:session-export'), {'start': '2025-03-02', 'end': '2025-03-04'})
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    records = [json.loads(line) for line in _body(response).decode().splitlines()]
+    sessions = [r for r in records if r['record'] == 'session']
+    assert [s['session_id'] for s in sessions] == [str(s.session_id) for s in history[1:4]]
+    assert sum(r['record'] == 'item' for r in records) == 3
+    assert {r['event_type'] for r in records if r['record'] == 'event'} == {'PAUSE', 'VUI_CMD'}
+    assert records[0]['record'] == 'session' and records[2]['record'] == 'item'
+
+
+@pytest.mark.django_db
+def test_export_csv_gzip(profile_user, history):
+    """
+    CSV gzip 내보내기 테스트.
+    Accept-Encoding 에 gzip 이 있으면 즉시 압축된 CSV 를 보내는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    response = client.get(reverse('exercises:session-export'), {'output': 'csv'}, HTTP_ACCEPT_ENCODING='gzip, br')
+
+    assert response['Content-Encoding'] == 'gzip'
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(_body(response)).decode())))
+    assert len(rows) == 5 * 4
+    event = next(row for row in rows if row['event_type'] == 'VUI_CMD')
+    assert json.loads(event['payload']) == {'command': '다음'}
+
+
+@pytest.mark.django_db
+def test_export_respects_encoding_quality(profile_user, history):
+    """
+    내보내기 인코딩 협상 테스트.
+    gzip;q=0 은 거부로 보아 압축하지 않고, gzip 과 비압축을 모두 거부하면 406 을 반환하는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-export')
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, br')
+    assert response.status_code == 200
+    assert not response.has_header('Content-Encoding')
+    assert len(_body(response).decode().splitlines()) == 5 * 4
+
+    assert client.get(url, HTTP_ACCEPT_ENCODING='*;q=0.5, identity;q=0')['Content-Encoding'] == 'gzip'
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity;q=0')
+    assert response.status_code == 406
+    assert response.data['error'] == 'NOT_ACCEPTABLE'
+
+
+@pytest.mark.django_db
+def test_export_other_user_requires_staff(profile_user, history, django_user_model):
+    """
+    다른 사용자 기록 내보내기 권한 테스트.
+    일반 사용자는 403, 관리자는 대상 사용자의 기록을 받는지 검증합니다.
+    """
+    other = django_user_model.objects.create_user(
+        username='other', password='pw', phone_number='01011112222',
+        height_cm=180, weight_kg=75, birthdate=datetime.date(1985, 5, 5), gender='M'
+    )
+    client = APIClient()
+    client.force_authenticate(user=other)
+    url = reverse('exercises:session-export')
+    assert client.get(url, {'user': profile_user.pk}).status_code == 403
+
+    other.is_staff = True
+    other.save()
+    response = client.get(url, {'user': profile_user.pk})
+    assert response.status_code == 200
+    assert len(_body(response).decode().splitlines()) == 5 * 4
@@ -0,0 +1,133 @@
+import datetime
+import threading
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises.models import ExerciseSession
+from apps.exercises import heartbeats as heartbeat_module
+from apps.exercises.heartbeats import heartbeats, record_heartbeat, sweep_stale_sessions
+
+
+@pytest.fixture
+def started(profile_user):
+    heartbeats.flush()
+    now = timezone.now()
+
+    def create(minutes_ago, **kwargs):
+        return ExerciseSession.objects.create(
+            user=profile_user, mode='MANUAL', started_at=now - timedelta(minutes=minutes_ago), **kwargs
+        )
+    return now, create
+
+
+@pytest.mark.django_db
+def test_heartbeat_buffered(profile_user, started, settings):
+    """
+    핑 기록 테스트.
+    핑은 소유자 확인 이후 DB 쓰기 없이 메모리에 모였다가 flush 시 한 번에 반영되는지 검증합니다.
+    """
+    settings.HEARTBEAT_FLUSH_INTERVAL = 3600
+    _, create = started
+    session = create(5)
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-heartbeat', kwargs={'pk': session.pk})
+
+    assert client.post(url).status_code == 204
+    with CaptureQueriesContext(connection) as queries:
+        assert client.post(url).status_code == 204
+    assert not [q for q in queries.captured_queries if 'exercise_sessions' in q['sql']]
+    session.refresh_from_db()
+    assert session.last_heartbeat_at is None
+
+    assert heartbeats.flush() == 1
+    session.refresh_from_db()
+    assert session.last_heartbeat_at is not None
+
+
+@pytest.mark.django_db
+def test_heartbeat_other_user(profile_user, started, django_user_model):
+    """
+    타인 세션 핑 테스트.
+    다른 사용자의 세션에 핑을 보내면 404 를 반환하는지 검증합니다.
+    """
+    _, create = started
+    session = create(5)
+    other = django_user_model.objects.create_user(
+        username='other', password='pw', phone_number='01011112222',
+        height_cm=180, weight_kg=75, birthdate=datetime.date(1985, 5, 5), gender='M'
+    )
+    client = APIClient()
+    client.force_authenticate(user=other)
+    response = client.post(reverse('exercises:session-heartbeat', kwargs={'pk': session.pk}))
+    assert response.status_code == 404
+    assert len(heartbeats) == 0
+
+
+@pytest.mark.django_db
+def test_sweep_stale_sessions(started):
+    """
+    비정상 종료 세션 정리 테스트.
+    핑이 있던 세션은 마지막 핑 시간으로 APP_KILLED, 핑이 없던 세션은 UNKNOWN/무효로 종료되고
+    종료된 세션과 최근 핑이 있는 세션은 그대로인지 검증합니다.
+    """
+    now, create = started
+    killed = create(60)
+    last_ping = killed.started_at + timedelta(minutes=20)
+    record_heartbeat(killed.pk, at=last_ping)
+    silent = create(60)
+    alive = create(60)
+    record_heartbeat(alive.pk, at=now - timedelta(minutes=1))
+    finished = create(60, ended_at=now - timedelta(minutes=30), duration_ms=1800000)
+
+    assert sweep_stale_sessions(threshold=timedelta(minutes=10), now=now) == 2
+
+    killed.refresh_from_db()
+    assert killed.ended_at == last_ping
+    assert killed.duration_ms == 20 * 60 * 1000
+    assert killed.abnormal_end_reason == 'APP_KILLED'
+    assert killed.is_valid is True
+
+    silent.refresh_from_db()
+    assert silent.ended_at == silent.started_at
+    assert silent.abnormal_end_reason == 'UNKNOWN'
+    assert silent.is_valid is False
+
+    alive.refresh_from_db()
+    assert alive.ended_at is None
+    finished.refresh_from_db()
+    assert finished.abnormal_end_reason is None
+    assert finished.duration_ms == 1800000
+
+
+@pytest.mark.django_db
+def test_heartbeat_flushed_without_next_ping(started, settings, monkeypatch):
+    """
+    주기 flush 테스트.
+    핑이 끊겨 다음 핑이 오지 않아도 flush 주기가 지나면 마지막 핑의 반영이 예약되는지 검증합니다.
+    """
+    settings.HEARTBEAT_FLUSH_INTERVAL = 0.05
+    submitted = threading.Event()
+
+    class Queue:
+        def submit(self, func):
+            submitted.func = func
+            submitted.set()
+
+    # 다른 테스트가 예약한 타이머와 섞이지 않도록 새 테이블을 쓴다.
+    table = heartbeat_module.HeartbeatTable()
+    monkeypatch.setattr(heartbeat_module, 'heartbeats', table)
+    monkeypatch.setattr(heartbeat_module, 'get_queue', lambda name: Queue())
+    _, create = started
+    session = create(5)
+    record_heartbeat(session.pk)
+
+    assert submitted.wait(2)
+    assert submitted.func == table.flush
+    assert submitted.func() == 1
+    session.refresh_from_db()
+    assert session.last_heartbeat_at is not None
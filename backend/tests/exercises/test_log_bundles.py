@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import json
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from apps.exercises import events
+from apps.exercises.log_bundles import build_bundle, bundle_path
+from apps.exercises.models import (
+    ExerciseCategory, Exercise, ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent, ExerciseLogObject
+)
+
+
+@pytest.fixture
+def closed_session(profile_user, settings, tmp_path):
+    settings.LOG_BUNDLE_DIR = tmp_path
+    events.clear_cache()
+    started = timezone.now() - timedelta(minutes=30)
+    session = ExerciseSession.objects.create(
+        user=profile_user, mode='MANUAL', started_at=started,
+        ended_at=started + timedelta(minutes=20), duration_ms=1200000
+    )
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    item = ExerciseSessionItem.objects.create(session=session, exercise=squat, sequence_no=1)
+    ExerciseSessionEvent.objects.bulk_create(
+        [events.build_event(session, 'PAUSE', i * 1000, {'position_ms': i * 1000}, item.pk) for i in range(5)]
+        + [ExerciseSessionEvent(session=session, event_time_ms=9000, event_type='VUI_CMD', payload={'command': '그만'})]
+    )
+    yield session
+    events.clear_cache()
+
+
+@pytest.mark.django_db
+def test_build_gzip_bundle(closed_session):
+    """
+    로그 번들 생성 테스트.
+    세션/항목/이벤트가 NDJSON 으로 압축 저장되고, 체크섬과 크기가 파일과 일치하는 PENDING 객체가 등록되는지 검증합니다.
+    """
+    log_object = build_bundle(closed_session, chunk_size=2)
+
+    assert log_object.upload_status == 'PENDING'
+    assert log_object.content_type == 'ndjson+gzip'
+    assert log_object.s3_key.endswith(f'{closed_session.session_id}.ndjson.gz')
+    with open(bundle_path(log_object.s3_key), 'rb') as fp:
+        data = fp.read()
+    assert log_object.bytes == len(data)
+    assert log_object.checksum == hashlib.sha256(data).hexdigest()
+
+    records = [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+    assert [r['record'] for r in records] == ['session', 'item'] + ['event'] * 6
+    assert records[0]['session_id'] == str(closed_session.session_id)
+    assert records[3]['payload'] == {'position_ms': 1000}
+    assert records[-1]['event_type'] == 'VUI_CMD'
+
+    # 같은 로그는 같은 체크섬으로 다시 만들어진다.
+    assert build_bundle(closed_session).checksum == log_object.checksum
+    assert ExerciseLogObject.objects.filter(session=closed_session).count() == 1
+
+
+@pytest.mark.django_db
+def test_build_log_bundles_command(closed_session, profile_user, capsys):
+    """
+    일괄 생성 명령 테스트.
+    로그 객체가 없는 종료된 세션에만 번들을 생성하는지 검증합니다.
+    """
+    open_session = ExerciseSession.objects.create(user=profile_user, mode='MANUAL', started_at=timezone.now())
+
+    call_command('build_log_bundles', '--workers', '1')
+
+    assert 'built 1 bundles, 0 failed' in capsys.readouterr().out
+    assert ExerciseLogObject.objects.filter(session=closed_session).exists()
+    assert not ExerciseLogObject.objects.filter(session=open_session).exists()
+    call_command('build_log_bundles', '--workers', '1')
+    assert 'no sessions to bundle' in capsys.readouterr().out
@@ -0,0 +1,126 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.exercises import playback
+from apps.exercises.media import clear_cache, fallback_chain, parse_accept_language
+from apps.exercises.models import (
+    ExerciseCategory, Exercise, ExerciseMedia, MediaVersion, RoutineTemplate, RoutineTemplateItem, MEDIA_VERSION_CACHE_KEY
+)
+
+
+@pytest.fixture
+def exercise(db):
+    clear_cache()
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    exercise = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    ExerciseMedia.objects.create(exercise=exercise, media_type='PICTOGRAM', locale='ko-KR', url='https://cdn/ko.png')
+    ExerciseMedia.objects.create(exercise=exercise, media_type='PICTOGRAM', locale='en-US', url='https://cdn/en.png')
+    ExerciseMedia.objects.create(
+        exercise=exercise, media_type='GUIDE_AUDIO', locale='ko-KR', url='https://cdn/ko.mp3', duration_ms=12000
+    )
+    yield exercise
+    clear_cache()
+
+
+def _media(response):
+    return {media['media_type']: (media['locale'], media['url']) for media in response.data['media_contents']}
+
+
+def test_fallback_chain(settings):
+    """
+    로케일 폴백 순서 테스트.
+    Accept-Language 의 q 값 순서로 태그를 정렬하고 주 언어와 기본 로케일을 덧붙이는지 검증합니다.
+    """
+    settings.MEDIA_DEFAULT_LOCALE = 'ko-KR'
+    languages = parse_accept_language('en;q=0.8, en-US, fr;q=0, *;q=0.1')
+    assert languages == ['en-us', 'en']
+    assert fallback_chain(languages) == ('en-us', 'en', 'ko-kr', 'ko')
+    assert fallback_chain([]) == ('ko-kr', 'ko')
+
+
+@pytest.mark.django_db
+def test_media_selected_by_locale(exercise):
+    """
+    로케일별 미디어 선택 테스트.
+    미디어 타입마다 하나씩, Accept-Language 폴백 순서에 맞는 미디어만 반환하는지 검증합니다.
+    """
+    client = APIClient()
+    url = reverse('exercises:exercise-detail', kwargs={'pk': exercise.pk})
+
+    assert _media(client.get(url)) == {
+        'PICTOGRAM': ('ko-KR', 'https://cdn/ko.png'),
+        'GUIDE_AUDIO': ('ko-KR', 'https://cdn/ko.mp3'),
+    }
+    english = client.get(url, HTTP_ACCEPT_LANGUAGE='en-GB,en;q=0.9')
+    assert _media(english) == {
+        'PICTOGRAM': ('en-US', 'https://cdn/en.png'),
+        'GUIDE_AUDIO': ('ko-KR', 'https://cdn/ko.mp3'),
+    }
+    assert 'Accept-Language' in english['Vary']
+
+
+@pytest.mark.django_db
+def test_media_map_rebuilt_on_change(exercise):
+    """
+    미디어 맵 갱신 테스트.
+    맵이 만들어진 뒤에는 미디어를 조회하지 않고, 미디어가 추가되면 다음 요청에서 반영되는지 검증합니다.
+    """
+    client = APIClient()
+    url = reverse('exercises:exercise-list')
+    client.get(url, HTTP_ACCEPT_LANGUAGE='en-US')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_ACCEPT_LANGUAGE='en-US')
+    assert not [q for q in queries.captured_queries if 'exercise_media' in q['sql']]
+    assert [media['locale'] for media in response.data[0]['media_contents']] == ['en-US', 'ko-KR']
+
+    ExerciseMedia.objects.create(exercise=exercise, media_type='GUIDE_AUDIO', locale='en', url='https://cdn/en.mp3')
+    response = client.get(url, HTTP_ACCEPT_LANGUAGE='en-US')
+    assert [media['url'] for media in response.data[0]['media_contents']] == ['https://cdn/en.png', 'https://cdn/en.mp3']
+
+
+@pytest.mark.django_db
+def test_media_version_from_other_process(exercise, settings):
+    """
+    다른 프로세스의 미디어 변경 반영 테스트.
+    다른 프로세스가 DB 의 버전 토큰을 바꾸면 캐시된 토큰이 만료된 뒤 다음 요청에서 맵을 다시 만드는지 검증합니다.
+    """
+    settings.MEDIA_VERSION_TTL = 60
+    client = APIClient()
+    url = reverse('exercises:exercise-list')
+    client.get(url, HTTP_ACCEPT_LANGUAGE='en-US')
+
+    # 다른 프로세스의 일괄 변경: 이 프로세스의 캐시는 건드리지 않고 DB 만 바뀐다.
+    ExerciseMedia.objects.bulk_create([
+        ExerciseMedia(exercise=exercise, media_type='GUIDE_AUDIO', locale='en', url='https://cdn/en.mp3')
+    ])
+    MediaVersion.objects.filter(pk=MediaVersion.SINGLETON_ID).update(token='other-process')
+    response = client.get(url, HTTP_ACCEPT_LANGUAGE='en-US')
+    assert [media['url'] for media in response.data[0]['media_contents']] == ['https://cdn/en.png', 'https://cdn/ko.mp3']
+
+    cache.delete(MEDIA_VERSION_CACHE_KEY)  # MEDIA_VERSION_TTL 만료
+    response = client.get(url, HTTP_ACCEPT_LANGUAGE='en-US')
+    assert [media['url'] for media in response.data[0]['media_contents']] == ['https://cdn/en.png', 'https://cdn/en.mp3']
+
+
+@pytest.mark.django_db
+def test_plan_media_per_locale(exercise):
+    """
+    재생 계획 로케일 테스트.
+    같은 템플릿이라도 로케일마다 다른 미디어로 계획을 만들고 따로 캐시하는지 검증합니다.
+    """
+    playback.clear_cache()
+    template = RoutineTemplate.objects.create(code='STR_BASIC', title='근력 기초', category=exercise.category)
+    RoutineTemplateItem.objects.create(template=template, exercise=exercise, sequence_no=1, set_count=1)
+
+    korean = playback.get_template_plan(template)
+    english = playback.get_template_plan(template, fallback_chain(['en-us']))
+    media_key = str(exercise.exercise_id)
+    assert korean['exercises'][media_key]['media']['PICTOGRAM']['url'] == 'https://cdn/ko.png'
+    assert english['exercises'][media_key]['media']['PICTOGRAM']['url'] == 'https://cdn/en.png'
+    # 가이드 오디오 길이(12초)로 세트 시간을 계산한다.
+    assert english['total_duration_sec'] == 12
+    playback.clear_cache()
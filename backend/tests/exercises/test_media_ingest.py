@@ -0,0 +1,93 @@
+import hashlib
+import io
+import os
+import struct
+import wave
+import pytest
+from apps.exercises.media_ingest import ingest, mp3_duration_ms
+from apps.exercises.models import ExerciseCategory, Exercise, ExerciseMedia
+
+
+def _wav_bytes(seconds, rate=8000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(b'\x00\x00' * rate * seconds)
+    return buffer.getvalue()
+
+
+def _mp3_bytes(frames=None, audio_bytes=16000):
+    # MPEG1 Layer III, 128kbps, 44.1kHz, mono 프레임 헤더 (+ ID3v2 태그)
+    id3 = b'ID3\x03\x00\x00\x00\x00\x00\x0a' + b'\x00' * 10
+    header = b'\xff\xfb\x90\xc0'
+    if frames is None:
+        return id3 + header + b'\x00' * (audio_bytes - len(header))
+    xing = b'Xing' + struct.pack('>II', 0x1, frames)
+    return id3 + header + b'\x00' * 17 + xing + b'\x00' * 400
+
+
+def _write(root, relative, data):
+    path = os.path.join(root, *relative.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fp:
+        fp.write(data)
+    return path
+
+
+def test_mp3_duration():
+    """
+    MP3 재생 시간 테스트.
+    Xing 헤더의 프레임 수 또는 CBR 비트레이트로 디코딩 없이 재생 시간을 계산하는지 검증합니다.
+    """
+    vbr = _mp3_bytes(frames=100)
+    assert mp3_duration_ms(io.BytesIO(vbr), len(vbr)) == 100 * 1152 * 1000 // 44100
+    cbr = _mp3_bytes(audio_bytes=16000)
+    assert mp3_duration_ms(io.BytesIO(cbr), len(cbr)) == 1000
+    assert mp3_duration_ms(io.BytesIO(b'not audio'), 9) is None
+
+
+@pytest.mark.django_db
+def test_ingest_media(tmp_path, settings):
+    """
+    미디어 일괄 등록 테스트.
+    파일 해시와 재생 시간을 채워 등록하고, 다시 실행하면 바뀐 파일만 갱신하는지 검증합니다.
+    """
+    settings.MEDIA_S3_PREFIX = 'media'
+    settings.MEDIA_BASE_URL = 'https://cdn.example.com'
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    exercise = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    existing = ExerciseMedia.objects.create(exercise=exercise, media_type='PICTOGRAM', locale='ko-KR', url='https://old/p.png')
+    root = str(tmp_path)
+    wav = _wav_bytes(2)
+    _write(root, f'ko-KR/guide_audio/{exercise.pk}.wav', wav)
+    _write(root, f'en-US/guide_audio/{exercise.pk}.mp3', _mp3_bytes(frames=100))
+    png = _write(root, f'ko-KR/pictogram/{exercise.pk}.png', b'\x89PNG' + b'\x00' * 100)
+    _write(root, 'ko-KR/pictogram/squat.png', b'\x89PNG')
+    _write(root, f'ko-KR/pictogram/{"0" * 8}-0000-0000-0000-{"0" * 12}.png', b'\x89PNG')
+    _write(root, 'README.txt', b'layout')
+
+    report = ingest(root, workers=1)
+    assert (report.scanned, report.created, report.updated, report.unchanged) == (4, 2, 1, 0)
+    assert sorted(reason for _, reason in report.rejected) == ['exercise_id', 'layout', 'unknown_exercise']
+
+    audio = ExerciseMedia.objects.get(exercise=exercise, media_type='GUIDE_AUDIO', locale='ko-KR')
+    assert audio.duration_ms == 2000
+    assert audio.checksum == hashlib.sha256(wav).hexdigest()
+    assert audio.s3_key == f'media/ko-KR/guide_audio/{exercise.pk}.wav'
+    assert audio.url == f'https://cdn.example.com/media/ko-KR/guide_audio/{exercise.pk}.wav'
+    assert ExerciseMedia.objects.get(locale='en-US').duration_ms == 2612
+    existing.refresh_from_db()
+    assert existing.bytes == 104 and existing.duration_ms is None
+
+    report = ingest(root, workers=1)
+    assert (report.created, report.updated, report.unchanged) == (0, 0, 3)
+
+    with open(png, 'ab') as fp:
+        fp.write(b'\x00')
+    os.utime(png, ns=(0, 10 ** 18))
+    report = ingest(root, workers=1)
+    assert (report.created, report.updated, report.unchanged) == (0, 1, 2)
+    existing.refresh_from_db()
+    assert existing.bytes == 105
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.exercises.models import ExerciseCategory, Exercise, ExerciseMedia, Playlist, PlaylistItem
+from apps.exercises.playback import clear_cache
+
+
+@pytest.fixture
+def routine(profile_user):
+    clear_cache()
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    lunge = Exercise.objects.create(category=category, exercise_name='런지')
+    ExerciseMedia.objects.create(exercise=lunge, media_type='GUIDE_AUDIO', url='https://cdn/lunge.mp3', duration_ms=41500)
+    playlist = Playlist.objects.create(user=profile_user, mode='CUSTOM', title='하체')
+    PlaylistItem.objects.create(playlist=playlist, exercise=squat, sequence_no=1, set_count=2, reps_count=10, rest_sec=15)
+    PlaylistItem.objects.create(playlist=playlist, exercise=lunge, sequence_no=2, set_count=1, rest_sec=10)
+    yield playlist
+    clear_cache()
+
+
+@pytest.mark.django_db
+def test_plan_timeline(profile_user, routine):
+    """
+    재생 계획 테스트.
+    세트/휴식 세그먼트가 절대 오프셋과 함께 생성되고, 다음 동작 안내와 총 소요 시간이 계산되는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    response = client.get(reverse('exercises:routine-plan', kwargs={'pk': routine.pk}))
+
+    assert response.status_code == 200
+    segments = response.data['segments']
+    assert [(s['type'], s['offset_sec'], s['duration_sec']) for s in segments] == [
+        ('EXERCISE', 0, 30),
+        ('REST', 30, 15),
+        ('EXERCISE', 45, 30),
+        ('REST', 75, 15),
+        ('EXERCISE', 90, 42),
+    ]
+    assert segments[3]['announcement'] == '수고하셨습니다. 다음 동작은 런지입니다. 준비하세요.'
+    assert response.data['total_duration_sec'] == 132
+    lunge_id = segments[4]['exercise_id']
+    assert response.data['exercises'][lunge_id]['media']['GUIDE_AUDIO']['url'] == 'https://cdn/lunge.mp3'
+
+
+@pytest.mark.django_db
+def test_plan_cached_per_version(profile_user, routine):
+    """
+    재생 계획 캐시 테스트.
+    같은 버전은 루틴 조회 외 추가 쿼리 없이 제공되고, 항목 변경 후에는 다시 계산되는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-plan', kwargs={'pk': routine.pk})
+    client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert not [q for q in queries if 'playlist_items' in q['sql']]
+
+    item = routine.items.get(sequence_no=2)
+    response = client.post(reverse('exercises:routine-apply-diff', kwargs={'pk': routine.pk}), {
+        'update': [{'playlist_item_id': str(item.pk), 'set_count': 2}]
+    }, format='json')
+    assert response.status_code == 200
+    assert client.get(url).data['total_duration_sec'] == 132 + 10 + 42
+
+
+@pytest.mark.django_db
+def test_plan_refreshed_on_exercise_edit(profile_user, routine):
+    """
+    카탈로그 변경 테스트.
+    루틴 항목이 그대로여도 운동 이름이 바뀌면 캐시된 계획 대신 다시 계산한 계획을 반환하는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-plan', kwargs={'pk': routine.pk})
+    assert client.get(url).data['segments'][3]['announcement'].endswith('다음 동작은 런지입니다. 준비하세요.')
+
+    lunge = Exercise.objects.get(exercise_name='런지')
+    lunge.exercise_name = '런지 (좌우)'
+    lunge.save()
+    assert client.get(url).data['segments'][3]['announcement'].endswith('다음 동작은 런지 (좌우)입니다. 준비하세요.')
@@ -0,0 +1,76 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises import reports
+from apps.exercises.models import ExerciseCategory, Exercise, ExerciseSession, ExerciseSessionItem
+
+
+def _session(user, day, *items):
+    started = timezone.make_aware(datetime.datetime(2025, 3, day, 9, 0))
+    session = ExerciseSession.objects.create(user=user, mode='MANUAL', started_at=started)
+    for sequence_no, (exercise, duration_ms, skipped) in enumerate(items, 1):
+        ExerciseSessionItem.objects.create(
+            session=session, exercise=exercise, sequence_no=sequence_no, duration_ms=duration_ms, is_skipped=skipped
+        )
+    return session
+
+
+@pytest.mark.django_db
+def test_estimate_report(profile_user, settings):
+    """
+    칼로리 추정 테스트.
+    운동/카테고리/기본 MET 순으로 강도를 정하고, 스킵 항목을 제외해 세션/날짜/카테고리별로 합산하는지 검증합니다.
+    """
+    settings.EXERCISE_CATEGORY_MET = {'CARDIO': 7.0}
+    settings.EXERCISE_DEFAULT_MET = 4.0
+    strength = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    cardio = ExerciseCategory.objects.create(category_id='CARDIO', display_name='유산소')
+    squat = Exercise.objects.create(category=strength, exercise_name='스쿼트', met=5.0)
+    lunge = Exercise.objects.create(category=strength, exercise_name='런지')
+    jog = Exercise.objects.create(category=cardio, exercise_name='제자리 뛰기')
+    _session(profile_user, 1, (squat, 600000, False), (jog, 600000, False), (lunge, 600000, True))
+    _session(profile_user, 1, (lunge, 300000, False))
+    _session(profile_user, 2, (jog, None, False))
+
+    report = reports.estimate(profile_user)
+
+    # kcal = MET × 3.5 × 65 / 200 × 분
+    assert report['total'] == {
+        'sessions': 3, 'items': 4, 'duration_ms': 1500000,
+        'calories': round((5.0 * 10 + 7.0 * 10 + 4.0 * 5) * 3.5 * 65 / 200, 1), 'met_minutes': 140.0,
+    }
+    assert [(day['date'], day['sessions'], day['items']) for day in report['by_day']] == [
+        ('2025-03-01', 2, 3), ('2025-03-02', 1, 1)
+    ]
+    assert {row['category_id']: row['met_minutes'] for row in report['by_category']} == {'CARDIO': 70.0, 'STR': 70.0}
+    assert sorted(row['duration_ms'] for row in report['by_session']) == [0, 300000, 1200000]
+    assert reports.tts_summary(report) == "2일 동안 3번 운동했습니다. 총 25분 운동하며 약 159킬로칼로리를 소모했습니다."
+
+
+@pytest.mark.django_db
+def test_report_api(profile_user):
+    """
+    운동 리포트 API 테스트.
+    기간 조건을 적용한 리포트와 음성 안내 문구를 반환하고, 기록이 없으면 빈 리포트를 반환하는지 검증합니다.
+    """
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트', met=5.0)
+    _session(profile_user, 1, (squat, 600000, False))
+    _session(profile_user, 3, (squat, 600000, False))
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-report')
+
+    response = client.get(url, {'start': '2025-03-02', 'end': '2025-03-03'})
+    assert response.status_code == 200
+    assert response.data['total']['sessions'] == 1
+    assert response.data['by_day'][0]['date'] == '2025-03-03'
+    assert response.data['tts_message'].startswith("1일 동안 1번 운동했습니다.")
+
+    response = client.get(url, {'start': '2025-04-01'})
+    assert response.data['total']['sessions'] == 0
+    assert response.data['by_day'] == []
+    assert response.data['tts_message'] == "이 기간에는 운동 기록이 없습니다."
+    assert client.get(url, {'start': '2025-03-03', 'end': '2025-03-01'}).status_code == 400
@@ -0,0 +1,133 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises.models import (
+    ExerciseCategory, Exercise, RoutineTemplate, RoutineTemplateItem, Playlist
+)
+from apps.exercises import routine_templates
+from apps.exercises.routine_templates import bump_version, clear_cache, fork_template
+
+
+@pytest.fixture
+def template(db):
+    clear_cache()
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    template = RoutineTemplate.objects.create(code='STR_BASIC', title='근력 기초', category=category)
+    for index, name in enumerate(['스쿼트', '런지']):
+        exercise = Exercise.objects.create(category=category, exercise_name=name)
+        RoutineTemplateItem.objects.create(template=template, exercise=exercise, sequence_no=index + 1, set_count=3)
+    yield template
+    clear_cache()
+
+
+@pytest.mark.django_db
+def test_template_reads_are_cached(profile_user, template):
+    """
+    템플릿 캐시 테스트.
+    두 번째 조회부터는 버전 확인 쿼리만 실행되고, 버전이 바뀌면 다시 읽는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-template-list')
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert [item['exercise']['exercise_name'] for item in first.data[0]['items']] == ['스쿼트', '런지']
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).data == first.data
+    assert len([q for q in queries if 'routine_template' in q['sql']]) == 1
+
+    template.items.filter(sequence_no=2).update(set_count=5)
+    bump_version(template)
+    response = client.get(reverse('exercises:routine-template-detail', kwargs={'pk': template.pk}))
+    assert response.data['version'] == 2
+    assert response.data['items'][1]['set_count'] == 5
+
+
+@pytest.mark.django_db
+def test_customize_copies_on_first_edit(profile_user, template):
+    """
+    copy-on-write 테스트.
+    템플릿 조회만으로는 사용자 루틴이 생성되지 않고, 편집 시에만 한 번 복사되는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    client.get(reverse('exercises:routine-template-list'))
+    assert not Playlist.objects.exists()
+
+    url = reverse('exercises:routine-template-customize', kwargs={'pk': template.pk})
+    response = client.post(url, {'update': []}, format='json')
+    assert response.status_code == 201
+    playlist_id = response.data['playlist_id']
+    assert response.data['template_version'] == 1
+    first_item = response.data['items'][0]['playlist_item_id']
+
+    response = client.post(url, {
+        'update': [{'playlist_item_id': first_item, 'reps_count': 15}]
+    }, format='json')
+    assert response.status_code == 200
+    assert response.data['playlist_id'] == playlist_id
+    assert response.data['items'][0]['reps_count'] == 15
+    assert Playlist.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_customize_first_edit_uses_template_items(profile_user, template):
+    """
+    첫 편집 테스트.
+    복사 전에는 템플릿 항목 ID 로 변경을 지정할 수 있고, 변경이 거부되면 복사한 루틴이 남지 않는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-template-customize', kwargs={'pk': template.pk})
+    first, second = template.items.order_by('sequence_no')
+
+    response = client.post(url, {'delete': [str(template.pk)]}, format='json')
+    assert response.status_code == 400
+    assert not Playlist.objects.exists()
+
+    response = client.post(url, {
+        'update': [{'playlist_item_id': str(first.pk), 'reps_count': 12}],
+        'move': [{'playlist_item_id': str(second.pk), 'position': 0}],
+    }, format='json')
+    assert response.status_code == 201
+    assert [item['reps_count'] for item in response.data['items']] == [None, 12]
+    assert Playlist.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_session_references_template(profile_user, template):
+    """
+    템플릿 세션 테스트.
+    사용자 루틴 없이 템플릿을 참조하는 세션이 생성되고 템플릿 버전이 기록되는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    response = client.post(reverse('exercises:session-list'), {
+        'template': str(template.pk), 'mode': 'CURRICULUM', 'started_at': timezone.now().isoformat()
+    }, format='json')
+    assert response.status_code == 201
+    assert response.data['template_version'] == 1
+
+
+@pytest.mark.django_db
+def test_concurrent_first_customize_keeps_one_fork(profile_user, template, monkeypatch):
+    """
+    동시 첫 편집 테스트.
+    다른 요청이 확인과 생성 사이에 먼저 복사해도 활성 복사본을 하나만 남기고 그 루틴을 반환하는지 검증합니다.
+    """
+    winner, created = fork_template(template, profile_user)
+    assert created
+    # 이 요청의 확인 시점에는 다른 요청의 복사본이 아직 보이지 않았다.
+    lookups = iter([None])
+    active_fork = routine_templates._active_fork
+    monkeypatch.setattr(routine_templates, '_active_fork', lambda *args: next(lookups, None) or active_fork(*args))
+
+    playlist, created = fork_template(template, profile_user)
+    assert not created
+    assert playlist.pk == winner.pk
+    assert Playlist.objects.filter(user=profile_user, template=template, status='ACTIVE').count() == 1
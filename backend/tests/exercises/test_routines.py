@@ -0,0 +1,142 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.exercises.models import ExerciseCategory, Exercise, Playlist, PlaylistItem
+from apps.exercises.routines import SEQUENCE_GAP
+
+
+def _routine(user, sequences):
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    exercises = [Exercise.objects.create(category=category, exercise_name=f'운동{i}') for i in range(len(sequences))]
+    playlist = Playlist.objects.create(user=user, mode='CUSTOM', title='루틴')
+    items = [
+        PlaylistItem.objects.create(playlist=playlist, exercise=exercise, sequence_no=seq, set_count=3)
+        for exercise, seq in zip(exercises, sequences)
+    ]
+    return playlist, items, exercises
+
+
+def _item_updates(queries):
+    return [q['sql'] for q in queries if q['sql'].startswith('UPDATE "playlist_items"')]
+
+
+@pytest.mark.django_db
+def test_move_to_front_updates_single_row(profile_user):
+    """
+    희소 번호 이동 테스트.
+    마지막 항목을 맨 앞으로 옮길 때 해당 항목 한 행만 갱신되는지 검증합니다.
+    """
+    playlist, items, _ = _routine(profile_user, [SEQUENCE_GAP * (i + 1) for i in range(4)])
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-apply-diff', kwargs={'pk': playlist.pk})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, {
+            'move': [{'playlist_item_id': str(items[3].pk), 'position': 0}]
+        }, format='json')
+
+    assert response.status_code == 200
+    assert [item['playlist_item_id'] for item in response.data['items']] == [
+        str(items[3].pk), str(items[0].pk), str(items[1].pk), str(items[2].pk)
+    ]
+    assert len(_item_updates(queries)) == 1
+    items[3].refresh_from_db()
+    assert 0 < items[3].sequence_no < SEQUENCE_GAP
+
+
+@pytest.mark.django_db
+def test_diff_rebalances_when_gap_exhausted(profile_user):
+    """
+    재배치 테스트.
+    연속 번호(1,2,3) 사이에 삽입할 공간이 없으면 전체 번호를 간격을 두고 재배치하고,
+    삭제/수정이 함께 적용되는지 검증합니다.
+    """
+    playlist, items, exercises = _routine(profile_user, [1, 2, 3])
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-apply-diff', kwargs={'pk': playlist.pk})
+
+    response = client.post(url, {
+        'delete': [str(items[2].pk)],
+        'update': [{'playlist_item_id': str(items[0].pk), 'reps_count': 12, 'rest_sec': 30}],
+        'insert': [{'exercise_id': str(exercises[2].pk), 'position': 1, 'set_count': 2}],
+        'move': [{'playlist_item_id': str(items[1].pk), 'position': 0}],
+    }, format='json')
+
+    assert response.status_code == 200
+    rows = list(PlaylistItem.objects.filter(playlist=playlist).values_list('exercise_id', 'sequence_no', 'reps_count'))
+    assert rows == [
+        (exercises[1].pk, SEQUENCE_GAP, None),
+        (exercises[2].pk, SEQUENCE_GAP * 2, None),
+        (exercises[0].pk, SEQUENCE_GAP * 3, 12),
+    ]
+
+
+@pytest.mark.django_db
+def test_diff_rejects_unknown_items(profile_user):
+    """
+    검증 테스트.
+    루틴에 없는 항목을 참조하면 아무 변경 없이 400 응답을 반환하는지 검증합니다.
+    """
+    playlist, items, _ = _routine(profile_user, [SEQUENCE_GAP])
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:routine-apply-diff', kwargs={'pk': playlist.pk})
+
+    response = client.post(url, {
+        'delete': [str(items[0].pk)],
+        'move': [{'playlist_item_id': '00000000-0000-0000-0000-000000000000', 'position': 0}],
+    }, format='json')
+    assert response.status_code == 400
+    assert PlaylistItem.objects.filter(pk=items[0].pk).exists()
+
+
+@pytest.mark.django_db
+def test_create_routine_with_items(profile_user):
+    """
+    루틴 일괄 생성 테스트.
+    항목 목록을 포함한 한 번의 요청으로 루틴이 생성되고, 운동 검증은 한 번의 IN 쿼리로,
+    항목 저장은 bulk insert 한 번으로 처리되는지 검증합니다.
+    """
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    exercises = [Exercise.objects.create(category=category, exercise_name=f'운동{i}') for i in range(3)]
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(reverse('exercises:routine-list'), {
+            'mode': 'CUSTOM',
+            'title': '나만의 루틴',
+            'items': [
+                {'exercise_id': str(exercise.pk), 'set_count': 3, 'reps_count': 10}
+                for exercise in reversed(exercises)
+            ],
+        }, format='json')
+
+    assert response.status_code == 201
+    assert [item['exercise']['exercise_name'] for item in response.data['items']] == ['운동2', '운동1', '운동0']
+    sqls = [q['sql'] for q in queries]
+    assert len([sql for sql in sqls if sql.startswith('SELECT') and 'FROM "exercise"' in sql]) == 1
+    assert len([sql for sql in sqls if sql.startswith('INSERT INTO "playlist_items"')]) == 1
+    assert list(PlaylistItem.objects.order_by('sequence_no').values_list('sequence_no', flat=True)) == [
+        SEQUENCE_GAP, SEQUENCE_GAP * 2, SEQUENCE_GAP * 3
+    ]
+
+
+@pytest.mark.django_db
+def test_create_routine_rejects_unknown_exercise(profile_user):
+    """
+    루틴 일괄 생성 검증 테스트.
+    존재하지 않는 운동이 포함되면 루틴이 생성되지 않는지 검증합니다.
+    """
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    response = client.post(reverse('exercises:routine-list'), {
+        'mode': 'CUSTOM', 'title': '루틴',
+        'items': [{'exercise_id': '00000000-0000-0000-0000-000000000000', 'set_count': 1}],
+    }, format='json')
+    assert response.status_code == 400
+    assert not Playlist.objects.exists()
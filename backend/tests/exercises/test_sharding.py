@@ -0,0 +1,285 @@
+import datetime
+import uuid
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises import events
+from apps.exercises.heartbeats import heartbeats, sweep_stale_sessions
+from apps.exercises.models import (
+    ExerciseCategory, Exercise, Playlist, PlaylistItem, ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent
+)
+from apps.exercises.sharding import history_databases, shard_for_user
+from apps.users import purge
+from apps.users.purge import deactivate_account, run_purge_job
+
+sharded = pytest.mark.skipif(
+    not getattr(settings, 'HISTORY_SHARDS', None),
+    reason='config.settings_sharded 로 실행해야 합니다. (--ds=config.settings_sharded)',
+)
+
+
+def test_shard_for_user_is_stable():
+    """
+    사용자 샤드 결정 테스트.
+    같은 사용자는 항상 같은 샤드에 배정되고, 샤드를 3개에서 4개로 늘리면
+    약 1/4 의 사용자만 새 샤드로 이동하는지 검증합니다.
+    """
+    three, four = ['s0', 's1', 's2'], ['s0', 's1', 's2', 's3']
+    user_ids = [uuid.uuid5(uuid.NAMESPACE_OID, str(index)) for index in range(2000)]
+    before = [shard_for_user(user_id, three) for user_id in user_ids]
+    assert before == [shard_for_user(str(user_id), three) for user_id in user_ids]
+    assert set(before) == set(three)
+
+    after = [shard_for_user(user_id, four) for user_id in user_ids]
+    moved = [(old, new) for old, new in zip(before, after) if old != new]
+    assert all(new == 's3' for _, new in moved)
+    assert 0.2 < len(moved) / len(user_ids) < 0.3
+
+
+def _users_on_each_shard(django_user_model):
+    """기록 DB 마다 그 샤드에 배정된, 프로필을 입력한 사용자를 한 명씩 만든다."""
+    users = {}
+    index = 0
+    while len(users) < len(history_databases()):
+        user = django_user_model.objects.create_user(
+            username=f'runner{index}', password='pw', phone_number=f'0107777{index:04d}',
+            height_cm=170, weight_kg=65, birthdate=datetime.date(1990, 1, 1), gender='F'
+        )
+        users.setdefault(shard_for_user(user.pk), user)
+        index += 1
+    return users
+
+
+@sharded
+@pytest.mark.django_db(databases='__all__')
+def test_session_api_uses_user_shard(django_user_model):
+    """
+    샤드 라우팅 테스트.
+    뷰 변경 없이 API 로 만든 세션과 이벤트가 사용자의 기록 DB 에만 저장되고,
+    목록/이벤트 조회와 통계 리포트가 그 DB 에서 읽히는지 검증합니다.
+    """
+    users = _users_on_each_shard(django_user_model)
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    created = {}
+    for shard, user in users.items():
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(
+            reverse('exercises:session-list'), {'mode': 'MANUAL', 'started_at': timezone.now().isoformat()}, format='json'
+        )
+        assert response.status_code == 201
+        session_id = response.data['session_id']
+        created[shard] = session_id
+        response = client.post(
+            reverse('exercises:session-events', kwargs={'pk': session_id}),
+            [{'event_type': 'PLAY', 'event_time_ms': 0, 'payload': {'position_ms': 0}}], format='json',
+        )
+        assert response.status_code == 201
+
+    for shard, session_id in created.items():
+        for alias in history_databases():
+            stored = ExerciseSession.objects.using(alias).filter(pk=session_id).exists()
+            assert stored is (alias == shard)
+        assert ExerciseSessionEvent.objects.using(shard).filter(session_id=session_id).count() == 1
+        assert not ExerciseSession.objects.using('default').exists()
+
+    first = next(iter(users))
+    session = ExerciseSession.objects.using(first).get(pk=created[first])
+    # 요청 밖에서는 세션 인스턴스를 힌트로 쓰는 관련 매니저가 세션의 기록 DB 에 저장한다.
+    session.items.create(exercise=squat, sequence_no=1, duration_ms=60000)
+    assert ExerciseSessionItem.objects.using(first).filter(session_id=session.pk).exists()
+
+    for shard, user in users.items():
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(reverse('exercises:session-list'))
+        assert response.status_code == 200
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        assert [row['session_id'] for row in results] == [created[shard]]
+        response = client.get(reverse('exercises:session-events', kwargs={'pk': created[shard]}))
+        assert [event['event_type'] for event in response.data] == ['PLAY']
+        response = client.get(reverse('exercises:session-report'))
+        assert response.data['total']['items'] == (1 if shard == first else 0)
+
+
+@sharded
+@pytest.mark.django_db(databases='__all__')
+def test_rebalance_history_moves_user(django_user_model):
+    """
+    기록 재배치 테스트.
+    다른 DB 에 있는 사용자 기록을 rebalance_history 명령이 생성/수정 일시를 유지한 채
+    사용자의 샤드로 옮기고, 원래 DB 에서는 삭제하는지 검증합니다.
+    """
+    events.clear_cache()
+    user = django_user_model.objects.create_user(username='mover', password='pw')
+    target = shard_for_user(user.pk)
+    source = next(alias for alias in history_databases() if alias != target)
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    started = timezone.now() - datetime.timedelta(days=30)
+
+    session = ExerciseSession(user=user, mode='MANUAL', started_at=started)
+    session.save(using=source)
+    item = ExerciseSessionItem(session=session, exercise=squat, sequence_no=1)
+    item.save(using=source)
+    ExerciseSessionEvent.objects.using(source).bulk_create([
+        events.build_event(session, 'PLAY', index * 1000, {'position_ms': index * 1000}, item.pk)
+        for index in range(5)
+    ])
+    ExerciseSession.objects.using(source).filter(pk=session.pk).update(created_at=started, updated_at=started)
+
+    call_command('rebalance_history', '--dry-run')
+    assert ExerciseSession.objects.using(source).filter(pk=session.pk).exists()
+
+    call_command('rebalance_history', '--batch-size', '2')
+    moved = ExerciseSession.objects.using(target).get(pk=session.pk)
+    assert moved.created_at == started and moved.updated_at == started
+    assert ExerciseSessionItem.objects.using(target).filter(session_id=session.pk).count() == 1
+    assert ExerciseSessionEvent.objects.using(target).filter(session_id=session.pk).count() == 5
+    assert not ExerciseSession.objects.using(source).filter(pk=session.pk).exists()
+    assert not ExerciseSessionEvent.objects.using(source).exists()
+    events.clear_cache()
+
+
+def _two_shard_users(django_user_model):
+    """서로 다른 기록 DB 에 배정된 사용자 두 명."""
+    users = list(_users_on_each_shard(django_user_model).values())
+    return users[0], users[1]
+
+
+@sharded
+@pytest.mark.django_db(databases='__all__')
+def test_staff_event_query_reads_session_shard(django_user_model):
+    """
+    관리자 이벤트 조회 샤드 테스트.
+    관리자가 다른 샤드 사용자의 세션 이벤트를 뷰 변경 없이 조회할 수 있고, 없는 세션은 404 인지 검증합니다.
+    """
+    owner, staff = _two_shard_users(django_user_model)
+    staff.is_staff = True
+    staff.save(update_fields=['is_staff'])
+    session = ExerciseSession(user=owner, mode='MANUAL', started_at=timezone.now())
+    session.save()
+    ExerciseSessionEvent.objects.using(session._state.db).bulk_create([
+        events.build_event(session, 'PLAY', index * 1000, {'position_ms': index * 1000}) for index in range(3)
+    ])
+    assert session._state.db == shard_for_user(owner.pk) != shard_for_user(staff.pk)
+
+    client = APIClient()
+    client.force_authenticate(user=staff)
+    response = client.get(reverse('exercises:session-event-query', args=[session.pk]))
+    assert response.status_code == 200
+    assert [event['event_time_ms'] for event in response.data['results']] == [0, 1000, 2000]
+    response = client.get(reverse('exercises:session-event-query', args=[uuid.uuid4()]))
+    assert response.status_code == 404
+
+
+@sharded
+@pytest.mark.django_db(databases='__all__')
+def test_heartbeat_flush_and_sweep_on_each_shard(django_user_model):
+    """
+    샤드별 핑 반영/정리 테스트.
+    모인 핑이 각 세션의 기록 DB 에 반영되고, 비정상 종료 세션 정리가 모든 기록 DB 에서 실행되는지 검증합니다.
+    """
+    heartbeats.flush()
+    now = timezone.now()
+    sessions = {}
+    for shard, user in _users_on_each_shard(django_user_model).items():
+        killed = ExerciseSession(user=user, mode='MANUAL', started_at=now - datetime.timedelta(minutes=60))
+        killed.save()
+        alive = ExerciseSession(user=user, mode='MANUAL', started_at=now - datetime.timedelta(minutes=60))
+        alive.save()
+        heartbeats.touch(killed.pk, killed.started_at + datetime.timedelta(minutes=20))
+        heartbeats.touch(alive.pk, now - datetime.timedelta(minutes=1))
+        sessions[shard] = (killed, alive)
+
+    assert sweep_stale_sessions(threshold=datetime.timedelta(minutes=10), now=now) == len(sessions)
+    assert len(heartbeats) == 0
+    for shard, (killed, alive) in sessions.items():
+        killed = ExerciseSession.objects.using(shard).get(pk=killed.pk)
+        assert killed.abnormal_end_reason == 'APP_KILLED'
+        assert killed.ended_at == killed.last_heartbeat_at
+        alive = ExerciseSession.objects.using(shard).get(pk=alive.pk)
+        assert alive.ended_at is None and alive.last_heartbeat_at is not None
+
+
+@sharded
+@pytest.mark.django_db(databases='__all__')
+def test_purge_detaches_routines_on_every_shard(django_user_model):
+    """
+    샤드 회원탈퇴 삭제 테스트.
+    탈퇴한 사용자의 기록은 그 사용자의 기록 DB 에서 삭제되고, 다른 샤드 기록의 루틴 참조는 해제되며
+    루틴 삭제 시에도 모든 기록 DB 의 참조가 해제되는지 검증합니다.
+    """
+    leaver, other = _two_shard_users(django_user_model)
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    playlist = Playlist.objects.create(user=leaver, mode='CUSTOM', title='루틴')
+    item = PlaylistItem.objects.create(playlist=playlist, exercise=squat, sequence_no=1, set_count=3)
+
+    sessions = []
+    for user in (leaver, other):
+        session = ExerciseSession(user=user, playlist=playlist, mode='MANUAL', started_at=timezone.now())
+        session.save()
+        session_item = session.items.create(exercise=squat, playlist_item=item, sequence_no=1)
+        ExerciseSessionEvent.objects.using(session._state.db).bulk_create([
+            events.build_event(session, 'PLAY', index * 1000, {'position_ms': index * 1000}, session_item.pk)
+            for index in range(3)
+        ])
+        sessions.append(session)
+    left, kept = sessions
+
+    job = run_purge_job(deactivate_account(leaver), chunk_size=2)
+
+    assert job.status == 'DONE'
+    assert not django_user_model.objects.filter(pk=leaver.pk).exists()
+    assert not Playlist.objects.filter(pk=playlist.pk).exists()
+    for model in (ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent):
+        assert not model.objects.using(left._state.db).exists()
+    kept = ExerciseSession.objects.using(kept._state.db).get(pk=kept.pk)
+    assert kept.playlist_id is None
+    assert ExerciseSessionItem.objects.using(kept._state.db).get(session_id=kept.pk).playlist_item_id is None
+    assert ExerciseSessionEvent.objects.using(kept._state.db).filter(session_id=kept.pk).count() == 3
+
+    # 루틴을 직접 삭제해도 다른 기록 DB 의 참조가 해제된다. (detach_routine)
+    routine = Playlist.objects.create(user=other, mode='CUSTOM', title='새 루틴')
+    kept.playlist = routine
+    kept.save(update_fields=['playlist'])
+    routine.delete()
+    assert ExerciseSession.objects.using(kept._state.db).get(pk=kept.pk).playlist_id is None
+
+
+@sharded
+@pytest.mark.django_db(databases='__all__')
+def test_purge_detach_batches_routine_ids(django_user_model, monkeypatch):
+    """
+    루틴 ID 배치 테스트.
+    참조 해제 조건의 루틴 ID 가 한 쿼리의 파라미터 한도보다 많아도 배치로 나눠 모두 해제하고,
+    단계 목록은 기록 DB 수로만 정해지는지 검증합니다.
+    """
+    monkeypatch.setattr(purge, 'MAX_IN_PARAMS', 2)
+    leaver, other = _two_shard_users(django_user_model)
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    kept = []
+    for index in range(5):
+        playlist = Playlist.objects.create(user=leaver, mode='CUSTOM', title=f'루틴 {index}')
+        item = PlaylistItem.objects.create(playlist=playlist, exercise=squat, sequence_no=1, set_count=3)
+        session = ExerciseSession(user=other, playlist=playlist, mode='MANUAL', started_at=timezone.now())
+        session.save()
+        session.items.create(exercise=squat, playlist_item=item, sequence_no=1)
+        kept.append(session)
+    names = [step.name for step in purge.build_steps(leaver.pk)]
+    assert names.count('detach_sessions') == len(history_databases())
+
+    job = run_purge_job(deactivate_account(leaver), chunk_size=2)
+
+    assert job.status == 'DONE'
+    assert job.deleted_rows['detach_sessions'] == 5
+    assert job.deleted_rows['detach_session_items'] == 5
+    using = kept[0]._state.db
+    assert not ExerciseSession.objects.using(using).filter(playlist__isnull=False).exists()
+    assert not ExerciseSessionItem.objects.using(using).filter(playlist_item__isnull=False).exists()
@@ -0,0 +1,92 @@
+import datetime
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.exercises import events
+from apps.exercises.heartbeats import sweep_stale_sessions
+from apps.exercises.models import ExerciseCategory, Exercise, ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent
+from apps.exercises.timeline import derive_session_metrics
+
+
+@pytest.fixture
+def recorded(profile_user):
+    """항목 2개(0~60초, 70~100초)와 일시정지/배속/탐색/음성 명령 이벤트가 있는 진행 중 세션"""
+    events.clear_cache()
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    squat = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    started = timezone.now() - datetime.timedelta(hours=1)
+    session = ExerciseSession.objects.create(user=profile_user, mode='MANUAL', started_at=started)
+
+    def item(sequence_no, start_sec, end_sec):
+        return ExerciseSessionItem.objects.create(
+            session=session, exercise=squat, sequence_no=sequence_no,
+            started_at=started + datetime.timedelta(seconds=start_sec),
+            ended_at=started + datetime.timedelta(seconds=end_sec),
+        )
+
+    first, second = item(1, 0, 60), item(2, 70, 100)
+    ExerciseSessionEvent.objects.bulk_create([
+        events.build_event(session, 'PLAY', 0, {'position_ms': 0}, first.pk),
+        events.build_event(session, 'PAUSE', 10000, {'position_ms': 10000}, first.pk),
+        events.build_event(session, 'RESUME', 25000, {'position_ms': 10000}, first.pk),
+        events.build_event(session, 'SPEED_CHANGE', 35000, {'from_rate': 1.0, 'to_rate': 1.5}),
+        events.build_event(session, 'SEEK_SEGMENT', 40000, {'from_ms': 30000, 'to_ms': 20000}),
+        events.build_event(session, 'VUI_CMD', 50000, {'command': '다음'}),
+        events.build_event(session, 'VUI_CMD', 80000, {'command': '다음'}, second.pk),
+        events.build_event(session, 'VUI_CMD', 85000, {'command': '멈춰'}),
+    ])
+    yield session, first, second
+    events.clear_cache()
+
+
+@pytest.mark.django_db
+def test_close_session_derives_metrics(profile_user, recorded):
+    """
+    세션 종료 테스트.
+    종료 시 이벤트를 한 번 읽어 항목별 활성/일시정지 시간, 평균 배속, 탐색/명령 횟수를 저장하고
+    이후 조회는 저장된 지표를 반환하는지 검증합니다.
+    """
+    session, first, second = recorded
+    client = APIClient()
+    client.force_authenticate(user=profile_user)
+    url = reverse('exercises:session-close', kwargs={'pk': session.pk})
+
+    response = client.post(url, {'ended_at': (session.started_at + datetime.timedelta(seconds=100)).isoformat()}, format='json')
+    assert response.status_code == 200
+    assert response.data['duration_ms'] == 100000
+    assert response.data['abnormal_end_reason'] == 'NORMAL'
+
+    first.refresh_from_db()
+    # 0~10초 재생, 10~25초 일시정지, 25~35초 1배속, 35~60초 1.5배속
+    assert (first.active_ms, first.paused_ms) == (45000, 15000)
+    assert first.avg_playback_rate == round((20000 + 25000 * 1.5) / 45000, 2)
+    assert (first.seek_count, first.command_counts) == (1, {'다음': 1})
+    second.refresh_from_db()
+    assert (second.active_ms, second.paused_ms, second.avg_playback_rate) == (30000, 0, 1.5)
+    assert second.command_counts == {'다음': 1, '멈춰': 1}
+
+    ExerciseSessionEvent.objects.filter(session=session).delete()
+    detail = client.get(reverse('exercises:session-detail', kwargs={'pk': session.pk})).data
+    assert [item['active_ms'] for item in detail['items']] == [45000, 30000]
+    assert client.post(url).data['error'] == 'SESSION_ALREADY_CLOSED'
+    assert derive_session_metrics(ExerciseSession.objects.using(session._state.db).get(pk=session.pk)) == 0
+
+
+@pytest.mark.django_db
+def test_sweeper_derives_metrics(recorded):
+    """
+    비정상 종료 세션 지표 테스트.
+    정리 작업이 종료한 세션도 항목별 지표를 계산하고 updated_at 을 갱신하는지 검증합니다.
+    """
+    session, first, _ = recorded
+    before = ExerciseSession.objects.using(session._state.db).get(pk=session.pk).updated_at
+
+    assert sweep_stale_sessions(threshold=datetime.timedelta(minutes=10)) == 1
+
+    session.refresh_from_db()
+    assert session.abnormal_end_reason == 'UNKNOWN'
+    assert session.metrics_at is not None
+    assert session.updated_at > before
+    first.refresh_from_db()
+    assert first.active_ms == 45000
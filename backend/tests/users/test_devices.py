@@ -0,0 +1,89 @@
+import datetime
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.users import devices
+from apps.users.models import TrustedDevice
+from apps.users.verification import get_store, hash_device_id
+
+User = get_user_model()
+
+
+@pytest.fixture
+def pin_user(db):
+    devices.clear_cache()
+    yield User.objects.create_user(
+        username='deviceuser', password='pw', phone_number='01055556666', pin_hash=make_password('1234')
+    )
+    devices.clear_cache()
+
+
+@pytest.mark.django_db
+def test_login_detects_new_device(pin_user, django_assert_num_queries):
+    """
+    새 기기 판단 테스트.
+    SMS 인증 전에는 새 기기로, 인증 후에는 신뢰 기기로 판단하고 신뢰 기기 확인은 캐시 이후 DB 를 조회하지 않으며
+    캐시에 없는 기기만 한 번 조회하는지 검증합니다.
+    """
+    client = APIClient()
+    login = {'phone_number': '01055556666', 'pin_number': '1234', 'device_id': 'phone-1'}
+    response = client.post(reverse('users:user-login'), login)
+    assert response.status_code == 200
+    assert response.data['is_new_device'] is True
+    assert 'is_new_device' not in client.post(reverse('users:user-login'), {**login, 'device_id': ''}).data
+
+    device_hash = hash_device_id('phone-1')
+    get_store().issue('01055556666', device_hash, '123456')
+    response = client.post(reverse('users:user-sms-verify'), {
+        'phone_number': '01055556666', 'device_id': 'phone-1', 'verification_code': '123456'
+    })
+    assert response.status_code == 200
+    assert TrustedDevice.objects.filter(user=pin_user, device_hash=device_hash).count() == 1
+
+    assert client.post(reverse('users:user-login'), login).data['is_new_device'] is False
+    with django_assert_num_queries(0):
+        assert devices.is_trusted(pin_user, device_hash) is True
+    with django_assert_num_queries(1):
+        assert devices.is_trusted(pin_user, hash_device_id('phone-2')) is False
+
+
+@pytest.mark.django_db
+def test_device_trusted_in_other_process(pin_user, django_assert_num_queries):
+    """
+    다른 프로세스 인증 기기 테스트.
+    이 프로세스의 기기 캐시가 만들어진 뒤 다른 프로세스에서 인증된 기기도 캐시 만료 전에 신뢰 기기로 판단하고
+    이후에는 캐시에서 확인하는지 검증합니다.
+    """
+    assert devices.is_trusted(pin_user, 'a' * 64) is False
+    # 다른 프로세스의 trust_device: DB 에만 반영되고 이 프로세스의 캐시는 그대로다.
+    TrustedDevice.objects.create(user=pin_user, device_hash='a' * 64, verified_at=timezone.now(), last_seen_at=timezone.now())
+
+    with django_assert_num_queries(1):
+        assert devices.is_trusted(pin_user, 'a' * 64) is True
+    with django_assert_num_queries(0):
+        assert devices.is_trusted(pin_user, 'a' * 64) is True
+
+
+@pytest.mark.django_db
+def test_touch_and_prune_devices(pin_user):
+    """
+    신뢰 기기 갱신/정리 테스트.
+    최근 사용 일시는 갱신 주기가 지났을 때만 기록되고, 오래된 기기만 배치 단위로 삭제되는지 검증합니다.
+    """
+    now = timezone.now()
+    old = now - datetime.timedelta(days=200)
+    devices.trust_device(pin_user, 'a' * 64, now=old)
+    devices.trust_device(pin_user, 'b' * 64, now=old)
+    devices.trust_device(pin_user, 'c' * 64, now=now)
+
+    assert devices.is_trusted(pin_user, 'a' * 64, now=now) is True
+    assert TrustedDevice.objects.get(device_hash='a' * 64).last_seen_at == now
+    assert devices.is_trusted(pin_user, 'c' * 64, now=now + datetime.timedelta(hours=1)) is True
+    assert TrustedDevice.objects.get(device_hash='c' * 64).last_seen_at == now
+
+    assert devices.prune_stale_devices(max_idle=datetime.timedelta(days=180), now=now, batch_size=1) == 1
+    assert set(TrustedDevice.objects.values_list('device_hash', flat=True)) == {'a' * 64, 'c' * 64}
+    assert devices.is_trusted(pin_user, 'b' * 64) is False
@@ -0,0 +1,55 @@
+import pytest
+from unittest import mock
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_login_with_pin():
+    """
+    PIN 로그인 테스트.
+    올바른 PIN 입력 시 200, 잘못된 PIN 입력 시 401 응답을 검증합니다.
+    """
+    User.objects.create_user(
+        username='pinuser', password='pw', phone_number='01012345678',
+        pin_hash=make_password('1234')
+    )
+    client = APIClient()
+    url = reverse('users:user-login')
+
+    response = client.post(url, {'phone_number': '01012345678', 'pin_number': '1234'})
+    assert response.status_code == 200
+    assert response.data['is_profile_completed'] is False
+
+    response = client.post(url, {'phone_number': '01012345678', 'pin_number': '9999'})
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_login_failures_locked_before_hashing():
+    """
+    로그인 실패 잠금 테스트.
+    5회 실패 후에는 PIN 해시 검증을 수행하지 않고 429 응답을 반환하는지 검증합니다.
+    """
+    User.objects.create_user(
+        username='locked', password='pw', phone_number='01099998888',
+        pin_hash=make_password('1234')
+    )
+    client = APIClient()
+    url = reverse('users:user-login')
+    data = {'phone_number': '01099998888', 'pin_number': '0000'}
+
+    for _ in range(5):
+        assert client.post(url, data).status_code == 401
+
+    with mock.patch('apps.users.views.check_password') as check, \
+            mock.patch('apps.users.views.make_password') as make:
+        response = client.post(url, {'phone_number': '01099998888', 'pin_number': '1234'})
+    assert response.status_code == 429
+    assert 'Retry-After' in response
+    check.assert_not_called()
+    make.assert_not_called()
@@ -0,0 +1,83 @@
+import datetime
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.users.permissions import IsProfileCompleted, ProfileIncomplete
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_profile_completed_flag_maintained():
+    """
+    프로필 완성 여부 갱신 테스트.
+    필수 정보 4종이 모두 저장되는 순간 is_profile_completed 가 True 로 바뀌는지 검증합니다.
+    """
+    user = User.objects.create_user(username='partial', password='pw', height_cm=180, weight_kg=80)
+    assert user.is_profile_completed is False
+
+    user.birthdate = datetime.date(1995, 5, 5)
+    user.gender = 'M'
+    user.save(update_fields=['birthdate', 'gender'])
+    user.refresh_from_db()
+    assert user.is_profile_completed is True
+
+    user.weight_kg = None
+    user.save(update_fields=['weight_kg'])
+    user.refresh_from_db()
+    assert user.is_profile_completed is False
+
+
+@pytest.mark.django_db
+def test_incomplete_profile_blocked():
+    """
+    라우트 가드 테스트.
+    필수 정보가 누락된 사용자는 메인 기능(루틴) 접근 시 403과 입력 화면 안내를 받는지 검증합니다.
+    """
+    user = User.objects.create_user(username='partial', password='pw')
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse('exercises:routine-list'))
+    assert response.status_code == 403
+    assert response.data['error'] == 'PROFILE_INCOMPLETE'
+
+
+@pytest.mark.django_db
+def test_guard_runs_without_queries(profile_user, rf):
+    """
+    라우트 가드 비용 테스트.
+    토큰 클레임 또는 인증 시 로드된 사용자로 판단하여 DB 쿼리가 발생하지 않는지 검증합니다.
+    """
+    request = rf.get('/')
+    request.user = profile_user
+    request.auth = None
+    with CaptureQueriesContext(connection) as queries:
+        assert IsProfileCompleted().has_permission(request, None)
+    assert len(queries) == 0
+
+    request.auth = {'profile_completed': False}
+    with pytest.raises(ProfileIncomplete):
+        IsProfileCompleted().has_permission(request, None)
+
+
+@pytest.mark.django_db
+def test_guard_uses_loaded_user(profile_user, rf):
+    """
+    라우트 가드 최신 값 테스트.
+    토큰 클레임이 없으면 요청마다 로드된 사용자의 완성 여부를 그대로 사용해, 프로필이 미완성으로 바뀐
+    다음 요청부터 바로 403 을 반환하는지 검증합니다.
+    """
+    request = rf.get('/')
+    request.user = profile_user
+    request.auth = None
+    assert IsProfileCompleted().has_permission(request, None)
+
+    profile_user.weight_kg = None
+    profile_user.save(update_fields=['weight_kg'])
+    request.user = User.objects.get(pk=profile_user.pk)
+    with pytest.raises(ProfileIncomplete):
+        IsProfileCompleted().has_permission(request, None)
@@ -0,0 +1,84 @@
+import re
+import time
+import pytest
+from unittest import mock
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.core.background import get_queue
+from apps.users.sms import get_provider
+from apps.users.verification import InMemoryVerificationCodeStore, VerificationResult
+
+User = get_user_model()
+
+
+def test_code_store_ttl():
+    """
+    인증번호 저장소 TTL 테스트.
+    만료 전에는 검증되고, 만료 후에는 EXPIRED, 주기 정리 시 항목이 제거되는지 검증합니다.
+    """
+    store = InMemoryVerificationCodeStore(ttl=180, sweep_interval=30)
+    store.issue('01011112222', 'dev', '123456', now=1000)
+    store.issue('01033334444', 'dev', '654321', now=1100)
+
+    assert store.verify('01011112222', 'dev', '000000', now=1010) == VerificationResult.MISMATCH
+    assert store.verify('01011112222', 'dev', '123456', now=1010) == VerificationResult.OK
+    # 성공한 인증번호는 재사용 불가
+    assert store.verify('01011112222', 'dev', '123456', now=1011) == VerificationResult.EXPIRED
+
+    store.issue('01055556666', 'dev', '111111', now=1020)
+    assert store.verify('01055556666', 'dev', '111111', now=1200) == VerificationResult.EXPIRED
+
+    store.purge_expired(now=1281)
+    assert len(store) == 0
+
+
+@pytest.mark.django_db
+def test_sms_send_does_not_wait_for_provider():
+    """
+    SMS 비동기 발송 테스트.
+    제공자 응답이 느려도 발송 요청은 즉시 반환되고, 발송된 인증번호로 기기 인증이 되는지 검증합니다.
+    """
+    User.objects.create_user(username='smsuser', password='pw', phone_number='01012341234')
+    provider = get_provider()
+    original_send = provider.send
+
+    def slow_send(phone_number, message):
+        time.sleep(0.5)
+        original_send(phone_number, message)
+
+    client = APIClient()
+    with mock.patch.object(provider, 'send', side_effect=slow_send):
+        started = time.monotonic()
+        response = client.post(reverse('users:user-sms-send'), {
+            'phone_number': '01012341234', 'device_id': 'device-1'
+        })
+        elapsed = time.monotonic() - started
+        get_queue('sms').join()
+
+    assert response.status_code == 202
+    assert elapsed < 0.5
+    phone_number, message = provider.outbox[-1]
+    assert phone_number == '01012341234'
+    code = re.search(r'\d{6}', message).group()
+
+    response = client.post(reverse('users:user-sms-verify'), {
+        'phone_number': '01012341234', 'device_id': 'device-1', 'verification_code': code
+    })
+    assert response.status_code == 200
+    assert len(response.data['device_hash']) == 64
+
+
+@pytest.mark.django_db
+def test_sms_verify_lockout():
+    """
+    인증번호 재시도 제한 테스트.
+    5회 실패 후에는 올바른 인증번호도 429로 거부되는지 검증합니다.
+    """
+    client = APIClient()
+    url = reverse('users:user-sms-verify')
+    data = {'phone_number': '01000000000', 'device_id': 'device-1', 'verification_code': '000000'}
+
+    for _ in range(5):
+        assert client.post(url, data).status_code == 400
+    assert client.post(url, data).status_code == 429
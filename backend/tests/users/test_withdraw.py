@@ -0,0 +1,80 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.exercises.models import (
+    ExerciseCategory, Exercise, Playlist, PlaylistItem,
+    ExerciseSession, ExerciseSessionItem, ExerciseSessionEvent
+)
+from apps.exercises.sharding import shard_for_user
+from apps.users.models import AccountPurgeJob, UserAuthProvider
+from apps.users.purge import run_purge_job
+
+User = get_user_model()
+
+
+def _create_history(user, events=5):
+    category = ExerciseCategory.objects.create(category_id='STR', display_name='근력')
+    exercise = Exercise.objects.create(category=category, exercise_name='스쿼트')
+    playlist = Playlist.objects.create(user=user, mode='CUSTOM', title='루틴')
+    item = PlaylistItem.objects.create(playlist=playlist, exercise=exercise, sequence_no=1, set_count=3)
+    session = ExerciseSession.objects.create(user=user, playlist=playlist, mode='MANUAL', started_at=timezone.now())
+    session_item = ExerciseSessionItem.objects.create(session=session, exercise=exercise, playlist_item=item, sequence_no=1)
+    ExerciseSessionEvent.objects.bulk_create([
+        ExerciseSessionEvent(session=session, session_item=session_item, event_time_ms=i * 1000, event_type='PAUSE')
+        for i in range(events)
+    ])
+    UserAuthProvider.objects.create(user=user, provider='LOCAL', provider_subject=str(user.pk))
+
+
+@pytest.mark.django_db
+def test_withdraw_deactivates_immediately():
+    """
+    회원탈퇴 요청 테스트.
+    탈퇴 요청 즉시 계정이 비활성화되고 삭제 작업이 생성되는지 검증합니다.
+    """
+    user = User.objects.create_user(username='leaver', password='pw', phone_number='01011110000')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse('users:user-withdraw')
+
+    assert client.post(url, {}).status_code == 400
+
+    response = client.post(url, {'confirm': True}, format='json')
+    assert response.status_code == 202
+    user.refresh_from_db()
+    assert user.is_active is False
+    assert user.phone_number is None
+    assert AccountPurgeJob.objects.filter(user_id=user.pk, status='PENDING').exists()
+
+
+@pytest.mark.django_db
+def test_purge_job_resumes_after_interruption():
+    """
+    삭제 작업 재개 테스트.
+    청크 처리 중 중단되더라도 다시 실행하면 남은 단계부터 이어서 모든 데이터를 삭제하는지 검증합니다.
+    """
+    user = User.objects.create_user(username='purged', password='pw')
+    _create_history(user, events=5)
+    job = AccountPurgeJob.objects.create(user_id=user.pk)
+
+    def interrupt(job, step_name, rows):
+        raise RuntimeError('worker killed')
+
+    with pytest.raises(RuntimeError):
+        run_purge_job(job, chunk_size=2, progress=interrupt)
+
+    job.refresh_from_db()
+    assert job.deleted_rows == {'session_events': 2}
+    assert ExerciseSessionEvent.objects.using(shard_for_user(user.pk)).count() == 3
+
+    run_purge_job(job, chunk_size=2)
+
+    job.refresh_from_db()
+    assert job.status == 'DONE'
+    assert job.deleted_rows['session_events'] == 5
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not ExerciseSession.objects.filter(user_id=user.pk).exists()
+    assert not Playlist.objects.exists()
+    assert not UserAuthProvider.objects.exists()